@@ -71,6 +71,16 @@ async def api_volumes(token: str = Query(""), hours: int = Query(48, ge=1, le=16
     return JSONResponse(data)
 
 
+@router.get("/api/queue-wait")
+async def api_queue_wait(token: str = Query(""), hours: int = Query(24, ge=1, le=168)):
+    """各源并发队列排队时长"""
+    _check_token(token)
+    if not _mongo:
+        raise HTTPException(status_code=500, detail="服务未初始化")
+    data = m.get_queue_wait_stats(_mongo, hours)
+    return JSONResponse(data)
+
+
 @router.get("/api/errors")
 async def api_errors(
     token: str = Query(""),
@@ -92,3 +102,19 @@ async def api_source_detail(name: str, token: str = Query("")):
     data = m.get_source_history(_mongo, name)
     content = json.loads(json.dumps(data, ensure_ascii=False, default=str))
     return JSONResponse(content)
+
+
+@router.get("/api/item/{item_id}/history")
+async def api_item_history(
+    item_id: str,
+    token: str = Query(""),
+    field: str = Query("hot_value", pattern="^(hot_value|position)$"),
+    granularity: str = Query("hour", pattern="^(hour|day)$"),
+    hours: int = Query(168, ge=1, le=24 * 90),
+):
+    """单条热搜的走势（压缩汇总 + 近期原始点）"""
+    _check_token(token)
+    if not _mongo:
+        raise HTTPException(status_code=500, detail="服务未初始化")
+    data = m.get_item_history(_mongo, item_id, field, granularity, hours)
+    return JSONResponse(data)
@@ -16,6 +16,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from pipeline.mongo_writer import MongoWriter
 from pipeline.config_loader import ConfigLoader
+from pipeline.history_rollup import get_history_rollups
 
 
 def ensure_indexes(mongo: MongoWriter) -> None:
@@ -135,6 +136,44 @@ def get_collection_volumes(
     return result
 
 
+def get_queue_wait_stats(mongo: MongoWriter, hours: int = 24) -> List[Dict]:
+    """
+    获取各源在并发控制队列中的排队时长。
+
+    返回按平均排队时长倒序的 [{source_name, category, runs, avg_seconds, max_seconds}, ...]
+    """
+    col = mongo.get_collection("crawl_runs")
+    since = datetime.now() - timedelta(hours=hours)
+    pipeline = [
+        {"$match": {"started_at": {"$gte": since}, "queue_wait_seconds": {"$ne": None}}},
+        {
+            "$group": {
+                "_id": "$source_name",
+                "category": {"$last": "$category"},
+                "runs": {"$sum": 1},
+                "avg_seconds": {"$avg": "$queue_wait_seconds"},
+                "max_seconds": {"$max": "$queue_wait_seconds"},
+            }
+        },
+        {"$sort": {"avg_seconds": -1}},
+    ]
+    try:
+        docs = list(col.aggregate(pipeline))
+    except Exception as e:
+        logger.warning(f"[Admin] 聚合排队时长失败: {e}")
+        return []
+    return [
+        {
+            "source_name": doc["_id"],
+            "category": doc.get("category"),
+            "runs": doc["runs"],
+            "avg_seconds": round(doc["avg_seconds"], 3),
+            "max_seconds": round(doc["max_seconds"], 3),
+        }
+        for doc in docs
+    ]
+
+
 def get_recent_runs(mongo: MongoWriter, limit: int = 100) -> List[Dict]:
     """获取最近 N 条执行记录"""
     col = mongo.get_collection("crawl_runs")
@@ -166,3 +205,30 @@ def get_source_history(
             if isinstance(doc.get(key), datetime):
                 doc[key] = doc[key].isoformat()
     return docs
+
+
+def get_item_history(
+    mongo: MongoWriter,
+    item_id: str,
+    field: str = "hot_value",
+    granularity: str = "hour",
+    hours: int = 168,
+) -> Dict[str, List[Dict]]:
+    """
+    获取单条热搜的时变字段走势：近期原始点 + 压缩后的小时/天汇总。
+
+    返回 {"rollup": [{bucket, min, max, last, count}, ...], "recent": [{ts, val}, ...]}
+    """
+    since_ts = int((datetime.now() - timedelta(hours=hours)).timestamp())
+    rollup = get_history_rollups(mongo, item_id, field, granularity, since_ts)
+
+    recent: List[Dict] = []
+    history_key = f"{field}_history"
+    for coll_name in ("hot_national", "hot_vertical", "aggregator", "hot_local"):
+        doc = mongo.get_collection(coll_name).find_one(
+            {"item_id": item_id}, {"_id": 0, history_key: 1}
+        )
+        if doc:
+            recent = doc.get(history_key, [])
+            break
+    return {"rollup": rollup, "recent": recent}
@@ -5,13 +5,25 @@
 定义所有第三方聚合 API 的统一接口
 """
 
+import hashlib
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
+from urllib.parse import urlparse
 import httpx
 from loguru import logger
 
+from .rate_limit import (
+    DEFAULT_BURST,
+    DEFAULT_RATE,
+    FETCH_RETRIES,
+    fan_out,
+    host_limiter,
+    is_retryable_status,
+    throttle_request,
+)
+
 
 @dataclass
 class AggregatorResult:
@@ -23,6 +35,10 @@ class AggregatorResult:
     error: Optional[str] = None
     timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
     raw_data: Optional[Any] = None
+    # 上游内容与上次抓取相同（304 或内容哈希一致），items 为空，调用方无需重新处理
+    unchanged: bool = False
+    # 上游返回 HTTP 错误时的状态码，决定 fetch_all 是否重试
+    status_code: Optional[int] = None
 
     @property
     def count(self) -> int:
@@ -36,9 +52,19 @@ class AggregatorResult:
             "count": self.count,
             "error": self.error,
             "timestamp": self.timestamp,
+            "unchanged": self.unchanged,
         }
 
 
+@dataclass
+class _PayloadFingerprint:
+    """单个数据源上次响应的条件请求凭据与内容哈希"""
+
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+
+
 class BaseAggregator(ABC):
     """聚合器基类"""
 
@@ -47,6 +73,11 @@ class BaseAggregator(ABC):
     display_name: str = "Base Aggregator"
     base_url: str = ""
 
+    # base_url 主机的令牌桶限速（每秒请求数 / 突发上限）与 fetch_all 并发数
+    rate_limit: float = DEFAULT_RATE
+    rate_burst: int = DEFAULT_BURST
+    max_concurrency: int = 8
+
     def __init__(self, timeout: float = 30.0):
         """
         初始化聚合器
@@ -56,6 +87,9 @@ class BaseAggregator(ABC):
         """
         self.timeout = timeout
         self._client: Optional[httpx.AsyncClient] = None
+        self._fingerprints: Dict[str, _PayloadFingerprint] = {}
+        # 本次响应的凭据，解析成功（_make_success_result）后才写入 _fingerprints
+        self._pending_fingerprints: Dict[str, _PayloadFingerprint] = {}
 
     @property
     def default_headers(self) -> Dict[str, str]:
@@ -74,10 +108,14 @@ class BaseAggregator(ABC):
     async def _get_client(self) -> httpx.AsyncClient:
         """获取 HTTP 客户端"""
         if self._client is None or self._client.is_closed:
+            host = urlparse(self.base_url).hostname
+            if host:
+                host_limiter.configure(host, self.rate_limit, self.rate_burst)
             self._client = httpx.AsyncClient(
                 timeout=self.timeout,
                 follow_redirects=True,
                 headers=self.default_headers,
+                event_hooks={"request": [throttle_request]},
             )
         return self._client
 
@@ -87,6 +125,58 @@ class BaseAggregator(ABC):
             await self._client.aclose()
             self._client = None
 
+    async def _conditional_get(
+        self, source: str, url: str, **kwargs: Any
+    ) -> Optional[httpx.Response]:
+        """
+        带 If-None-Match / If-Modified-Since 的 GET 请求
+
+        Args:
+            source: 数据源 ID，按数据源记录上次响应的 ETag、Last-Modified 和内容哈希
+            url: 请求地址
+            **kwargs: 传给 httpx 的其他参数
+
+        Returns:
+            上游内容未变化（304 或响应体与上次相同）时返回 None，否则返回响应
+
+        新响应的凭据先暂存，调用方解析成功并调用 _make_success_result 后才生效；
+        解析失败时同一响应体下次仍会被完整处理，而不是被当作未变化
+        """
+        previous = self._fingerprints.get(source)
+        headers = dict(kwargs.pop("headers", None) or {})
+        if previous:
+            if previous.etag:
+                headers["If-None-Match"] = previous.etag
+            if previous.last_modified:
+                headers["If-Modified-Since"] = previous.last_modified
+
+        client = await self._get_client()
+        response = await client.get(url, headers=headers, **kwargs)
+        if response.status_code == 304 and previous:
+            return None
+        response.raise_for_status()
+
+        fingerprint = _PayloadFingerprint(
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            content_hash=hashlib.md5(response.content).hexdigest(),
+        )
+        if previous and previous.content_hash == fingerprint.content_hash:
+            # 内容已成功处理过，只刷新 ETag / Last-Modified
+            self._fingerprints[source] = fingerprint
+            return None
+        self._pending_fingerprints[source] = fingerprint
+        return response
+
+    def _discard_pending_payload(self, source: str) -> None:
+        """丢弃本次响应暂存的凭据（解析失败时调用）"""
+        self._pending_fingerprints.pop(source, None)
+
+    def forget_payload(self, source: str) -> None:
+        """丢弃数据源的条件请求凭据，下次抓取完整处理（上次结果未能入库时调用）"""
+        self._fingerprints.pop(source, None)
+        self._pending_fingerprints.pop(source, None)
+
     async def __aenter__(self) -> "BaseAggregator":
         return self
 
@@ -118,51 +208,87 @@ class BaseAggregator(ABC):
         pass
 
     async def fetch_all(
-        self, sources: Optional[List[str]] = None, delay: float = 0.5
+        self,
+        sources: Optional[List[str]] = None,
+        concurrency: Optional[int] = None,
+        retries: int = FETCH_RETRIES,
+        timeout: Optional[float] = None,
     ) -> List[AggregatorResult]:
         """
-        获取多个数据源的数据
+        并发获取多个数据源的数据
+
+        请求速率由按主机的令牌桶控制（rate_limit / rate_burst），失败的数据源
+        按指数退避重试；单个数据源失败或整体超时只影响该数据源的结果。
 
         Args:
             sources: 数据源列表，None 表示所有支持的源
-            delay: 请求间隔（秒）
+            concurrency: 并发数，默认 max_concurrency
+            retries: 失败后的重试次数
+            timeout: 整体超时（秒），None 表示不限
 
         Returns:
-            结果列表
+            结果列表，与 sources 顺序一致
         """
-        import asyncio
-
         if sources is None:
             sources = self.get_supported_sources()
+        supported = set(self.get_supported_sources())
 
-        results = []
-        for source in sources:
+        async def fetch_one(source: str) -> AggregatorResult:
             logger.info(f"[{self.name}] 正在获取: {source}")
-            result = await self.fetch(source)
-            results.append(result)
+            return await self.fetch(source)
+
+        results = await fan_out(
+            sources,
+            fetch_one,
+            is_ok=lambda result: result.success,
+            on_error=self._make_error_result,
+            # 不支持的数据源、非限流的 4xx 重试无意义（同 get_today_news）
+            should_retry=lambda source, result: (
+                source in supported and is_retryable_status(result.status_code)
+            ),
+            concurrency=concurrency or self.max_concurrency,
+            retries=retries,
+            timeout=timeout,
+        )
 
-            if result.success:
+        for source, result in zip(sources, results):
+            if result.unchanged:
+                logger.info(f"[{self.name}] {source}: 内容未变化")
+            elif result.success:
                 logger.info(f"[{self.name}] {source}: 获取成功，共 {result.count} 条")
             else:
                 logger.warning(f"[{self.name}] {source}: {result.error}")
-
-            if delay > 0:
-                await asyncio.sleep(delay)
+        succeeded = sum(1 for r in results if r.success)
+        logger.info(f"[{self.name}] 完成 {succeeded}/{len(results)} 个数据源")
 
         return results
 
-    def _make_error_result(self, source: str, error: str) -> AggregatorResult:
-        """创建错误结果"""
+    def _make_error_result(
+        self, source: str, error: Union[str, Exception]
+    ) -> AggregatorResult:
+        """创建错误结果（传入 HTTPStatusError 时记录状态码），并丢弃本次暂存的凭据"""
+        self._discard_pending_payload(source)
+        status_code = None
+        if isinstance(error, httpx.HTTPStatusError):
+            status_code = error.response.status_code
         return AggregatorResult(
             success=False,
             source=source,
-            error=error,
+            error=str(error),
+            status_code=status_code,
         )
 
+    def _make_unchanged_result(self, source: str) -> AggregatorResult:
+        """创建上游未变化的结果"""
+        return AggregatorResult(success=True, source=source, unchanged=True)
+
     def _make_success_result(
         self, source: str, items: List[Dict], raw_data: Any = None
     ) -> AggregatorResult:
-        """创建成功结果"""
+        """创建成功结果，并提交本次响应的条件请求凭据"""
+        pending = self._pending_fingerprints.pop(source, None)
+        if pending is not None:
+            self._fingerprints[source] = pending
         return AggregatorResult(
             success=True,
             source=source,
@@ -80,9 +80,9 @@ class MoFishAggregator(BaseAggregator):
         url = f"{self.base_url}/api{source_info['path']}"
 
         try:
-            client = await self._get_client()
-            response = await client.get(url)
-            response.raise_for_status()
+            response = await self._conditional_get(source, url)
+            if response is None:
+                return self._make_unchanged_result(source)
 
             data = response.json()
             items = self._parse_items(data, source)
@@ -91,7 +91,7 @@ class MoFishAggregator(BaseAggregator):
 
         except Exception as e:
             logger.error(f"[MoFish] 获取 {source} 失败: {e}")
-            return self._make_error_result(source, str(e))
+            return self._make_error_result(source, e)
 
     def _parse_items(self, data: Any, source: str) -> List[Dict]:
         """解析 API 返回数据"""
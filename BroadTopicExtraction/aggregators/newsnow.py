@@ -19,6 +19,10 @@ class NewsNowAggregator(BaseAggregator):
     display_name = "NewsNow 热搜聚合"
     base_url = "https://newsnow.busiyi.world"
 
+    # 全量 18 个源同时发出
+    rate_burst = 20
+    max_concurrency = 20
+
     # 支持的数据源映射
     # API 端点: /api/s?id={source_id}
     SOURCE_MAP = {
@@ -67,9 +71,9 @@ class NewsNowAggregator(BaseAggregator):
         url = f"{self.base_url}/api/s?id={source_info['id']}"
 
         try:
-            client = await self._get_client()
-            response = await client.get(url)
-            response.raise_for_status()
+            response = await self._conditional_get(source, url)
+            if response is None:
+                return self._make_unchanged_result(source)
 
             data = response.json()
 
@@ -80,7 +84,7 @@ class NewsNowAggregator(BaseAggregator):
 
         except Exception as e:
             logger.error(f"[NewsNow] 获取 {source} 失败: {e}")
-            return self._make_error_result(source, str(e))
+            return self._make_error_result(source, e)
 
     def _parse_items(self, data: Any, source: str) -> List[Dict]:
         """
@@ -66,19 +66,20 @@ class OfficialAPIAggregator(BaseAggregator):
         method = source_info.get("method", "GET")
 
         try:
-            client = await self._get_client()
-
             if method == "POST":
+                client = await self._get_client()
                 payload = source_info.get("payload", {})
                 response = await client.post(
                     url,
                     json=payload,
                     headers={"Content-Type": "application/json"},
                 )
+                response.raise_for_status()
             else:
-                response = await client.get(url)
+                response = await self._conditional_get(source, url)
+                if response is None:
+                    return self._make_unchanged_result(source)
 
-            response.raise_for_status()
             data = response.json()
 
             # 根据不同源解析数据
@@ -88,6 +89,8 @@ class OfficialAPIAggregator(BaseAggregator):
 
         except Exception as e:
             logger.warning(f"[Official] httpx 获取 {source} 失败: {type(e).__name__}, 尝试 curl fallback")
+            # 凭据对应的是 httpx 未能解析的响应，不能随 curl 的结果一起提交
+            self._discard_pending_payload(source)
             return await self._fetch_via_curl(source, source_info)
 
     async def _fetch_via_curl(self, source: str, source_info: Dict) -> AggregatorResult:
@@ -129,7 +132,7 @@ class OfficialAPIAggregator(BaseAggregator):
 
         except Exception as e:
             logger.error(f"[Official] curl fallback 获取 {source} 失败: {e}")
-            return self._make_error_result(source, str(e))
+            return self._make_error_result(source, e)
 
     def _parse_by_source(self, data: Any, source: str) -> List[Dict]:
         """根据数据源解析数据"""
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+聚合器请求限速与并发抓取
+
+- TokenBucket / HostRateLimiter: 按上游主机的令牌桶限速，进程内所有聚合器共享，
+  通过 httpx 的 request 事件钩子 throttle_request 作用于每一次 HTTP 请求（含重试）
+- fan_out: 并发抓取多个数据源，失败重试（指数退避 + 抖动），整体超时时返回已完成的部分结果
+
+BaseAggregator.fetch_all 与 get_today_news.NewsCollector.get_popular_news 都基于 fan_out。
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, TypeVar
+
+import httpx
+from loguru import logger
+
+DEFAULT_RATE = 5.0  # 每秒请求数
+DEFAULT_BURST = 10  # 突发上限
+FETCH_RETRIES = 2  # 失败后的重试次数
+RETRY_BACKOFF = 1.0  # 首次重试等待（秒），之后逐次翻倍
+MAX_BACKOFF = 30.0
+
+T = TypeVar("T")
+
+
+class TokenBucket:
+    """令牌桶：按 rate 持续补充，最多积累 burst 个"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """预占一个令牌，返回需要等待的秒数
+
+        令牌不足时余额记为负数，后到的请求排在其后，按到达顺序依次放行。
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self) -> float:
+        """等待直到取得令牌，返回等待时长"""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+class HostRateLimiter:
+    """按主机分配令牌桶，未配置的主机使用默认速率"""
+
+    def __init__(self, default_rate: float = DEFAULT_RATE, default_burst: int = DEFAULT_BURST):
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self._limits: Dict[str, tuple] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, host: str, rate: float, burst: int) -> None:
+        """设置主机速率；速率不变时保留已有令牌桶"""
+        with self._lock:
+            if self._limits.get(host) != (rate, burst):
+                self._limits[host] = (rate, burst)
+                self._buckets.pop(host, None)
+
+    def bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            if host not in self._buckets:
+                rate, burst = self._limits.get(host, (self.default_rate, self.default_burst))
+                self._buckets[host] = TokenBucket(rate, burst)
+            return self._buckets[host]
+
+    async def acquire(self, host: str) -> float:
+        return await self.bucket(host).acquire()
+
+
+# 进程级共享：同一上游被多个聚合器实例 / 调度任务访问时合并计数
+host_limiter = HostRateLimiter()
+
+
+async def throttle_request(request: httpx.Request) -> None:
+    """httpx request 事件钩子：发出请求前按目标主机取令牌"""
+    wait = await host_limiter.acquire(request.url.host)
+    if wait >= 1:
+        logger.debug(f"[RateLimit] {request.url.host} 限速等待 {wait:.1f}s")
+
+
+def is_retryable_status(status_code: Optional[int]) -> bool:
+    """超时、网络错误（无状态码）、限流和 5xx 值得重试；其余 4xx 重试也不会成功"""
+    return status_code is None or status_code == 429 or status_code >= 500
+
+
+async def fan_out(
+    keys: Sequence[str],
+    fetch: Callable[[str], Awaitable[T]],
+    *,
+    is_ok: Callable[[T], bool],
+    on_error: Callable[[str, str], T],
+    should_retry: Optional[Callable[[str, T], bool]] = None,
+    concurrency: int = 8,
+    retries: int = FETCH_RETRIES,
+    backoff: Optional[float] = None,
+    timeout: Optional[float] = None,
+) -> List[T]:
+    """
+    并发抓取 keys，结果按 keys 顺序返回
+
+    Args:
+        keys: 数据源列表
+        fetch: 单个数据源的抓取协程
+        is_ok: 判断结果是否成功
+        on_error: (key, error) -> 失败结果，用于异常与超时
+        should_retry: (key, result) -> 失败结果是否值得重试，默认均重试
+        concurrency: 同时进行的抓取数
+        retries: 失败后的重试次数
+        backoff: 首次重试等待（秒），默认 RETRY_BACKOFF，之后逐次翻倍并加随机抖动
+        timeout: 整体超时（秒），到时未完成的数据源记为失败，其余结果照常返回
+
+    Returns:
+        结果列表，部分失败不影响其他数据源
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    if backoff is None:
+        backoff = RETRY_BACKOFF
+
+    async def run_one(key: str) -> T:
+        async with semaphore:
+            for attempt in range(retries + 1):
+                try:
+                    result = await fetch(key)
+                except Exception as e:
+                    result = on_error(key, str(e))
+                if is_ok(result) or attempt == retries:
+                    return result
+                if should_retry is not None and not should_retry(key, result):
+                    return result
+                delay = min(backoff * 2**attempt, MAX_BACKOFF)
+                delay += random.uniform(0, delay / 2)
+                logger.debug(f"[FanOut] {key} 第 {attempt + 1} 次失败，{delay:.1f}s 后重试")
+                await asyncio.sleep(delay)
+            return result
+
+    tasks = [asyncio.ensure_future(run_one(key)) for key in keys]
+    if not tasks:
+        return []
+    try:
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+    finally:
+        # 超时或调用方被取消时，不留下仍在运行的抓取
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+        logger.warning(f"[FanOut] 超时 {timeout}s，{len(pending)}/{len(tasks)} 个数据源未完成")
+
+    return [
+        task.result() if task not in pending else on_error(key, f"超时未完成 ({timeout}s)")
+        for key, task in zip(keys, tasks)
+    ]
@@ -90,12 +90,11 @@ class RSSHubAggregator(BaseAggregator):
             url = f"{url}?key={self.access_key}"
 
         try:
-            client = await self._get_client()
-
             # RSS 请求需要接受 XML
             headers = {"Accept": "application/rss+xml, application/xml, text/xml"}
-            response = await client.get(url, headers=headers)
-            response.raise_for_status()
+            response = await self._conditional_get(source, url, headers=headers)
+            if response is None:
+                return self._make_unchanged_result(source)
 
             # 解析 RSS XML
             items = self._parse_rss(response.text, source)
@@ -104,7 +103,7 @@ class RSSHubAggregator(BaseAggregator):
 
         except Exception as e:
             logger.error(f"[RSSHub] 获取 {source} 失败: {e}")
-            return self._make_error_result(source, str(e))
+            return self._make_error_result(source, e)
 
     def _parse_rss(self, xml_content: str, source: str) -> List[Dict]:
         """
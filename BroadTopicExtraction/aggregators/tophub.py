@@ -22,6 +22,11 @@ class TopHubAggregator(BaseAggregator):
     display_name = "今日热榜"
     base_url = "https://tophub.today"
 
+    # HTML 页面对频繁访问较敏感
+    rate_limit = 1.0
+    rate_burst = 3
+    max_concurrency = 3
+
     # 节点 ID 映射 (已验证可用)
     SOURCE_MAP = {
         # 社交媒体
@@ -67,12 +72,13 @@ class TopHubAggregator(BaseAggregator):
         url = f"{self.base_url}/n/{node_id}"
 
         try:
-            client = await self._get_client()
-            response = await client.get(
+            response = await self._conditional_get(
+                source,
                 url,
                 headers={"Accept": "text/html,application/xhtml+xml"},
             )
-            response.raise_for_status()
+            if response is None:
+                return self._make_unchanged_result(source)
 
             items = self._parse_html(response.text, source)
 
@@ -80,7 +86,7 @@ class TopHubAggregator(BaseAggregator):
 
         except Exception as e:
             logger.error(f"[TopHub] 获取 {source} 失败: {e}")
-            return self._make_error_result(source, str(e))
+            return self._make_error_result(source, e)
 
     def _parse_html(self, html: str, source: str) -> List[Dict]:
         """解析 HTML 表格中的热搜数据"""
@@ -4,6 +4,7 @@
 
 消费 signals collection 中的信号，管理候选话题生命周期：
 1. 聚类 — cross_platform 信号直接建候选，Layer 1 信号用 jieba 关键词重叠率匹配
+   （候选持久化 keywords 字段，每轮建倒排索引，只对共享关键词的候选打分）
 2. 准入 — 聚类命中 / cross_platform / velocity / position_jump 直接进，new_entry 需 position ≤ 10
 3. 时间序列 — 每轮追加 snapshot (score_pos, sum_hot)，无信号轮次衰减 ×0.8
 4. 状态机 — emerging → rising → confirmed → exploded → tracking → closed / faded
@@ -11,18 +12,20 @@
 嵌入采集调度器：cross_platform 检测完成后调用 run_cycle()。
 """
 
+import copy
 import hashlib
 import json
 import time
+from collections import defaultdict
 from datetime import date
-from typing import Optional
+from typing import Hashable, Iterable, Optional
 from urllib.parse import quote_plus
 
 import yaml
 from loguru import logger
 from pymongo import UpdateOne
 
-from BroadTopicExtraction.analyzer.signal_detector import _extract_keywords
+from BroadTopicExtraction.pipeline.keywords import extract_keywords as _extract_keywords
 from BroadTopicExtraction.pipeline.mongo_writer import MongoWriter
 
 import sys
@@ -61,6 +64,15 @@ CANDIDATE_TTL_SECONDS = 96 * 3600  # 候选最大存活时间 96 小时
 SOURCE_TITLES_MAX = 500  # source_titles 数组上限
 MAX_SNAPSHOTS = 200  # snapshots 数组上限（~100h @ 30min 间隔）
 
+# 只追加的数组字段 → 截断方式（正数保留开头 N 个，负数保留末尾 N 个，None 不截断）
+# 已有候选保存时用 $push + $slice 增量写入
+_APPEND_FIELDS = {
+    "snapshots": -MAX_SNAPSHOTS,
+    "source_titles": SOURCE_TITLES_MAX,
+    "platforms": None,
+    "status_history": None,
+}
+
 # 默认候选阈值
 DEFAULT_CANDIDATE_THRESHOLDS = {
     "keyword_overlap_min": 0.6,  # jieba 关键词重叠率阈值
@@ -119,6 +131,83 @@ TRANSITION_RULES = [
 ]
 
 
+def _candidate_keywords(candidate: dict) -> set[str]:
+    """候选的关键词集合（source_titles 分词并集）
+
+    持久化为 keywords 数组，加载后转为 set 原地缓存；旧候选缺少该字段时补算一次。
+    """
+    keywords = candidate.get("keywords")
+    if not isinstance(keywords, set):
+        if keywords is None:
+            keywords = set()
+            for title in candidate.get("source_titles", []):
+                keywords |= _extract_keywords(title)
+        else:
+            keywords = set(keywords)
+        candidate["keywords"] = keywords
+    return keywords
+
+
+def _appended_tail(old: list, new: list, cap: Optional[int]) -> Optional[list]:
+    """new 是否为 old 追加若干元素后按 cap 截断的结果，是则返回追加的元素，否则 None"""
+    for n in range(len(new) + 1):
+        tail = new[len(new) - n :]
+        merged = old + tail
+        if cap is not None:
+            merged = merged[cap:] if cap < 0 else merged[:cap]
+        if merged == new:
+            return tail
+    return None
+
+
+def _delta_update(baseline: dict, fields: dict) -> dict:
+    """对比加载时的基线，生成最小更新操作（无变化返回空 dict）"""
+    update_set: dict = {}
+    update_push: dict = {}
+    for key, value in fields.items():
+        old = baseline.get(key)
+        if key in baseline and value == old:
+            continue
+        if key in _APPEND_FIELDS and isinstance(old, list) and isinstance(value, list):
+            cap = _APPEND_FIELDS[key]
+            tail = _appended_tail(old, value, cap)
+            if tail is not None:
+                if tail:
+                    spec: dict = {"$each": tail}
+                    if cap is not None:
+                        spec["$slice"] = cap
+                    update_push[key] = spec
+                continue
+        update_set[key] = value
+
+    update: dict = {}
+    if update_set:
+        update["$set"] = update_set
+    if update_push:
+        update["$push"] = update_push
+    return update
+
+
+class _KeywordIndex:
+    """关键词 → key 倒排索引，lookup 按 key 首次加入的顺序返回"""
+
+    def __init__(self):
+        self._postings: dict[str, set] = defaultdict(set)
+        self._seq: dict[Hashable, int] = {}
+
+    def add(self, key: Hashable, keywords: Iterable[str]) -> None:
+        self._seq.setdefault(key, len(self._seq))
+        for kw in keywords:
+            self._postings[kw].add(key)
+
+    def lookup(self, keywords: Iterable[str]) -> list:
+        """与 keywords 至少共享一个关键词的 key"""
+        keys: set = set()
+        for kw in keywords:
+            keys |= self._postings.get(kw, set())
+        return sorted(keys, key=self._seq.__getitem__)
+
+
 def _is_declining(candidate: dict, rounds: int) -> bool:
     """检查 score_pos 是否连续 N 轮下降"""
     snapshots = candidate.get("snapshots", [])
@@ -162,6 +251,13 @@ class CandidateManager:
 
     # ==================== 信号消费 ====================
 
+    def _load_active_candidates(self) -> list[dict]:
+        """读取活跃候选，记录加载时的字段基线供增量保存"""
+        active = self.signal_writer.find(COLLECTION, {"status": {"$in": list(_ACTIVE_STATUSES)}})
+        for cand in active:
+            cand["_baseline"] = copy.deepcopy({k: v for k, v in cand.items() if k != "_id"})
+        return active
+
     def _fetch_all_signals(self) -> list[dict]:
         """读取 signals collection 全部文档"""
         self.signal_writer.connect()
@@ -183,18 +279,18 @@ class CandidateManager:
         return intersection / min(len(kw_a), len(kw_b))
 
     def _match_candidate(
-        self, signal_keywords: set[str], existing_candidates: list[dict]
+        self, signal_keywords: set[str], existing_candidates: Iterable[dict]
     ) -> Optional[dict]:
-        """用 jieba 关键词重叠率匹配已有候选，返回最高重叠率的候选"""
+        """用 jieba 关键词重叠率匹配已有候选，返回最高重叠率的候选
+
+        重叠率为 0 的候选不可能命中，run_cycle 只传入倒排索引查到的候选。
+        """
         min_overlap = self.thresholds["keyword_overlap_min"]
         best_candidate = None
         best_overlap = 0.0
 
         for cand in existing_candidates:
-            cand_keywords = set()
-            for title in cand.get("source_titles", []):
-                cand_keywords |= _extract_keywords(title)
-            overlap = self._compute_overlap(signal_keywords, cand_keywords)
+            overlap = self._compute_overlap(signal_keywords, _candidate_keywords(cand))
             if overlap >= min_overlap and overlap > best_overlap:
                 best_overlap = overlap
                 best_candidate = cand
@@ -272,10 +368,15 @@ class CandidateManager:
             plat = signal.get("platform")
             platforms = [plat] if plat else []
 
+        keywords: set[str] = set()
+        for t in source_titles:
+            keywords |= _extract_keywords(t)
+
         return {
             "candidate_id": f"cand_{title_hash}",
             "canonical_title": title,
             "source_titles": source_titles,
+            "keywords": keywords,
             "status": "emerging",
             "platforms": platforms,
             "platform_count": len(platforms),
@@ -289,16 +390,20 @@ class CandidateManager:
 
     def _update_candidate(self, candidate: dict, signal: dict, now: int) -> dict:
         """用新信号更新已有候选"""
-        title = signal.get("title", "")
-        if title and title not in candidate["source_titles"]:
-            candidate["source_titles"].append(title)
-
+        new_titles = [signal.get("title", "")]
         # 合并 cross_platform 的所有标题
         if signal.get("signal_type") == "cross_platform":
             for plat_info in signal.get("details", {}).get("platform_items", {}).values():
-                t = plat_info.get("title", "")
-                if t and t not in candidate["source_titles"]:
-                    candidate["source_titles"].append(t)
+                new_titles.append(plat_info.get("title", ""))
+
+        keywords = _candidate_keywords(candidate)
+        for t in new_titles:
+            if not t or t in candidate["source_titles"]:
+                continue
+            # 超出上限的标题不保留，也不计入关键词
+            if len(candidate["source_titles"]) < SOURCE_TITLES_MAX:
+                candidate["source_titles"].append(t)
+                keywords |= _extract_keywords(t)
 
         # 限制 source_titles 长度
         if len(candidate["source_titles"]) > SOURCE_TITLES_MAX:
@@ -511,26 +616,41 @@ class CandidateManager:
     # ==================== 持久化 ====================
 
     def _save_candidates(self, candidates: list[dict]) -> dict:
-        """批量 upsert candidates"""
+        """批量保存 candidates
+
+        新候选整体 upsert；已加载的候选与加载时的基线比较，只 $set 变化的字段，
+        只追加的数组用 $push + $slice，没有任何变化的候选跳过。
+        """
         ops = []
+        skipped = 0
         for cand in candidates:
             cand.pop("_has_signal", None)
             cand.pop("_id", None)
+            baseline = cand.pop("_baseline", None)
             cid = cand["candidate_id"]
             set_fields = {k: v for k, v in cand.items() if k != "candidate_id"}
-            ops.append(
-                UpdateOne(
-                    {"candidate_id": cid},
-                    {
-                        "$set": set_fields,
-                        "$setOnInsert": {"candidate_id": cid},
-                    },
-                    upsert=True,
+            set_fields["keywords"] = sorted(_candidate_keywords(cand))
+            if baseline is None:
+                ops.append(
+                    UpdateOne(
+                        {"candidate_id": cid},
+                        {
+                            "$set": set_fields,
+                            "$setOnInsert": {"candidate_id": cid},
+                        },
+                        upsert=True,
+                    )
                 )
-            )
+                continue
+            update = _delta_update(baseline, set_fields)
+            if update:
+                ops.append(UpdateOne({"candidate_id": cid}, update))
+            else:
+                skipped += 1
+        result = {"inserted": 0, "modified": 0, "upserted": 0}
         if ops:
-            return self.signal_writer.bulk_write(COLLECTION, ops)
-        return {"inserted": 0, "modified": 0, "upserted": 0}
+            result = self.signal_writer.bulk_write(COLLECTION, ops)
+        return {**result, "skipped": skipped}
 
     # ==================== 主循环 ====================
 
@@ -547,9 +667,7 @@ class CandidateManager:
         signals = self._fetch_all_signals()
         if not signals:
             # 即使没有新信号，也要对活跃候选做衰减和状态机评估
-            active = self.signal_writer.find(
-                COLLECTION, {"status": {"$in": list(_ACTIVE_STATUSES)}}
-            )
+            active = self._load_active_candidates()
             if active:
                 self._apply_decay(active, now)
                 transitions = self._evaluate_transitions(active, now)
@@ -569,9 +687,21 @@ class CandidateManager:
         logger.info(f"[Candidate] 开始消费 {len(signals)} 个信号")
 
         # 2. 加载已有活跃候选
-        existing = self.signal_writer.find(COLLECTION, {"status": {"$in": list(_ACTIVE_STATUSES)}})
+        existing = self._load_active_candidates()
         # candidate_id -> candidate dict
         cand_map: dict[str, dict] = {c["candidate_id"]: c for c in existing}
+        # 关键词 → candidate_id 倒排索引，候选新增标题时同步追加
+        cand_index = _KeywordIndex()
+        for cid, cand in cand_map.items():
+            cand_index.add(cid, _candidate_keywords(cand))
+
+        def match(sig_kw: set[str]) -> Optional[dict]:
+            shortlist = (cand_map[cid] for cid in cand_index.lookup(sig_kw))
+            return self._match_candidate(sig_kw, shortlist)
+
+        def register(cand: dict) -> None:
+            cand_map[cand["candidate_id"]] = cand
+            cand_index.add(cand["candidate_id"], _candidate_keywords(cand))
 
         # 3. 分类信号
         cross_signals = [s for s in signals if s.get("signal_type") == "cross_platform"]
@@ -583,14 +713,15 @@ class CandidateManager:
         # 4. 先处理 cross_platform 信号 — 直接建/更新候选
         for sig in cross_signals:
             sig_kw = _extract_keywords(sig.get("title", ""))
-            matched = self._match_candidate(sig_kw, list(cand_map.values()))
+            matched = match(sig_kw)
             if matched:
                 self._update_candidate(matched, sig, now)
+                register(matched)
                 updated_count += 1
             else:
                 new_cand = self._create_candidate(sig, now)
                 new_cand["_has_signal"] = True
-                cand_map[new_cand["candidate_id"]] = new_cand
+                register(new_cand)
                 created_count += 1
 
         # 5. 处理 Layer 1 信号 — jieba 重叠率匹配
@@ -598,27 +729,32 @@ class CandidateManager:
         unmatched_signals: list[tuple[dict, set]] = []
         for sig in layer1_signals:
             sig_kw = _extract_keywords(sig.get("title", ""))
-            matched = self._match_candidate(sig_kw, list(cand_map.values()))
+            matched = match(sig_kw)
             if matched:
                 self._update_candidate(matched, sig, now)
+                register(matched)
                 updated_count += 1
             else:
                 unmatched_signals.append((sig, sig_kw))
 
         # 6. 未匹配的 Layer 1 信号：互相聚类 + 准入检查
-        # 先尝试互相聚类
+        # 先尝试互相聚类：以每个未归类信号为种子，吸收与之重叠率达标的后续信号
         min_overlap = self.thresholds["keyword_overlap_min"]
         clusters: list[list[tuple[dict, set]]] = []
         used = set()
+        signal_index = _KeywordIndex()
+        for i, (_, kw) in enumerate(unmatched_signals):
+            signal_index.add(i, kw)
 
         for i, (sig_i, kw_i) in enumerate(unmatched_signals):
             if i in used:
                 continue
             cluster = [(sig_i, kw_i)]
             used.add(i)
-            for j, (sig_j, kw_j) in enumerate(unmatched_signals):
+            for j in signal_index.lookup(kw_i):
                 if j in used:
                     continue
+                sig_j, kw_j = unmatched_signals[j]
                 if self._compute_overlap(kw_i, kw_j) >= min_overlap:
                     cluster.append((sig_j, kw_j))
                     used.add(j)
@@ -632,7 +768,7 @@ class CandidateManager:
                 new_cand["_has_signal"] = True
                 for sig, _ in cluster[1:]:
                     self._update_candidate(new_cand, sig, now)
-                cand_map[new_cand["candidate_id"]] = new_cand
+                register(new_cand)
                 created_count += 1
                 updated_count += len(cluster) - 1
             else:
@@ -641,7 +777,7 @@ class CandidateManager:
                 if self._check_admission(sig):
                     new_cand = self._create_candidate(sig, now)
                     new_cand["_has_signal"] = True
-                    cand_map[new_cand["candidate_id"]] = new_cand
+                    register(new_cand)
                     created_count += 1
 
         # 7. 衰减：对本轮没有新信号的活跃候选
@@ -655,7 +791,8 @@ class CandidateManager:
         save_result = self._save_candidates(all_candidates)
         logger.info(
             f"[Candidate] 保存候选: upserted={save_result.get('upserted', 0)}, "
-            f"modified={save_result.get('modified', 0)}"
+            f"modified={save_result.get('modified', 0)}, "
+            f"unchanged={save_result.get('skipped', 0)}"
         )
 
         # 10. 清空信号
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+热搜写入的 change stream 监听（实时信号检测）
+
+tail 原始库上 HOT_COLLECTIONS 的 insert / update / replace 事件，按
+(collection, source) 合并成微批，交给回调做增量检测，使突发事件在写入后
+数秒内产生信号，而不必等整个信源爬完或 30 分钟的跨平台定时任务。
+
+change stream 需要副本集或分片集群；单机 mongod 上 supported() 返回 False，
+由调用方退回轮询模式。
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+from loguru import logger
+from pymongo.errors import OperationFailure, PyMongoError
+
+from BroadTopicExtraction.analyzer.data_reader import HOT_COLLECTIONS
+from BroadTopicExtraction.pipeline.mongo_writer import MongoWriter
+
+BATCH_WINDOW_SECONDS = 5  # 微批窗口：首个事件到达后最多等待的时长
+BATCH_MAX_EVENTS = 1000  # 单个微批的最大事件数
+MAX_AWAIT_MS = 1000  # 每次 try_next 的服务端等待时长，决定停止响应速度
+MAX_RETRIES = 5  # 连续出错多少次后放弃（调用方退回轮询）
+SINCE_LAG_SECONDS = 60  # 增量检测的回看余量，覆盖事件与 last_seen_at 的时间差
+
+# 非副本集上的 $changeStream / 不识别的聚合阶段
+_UNSUPPORTED_CODES = (40573, 40324)
+# ChangeStreamHistoryLost
+_HISTORY_LOST = 286
+
+# {collection: {source, ...}}
+ChangeBatch = dict[str, set[str]]
+
+
+class ChangeStreamWatcher:
+    """监听热搜 collection 的变更并按微批回调"""
+
+    def __init__(
+        self,
+        mongo_writer: MongoWriter,
+        on_batch: Callable[[ChangeBatch, int], None],
+        collections: tuple[str, ...] = HOT_COLLECTIONS,
+        batch_window: float = BATCH_WINDOW_SECONDS,
+        batch_max_events: int = BATCH_MAX_EVENTS,
+    ):
+        """
+        Args:
+            mongo_writer: 原始数据库连接
+            on_batch: 回调 (changes, since_ts)，changes 为 {collection: {source}}，
+                since_ts 为本批最早事件时间减去回看余量
+        """
+        self.mongo_writer = mongo_writer
+        self.on_batch = on_batch
+        self.collections = collections
+        self.batch_window = batch_window
+        self.batch_max_events = batch_max_events
+        self._resume_token: Optional[dict] = None
+        self._opened = False
+
+    def supported(self) -> bool:
+        """当前部署是否支持 change stream（副本集 / mongos）"""
+        try:
+            hello = self.mongo_writer.db.command("hello")
+        except PyMongoError as e:
+            logger.warning(f"[ChangeStream] 检测部署类型失败: {e}")
+            return False
+        return "setName" in hello or hello.get("msg") == "isdbgrid"
+
+    def run(self, stop: threading.Event) -> None:
+        """阻塞监听直到 stop 被设置；连续出错超过 MAX_RETRIES 次时抛出最后一次异常
+
+        出错后从最近的 resume token 续接，不丢事件。
+        """
+        failures = 0
+        while not stop.is_set():
+            self._opened = False
+            try:
+                self._watch(stop)
+                return
+            except OperationFailure as e:
+                # 不支持 change stream 等配置类错误，重试无意义
+                if e.code in _UNSUPPORTED_CODES:
+                    raise
+                if e.code == _HISTORY_LOST:
+                    # resume token 已滑出 oplog，只能从当前位置重新开始
+                    self._resume_token = None
+                error = e
+            except PyMongoError as e:
+                error = e
+            # 成功打开过说明连接正常，只累计连续失败
+            failures = 1 if self._opened else failures + 1
+            if failures > MAX_RETRIES:
+                raise error
+            logger.warning(f"[ChangeStream] 监听中断 ({failures}/{MAX_RETRIES}): {error}")
+            stop.wait(min(2**failures, 30))
+
+    def _pipeline(self) -> list[dict]:
+        return [
+            {
+                "$match": {
+                    "ns.coll": {"$in": list(self.collections)},
+                    "operationType": {"$in": ["insert", "update", "replace"]},
+                }
+            },
+            # 只需要信源；_id 即 resume token，必须保留
+            {"$project": {"ns.coll": 1, "fullDocument.source": 1}},
+        ]
+
+    def _watch(self, stop: threading.Event) -> None:
+        with self.mongo_writer.db.watch(
+            self._pipeline(),
+            full_document="updateLookup",
+            resume_after=self._resume_token,
+            max_await_time_ms=MAX_AWAIT_MS,
+        ) as stream:
+            self._opened = True
+            logger.info(f"[ChangeStream] 开始监听: {', '.join(self.collections)}")
+            batch: ChangeBatch = {}
+            events = 0
+            started = 0.0
+            since_ts = 0
+            try:
+                while not stop.is_set():
+                    change = stream.try_next()
+                    self._resume_token = stream.resume_token
+                    if change is not None:
+                        source = (change.get("fullDocument") or {}).get("source")
+                        if source:
+                            if not events:
+                                started = time.monotonic()
+                                since_ts = int(time.time()) - SINCE_LAG_SECONDS
+                            batch.setdefault(change["ns"]["coll"], set()).add(source)
+                            events += 1
+                    if events and (
+                        events >= self.batch_max_events
+                        or time.monotonic() - started >= self.batch_window
+                    ):
+                        self._flush(batch, events, since_ts)
+                        batch, events = {}, 0
+            finally:
+                # resume token 已越过这些事件，中断时也要处理掉
+                if events:
+                    self._flush(batch, events, since_ts)
+
+    def _flush(self, batch: ChangeBatch, events: int, since_ts: int) -> None:
+        logger.debug(
+            f"[ChangeStream] 微批 {events} 个事件: "
+            + ", ".join(f"{c}={sorted(s)}" for c, s in batch.items())
+        )
+        try:
+            self.on_batch(batch, since_ts)
+        except Exception as e:
+            # 回调失败不中断监听
+            logger.error(f"[ChangeStream] 微批处理失败: {e}")
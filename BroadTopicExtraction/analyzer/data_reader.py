@@ -19,6 +19,7 @@ _HOT_PROJECTION = {
     "_id": 0,
     "item_id": 1,
     "title": 1,
+    "keywords": 1,
     "platform": 1,
     "source": 1,
     "position": 1,
@@ -31,6 +32,8 @@ _HOT_PROJECTION = {
 
 _HOT_VERTICAL_PROJECTION = {**_HOT_PROJECTION, "vertical": 1}
 
+_HISTORY_FIELDS = ("hot_value_history", "position_history")
+
 _MEDIA_PROJECTION = {
     "_id": 0,
     "item_id": 1,
@@ -45,6 +48,9 @@ _MEDIA_PROJECTION = {
 
 DEFAULT_LOOKBACK = 3600  # 默认回看 1 小时
 
+# 跨平台聚合的热搜 collection，顺序即按 title 去重时的优先级
+HOT_COLLECTIONS = ("hot_national", "hot_vertical", "aggregator")
+
 
 class DataReader:
     """MongoDB 数据读取器，为信号检测提供数据"""
@@ -64,20 +70,29 @@ class DataReader:
 
     # ------ 单 collection 读取 ------
 
-    def get_hot_national(self, since_ts: Optional[int] = None) -> list[dict]:
+    # 热搜读取接口的 history_points 参数: None 返回完整历史，N > 0 只返回最近 N 个点
+    # （服务端 $slice），0 不返回历史字段
+
+    def get_hot_national(
+        self, since_ts: Optional[int] = None, history_points: Optional[int] = None
+    ) -> list[dict]:
         """读取 hot_national 中 last_seen_at >= since_ts 的文档"""
         since_ts = since_ts or _default_since()
-        return self._query("hot_national", since_ts, _HOT_PROJECTION)
+        return self._query("hot_national", since_ts, _hot_projection("hot_national", history_points))
 
-    def get_hot_vertical(self, since_ts: Optional[int] = None) -> list[dict]:
+    def get_hot_vertical(
+        self, since_ts: Optional[int] = None, history_points: Optional[int] = None
+    ) -> list[dict]:
         """读取 hot_vertical，额外返回 vertical 字段"""
         since_ts = since_ts or _default_since()
-        return self._query("hot_vertical", since_ts, _HOT_VERTICAL_PROJECTION)
+        return self._query("hot_vertical", since_ts, _hot_projection("hot_vertical", history_points))
 
-    def get_aggregator(self, since_ts: Optional[int] = None) -> list[dict]:
+    def get_aggregator(
+        self, since_ts: Optional[int] = None, history_points: Optional[int] = None
+    ) -> list[dict]:
         """读取 aggregator"""
         since_ts = since_ts or _default_since()
-        return self._query("aggregator", since_ts, _HOT_PROJECTION)
+        return self._query("aggregator", since_ts, _hot_projection("aggregator", history_points))
 
     def get_media(self, since_ts: Optional[int] = None) -> list[dict]:
         """读取 media"""
@@ -91,29 +106,63 @@ class DataReader:
     # ------ 按信源读取 ------
 
     def get_items_by_source(
-        self, collection: str, source: str, since_ts: Optional[int] = None
+        self,
+        collection: str,
+        source: str,
+        since_ts: Optional[int] = None,
+        history_points: Optional[int] = None,
     ) -> list[dict]:
         """读取指定 collection 中指定 source 的文档"""
         since_ts = since_ts or _default_since()
-        projection = _HOT_VERTICAL_PROJECTION if collection == "hot_vertical" else _HOT_PROJECTION
+        projection = _hot_projection(collection, history_points)
         query = {"last_seen_at": {"$gte": since_ts}, "source": source}
         items = self._mongo.find(collection, query, projection=projection)
         items = self._apply_filters(items)
         logger.debug(f"[DataReader] {collection}/{source}: {len(items)} 条")
         return items
 
+    def match_hot_items(
+        self,
+        collection: str,
+        expr: dict,
+        since_ts: Optional[int] = None,
+        source: Optional[str] = None,
+        history_points: Optional[int] = None,
+    ) -> list[dict]:
+        """在服务端用聚合表达式筛选文档，只返回 expr 为真的条目
+
+        Args:
+            expr: 聚合表达式，作为 $match 的 $expr 条件
+            source: 只读取该信源，None 读取整个 collection
+        """
+        since_ts = since_ts or _default_since()
+        query: dict = {"last_seen_at": {"$gte": since_ts}}
+        if source is not None:
+            query["source"] = source
+        pipeline = [
+            {"$match": query},
+            {"$match": {"$expr": expr}},
+            {"$project": _aggregate_projection(_hot_projection(collection, history_points))},
+        ]
+        items = self._mongo.aggregate(collection, pipeline)
+        items = self._apply_filters(items)
+        logger.debug(f"[DataReader] {collection}/{source or '*'} 聚合筛选: {len(items)} 条")
+        return items
+
     # ------ 聚合读取 ------
 
-    def get_all_hot_items(self, since_ts: Optional[int] = None) -> list[dict]:
+    def get_all_hot_items(
+        self, since_ts: Optional[int] = None, history_points: Optional[int] = None
+    ) -> list[dict]:
         """聚合 hot_national + hot_vertical + aggregator，按 title 去重
 
         去重优先级: hot_national > hot_vertical > aggregator
         """
         since_ts = since_ts or _default_since()
 
-        national = self.get_hot_national(since_ts)
-        vertical = self.get_hot_vertical(since_ts)
-        aggregator = self.get_aggregator(since_ts)
+        national = self.get_hot_national(since_ts, history_points)
+        vertical = self.get_hot_vertical(since_ts, history_points)
+        aggregator = self.get_aggregator(since_ts, history_points)
 
         seen_titles: set[str] = set()
         merged: list[dict] = []
@@ -131,6 +180,27 @@ class DataReader:
         )
         return merged
 
+    def get_hot_updates(
+        self, since_ts: int, history_points: Optional[int] = None
+    ) -> dict[str, list[dict]]:
+        """读取 HOT_COLLECTIONS 中 last_seen_at >= since_ts 的文档（增量），不做过滤和去重
+
+        供增量跨平台索引使用：被过滤的条目需要从索引中移除，由调用方用 is_filtered() 判断。
+
+        Returns:
+            {collection: [doc, ...]}
+        """
+        query = {"last_seen_at": {"$gte": since_ts}}
+        updates = {}
+        for collection in HOT_COLLECTIONS:
+            projection = _hot_projection(collection, history_points)
+            updates[collection] = self._mongo.find(collection, query, projection=projection)
+        logger.debug(
+            f"[DataReader] 增量热搜 (since_ts={since_ts}): "
+            + ", ".join(f"{c}={len(items)}" for c, items in updates.items())
+        )
+        return updates
+
     # ------ 过滤 ------
 
     def _load_filters(self) -> dict:
@@ -148,46 +218,45 @@ class DataReader:
                 bl["titles"] = frozenset(bl["titles"])
         return cfg
 
+    def is_filtered(self, item: dict) -> bool:
+        """条目是否命中黑名单或辟谣置顶规则"""
+        if not self._filters:
+            return False
+
+        source = item.get("source", "")
+        title = item.get("title", "")
+
+        # 1. 数据源黑名单 — 精确标题匹配 / 标题长度限制
+        bl = self._filters.get("source_blacklist", {}).get(source)
+        if bl:
+            if title in bl.get("titles", frozenset()):
+                return True
+            max_len = bl.get("max_title_len")
+            if max_len and len(title) <= max_len:
+                return True
+
+        # 2. 辟谣置顶
+        for rule in self._filters.get("pinned_debunk", []):
+            if source != rule.get("source"):
+                continue
+            if item.get("position") != rule.get("position"):
+                continue
+            keywords = rule.get("title_contains_any", [])
+            if any(kw in title for kw in keywords):
+                return True
+        return False
+
     def _apply_filters(self, items: list[dict]) -> list[dict]:
         """应用黑名单和辟谣置顶过滤"""
         if not self._filters:
             return items
 
-        blacklist = self._filters.get("source_blacklist", {})
-        debunk_rules = self._filters.get("pinned_debunk", [])
-
         filtered = []
         dropped = 0
         for item in items:
-            source = item.get("source", "")
-            title = item.get("title", "")
-
-            # 1. 数据源黑名单 — 精确标题匹配 / 标题长度限制
-            bl = blacklist.get(source)
-            if bl:
-                if title in bl.get("titles", frozenset()):
-                    dropped += 1
-                    continue
-                max_len = bl.get("max_title_len")
-                if max_len and len(title) <= max_len:
-                    dropped += 1
-                    continue
-
-            # 2. 辟谣置顶
-            skip = False
-            for rule in debunk_rules:
-                if source != rule.get("source"):
-                    continue
-                if item.get("position") != rule.get("position"):
-                    continue
-                keywords = rule.get("title_contains_any", [])
-                if any(kw in title for kw in keywords):
-                    skip = True
-                    break
-            if skip:
+            if self.is_filtered(item):
                 dropped += 1
                 continue
-
             filtered.append(item)
 
         if dropped:
@@ -204,5 +273,38 @@ class DataReader:
         return items
 
 
+def _hot_projection(collection: str, history_points: Optional[int] = None) -> dict:
+    """热搜 collection 的字段投影，history_points 见 DataReader 热搜读取接口说明"""
+    base = _HOT_VERTICAL_PROJECTION if collection == "hot_vertical" else _HOT_PROJECTION
+    if history_points is None:
+        return base
+    projection = dict(base)
+    for field in _HISTORY_FIELDS:
+        if history_points > 0:
+            projection[field] = {"$slice": -history_points}
+        else:
+            del projection[field]
+    return projection
+
+
+def _aggregate_projection(projection: dict) -> dict:
+    """把 find 投影转换为 $project 阶段
+
+    {"$slice": -N} 改写为聚合表达式形式；字段不存在时同 find 一样不返回（而不是 null）。
+    """
+    stage = {}
+    for field, spec in projection.items():
+        if isinstance(spec, dict):
+            spec = {
+                "$cond": [
+                    {"$isArray": [f"${field}"]},
+                    {"$slice": [f"${field}", spec["$slice"]]},
+                    "$$REMOVE",
+                ]
+            }
+        stage[field] = spec
+    return stage
+
+
 def _default_since() -> int:
     return int(time.time()) - DEFAULT_LOOKBACK
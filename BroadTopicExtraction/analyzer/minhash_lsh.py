@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+MinHash / LSH 聚类
+
+跨平台共振检测的另一种聚类后端（thresholds["cross_platform_engine"] = "minhash"）:
+
+1. 每个标题的 token 集合（jieba 关键词，或字符 2-gram）计算 MinHash 签名
+2. 签名按 band 切分做 LSH 分桶，同桶即候选对，无需按倒排表两两配对，
+   也不需要"命中超过 50 条的关键词直接丢弃"的硬阈值
+3. 候选对先用签名估计 Jaccard 过滤，再用真实 token 集合校验，通过则合并
+
+签名与分桶全部用 numpy 向量化，整体近似线性。
+"""
+
+import zlib
+from typing import Iterable, Sequence
+
+import numpy as np
+
+_PRIME = np.uint64((1 << 31) - 1)
+# 每批计算签名的 token 数上限，控制 (num_perm × tokens) 中间矩阵的内存
+_CHUNK_TOKENS = 200_000
+
+
+def char_shingles(title: str, n: int = 2) -> set[str]:
+    """标题的字符 n-gram 集合（忽略空白）"""
+    text = "".join(title.split())
+    if len(text) <= n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class MinHashLSH:
+    """MinHash 签名 + banded LSH 聚类
+
+    Args:
+        num_perm: 签名长度（哈希函数个数）
+        bands: band 数，num_perm 必须能被整除；
+            候选阈值约为 (1 / bands) ** (bands / num_perm)
+        seed: 哈希函数随机种子，固定后结果可复现
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 32, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError(f"num_perm={num_perm} 不能被 bands={bands} 整除")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_PRIME), num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), num_perm, dtype=np.uint64)
+        self._band_weights = rng.integers(1, 1 << 62, self.rows, dtype=np.uint64)
+
+    def signatures(self, token_sets: Sequence[Iterable[str]]) -> np.ndarray:
+        """计算 (n, num_perm) 签名矩阵，token 集合不能为空"""
+        n = len(token_sets)
+        sigs = np.empty((n, self.num_perm), dtype=np.uint64)
+        start = 0
+        while start < n:
+            hashes: list[int] = []
+            offsets: list[int] = []
+            end = start
+            while end < n and (end == start or len(hashes) < _CHUNK_TOKENS):
+                offsets.append(len(hashes))
+                hashes.extend(zlib.crc32(t.encode("utf-8")) for t in token_sets[end])
+                end += 1
+            h = np.asarray(hashes, dtype=np.uint64) % _PRIME
+            # (a * h + b) mod p，p < 2^31 保证乘积不溢出 uint64
+            permuted = (np.outer(self._a, h) + self._b[:, None]) % _PRIME
+            sigs[start:end] = np.minimum.reduceat(permuted, offsets, axis=1).T
+            start = end
+        return sigs
+
+    def candidate_pairs(self, sigs: np.ndarray) -> np.ndarray:
+        """LSH 分桶，返回去重后的候选对 (m, 2)，每对 i < j
+
+        每个桶只生成 (桶首, 成员) 和 (前一成员, 成员) 两类配对，
+        桶再大也是线性数量；同一簇在多个 band 中相遇，足以连通。
+        """
+        n = sigs.shape[0]
+        if n < 2:
+            return np.empty((0, 2), dtype=np.int64)
+        pairs = []
+        for band in range(self.bands):
+            block = sigs[:, band * self.rows:(band + 1) * self.rows]
+            keys = block @ self._band_weights  # uint64 溢出回绕即哈希
+            order = np.argsort(keys, kind="stable")
+            sorted_keys = keys[order]
+            same_as_prev = np.empty(n, dtype=bool)
+            same_as_prev[0] = False
+            same_as_prev[1:] = sorted_keys[1:] == sorted_keys[:-1]
+            if not same_as_prev.any():
+                continue
+            run_start = np.maximum.accumulate(np.where(same_as_prev, 0, np.arange(n)))
+            members = np.nonzero(same_as_prev)[0]
+            pairs.append(np.stack([order[run_start[members]], order[members]], axis=1))
+            pairs.append(np.stack([order[members - 1], order[members]], axis=1))
+        if not pairs:
+            return np.empty((0, 2), dtype=np.int64)
+        pairs = np.concatenate(pairs).astype(np.int64)
+        pairs.sort(axis=1)
+        pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+        # 编码成单个整数去重，比 np.unique(axis=0) 的结构化排序快得多
+        codes = np.unique(pairs[:, 0] * n + pairs[:, 1])
+        return np.stack([codes // n, codes % n], axis=1)
+
+    def cluster(
+        self,
+        token_sets: Sequence[set[str]],
+        threshold: float,
+        min_shared: int = 1,
+    ) -> list[list[int]]:
+        """聚类，返回按首个成员下标排序的分组（组内下标升序）
+
+        Args:
+            token_sets: 每个条目的 token 集合（非空）
+            threshold: Jaccard 相似度阈值
+            min_shared: 至少共享的 token 数
+        """
+        n = len(token_sets)
+        parent = list(range(n))
+
+        def find(x: int) -> int:
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        if n >= 2:
+            sigs = self.signatures(token_sets)
+            pairs = self.candidate_pairs(sigs)
+            if len(pairs):
+                # 签名估计 Jaccard 粗筛（放宽一个标准差），再用真实集合校验
+                estimated = (sigs[pairs[:, 0]] == sigs[pairs[:, 1]]).mean(axis=1)
+                slack = 1.0 / np.sqrt(self.num_perm)
+                pairs = pairs[estimated >= threshold - slack]
+            for i, j in pairs.tolist():
+                ri, rj = find(i), find(j)
+                if ri == rj:
+                    continue
+                a, b = token_sets[i], token_sets[j]
+                shared = len(a & b)
+                if shared >= min_shared and shared >= threshold * len(a | b):
+                    parent[max(ri, rj)] = min(ri, rj)
+
+        groups: dict[int, list[int]] = {}
+        for i in range(n):
+            groups.setdefault(find(i), []).append(i)
+        return sorted(groups.values(), key=lambda g: g[0])
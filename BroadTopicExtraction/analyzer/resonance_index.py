@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+"""
+增量跨平台共振索引
+
+SignalDetector._detect_cross_platform 每次都对整个回看窗口重新分词、
+重建倒排索引和 Union-Find。ResonanceIndex 常驻内存，只处理变化的条目:
+
+- upsert/remove: 新增、更新、被过滤的条目，标题不变时不重新分词
+- evict: 淘汰 last_seen_at 滑出窗口的条目
+- 倒排索引、条目对共享关键词计数、连通分量均增量维护，
+  删边时只对受影响的分量重新 BFS
+
+groups() 输出的分组及组内顺序与批量算法一致（按 collection 优先级 + first_seen_at），
+保证两条路径生成相同的信号。
+"""
+
+import heapq
+import itertools
+from collections import defaultdict
+from typing import Callable, Iterable
+
+# 关键词命中条目数超过该值视为常见词，不参与配对（与批量算法一致）
+MAX_KEYWORD_FANOUT = 50
+
+# 已移除条目保留的插入序号上限（FIFO 淘汰）
+_RETIRED_ORDER_CAP = 100_000
+
+_Key = tuple[str, str]  # (collection, item_id)
+
+
+class _Entry:
+    __slots__ = ("item", "title", "keywords", "order", "last_seen_at")
+
+    def __init__(self, item: dict, keywords: frozenset, order: tuple):
+        self.item = item
+        self.title = item.get("title", "")
+        self.keywords = keywords
+        self.order = order
+        self.last_seen_at = item.get("last_seen_at", 0) or 0
+
+
+class ResonanceIndex:
+    """跨平台共振增量索引
+
+    Args:
+        min_keywords: 两个条目共享关键词数 >= 该值时连边
+        keyword_fn: 条目 → 关键词集合
+        collection_order: collection 优先级，同标题条目只保留优先级最高的一条
+    """
+
+    def __init__(
+        self,
+        min_keywords: int,
+        keyword_fn: Callable[[dict], set[str]],
+        collection_order: Iterable[str],
+    ):
+        self.min_keywords = min_keywords
+        self._keyword_fn = keyword_fn
+        self._rank = {c: i for i, c in enumerate(collection_order)}
+        self._seq = itertools.count()
+
+        self._entries: dict[_Key, _Entry] = {}
+        self._title_entries: dict[str, set[_Key]] = defaultdict(set)
+        self._title_owner: dict[str, _Key] = {}
+        self._expiry: list[tuple[int, _Key]] = []  # (last_seen_at, key) 小顶堆，惰性删除
+        # 条目滑出窗口后又重新出现时沿用原插入序号，保持与 collection 自然顺序一致
+        self._retired_seq: dict[_Key, int] = {}
+
+        # 图结构只包含"活跃节点"：标题归属者且关键词非空
+        self._postings: dict[str, set[_Key]] = defaultdict(set)
+        self._pair_shared: dict[tuple[_Key, _Key], int] = defaultdict(int)
+        self._adj: dict[_Key, set[_Key]] = {}
+
+        self._comp_of: dict[_Key, int] = {}
+        self._comps: dict[int, set[_Key]] = {}
+        self._dirty: set[int] = set()
+        self._comp_ids = itertools.count()
+
+        self.stats = {"tokenized": 0, "ingested": 0, "evicted": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ==================== 条目维护 ====================
+
+    def upsert(self, collection: str, item: dict) -> None:
+        """新增或更新一个条目"""
+        item_id = item.get("item_id", "")
+        if not item_id:
+            return
+        key = (collection, item_id)
+        self.stats["ingested"] += 1
+        old = self._entries.get(key)
+        title = item.get("title", "")
+
+        if old is not None and old.title == title:
+            # 标题未变：关键词和图结构不变，只刷新数据
+            old.item = item
+            old.last_seen_at = item.get("last_seen_at", 0) or 0
+            heapq.heappush(self._expiry, (old.last_seen_at, key))
+            return
+
+        if old is not None:
+            self.remove(collection, item_id)
+
+        self.stats["tokenized"] += 1
+        seq = self._retired_seq.pop(key) if key in self._retired_seq else next(self._seq)
+        order = (self._rank.get(collection, len(self._rank)), item.get("first_seen_at", 0) or 0, seq)
+        entry = _Entry(item, frozenset(self._keyword_fn(item)), order)
+        self._entries[key] = entry
+        heapq.heappush(self._expiry, (entry.last_seen_at, key))
+        if title:
+            self._title_entries[title].add(key)
+            self._refresh_title_owner(title)
+
+    def remove(self, collection: str, item_id: str) -> None:
+        """移除一个条目（被过滤或滑出窗口）"""
+        key = (collection, item_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        if entry.title:
+            keys = self._title_entries[entry.title]
+            keys.discard(key)
+            if not keys:
+                del self._title_entries[entry.title]
+            self._refresh_title_owner(entry.title)
+        del self._entries[key]
+        self._retired_seq[key] = entry.order[2]
+        if len(self._retired_seq) > _RETIRED_ORDER_CAP:
+            del self._retired_seq[next(iter(self._retired_seq))]
+
+    def evict(self, since_ts: int) -> int:
+        """淘汰 last_seen_at < since_ts 的条目，返回淘汰数"""
+        evicted = 0
+        while self._expiry and self._expiry[0][0] < since_ts:
+            last_seen_at, key = heapq.heappop(self._expiry)
+            entry = self._entries.get(key)
+            if entry is not None and entry.last_seen_at == last_seen_at:
+                self.remove(*key)
+                evicted += 1
+        self.stats["evicted"] += evicted
+        return evicted
+
+    def _refresh_title_owner(self, title: str) -> None:
+        """同标题条目中 order 最小者为归属者（对应批量算法的按 title 去重）"""
+        prev = self._title_owner.get(title)
+        keys = self._title_entries.get(title)
+        owner = min(keys, key=lambda k: self._entries[k].order) if keys else None
+        if owner == prev:
+            return
+        if prev is not None:
+            self._deactivate(prev)
+            del self._title_owner[title]
+        if owner is not None:
+            self._title_owner[title] = owner
+            self._activate(owner)
+
+    # ==================== 图维护 ====================
+
+    def _activate(self, key: _Key) -> None:
+        entry = self._entries[key]
+        if not entry.keywords:
+            return
+        self._adj[key] = set()
+        cid = next(self._comp_ids)
+        self._comps[cid] = {key}
+        self._comp_of[key] = cid
+
+        for kw in entry.keywords:
+            posting = self._postings[kw]
+            size = len(posting)
+            if size < MAX_KEYWORD_FANOUT:
+                for other in posting:
+                    self._inc(key, other)
+            elif size == MAX_KEYWORD_FANOUT:
+                # 变为常见词：撤销该词贡献的所有配对
+                for a, b in itertools.combinations(posting, 2):
+                    self._dec(a, b)
+            posting.add(key)
+
+    def _deactivate(self, key: _Key) -> None:
+        if key not in self._adj:
+            return
+        for kw in self._entries[key].keywords:
+            posting = self._postings[kw]
+            posting.discard(key)
+            size = len(posting)
+            if size < MAX_KEYWORD_FANOUT:
+                for other in posting:
+                    self._dec(key, other)
+            elif size == MAX_KEYWORD_FANOUT:
+                # 回落为非常见词：恢复该词贡献的所有配对
+                for a, b in itertools.combinations(posting, 2):
+                    self._inc(a, b)
+            if not posting:
+                del self._postings[kw]
+
+        del self._adj[key]
+        cid = self._comp_of.pop(key)
+        members = self._comps[cid]
+        members.discard(key)
+        if members:
+            self._dirty.add(cid)
+        else:
+            del self._comps[cid]
+            self._dirty.discard(cid)
+
+    @staticmethod
+    def _pair(a: _Key, b: _Key) -> tuple[_Key, _Key]:
+        return (a, b) if a < b else (b, a)
+
+    def _inc(self, a: _Key, b: _Key) -> None:
+        pair = self._pair(a, b)
+        self._pair_shared[pair] += 1
+        if self._pair_shared[pair] == self.min_keywords:
+            self._adj[a].add(b)
+            self._adj[b].add(a)
+            self._merge(self._comp_of[a], self._comp_of[b])
+
+    def _dec(self, a: _Key, b: _Key) -> None:
+        pair = self._pair(a, b)
+        count = self._pair_shared[pair] - 1
+        if count:
+            self._pair_shared[pair] = count
+        else:
+            del self._pair_shared[pair]
+        if count == self.min_keywords - 1:
+            self._adj[a].discard(b)
+            self._adj[b].discard(a)
+            self._dirty.add(self._comp_of[a])
+
+    def _merge(self, ca: int, cb: int) -> None:
+        if ca == cb:
+            return
+        if len(self._comps[ca]) < len(self._comps[cb]):
+            ca, cb = cb, ca
+        for key in self._comps[cb]:
+            self._comp_of[key] = ca
+        self._comps[ca] |= self._comps.pop(cb)
+        if cb in self._dirty:
+            self._dirty.discard(cb)
+            self._dirty.add(ca)
+
+    def _resolve_dirty(self) -> None:
+        """删边/删点后的分量可能已断开，只对这些分量重新 BFS"""
+        for cid in self._dirty:
+            members = self._comps.pop(cid, None)
+            if not members:
+                continue
+            while members:
+                start = members.pop()
+                new_cid = next(self._comp_ids)
+                comp = {start}
+                stack = [start]
+                while stack:
+                    for nb in self._adj[stack.pop()]:
+                        if nb not in comp:
+                            comp.add(nb)
+                            stack.append(nb)
+                members -= comp
+                self._comps[new_cid] = comp
+                for key in comp:
+                    self._comp_of[key] = new_cid
+        self._dirty.clear()
+
+    # ==================== 输出 ====================
+
+    def groups(self, min_size: int = 1) -> list[list[tuple[dict, frozenset]]]:
+        """返回成员数 >= min_size 的分组 [[(item, keywords), ...], ...]
+
+        组间按最小 order 排序、组内按 order 排序，与批量算法的输出顺序一致。
+        """
+        self._resolve_dirty()
+        result = []
+        for members in self._comps.values():
+            if len(members) < min_size:
+                continue
+            entries = sorted((self._entries[k] for k in members), key=lambda e: e.order)
+            result.append(entries)
+        result.sort(key=lambda entries: entries[0].order)
+        return [[(e.item, e.keywords) for e in entries] for entries in result]
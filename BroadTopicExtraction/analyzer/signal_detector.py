@@ -17,11 +17,17 @@ import time
 from collections import defaultdict
 from typing import Optional
 
-import jieba
 from loguru import logger
 from pymongo import UpdateOne
 
-from BroadTopicExtraction.analyzer.data_reader import DataReader
+from BroadTopicExtraction.analyzer.data_reader import DataReader, HOT_COLLECTIONS
+from BroadTopicExtraction.analyzer.minhash_lsh import MinHashLSH, char_shingles
+from BroadTopicExtraction.analyzer.resonance_index import MAX_KEYWORD_FANOUT, ResonanceIndex
+from BroadTopicExtraction.pipeline.keywords import (
+    extract_keywords as _extract_keywords,  # 兼容旧的导入路径
+    item_keywords,
+    keyword_cache_stats,
+)
 from BroadTopicExtraction.pipeline.mongo_writer import MongoWriter
 
 import sys
@@ -30,15 +36,6 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from ms_config import settings
 
-# jieba 粗筛停用词（单字、标点、常见套话）
-_STOPWORDS = frozenset(
-    "的 了 在 是 我 有 和 就 不 人 都 一 一个 上 也 很 到 说 要 去 你 会 着 没有 看 好 "
-    "自己 这 他 她 它 们 那 被 从 把 让 用 为 什么 怎么 如何 如何看待 哪些 为什么 "
-    "怎样 可以 这个 那个 还是 或者 以及 但是 然而 因为 所以 如果 虽然 已经 正在 "
-    "关于 对于 通过 进行 开始 之后 之前 以来 目前 今天 昨天 明天 最新 最近 突发 "
-    "热搜 曝光 回应 官方 发布 公布 通报".split()
-)
-
 # 平台名归一化：聚合器变体 → 标准平台名
 # 同一平台的聚合源和原生爬虫不算跨平台
 _PLATFORM_ALIAS = {
@@ -55,10 +52,29 @@ DEFAULT_THRESHOLDS = {
     "new_entry_min_hot_value": 50000,  # 新上榜最低热度
     "new_entry_max_position": 10,  # 新上榜最高排名
     "position_jump_min": 10,  # 排名跃升最小幅度
+    "layer1_engine": "python",  # Layer 1 读取: python(读取全部条目) | aggregation(服务端聚合预筛)
     "cross_platform_min_keywords": 2,  # 关键词交集最少个数
     "cross_platform_min_platforms": 3,  # 跨平台最少平台数
+    "cross_platform_engine": "keyword",  # 聚类后端: keyword(倒排索引+Union-Find) | minhash(MinHash/LSH)
+    "minhash_num_perm": 64,  # MinHash 签名长度
+    "minhash_bands": 32,  # LSH band 数（每 band 行数 = num_perm / bands）
+    "minhash_threshold": 0.3,  # 合并所需的 Jaccard 相似度
+    "minhash_tokens": "keyword",  # MinHash token: keyword(jieba 关键词) | char(字符 2-gram)
 }
 
+# 各检测算法需要的历史点数，DataReader 按最大值用 $slice 只取最近 N 个点
+# cross_platform 本身不看历史，信号中附带最近两个点供候选打分
+HISTORY_POINTS = {
+    "velocity": 2,
+    "new_entry": 0,
+    "position_jump": 2,
+    "cross_platform": 2,
+}
+_LAYER1_HISTORY_POINTS = max(HISTORY_POINTS[k] for k in ("velocity", "new_entry", "position_jump"))
+
+# 增量索引每次回读的重叠时长：覆盖 last_seen_at 已生成但尚未写入的并发批次
+_RESONANCE_REREAD_LAG = 300
+
 
 class SignalDetector:
     """信号检测器，发现异动并写入 signals collection
@@ -71,13 +87,24 @@ class SignalDetector:
         data_reader: Optional[DataReader] = None,
         signal_writer: Optional[MongoWriter] = None,
         thresholds: Optional[dict] = None,
+        incremental: bool = True,
     ):
+        """
+        Args:
+            incremental: 跨平台检测使用常驻增量索引（只读取、分词变化的条目），
+                False 时每次全量读取窗口内数据重建；仅 keyword 聚类后端支持增量
+        """
         self.data_reader = data_reader or DataReader()
         # 信号写入独立的 signal 库
         self.signal_writer = signal_writer or MongoWriter(
             db_name=settings.MONGO_SIGNAL_DB_NAME
         )
         self.thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+        self.incremental = incremental
+        self._resonance_index: Optional[ResonanceIndex] = None
+        self._resonance_since = 0  # 索引当前覆盖的窗口起点
+        self._resonance_watermark = 0  # 已读取到的最大 last_seen_at
+        self._minhash: Optional[MinHashLSH] = None
 
     def detect(self, since_ts: Optional[int] = None) -> list[dict]:
         """执行一次完整检测（Layer 1 + Layer 2），返回所有发现的信号
@@ -108,7 +135,7 @@ class SignalDetector:
         since_ts = since_ts or int(time.time()) - 3600
         signals: list[dict] = []
 
-        items = self.data_reader.get_items_by_source(source_collection, source, since_ts)
+        items = self._read_layer1_items(source_collection, since_ts, source)
         if items:
             signals += self._detect_velocity(items, source_collection)
             signals += self._detect_new_entry(items, source_collection)
@@ -130,10 +157,16 @@ class SignalDetector:
         """
         since_ts = since_ts or int(time.time()) - 3600
 
-        all_items = self.data_reader.get_all_hot_items(since_ts)
-        signals = self._detect_cross_platform(all_items)
+        if self.incremental and self.thresholds["cross_platform_engine"] == "keyword":
+            groups = self._sync_resonance_index(since_ts)
+            signals = self._build_cross_platform_signals(groups)
+        else:
+            all_items = self.data_reader.get_all_hot_items(
+                since_ts, history_points=HISTORY_POINTS["cross_platform"]
+            )
+            signals = self._detect_cross_platform(all_items)
 
-        logger.info(f"跨平台信号检测: {len(signals)} 个信号")
+        logger.info(f"跨平台信号检测: {len(signals)} 个信号, 关键词缓存 {keyword_cache_stats()}")
         for s in signals:
             logger.debug(f"  [{s['signal_type']}] {s['title']}")
 
@@ -142,6 +175,44 @@ class SignalDetector:
 
         return signals
 
+    def _sync_resonance_index(self, since_ts: int) -> list[list[tuple[dict, frozenset]]]:
+        """增量同步跨平台索引并返回候选分组
+
+        只读取 last_seen_at 在水位之后的条目，淘汰滑出窗口的条目。
+        窗口起点回退（索引已淘汰的数据无法恢复）时重建索引。
+        """
+        index = self._resonance_index
+        if index is None or since_ts < self._resonance_since:
+            index = ResonanceIndex(
+                self.thresholds["cross_platform_min_keywords"],
+                item_keywords,
+                HOT_COLLECTIONS,
+            )
+            self._resonance_index = index
+            self._resonance_watermark = 0
+
+        read_from = max(since_ts, self._resonance_watermark - _RESONANCE_REREAD_LAG)
+        updates = self.data_reader.get_hot_updates(
+            read_from, history_points=HISTORY_POINTS["cross_platform"]
+        )
+        for collection in HOT_COLLECTIONS:
+            for item in updates.get(collection, []):
+                if self.data_reader.is_filtered(item):
+                    index.remove(collection, item.get("item_id", ""))
+                else:
+                    index.upsert(collection, item)
+                self._resonance_watermark = max(
+                    self._resonance_watermark, item.get("last_seen_at", 0) or 0
+                )
+        evicted = index.evict(since_ts)
+        self._resonance_since = since_ts
+
+        logger.debug(
+            f"跨平台增量索引: 读取 {sum(len(v) for v in updates.values())} 条, "
+            f"淘汰 {evicted} 条, 索引 {len(index)} 条, stats={index.stats}"
+        )
+        return index.groups(min_size=self.thresholds["cross_platform_min_platforms"])
+
     def _detect_layer1_all(self, since_ts: int) -> list[dict]:
         """对 hot_national + hot_vertical 全量跑 Layer 1"""
         signals: list[dict] = []
@@ -149,7 +220,10 @@ class SignalDetector:
             ("hot_national", self.data_reader.get_hot_national),
             ("hot_vertical", self.data_reader.get_hot_vertical),
         ):
-            items = getter(since_ts)
+            if self.thresholds["layer1_engine"] == "aggregation":
+                items = self._read_layer1_items(collection, since_ts)
+            else:
+                items = getter(since_ts, history_points=_LAYER1_HISTORY_POINTS)
             signals += self._detect_velocity(items, collection)
             signals += self._detect_new_entry(items, collection)
             signals += self._detect_position_jump(items, collection)
@@ -159,6 +233,26 @@ class SignalDetector:
 
         return signals
 
+    def _read_layer1_items(
+        self, collection: str, since_ts: int, source: Optional[str] = None
+    ) -> list[dict]:
+        """读取 Layer 1 检测的输入条目
+
+        aggregation 引擎在 MongoDB 中按同一组阈值预筛，只返回至少触发一种信号的条目，
+        信号仍由下方 _detect_* 生成，两种引擎输出一致。
+        """
+        if self.thresholds["layer1_engine"] == "aggregation":
+            return self.data_reader.match_hot_items(
+                collection,
+                layer1_match_expr(self.thresholds, int(time.time())),
+                since_ts,
+                source=source,
+                history_points=_LAYER1_HISTORY_POINTS,
+            )
+        return self.data_reader.get_items_by_source(
+            collection, source, since_ts, history_points=_LAYER1_HISTORY_POINTS
+        )
+
     # ==================== Layer 1 算法 ====================
 
     def _detect_velocity(self, items: list[dict], source_collection: str) -> list[dict]:
@@ -274,9 +368,11 @@ class SignalDetector:
     def _detect_cross_platform(self, items: list[dict]) -> list[dict]:
         """跨平台共振检测（jieba 粗筛）
 
-        1. 对所有 title 用 jieba 提取关键词
-        2. 用倒排索引找关键词交集 >= 2 的配对
-        3. 贪心聚类，同一话题出现在 >= 3 个不同 platform → 生成信号
+        1. 取每条 title 的关键词（入库时已写入 keywords 字段，旧数据走共享分词缓存）
+        2. 聚类（thresholds["cross_platform_engine"]）:
+           - keyword: 倒排索引找关键词交集 >= 2 的配对，Union-Find 贪心聚类
+           - minhash: MinHash 签名 + LSH 分桶找候选对，Jaccard 校验后合并
+        3. 同一话题出现在 >= 3 个不同 platform → 生成信号
 
         NOTE: 超级话题（如春晚）可能命中 20+ 平台，此处不做上限过滤，
         留给候选管理阶段根据话题生命周期和客户兴趣做降噪处理。
@@ -293,66 +389,65 @@ class SignalDetector:
             item_id = item.get("item_id", "")
             if not item_id:
                 continue
-            words = _extract_keywords(item.get("title", ""))
+            words = item_keywords(item)
             if words:
                 item_data[item_id] = {"item": item, "keywords": words}
 
         if len(item_data) < min_plat:
             return []
 
-        # 2. 倒排索引: keyword -> [item_ids]
-        kw_index: dict[str, list[str]] = defaultdict(list)
-        for item_id, data in item_data.items():
-            for kw in data["keywords"]:
-                kw_index[kw].append(item_id)
-
-        # 3. 找配对 — 共享关键词 >= min_kw 的 item 对
-        pair_count: dict[tuple[str, str], set[str]] = defaultdict(set)
-        for kw, ids in kw_index.items():
-            if len(ids) > 50:
-                # 太常见的词跳过，避免噪音
-                continue
-            for i in range(len(ids)):
-                for j in range(i + 1, len(ids)):
-                    a, b = ids[i], ids[j]
-                    key = (min(a, b), max(a, b))
-                    pair_count[key].add(kw)
-
-        # 4. 贪心聚类 — Union-Find
-        parent: dict[str, str] = {}
-
-        def find(x: str) -> str:
-            while parent.get(x, x) != x:
-                parent[x] = parent.get(parent[x], parent[x])
-                x = parent[x]
-            return x
-
-        def union(x: str, y: str) -> None:
-            rx, ry = find(x), find(y)
-            if rx != ry:
-                parent[rx] = ry
-
-        for (a, b), common_kws in pair_count.items():
-            if len(common_kws) >= min_kw:
-                union(a, b)
-
-        # 5. 按组聚合
-        groups: dict[str, list[str]] = defaultdict(list)
-        for item_id in item_data:
-            groups[find(item_id)].append(item_id)
-
-        # 6. 检查每组的平台数（归一化后）
+        # 2~5. 聚类
+        if self.thresholds["cross_platform_engine"] == "minhash":
+            groups = self._minhash_clusters(item_data)
+        else:
+            groups = _keyword_clusters(
+                {item_id: data["keywords"] for item_id, data in item_data.items()}, min_kw
+            )
+
+        return self._build_cross_platform_signals(
+            [
+                [(item_data[item_id]["item"], item_data[item_id]["keywords"]) for item_id in group_ids]
+                for group_ids in groups
+            ]
+        )
+
+    def _minhash_clusters(self, item_data: dict[str, dict]) -> list[list[str]]:
+        """MinHash/LSH 聚类：不需要常见词截断，候选对生成近似线性"""
+        if self._minhash is None:
+            self._minhash = MinHashLSH(
+                num_perm=self.thresholds["minhash_num_perm"],
+                bands=self.thresholds["minhash_bands"],
+            )
+        ids = list(item_data)
+        if self.thresholds["minhash_tokens"] == "char":
+            token_sets = [char_shingles(item_data[i]["item"].get("title", "")) for i in ids]
+            min_shared = 1
+        else:
+            token_sets = [item_data[i]["keywords"] for i in ids]
+            min_shared = self.thresholds["cross_platform_min_keywords"]
+        groups = self._minhash.cluster(
+            token_sets, self.thresholds["minhash_threshold"], min_shared=min_shared
+        )
+        return [[ids[i] for i in group] for group in groups]
+
+    def _build_cross_platform_signals(
+        self, groups: list[list[tuple[dict, set[str]]]]
+    ) -> list[dict]:
+        """检查每组的平台数（归一化后），>= min_platforms 的组生成信号
+
+        Args:
+            groups: [[(item, keywords), ...], ...]，组间/组内顺序决定代表标题
+        """
+        min_plat = self.thresholds["cross_platform_min_platforms"]
         signals = []
-        for group_ids in groups.values():
+        for group in groups:
             platforms: dict[str, dict] = {}  # normalized_platform -> item info
             common_keywords: set[str] = set()
 
-            for item_id in group_ids:
-                data = item_data[item_id]
-                raw_plat = data["item"].get("platform", "unknown")
+            for item, keywords in group:
+                raw_plat = item.get("platform", "unknown")
                 plat = _normalize_platform(raw_plat)
                 if plat not in platforms:
-                    item = data["item"]
                     platforms[plat] = {
                         "title": item.get("title", ""),
                         "hot_value": item.get("hot_value"),
@@ -361,9 +456,9 @@ class SignalDetector:
                         "position_history": item.get("position_history", []),
                     }
                 if not common_keywords:
-                    common_keywords = set(data["keywords"])
+                    common_keywords = set(keywords)
                 else:
-                    common_keywords &= data["keywords"]
+                    common_keywords &= keywords
 
             if len(platforms) >= min_plat:
                 representative_title = next(iter(platforms.values()))["title"]
@@ -462,7 +557,7 @@ class SignalDetector:
             "details": details,
         }
 
-        # Layer 1: 带上完整历史数据
+        # Layer 1: 带上读取到的近期历史数据
         if item and layer == 1:
             doc["hot_value_history"] = item.get("hot_value_history", [])
             doc["position_history"] = item.get("position_history", [])
@@ -472,12 +567,134 @@ class SignalDetector:
         return doc
 
 
-def _extract_keywords(title: str) -> set[str]:
-    """用 jieba 从标题提取关键词，过滤停用词和单字"""
-    if not title:
-        return set()
-    words = jieba.cut(title)
-    return {w for w in words if len(w) >= 2 and w not in _STOPWORDS}
+def _history_val(field: str, index: int) -> dict:
+    """{field}_history 倒数第 index 个点的 val，缺失视为 0（同 history[index].get("val", 0)）"""
+    return {
+        "$let": {
+            "vars": {"point": {"$arrayElemAt": [f"${field}_history", index]}},
+            "in": {"$ifNull": ["$$point.val", 0]},
+        }
+    }
+
+
+def layer1_match_expr(thresholds: dict, now: int) -> dict:
+    """Layer 1 三种信号的聚合表达式（$match 的 $expr），与 _detect_* 使用同一组阈值
+
+    now 应不晚于 Python 侧生成信号时的时间，保证 new_entry 的预筛结果是超集。
+    """
+    velocity = {
+        "$let": {
+            "vars": {"prev": _history_val("hot_value", -2), "curr": _history_val("hot_value", -1)},
+            "in": {
+                # $and 短路求值，prev > 0 时才做除法
+                "$and": [
+                    {"$gt": ["$$prev", 0]},
+                    {"$gte": ["$$curr", thresholds["velocity_min_hot_value"]]},
+                    {
+                        "$gte": [
+                            {"$divide": [{"$subtract": ["$$curr", "$$prev"]}, "$$prev"]},
+                            thresholds["velocity_growth_rate"],
+                        ]
+                    },
+                ]
+            },
+        }
+    }
+    new_entry = {
+        "$let": {
+            "vars": {
+                "first_seen": {"$ifNull": ["$first_seen_at", 0]},
+                "position": {
+                    "$cond": [{"$eq": [{"$ifNull": ["$position", 0]}, 0]}, 999, "$position"]
+                },
+            },
+            "in": {
+                "$and": [
+                    {"$ne": ["$$first_seen", 0]},
+                    {"$lte": [{"$subtract": [now, "$$first_seen"]}, thresholds["new_entry_max_age"]]},
+                    {
+                        "$or": [
+                            {
+                                "$gte": [
+                                    {"$ifNull": ["$hot_value", 0]},
+                                    thresholds["new_entry_min_hot_value"],
+                                ]
+                            },
+                            {"$lte": ["$$position", thresholds["new_entry_max_position"]]},
+                        ]
+                    },
+                ]
+            },
+        }
+    }
+    position_jump = {
+        "$let": {
+            "vars": {"prev": _history_val("position", -2), "curr": _history_val("position", -1)},
+            "in": {
+                "$and": [
+                    {"$gt": ["$$prev", 0]},
+                    {"$gt": ["$$curr", 0]},
+                    {
+                        "$gte": [
+                            {"$subtract": ["$$prev", "$$curr"]},
+                            thresholds["position_jump_min"],
+                        ]
+                    },
+                ]
+            },
+        }
+    }
+    return {"$or": [velocity, new_entry, position_jump]}
+
+
+def _keyword_clusters(keyword_sets: dict[str, set[str]], min_kw: int) -> list[list[str]]:
+    """倒排索引 + Union-Find 聚类，返回按首个成员出现顺序排列的分组
+
+    Args:
+        keyword_sets: item_id -> 关键词集合（按批量读取顺序）
+        min_kw: 两个条目共享关键词数 >= min_kw 时合并
+    """
+    # 倒排索引: keyword -> [item_ids]
+    kw_index: dict[str, list[str]] = defaultdict(list)
+    for item_id, keywords in keyword_sets.items():
+        for kw in keywords:
+            kw_index[kw].append(item_id)
+
+    # 找配对 — 共享关键词 >= min_kw 的 item 对
+    pair_count: dict[tuple[str, str], set[str]] = defaultdict(set)
+    for kw, ids in kw_index.items():
+        if len(ids) > MAX_KEYWORD_FANOUT:
+            # 太常见的词跳过，避免噪音
+            continue
+        for i in range(len(ids)):
+            for j in range(i + 1, len(ids)):
+                a, b = ids[i], ids[j]
+                key = (min(a, b), max(a, b))
+                pair_count[key].add(kw)
+
+    # 贪心聚类 — Union-Find
+    parent: dict[str, str] = {}
+
+    def find(x: str) -> str:
+        while parent.get(x, x) != x:
+            parent[x] = parent.get(parent[x], parent[x])
+            x = parent[x]
+        return x
+
+    def union(x: str, y: str) -> None:
+        rx, ry = find(x), find(y)
+        if rx != ry:
+            parent[rx] = ry
+
+    for (a, b), common_kws in pair_count.items():
+        if len(common_kws) >= min_kw:
+            union(a, b)
+
+    # 按组聚合
+    groups: dict[str, list[str]] = defaultdict(list)
+    for item_id in keyword_sets:
+        groups[find(item_id)].append(item_id)
+    return list(groups.values())
 
 
 def _normalize_platform(platform: str) -> str:
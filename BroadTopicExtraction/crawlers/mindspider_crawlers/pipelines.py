@@ -3,16 +3,22 @@
 MindSpider Scrapy 管道
 
 将爬取的数据通过统一数据管道写入 MongoDB
+- MongoPipeline: 逐条同步写入
+- BatchMongoPipeline: 缓冲后在线程池中批量写入，不阻塞 reactor（默认启用）
 """
 
 import sys
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Set
 
 from scrapy import Spider
 from scrapy.exceptions import DropItem
+from scrapy.utils.defer import maybe_deferred_to_future
 from itemadapter import ItemAdapter
 from loguru import logger
+from twisted.internet.defer import Deferred, DeferredList
+from twisted.internet.threads import deferToThreadPool
+from twisted.python.threadpool import ThreadPool
 
 # 添加项目路径
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -80,6 +86,148 @@ class MongoPipeline:
         return item
 
 
+class BatchMongoPipeline:
+    """批量 MongoDB 写入管道
+
+    数据项先进入缓冲区，满 MONGO_BATCH_SIZE 条、每隔 MONGO_BATCH_INTERVAL 秒以及爬虫关闭时
+    在管道自己的线程池中调用 process_batch_optimized（一次 bulk_write），爬取不等待写入。
+    不用 reactor 线程池：写入较慢时会占满其线程，拖慢同一线程池中的 DNS 解析。
+    写入时数据项已交给后续管道，失败的批次只记录日志和 stats（mongo/failed_items），
+    不再 DropItem。close_spider 等待所有批次写完后才关闭连接。
+    """
+
+    DEFAULT_BATCH_SIZE = 100
+    DEFAULT_BATCH_INTERVAL = 2.0
+    WRITE_THREADS = 2  # 同时进行的批量写入数
+
+    def __init__(
+        self,
+        mongo_uri: str,
+        config_dir: str,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        batch_interval: float = DEFAULT_BATCH_INTERVAL,
+        stats: Any = None,
+    ):
+        self.mongo_uri = mongo_uri
+        self.config_dir = config_dir
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.stats = stats
+        self.processor: DataProcessor | None = None
+        self.clock: Any = None  # 定时刷新使用的时钟（IReactorTime），None 为 reactor
+        self._buffer: List[Dict] = []
+        self._pending: Set[Deferred] = set()
+        self._timer: Any = None
+        self._pool: Optional[ThreadPool] = None
+        self._source_name = ""
+        self._spider_name = ""
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(
+            mongo_uri=crawler.settings.get("MONGO_URI"),
+            config_dir=crawler.settings.get("CONFIG_DIR"),
+            batch_size=crawler.settings.getint("MONGO_BATCH_SIZE", cls.DEFAULT_BATCH_SIZE),
+            batch_interval=crawler.settings.getfloat(
+                "MONGO_BATCH_INTERVAL", cls.DEFAULT_BATCH_INTERVAL
+            ),
+            stats=crawler.stats,
+        )
+
+    def open_spider(self, spider: Spider) -> None:
+        """爬虫启动时初始化连接并启动定时刷新"""
+        self.processor = DataProcessor(
+            mongo_uri=self.mongo_uri,
+            config_dir=self.config_dir,
+        )
+        self.processor.connect()
+        # 获取信源名称 (从 spider 的 source_name 属性或 name)
+        self._source_name = getattr(spider, "source_name", spider.name)
+        self._spider_name = spider.name
+
+        self._pool = ThreadPool(minthreads=1, maxthreads=self.WRITE_THREADS, name="mongo-writer")
+        self._pool.start()
+        self._schedule_flush()
+        logger.info(
+            f"[{spider.name}] MongoDB 批量管道已初始化 "
+            f"(batch_size={self.batch_size}, interval={self.batch_interval}s)"
+        )
+
+    async def close_spider(self, spider: Spider) -> None:
+        """写入剩余数据，等待所有批次完成后关闭连接"""
+        if self._timer and self._timer.active():
+            self._timer.cancel()
+        self._flush()
+
+        try:
+            if self._pending:
+                await maybe_deferred_to_future(DeferredList(list(self._pending)))
+        finally:
+            if self._pool:
+                self._pool.stop()
+            if self.processor:
+                self.processor.close()
+            logger.info(f"[{spider.name}] MongoDB 批量管道已关闭")
+
+    def process_item(self, item: Any, spider: Spider) -> Any:
+        """缓冲数据项，满批时提交写入"""
+        data = dict(ItemAdapter(item))
+
+        # 验证必填字段
+        if not data.get("title"):
+            raise DropItem(f"缺少标题: {data}")
+
+        self._buffer.append(data)
+        if len(self._buffer) >= self.batch_size:
+            self._flush()
+        return item
+
+    def _schedule_flush(self) -> None:
+        if self.clock is None:
+            from twisted.internet import reactor
+
+            self.clock = reactor
+        self._timer = self.clock.callLater(self.batch_interval, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._flush()
+        self._schedule_flush()
+
+    def _flush(self) -> None:
+        """把缓冲区交给线程池写入"""
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        d = self._run_in_pool(self.processor.process_batch_optimized, batch, self._source_name)
+        self._pending.add(d)
+        d.addCallbacks(
+            self._on_written, self._on_failed, callbackArgs=(len(batch),), errbackArgs=(len(batch),)
+        )
+        d.addBoth(lambda _: self._pending.discard(d))
+
+    def _run_in_pool(self, func: Any, *args: Any) -> Deferred:
+        from twisted.internet import reactor
+
+        return deferToThreadPool(reactor, self._pool, func, *args)
+
+    def _on_written(self, stats: Dict[str, int], count: int) -> None:
+        logger.debug(
+            f"[{self._spider_name}] 批量写入 {count} 条: "
+            f"插入 {stats['inserted']}, 更新 {stats['updated']}, 跳过 {stats['skipped']}"
+        )
+        if self.stats is not None:
+            for action in ("inserted", "updated", "skipped"):
+                self.stats.inc_value(f"mongo/{action}", stats[action])
+
+    def _on_failed(self, failure: Any, count: int) -> None:
+        if failure.check(ValueError):
+            logger.warning(f"[{self._spider_name}] 信源配置不存在，丢弃 {count} 条: {failure.value}")
+        else:
+            logger.error(f"[{self._spider_name}] 批量写入 {count} 条失败: {failure.value}")
+        if self.stats is not None:
+            self.stats.inc_value("mongo/failed_items", count)
+
+
 class DuplicateFilterPipeline:
     """去重管道 (基于内存，用于单次爬取)"""
 
@@ -40,9 +40,13 @@ DOWNLOADER_MIDDLEWARES = {
 
 # 启用的管道
 ITEM_PIPELINES = {
-    "mindspider_crawlers.pipelines.MongoPipeline": 300,
+    "mindspider_crawlers.pipelines.BatchMongoPipeline": 300,
 }
 
+# 批量写入：满 N 条或每隔 N 秒提交一次 bulk_write
+MONGO_BATCH_SIZE = 100
+MONGO_BATCH_INTERVAL = 2.0
+
 # 日志设置
 LOG_LEVEL = "INFO"
 LOG_FORMAT = "%(asctime)s [%(name)s] %(levelname)s: %(message)s"
@@ -20,6 +20,11 @@ sys.path.append(str(project_root))
 
 try:
     from BroadTopicExtraction.database_manager import DatabaseManager
+    from BroadTopicExtraction.aggregators.rate_limit import (
+        fan_out,
+        is_retryable_status,
+        throttle_request,
+    )
 except ImportError as e:
     raise ImportError(f"导入模块失败: {e}")
 
@@ -85,7 +90,11 @@ class NewsCollector:
         }
         
         try:
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+            async with httpx.AsyncClient(
+                timeout=30.0,
+                follow_redirects=True,
+                event_hooks={"request": [throttle_request]},  # 按主机限速
+            ) as client:
                 response = await client.get(url, headers=headers)
                 response.raise_for_status()
                 
@@ -108,6 +117,7 @@ class NewsCollector:
             return {
                 "source": source,
                 "status": "http_error",
+                "status_code": e.response.status_code,
                 "error": f"HTTP错误: {source}({url}) - {e.response.status_code}",
                 "timestamp": datetime.now().isoformat()
             }
@@ -120,20 +130,29 @@ class NewsCollector:
             }
     
     async def get_popular_news(self, sources: List[str] = None) -> List[dict]:
-        """获取热门新闻"""
+        """获取热门新闻（并发请求，失败重试，部分源失败不影响其他源）"""
         if sources is None:
             sources = list(SOURCE_NAMES.keys())
         
         logger.info(f"正在获取 {len(sources)} 个新闻源的最新内容...")
         logger.info("=" * 80)
         
-        results = []
-        for source in sources:
-            source_name = SOURCE_NAMES.get(source, source)
-            logger.info(f"正在获取 {source_name} 的新闻...")
-            result = await self.fetch_news(source)
-            results.append(result)
-            
+        results = await fan_out(
+            sources,
+            self.fetch_news,
+            is_ok=lambda result: result["status"] == "success",
+            on_error=lambda source, error: {
+                "source": source,
+                "status": "error",
+                "error": error,
+                "timestamp": datetime.now().isoformat()
+            },
+            should_retry=self._should_retry,
+            concurrency=len(sources),
+        )
+        
+        for result in results:
+            source_name = SOURCE_NAMES.get(result["source"], result["source"])
             if result["status"] == "success":
                 data = result["data"]
                 if 'items' in data and isinstance(data['items'], list):
@@ -143,12 +162,16 @@ class NewsCollector:
                     logger.info(f"✓ {source_name}: 获取成功")
             else:
                 logger.error(f"✗ {source_name}: {result.get('error', '获取失败')}")
-            
-            # 避免请求过快
-            await asyncio.sleep(0.5)
         
         return results
     
+    @staticmethod
+    def _should_retry(source: str, result: dict) -> bool:
+        """超时、网络错误、限流和 5xx 重试；其余 4xx 不重试"""
+        if result["status"] != "http_error":
+            return True
+        return is_retryable_status(result.get("status_code", 0))
+    
     # ==================== 数据处理和存储 ====================
     
     async def collect_and_save_news(self, sources: Optional[List[str]] = None) -> Dict:
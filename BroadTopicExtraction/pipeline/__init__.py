@@ -2,11 +2,20 @@
 """
 统一数据管道模块
 
-提供配置加载、数据处理（去重+历史追踪）、MongoDB写入功能
+提供配置加载、数据处理（去重+历史追踪）、历史压缩、MongoDB写入（同步 / 异步）功能
 """
 
 from .config_loader import ConfigLoader
-from .processor import DataProcessor
+from .processor import AsyncDataProcessor, DataProcessor
 from .mongo_writer import MongoWriter
+from .async_mongo_writer import AsyncMongoWriter
+from .history_rollup import HistoryCompactor
 
-__all__ = ["ConfigLoader", "DataProcessor", "MongoWriter"]
+__all__ = [
+    "ConfigLoader",
+    "DataProcessor",
+    "AsyncDataProcessor",
+    "MongoWriter",
+    "AsyncMongoWriter",
+    "HistoryCompactor",
+]
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+异步 MongoDB 写入器
+
+基于 motor 的 MongoWriter 异步版本，供运行在 asyncio 事件循环中的调度器、
+TaskRunner 和 AsyncDataProcessor 使用，写入期间不阻塞其他聚合器抓取。
+Scrapy 管道等同步调用方继续使用 MongoWriter。
+"""
+
+from typing import Dict, List, Optional, Any
+
+from loguru import logger
+from motor.motor_asyncio import (
+    AsyncIOMotorClient,
+    AsyncIOMotorCollection,
+    AsyncIOMotorDatabase,
+)
+from pymongo import UpdateOne
+
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from ms_config import settings
+
+
+class AsyncMongoWriter:
+    """异步 MongoDB 写入器，接口与 MongoWriter 一致（读写方法为协程）"""
+
+    def __init__(self, mongo_uri: Optional[str] = None, db_name: Optional[str] = None):
+        """
+        初始化异步 MongoDB 写入器
+
+        Args:
+            mongo_uri: MongoDB 连接 URI，默认从配置读取
+            db_name: 数据库名称，默认从配置读取
+        """
+        self.mongo_uri = mongo_uri or settings.MONGO_URI
+        self.db_name = db_name or settings.MONGO_DB_NAME
+        self._client: Optional[AsyncIOMotorClient] = None
+        self._db: Optional[AsyncIOMotorDatabase] = None
+
+    async def connect(self) -> None:
+        """建立 MongoDB 连接"""
+        if self._client is None:
+            try:
+                self._client = AsyncIOMotorClient(self.mongo_uri)
+                self._db = self._client[self.db_name]
+                # 测试连接
+                await self._client.admin.command("ping")
+                logger.info(f"MongoDB 连接成功 (async): {self.db_name}")
+            except Exception as e:
+                self._client = None
+                self._db = None
+                logger.error(f"MongoDB 连接失败: {e}")
+                raise
+
+    def close(self) -> None:
+        """关闭 MongoDB 连接"""
+        if self._client:
+            self._client.close()
+            self._client = None
+            self._db = None
+            logger.debug("MongoDB 连接已关闭 (async)")
+
+    async def __aenter__(self) -> "AsyncMongoWriter":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
+
+    @property
+    def db(self) -> AsyncIOMotorDatabase:
+        """获取数据库实例（motor 客户端惰性连接，未 connect 时直接创建）"""
+        if self._db is None:
+            self._client = AsyncIOMotorClient(self.mongo_uri)
+            self._db = self._client[self.db_name]
+        return self._db
+
+    def get_collection(self, collection_name: str) -> AsyncIOMotorCollection:
+        """获取集合实例"""
+        return self.db[collection_name]
+
+    async def insert_one(self, collection_name: str, document: Dict) -> str:
+        """插入单个文档，返回文档 ID"""
+        result = await self.get_collection(collection_name).insert_one(document)
+        return str(result.inserted_id)
+
+    async def insert_many(self, collection_name: str, documents: List[Dict]) -> List[str]:
+        """批量插入文档，返回文档 ID 列表"""
+        if not documents:
+            return []
+        result = await self.get_collection(collection_name).insert_many(documents)
+        return [str(id) for id in result.inserted_ids]
+
+    async def find_one(self, collection_name: str, query: Dict) -> Optional[Dict]:
+        """查询单个文档，不存在则返回 None"""
+        return await self.get_collection(collection_name).find_one(query)
+
+    async def find(
+        self,
+        collection_name: str,
+        query: Dict,
+        projection: Optional[Dict] = None,
+        limit: int = 0,
+        sort: Optional[List] = None,
+    ) -> List[Dict]:
+        """查询多个文档"""
+        cursor = self.get_collection(collection_name).find(query, projection)
+        if sort:
+            cursor = cursor.sort(sort)
+        if limit > 0:
+            cursor = cursor.limit(limit)
+        return await cursor.to_list(length=None)
+
+    async def aggregate(self, collection_name: str, pipeline: List[Dict]) -> List[Dict]:
+        """执行聚合管道"""
+        cursor = self.get_collection(collection_name).aggregate(pipeline)
+        return await cursor.to_list(length=None)
+
+    async def update_one(
+        self, collection_name: str, query: Dict, update: Dict, upsert: bool = False
+    ) -> int:
+        """更新单个文档，返回修改的文档数量"""
+        result = await self.get_collection(collection_name).update_one(
+            query, update, upsert=upsert
+        )
+        return result.modified_count
+
+    async def update_many(self, collection_name: str, query: Dict, update: Dict) -> int:
+        """更新所有匹配的文档，返回修改的文档数量"""
+        result = await self.get_collection(collection_name).update_many(query, update)
+        return result.modified_count
+
+    async def bulk_write(self, collection_name: str, operations: List[UpdateOne]) -> Dict:
+        """批量写入操作，返回操作结果统计"""
+        if not operations:
+            return {"inserted": 0, "modified": 0, "upserted": 0}
+        result = await self.get_collection(collection_name).bulk_write(operations, ordered=False)
+        return {
+            "inserted": result.inserted_count,
+            "modified": result.modified_count,
+            "upserted": result.upserted_count,
+        }
+
+    async def count_documents(self, collection_name: str, query: Dict) -> int:
+        """统计文档数量"""
+        return await self.get_collection(collection_name).count_documents(query)
+
+    async def create_indexes(self, collection_name: str, indexes: List[Dict]) -> List[str]:
+        """创建索引，indexes 每个元素包含 keys 和可选的 options"""
+        collection = self.get_collection(collection_name)
+        created = []
+        for index in indexes:
+            keys = index.get("keys", [])
+            options = index.get("options", {})
+            name = await collection.create_index(keys, **options)
+            created.append(name)
+        return created
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+时变字段历史压缩
+
+DataProcessor 每次采集都向 {field}_history 追加 {ts, val}，并用 $slice 保留最近
+HISTORY_MAX_POINTS 个点作为硬上限。HistoryCompactor 作为后台任务定期运行:
+
+- 把早于保留窗口（默认 6 小时）的原始点汇总成小时 / 天粒度的
+  min / max / last / count，写入独立的 hot_history_rollup collection
+- 汇总后从原文档 $pull 这些点，原文档只保留近期原始点（至少 MIN_RAW_POINTS 个，
+  保证信号检测始终能取到最近两个快照）
+
+小时粒度汇总保留 HOURLY_TTL_DAYS 天（TTL 索引），天粒度长期保留。
+每个原始点只被汇总一次（汇总后即删除），且按时间顺序处理，
+因此同一桶跨多次运行合并时 last 可直接覆盖。
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from loguru import logger
+from pymongo import UpdateOne
+
+from .config_loader import ConfigLoader
+from .mongo_writer import MongoWriter
+
+ROLLUP_COLLECTION = "hot_history_rollup"
+RAW_RETENTION_SECONDS = 6 * 3600  # 原文档保留的原始点时长
+MIN_RAW_POINTS = 2  # 原文档至少保留的原始点数
+HOURLY_TTL_DAYS = 14  # 小时粒度汇总保留天数
+BATCH_SIZE = 500  # 每批处理的文档数
+
+# 天粒度按北京时间切分
+_TZ_OFFSET = 8 * 3600
+_GRANULARITY_SECONDS = {"hour": 3600, "day": 86400}
+
+
+def bucket_start(ts: int, granularity: str) -> int:
+    """ts 所在时间桶的起点（秒级时间戳）"""
+    size = _GRANULARITY_SECONDS[granularity]
+    return (ts + _TZ_OFFSET) // size * size - _TZ_OFFSET
+
+
+def rollup_points(points: List[Dict], granularity: str) -> Dict[int, Dict]:
+    """把 [{ts, val}] 汇总为 {bucket: {min, max, last, last_ts, count}}"""
+    buckets: Dict[int, Dict] = {}
+    for point in sorted(points, key=lambda p: p["ts"]):
+        val = point.get("val")
+        if val is None:
+            continue
+        bucket = bucket_start(point["ts"], granularity)
+        agg = buckets.get(bucket)
+        if agg is None:
+            buckets[bucket] = {"min": val, "max": val, "last": val, "last_ts": point["ts"], "count": 1}
+        else:
+            agg["min"] = min(agg["min"], val)
+            agg["max"] = max(agg["max"], val)
+            agg["last"] = val
+            agg["last_ts"] = point["ts"]
+            agg["count"] += 1
+    return buckets
+
+
+def split_history(history: List[Dict], cutoff: int) -> List[Dict]:
+    """返回需要汇总并移出原文档的点：早于 cutoff，且不在最近 MIN_RAW_POINTS 个点内"""
+    if len(history) <= MIN_RAW_POINTS:
+        return []
+    return [p for p in history[:-MIN_RAW_POINTS] if p.get("ts", 0) < cutoff]
+
+
+class HistoryCompactor:
+    """时变字段历史压缩任务"""
+
+    def __init__(
+        self,
+        mongo_writer: Optional[MongoWriter] = None,
+        config_loader: Optional[ConfigLoader] = None,
+        raw_retention: int = RAW_RETENTION_SECONDS,
+    ):
+        """
+        Args:
+            mongo_writer: 原始数据库连接
+            config_loader: 信源配置，用于确定各 collection 的时变字段
+            raw_retention: 原文档保留的原始点时长（秒）
+        """
+        self.mongo_writer = mongo_writer or MongoWriter()
+        self.config_loader = config_loader or ConfigLoader()
+        self.raw_retention = raw_retention
+
+    def ensure_indexes(self) -> None:
+        """创建汇总 collection 索引"""
+        self.mongo_writer.create_indexes(
+            ROLLUP_COLLECTION,
+            [
+                {
+                    "keys": [("item_id", 1), ("field", 1), ("granularity", 1), ("bucket", 1)],
+                    "options": {"unique": True, "name": "item_field_bucket"},
+                },
+                {
+                    "keys": [("expire_at", 1)],
+                    "options": {"name": "ttl_hourly", "expireAfterSeconds": 0},
+                },
+            ],
+        )
+
+    def history_fields(self) -> Dict[str, List[str]]:
+        """{collection: [时变字段]}，从信源配置汇总"""
+        fields: Dict[str, set] = {}
+        for config in self.config_loader.get_all_sources().values():
+            collection = config.get("mongo_collection")
+            varying = config.get("time_varying_fields") or []
+            if collection and varying:
+                fields.setdefault(collection, set()).update(varying)
+        return {c: sorted(f) for c, f in fields.items()}
+
+    def compact(self, now: Optional[int] = None) -> Dict[str, int]:
+        """压缩所有 collection，返回统计 {documents, points, buckets}"""
+        now = now or int(time.time())
+        cutoff = now - self.raw_retention
+        self.ensure_indexes()
+
+        stats = {"documents": 0, "points": 0, "buckets": 0}
+        for collection, fields in self.history_fields().items():
+            result = self.compact_collection(collection, fields, cutoff)
+            for key in stats:
+                stats[key] += result[key]
+        logger.info(f"[HistoryRollup] 历史压缩完成: {stats}")
+        return stats
+
+    def compact_collection(self, collection: str, fields: List[str], cutoff: int) -> Dict[str, int]:
+        """压缩单个 collection 中早于 cutoff 的历史点"""
+        history_keys = [f"{field}_history" for field in fields]
+        query = {
+            "$or": [
+                {f"{key}.0.ts": {"$lt": cutoff}, f"{key}.{MIN_RAW_POINTS}": {"$exists": True}}
+                for key in history_keys
+            ]
+        }
+        projection = {"_id": 1, "item_id": 1, **{key: 1 for key in history_keys}}
+
+        stats = {"documents": 0, "points": 0, "buckets": 0}
+        while True:
+            docs = self.mongo_writer.find(collection, query, projection=projection, limit=BATCH_SIZE)
+            rollup_ops: List[UpdateOne] = []
+            pull_ops: List[UpdateOne] = []
+            for doc in docs:
+                pull: Dict = {}
+                for field, key in zip(fields, history_keys):
+                    old_points = split_history(doc.get(key) or [], cutoff)
+                    if not old_points:
+                        continue
+                    pull[key] = {"ts": {"$in": [p["ts"] for p in old_points]}}
+                    rollup_ops += self._rollup_ops(collection, doc.get("item_id", ""), field, old_points)
+                    stats["points"] += len(old_points)
+                if pull:
+                    pull_ops.append(UpdateOne({"_id": doc["_id"]}, {"$pull": pull}))
+
+            # 先写汇总再删原始点：中途失败最多重复汇总，不会丢点
+            if rollup_ops:
+                self.mongo_writer.bulk_write(ROLLUP_COLLECTION, rollup_ops)
+            if pull_ops:
+                self.mongo_writer.bulk_write(collection, pull_ops)
+            stats["documents"] += len(pull_ops)
+            stats["buckets"] += len(rollup_ops)
+
+            if len(docs) < BATCH_SIZE or not pull_ops:
+                break
+
+        if stats["documents"]:
+            logger.debug(f"[HistoryRollup] {collection}: {stats}")
+        return stats
+
+    def _rollup_ops(self, collection: str, item_id: str, field: str, points: List[Dict]) -> List[UpdateOne]:
+        ops = []
+        for granularity in ("hour", "day"):
+            for bucket, agg in rollup_points(points, granularity).items():
+                on_insert = {"collection": collection}
+                if granularity == "hour":
+                    on_insert["expire_at"] = datetime.fromtimestamp(bucket, tz=timezone.utc) + timedelta(
+                        days=HOURLY_TTL_DAYS
+                    )
+                ops.append(
+                    UpdateOne(
+                        {"item_id": item_id, "field": field, "granularity": granularity, "bucket": bucket},
+                        {
+                            "$min": {"min": agg["min"]},
+                            "$max": {"max": agg["max"], "last_ts": agg["last_ts"]},
+                            "$set": {"last": agg["last"]},
+                            "$inc": {"count": agg["count"]},
+                            "$setOnInsert": on_insert,
+                        },
+                        upsert=True,
+                    )
+                )
+        return ops
+
+
+def get_history_rollups(
+    mongo_writer: MongoWriter,
+    item_id: str,
+    field: str = "hot_value",
+    granularity: str = "hour",
+    since_ts: int = 0,
+) -> List[Dict]:
+    """读取单条数据的历史汇总，按时间升序"""
+    return mongo_writer.find(
+        ROLLUP_COLLECTION,
+        {"item_id": item_id, "field": field, "granularity": granularity, "bucket": {"$gte": since_ts}},
+        projection={"_id": 0, "bucket": 1, "min": 1, "max": 1, "last": 1, "count": 1},
+        sort=[("bucket", 1)],
+    )
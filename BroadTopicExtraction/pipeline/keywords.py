@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+标题关键词提取（进程级共享缓存）
+
+同一标题会被反复分词：信号检测的跨平台聚类、候选匹配中每个信号 × 每个候选的
+source_titles、TopicMatcher 预筛。这里统一提供带有界 LRU 缓存的 jieba 分词，
+并在入库时把关键词写入热搜文档的 keywords 字段，下游读取时直接使用。
+"""
+
+from functools import lru_cache
+from typing import Optional
+
+import jieba
+
+# jieba 粗筛停用词（单字、标点、常见套话）
+_STOPWORDS = frozenset(
+    "的 了 在 是 我 有 和 就 不 人 都 一 一个 上 也 很 到 说 要 去 你 会 着 没有 看 好 "
+    "自己 这 他 她 它 们 那 被 从 把 让 用 为 什么 怎么 如何 如何看待 哪些 为什么 "
+    "怎样 可以 这个 那个 还是 或者 以及 但是 然而 因为 所以 如果 虽然 已经 正在 "
+    "关于 对于 通过 进行 开始 之后 之前 以来 目前 今天 昨天 明天 最新 最近 突发 "
+    "热搜 曝光 回应 官方 发布 公布 通报".split()
+)
+
+# 缓存标题数上限：热搜回看窗口内的去重标题通常在万级
+KEYWORD_CACHE_SIZE = 50_000
+
+# 写入关键词字段的 collection（与跨平台聚合的热搜 collection 一致）
+KEYWORD_COLLECTIONS = frozenset({"hot_national", "hot_vertical", "aggregator"})
+
+
+@lru_cache(maxsize=KEYWORD_CACHE_SIZE)
+def _tokenize(title: str) -> frozenset[str]:
+    words = jieba.cut(title)
+    return frozenset(w for w in words if len(w) >= 2 and w not in _STOPWORDS)
+
+
+def extract_keywords(title: Optional[str]) -> set[str]:
+    """用 jieba 从标题提取关键词，过滤停用词和单字（返回可修改的副本）"""
+    if not title:
+        return set()
+    return set(_tokenize(title))
+
+
+def item_keywords(item: dict) -> frozenset[str]:
+    """条目的关键词：优先使用入库时写入的 keywords 字段，旧数据回退到缓存分词"""
+    keywords = item.get("keywords")
+    if keywords is not None:
+        return frozenset(keywords)
+    title = item.get("title")
+    return _tokenize(title) if title else frozenset()
+
+
+def keyword_cache_stats() -> dict:
+    """缓存命中统计 {hits, misses, size, maxsize, hit_rate}"""
+    info = _tokenize.cache_info()
+    total = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "maxsize": info.maxsize,
+        "hit_rate": round(info.hits / total, 4) if total else 0.0,
+    }
@@ -157,6 +157,20 @@ class MongoWriter:
             cursor = cursor.limit(limit)
         return list(cursor)
 
+    def aggregate(self, collection_name: str, pipeline: List[Dict]) -> List[Dict]:
+        """
+        执行聚合管道
+
+        Args:
+            collection_name: 集合名称
+            pipeline: 聚合阶段列表
+
+        Returns:
+            结果文档列表
+        """
+        collection = self.get_collection(collection_name)
+        return list(collection.aggregate(pipeline))
+
     def update_one(
         self, collection_name: str, query: Dict, update: Dict, upsert: bool = False
     ) -> int:
@@ -176,6 +190,38 @@ class MongoWriter:
         result = collection.update_one(query, update, upsert=upsert)
         return result.modified_count
 
+    def upsert_one(self, collection_name: str, query: Dict, update: Dict) -> bool:
+        """
+        按查询条件 upsert 单个文档
+
+        Args:
+            collection_name: 集合名称
+            query: 查询条件
+            update: 更新操作（可含 $setOnInsert）
+
+        Returns:
+            是否插入了新文档
+        """
+        collection = self.get_collection(collection_name)
+        result = collection.update_one(query, update, upsert=True)
+        return result.upserted_id is not None
+
+    def update_many(self, collection_name: str, query: Dict, update: Dict) -> int:
+        """
+        更新所有匹配的文档
+
+        Args:
+            collection_name: 集合名称
+            query: 查询条件
+            update: 更新操作
+
+        Returns:
+            修改的文档数量
+        """
+        collection = self.get_collection(collection_name)
+        result = collection.update_many(query, update)
+        return result.modified_count
+
     def bulk_write(self, collection_name: str, operations: List[UpdateOne]) -> Dict:
         """
         批量写入操作
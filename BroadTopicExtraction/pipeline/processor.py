@@ -7,21 +7,35 @@
 - 新数据直接插入
 - 已存在数据：
   - 无时变字段：跳过
-  - 有时变字段：更新当前值并追加历史记录
+  - 有时变字段：更新当前值并追加历史记录（只保留最近 HISTORY_MAX_POINTS 个点，
+    更早的点由 HistoryCompactor 汇总到 hot_history_rollup）
+- 热搜文档入库时写入标题分词结果 keywords，下游检测不再重复分词
+
+插入与更新合并为一次 upsert（$setOnInsert 写入新文档字段，$set / $push 更新当前值
+与历史），不再先查询是否存在：单条处理一次 update_one，批量处理一次 bulk_write，
+插入 / 更新 / 跳过数取自写入结果。
+
+DataProcessor 使用同步 MongoWriter（Scrapy 管道）；AsyncDataProcessor 使用
+AsyncMongoWriter，供 asyncio 调度器中的聚合器任务批量写入。
 """
 
 import hashlib
 import time
-from typing import Dict, List, Optional, Any, Literal
+from typing import Dict, List, Optional, Any, Literal, Tuple
 from pymongo import UpdateOne
 from loguru import logger
 
 from .config_loader import ConfigLoader
+from .keywords import KEYWORD_COLLECTIONS, extract_keywords
+from .async_mongo_writer import AsyncMongoWriter
 from .mongo_writer import MongoWriter
 
 
 ActionType = Literal["inserted", "updated", "skipped"]
 
+# {field}_history 保留的最近点数上限（30 分钟采集间隔约 48 小时）
+HISTORY_MAX_POINTS = 96
+
 
 class ProcessResult:
     """处理结果"""
@@ -39,7 +53,157 @@ class ProcessResult:
         }
 
 
-class DataProcessor:
+class _DataProcessorBase:
+    """DataProcessor / AsyncDataProcessor 共用的配置读取、去重与文档构建逻辑（不涉及 I/O）"""
+
+    def __init__(self, config_dir: Optional[str] = None):
+        self.config_loader = ConfigLoader(config_dir)
+        self._connected = False
+
+    def _generate_item_id(
+        self, item: Dict, source: str, dedup_fields: List[str]
+    ) -> str:
+        """
+        生成唯一 ID
+
+        Args:
+            item: 数据项
+            source: 信源名称
+            dedup_fields: 去重字段列表
+
+        Returns:
+            MD5 哈希的唯一 ID
+        """
+        parts = [source]
+        for field in dedup_fields:
+            value = item.get(field, "")
+            parts.append(str(value))
+        content = "_".join(parts)
+        return hashlib.md5(content.encode("utf-8")).hexdigest()
+
+    def _build_new_doc(
+        self,
+        item: Dict,
+        item_id: str,
+        source_name: str,
+        time_varying_fields: List[str],
+        now: int,
+        collection_name: str = "",
+    ) -> Dict:
+        """构建新文档"""
+        doc = dict(item)
+        doc["item_id"] = item_id
+        doc["source"] = source_name
+        doc["first_seen_at"] = now
+        doc["last_seen_at"] = now
+
+        # 热搜标题分词（item_id 由 dedup_fields 决定，更新时标题不变，只需入库时写一次）
+        if collection_name in KEYWORD_COLLECTIONS and doc.get("title") and "keywords" not in doc:
+            doc["keywords"] = sorted(extract_keywords(doc["title"]))
+
+        # 初始化时变字段的历史
+        for field in time_varying_fields:
+            if field in doc and doc[field] is not None:
+                doc[f"{field}_history"] = [{"ts": now, "val": doc[field]}]
+
+        return doc
+
+    def _build_update_ops(
+        self, item: Dict, time_varying_fields: List[str], now: int
+    ) -> Dict:
+        """构建更新操作"""
+        update_set: Dict[str, Any] = {"last_seen_at": now}
+        update_push: Dict[str, Any] = {}
+
+        for field in time_varying_fields:
+            new_val = item.get(field)
+            if new_val is not None:
+                update_set[field] = new_val
+                update_push[f"{field}_history"] = {
+                    "$each": [{"ts": now, "val": new_val}],
+                    "$slice": -HISTORY_MAX_POINTS,
+                }
+
+        update_ops: Dict[str, Any] = {"$set": update_set}
+        if update_push:
+            update_ops["$push"] = update_push
+
+        return update_ops
+
+    def _build_upsert(
+        self,
+        item: Dict,
+        item_id: str,
+        source_name: str,
+        time_varying_fields: List[str],
+        now: int,
+        collection_name: str,
+    ) -> Dict:
+        """
+        构建单条数据按 item_id upsert 的更新文档
+
+        不存在时插入 _build_new_doc 的完整文档；已存在时：
+        - 无时变字段：只有 $setOnInsert，不改动文档
+        - 有时变字段：$set 当前值与 last_seen_at，$push 追加历史点
+        $set / $push 涉及的字段在插入时同样生效，因此从 $setOnInsert 中剔除（路径不能重复）。
+        """
+        doc = self._build_new_doc(
+            item, item_id, source_name, time_varying_fields, now, collection_name
+        )
+        if not time_varying_fields:
+            return {"$setOnInsert": doc}
+
+        update_ops = self._build_update_ops(item, time_varying_fields, now)
+        written = set(update_ops["$set"]) | set(update_ops.get("$push", {}))
+        update_ops["$setOnInsert"] = {k: v for k, v in doc.items() if k not in written}
+        return update_ops
+
+    def _build_batch_upserts(
+        self, items: List[Dict], source_name: str
+    ) -> Tuple[str, List[UpdateOne]]:
+        """读取信源配置并为每条数据构建 upsert，返回 (collection, bulk 操作)"""
+        config = self.config_loader.get_source(source_name)
+        if not config:
+            raise ValueError(f"未知信源: {source_name}")
+
+        collection_name = config["mongo_collection"]
+        dedup_fields = config["dedup_fields"]
+        time_varying_fields = config.get("time_varying_fields", [])
+        now = int(time.time())
+
+        operations = []
+        for item in items:
+            item_id = self._generate_item_id(item, source_name, dedup_fields)
+            update = self._build_upsert(
+                item, item_id, source_name, time_varying_fields, now, collection_name
+            )
+            operations.append(UpdateOne({"item_id": item_id}, update, upsert=True))
+        return collection_name, operations
+
+    @staticmethod
+    def _batch_stats(total: int, result: Dict[str, int]) -> Dict[str, int]:
+        """由 bulk_write 结果计算统计：upsert 插入为新增，有改动为更新，其余为跳过"""
+        inserted = result["upserted"]
+        updated = result["modified"]
+        return {"inserted": inserted, "updated": updated, "skipped": total - inserted - updated}
+
+    def _touch_operation(self, source_name: str, since_ts: int) -> Tuple[str, Dict, Dict]:
+        config = self.config_loader.get_source(source_name)
+        if not config:
+            raise ValueError(f"未知信源: {source_name}")
+        query = {"source": source_name, "last_seen_at": {"$gte": since_ts}}
+        return config["mongo_collection"], query, {"$set": {"last_seen_at": int(time.time())}}
+
+    def _log_batch(self, source_name: str, stats: Dict[str, int]) -> None:
+        logger.info(
+            f"[{source_name}] 批量处理完成: "
+            f"插入 {stats['inserted']}, "
+            f"更新 {stats['updated']}, "
+            f"跳过 {stats['skipped']}"
+        )
+
+
+class DataProcessor(_DataProcessorBase):
     """统一数据处理器 - 去重 + 历史追踪"""
 
     def __init__(
@@ -54,9 +218,8 @@ class DataProcessor:
             mongo_uri: MongoDB 连接 URI，默认从配置读取
             config_dir: YAML 配置目录，默认为 config/sources
         """
+        super().__init__(config_dir)
         self.mongo_writer = MongoWriter(mongo_uri)
-        self.config_loader = ConfigLoader(config_dir)
-        self._connected = False
 
     def connect(self) -> None:
         """建立连接"""
@@ -101,27 +264,17 @@ class DataProcessor:
 
         # 生成 item_id
         item_id = self._generate_item_id(item, source_name, dedup_fields)
-
-        # 查询是否已存在
-        existing = self.mongo_writer.find_one(collection_name, {"item_id": item_id})
         now = int(time.time())
 
-        if existing:
-            if not time_varying_fields:
-                # 无时变字段，跳过
-                return ProcessResult("skipped", item_id, source_name)
-            else:
-                # 有时变字段，更新历史
-                self._update_with_history(
-                    collection_name, existing, item, time_varying_fields, now
-                )
-                return ProcessResult("updated", item_id, source_name)
-        else:
-            # 新数据，插入
-            self._insert_new(
-                collection_name, item, item_id, source_name, time_varying_fields, now
-            )
+        update = self._build_upsert(
+            item, item_id, source_name, time_varying_fields, now, collection_name
+        )
+        inserted = self.mongo_writer.upsert_one(collection_name, {"item_id": item_id}, update)
+        if inserted:
             return ProcessResult("inserted", item_id, source_name)
+        # 已存在：有时变字段时更新了当前值和历史，否则未改动
+        action: ActionType = "updated" if time_varying_fields else "skipped"
+        return ProcessResult(action, item_id, source_name)
 
     def process_batch(
         self, items: List[Dict], source_name: str
@@ -162,7 +315,7 @@ class DataProcessor:
         self, items: List[Dict], source_name: str
     ) -> Dict[str, int]:
         """
-        优化的批量处理（使用 bulk_write 减少数据库往返）
+        优化的批量处理（整批一次 bulk_write upsert，不预先查询）
 
         Args:
             items: 数据项列表
@@ -171,172 +324,107 @@ class DataProcessor:
         Returns:
             操作统计 {inserted, updated, skipped}
         """
-        config = self.config_loader.get_source(source_name)
-        if not config:
-            raise ValueError(f"未知信源: {source_name}")
+        collection_name, operations = self._build_batch_upserts(items, source_name)
+        self.connect()
 
-        collection_name = config["mongo_collection"]
-        dedup_fields = config["dedup_fields"]
-        time_varying_fields = config.get("time_varying_fields", [])
+        result = self.mongo_writer.bulk_write(collection_name, operations)
+        stats = self._batch_stats(len(operations), result)
 
-        self.connect()
-        now = int(time.time())
+        self._log_batch(source_name, stats)
+        return stats
 
-        # 生成所有 item_id
-        item_ids = []
-        items_with_id = []
-        for item in items:
-            item_id = self._generate_item_id(item, source_name, dedup_fields)
-            item_ids.append(item_id)
-            items_with_id.append((item, item_id))
-
-        # 批量查询已存在的文档
-        existing_docs = self.mongo_writer.find(
-            collection_name,
-            {"item_id": {"$in": item_ids}},
-            projection={"item_id": 1, "_id": 1},
-        )
-        existing_ids = {doc["item_id"] for doc in existing_docs}
+    def touch_last_seen(self, source_name: str, since_ts: int) -> int:
+        """
+        上游内容未变化时只刷新 last_seen_at，不追加历史点
 
-        # 分类处理
-        operations = []
-        stats = {"inserted": 0, "updated": 0, "skipped": 0}
-
-        for item, item_id in items_with_id:
-            if item_id in existing_ids:
-                if not time_varying_fields:
-                    stats["skipped"] += 1
-                else:
-                    # 构建更新操作
-                    update_ops = self._build_update_ops(item, time_varying_fields, now)
-                    operations.append(
-                        UpdateOne({"item_id": item_id}, update_ops)
-                    )
-                    stats["updated"] += 1
-            else:
-                # 构建插入操作（使用 upsert）
-                doc = self._build_new_doc(
-                    item, item_id, source_name, time_varying_fields, now
-                )
-                operations.append(
-                    UpdateOne({"item_id": item_id}, {"$setOnInsert": doc}, upsert=True)
-                )
-                stats["inserted"] += 1
-
-        # 执行批量操作
-        if operations:
-            self.mongo_writer.bulk_write(collection_name, operations)
+        上一批写入的文档 last_seen_at 均不早于 since_ts（批次开始时间）。
 
-        logger.info(
-            f"[{source_name}] 批量处理完成: "
-            f"插入 {stats['inserted']}, "
-            f"更新 {stats['updated']}, "
-            f"跳过 {stats['skipped']}"
-        )
+        Args:
+            source_name: 信源名称
+            since_ts: 上一批处理开始的时间戳
 
-        return stats
+        Returns:
+            刷新的文档数量
+        """
+        collection_name, query, update = self._touch_operation(source_name, since_ts)
+        self.connect()
+        return self.mongo_writer.update_many(collection_name, query, update)
 
-    def _generate_item_id(
-        self, item: Dict, source: str, dedup_fields: List[str]
-    ) -> str:
+    def get_stats(self, collection_name: str) -> Dict:
         """
-        生成唯一 ID
+        获取集合统计信息
 
         Args:
-            item: 数据项
-            source: 信源名称
-            dedup_fields: 去重字段列表
+            collection_name: 集合名称
 
         Returns:
-            MD5 哈希的唯一 ID
+            统计信息
         """
-        parts = [source]
-        for field in dedup_fields:
-            value = item.get(field, "")
-            parts.append(str(value))
-        content = "_".join(parts)
-        return hashlib.md5(content.encode("utf-8")).hexdigest()
+        self.connect()
+        total = self.mongo_writer.count_documents(collection_name, {})
+        return {
+            "collection": collection_name,
+            "total_documents": total,
+        }
 
-    def _insert_new(
-        self,
-        collection_name: str,
-        item: Dict,
-        item_id: str,
-        source_name: str,
-        time_varying_fields: List[str],
-        now: int,
-    ) -> None:
-        """插入新文档"""
-        doc = self._build_new_doc(item, item_id, source_name, time_varying_fields, now)
-        self.mongo_writer.insert_one(collection_name, doc)
 
-    def _build_new_doc(
-        self,
-        item: Dict,
-        item_id: str,
-        source_name: str,
-        time_varying_fields: List[str],
-        now: int,
-    ) -> Dict:
-        """构建新文档"""
-        doc = dict(item)
-        doc["item_id"] = item_id
-        doc["source"] = source_name
-        doc["first_seen_at"] = now
-        doc["last_seen_at"] = now
+class AsyncDataProcessor(_DataProcessorBase):
+    """异步数据处理器 - 批量去重 + 历史追踪，写入不阻塞事件循环
 
-        # 初始化时变字段的历史
-        for field in time_varying_fields:
-            if field in doc and doc[field] is not None:
-                doc[f"{field}_history"] = [{"ts": now, "val": doc[field]}]
+    只提供批量接口 process_batch_optimized；去重、文档构建逻辑与 DataProcessor 共用
+    （_DataProcessorBase），两者互不继承，同步 / 异步接口各自完整。
+    """
 
-        return doc
-
-    def _update_with_history(
+    def __init__(
         self,
-        collection_name: str,
-        existing: Dict,
-        new_item: Dict,
-        time_varying_fields: List[str],
-        now: int,
-    ) -> None:
-        """更新文档并追加历史"""
-        update_ops = self._build_update_ops(new_item, time_varying_fields, now)
-        self.mongo_writer.update_one(
-            collection_name, {"_id": existing["_id"]}, update_ops
-        )
+        mongo_uri: Optional[str] = None,
+        config_dir: Optional[str] = None,
+    ):
+        super().__init__(config_dir)
+        self.mongo_writer = AsyncMongoWriter(mongo_uri)
 
-    def _build_update_ops(
-        self, item: Dict, time_varying_fields: List[str], now: int
-    ) -> Dict:
-        """构建更新操作"""
-        update_set: Dict[str, Any] = {"last_seen_at": now}
-        update_push: Dict[str, Any] = {}
+    async def connect(self) -> None:
+        """建立连接"""
+        if not self._connected:
+            await self.mongo_writer.connect()
+            self._connected = True
 
-        for field in time_varying_fields:
-            new_val = item.get(field)
-            if new_val is not None:
-                update_set[field] = new_val
-                update_push[f"{field}_history"] = {"ts": now, "val": new_val}
+    def close(self) -> None:
+        """关闭连接"""
+        if self._connected:
+            self.mongo_writer.close()
+            self._connected = False
 
-        update_ops: Dict[str, Any] = {"$set": update_set}
-        if update_push:
-            update_ops["$push"] = update_push
+    async def __aenter__(self) -> "AsyncDataProcessor":
+        await self.connect()
+        return self
 
-        return update_ops
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
 
-    def get_stats(self, collection_name: str) -> Dict:
-        """
-        获取集合统计信息
+    async def process_batch_optimized(
+        self, items: List[Dict], source_name: str
+    ) -> Dict[str, int]:
+        """批量处理（异步，一次 bulk_write），返回操作统计 {inserted, updated, skipped}"""
+        collection_name, operations = self._build_batch_upserts(items, source_name)
+        await self.connect()
 
-        Args:
-            collection_name: 集合名称
+        result = await self.mongo_writer.bulk_write(collection_name, operations)
+        stats = self._batch_stats(len(operations), result)
 
-        Returns:
-            统计信息
-        """
-        self.connect()
-        total = self.mongo_writer.count_documents(collection_name, {})
+        self._log_batch(source_name, stats)
+        return stats
+
+    async def touch_last_seen(self, source_name: str, since_ts: int) -> int:
+        """上游内容未变化时只刷新 last_seen_at（异步），返回刷新的文档数量"""
+        collection_name, query, update = self._touch_operation(source_name, since_ts)
+        await self.connect()
+        return await self.mongo_writer.update_many(collection_name, query, update)
+
+    async def get_stats(self, collection_name: str) -> Dict:
+        """获取集合统计信息"""
+        await self.connect()
+        total = await self.mongo_writer.count_documents(collection_name, {})
         return {
             "collection": collection_name,
             "total_documents": total,
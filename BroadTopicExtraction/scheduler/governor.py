@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+采集并发控制
+
+所有信源任务执行前先向 ConcurrencyGovernor 申请执行槽位，同时受三层上限约束:
+
+- 全局上限：同时运行的采集任务总数（聚合器抓取、Scrapy 爬虫及其 MongoDB 写入）
+- 分类上限：hot_national / hot_local / media 等分类各自的并发数
+- 上游主机上限：tophub、newsnow、rsshub 等被多个信源共享的上游
+
+等待队列按到达顺序放行：队首因某个上限满而等待时，不占用该上限的后续任务
+可以先行，但同一资源释放时总是先分给更早到达的任务。
+每次放行记录排队时长，按信源汇总。
+
+配置见 config/schedule.yaml 的 scheduler.concurrency。
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Deque, Dict, Optional, Tuple
+
+from loguru import logger
+
+DEFAULT_GLOBAL_LIMIT = 8
+DEFAULT_HOST_LIMIT = 4
+SLOW_WAIT_SECONDS = 60  # 排队超过该时长打 warning
+
+
+@dataclass
+class _Waiter:
+    source_name: str
+    keys: Tuple[str, ...]
+    future: asyncio.Future
+    enqueued_at: float
+
+
+@dataclass
+class _WaitStats:
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    last: float = 0.0
+
+    def add(self, wait: float) -> None:
+        self.count += 1
+        self.total += wait
+        self.max = max(self.max, wait)
+        self.last = wait
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "avg_seconds": round(self.total / self.count, 3) if self.count else 0.0,
+            "max_seconds": round(self.max, 3),
+            "last_seconds": round(self.last, 3),
+        }
+
+
+@dataclass
+class GovernorLimits:
+    """并发上限，categories / hosts 中未列出的分类不限、主机使用 default_host"""
+
+    global_limit: int = DEFAULT_GLOBAL_LIMIT
+    categories: Dict[str, int] = field(default_factory=dict)
+    hosts: Dict[str, int] = field(default_factory=dict)
+    default_host: int = DEFAULT_HOST_LIMIT
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> "GovernorLimits":
+        """从 schedule.yaml 的 scheduler.concurrency 构造"""
+        config = config or {}
+        return cls(
+            global_limit=config.get("global", DEFAULT_GLOBAL_LIMIT),
+            categories=dict(config.get("categories") or {}),
+            hosts=dict(config.get("hosts") or {}),
+            default_host=config.get("default_host", DEFAULT_HOST_LIMIT),
+        )
+
+
+def upstream_host(config: Dict) -> str:
+    """信源的上游主机标识：显式 upstream_host > 聚合器名 > 平台"""
+    if config.get("upstream_host"):
+        return config["upstream_host"]
+    if config.get("source_type") == "aggregator" and config.get("aggregator_name"):
+        # official 聚合器按平台直连各自官方 API，不共享上游
+        if config["aggregator_name"] != "official":
+            return config["aggregator_name"]
+    return config.get("platform", "")
+
+
+class ConcurrencyGovernor:
+    """全局 / 分类 / 上游主机三层并发上限 + 公平等待队列"""
+
+    def __init__(self, limits: Optional[GovernorLimits] = None):
+        self.limits = limits or GovernorLimits()
+        self._running: Dict[str, int] = {}
+        self._waiters: Deque[_Waiter] = deque()
+        self._wait_stats: Dict[str, _WaitStats] = {}
+
+    def _resource_keys(self, config: Dict) -> Tuple[str, ...]:
+        keys = ["global"]
+        category = config.get("category")
+        if category in self.limits.categories:
+            keys.append(f"category:{category}")
+        host = upstream_host(config)
+        if host:
+            keys.append(f"host:{host}")
+        return tuple(keys)
+
+    def _limit(self, key: str) -> int:
+        kind, _, name = key.partition(":")
+        if kind == "global":
+            return self.limits.global_limit
+        if kind == "category":
+            return self.limits.categories[name]
+        return self.limits.hosts.get(name, self.limits.default_host)
+
+    def _fits(self, keys: Tuple[str, ...], reserved: Dict[str, int]) -> bool:
+        return all(
+            self._running.get(k, 0) + reserved.get(k, 0) < self._limit(k) for k in keys
+        )
+
+    def _dispatch(self) -> None:
+        """按到达顺序放行；被跳过的等待者预留其资源，保证资源释放时先分给它"""
+        reserved: Dict[str, int] = {}
+        for waiter in list(self._waiters):
+            if waiter.future.done():
+                self._waiters.remove(waiter)
+                continue
+            if self._fits(waiter.keys, reserved):
+                self._waiters.remove(waiter)
+                for k in waiter.keys:
+                    self._running[k] = self._running.get(k, 0) + 1
+                waiter.future.set_result(None)
+            else:
+                # 只为已满的资源排队：在它之后到达的任务不能抢占这些资源
+                for k in waiter.keys:
+                    if self._running.get(k, 0) + reserved.get(k, 0) >= self._limit(k):
+                        reserved[k] = reserved.get(k, 0) + 1
+
+    def _release(self, keys: Tuple[str, ...]) -> None:
+        for k in keys:
+            self._running[k] -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, source_name: str, config: Dict) -> AsyncIterator[float]:
+        """申请执行槽位，yield 排队时长（秒）
+
+        用法:
+            async with governor.slot(source_name, config) as queue_wait:
+                ...
+        """
+        keys = self._resource_keys(config)
+        waiter = _Waiter(
+            source_name, keys, asyncio.get_running_loop().create_future(), time.monotonic()
+        )
+        self._waiters.append(waiter)
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # 已放行但调用方被取消：归还槽位
+                self._release(keys)
+            else:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                self._dispatch()
+            raise
+
+        wait = time.monotonic() - waiter.enqueued_at
+        self._wait_stats.setdefault(source_name, _WaitStats()).add(wait)
+        if wait >= SLOW_WAIT_SECONDS:
+            logger.warning(f"[Governor] {source_name} 排队 {wait:.1f}s, 资源 {keys}")
+        try:
+            yield wait
+        finally:
+            self._release(keys)
+
+    def snapshot(self) -> Dict:
+        """当前运行数、排队数与各信源排队时长统计"""
+        return {
+            "running": {k: v for k, v in self._running.items() if v},
+            "queued": [w.source_name for w in self._waiters],
+            "queue_wait": {s: st.to_dict() for s, st in sorted(self._wait_stats.items())},
+        }
@@ -3,41 +3,73 @@
 任务执行器
 
 负责执行 Scrapy 爬虫和聚合器任务
+
+Scrapy 爬虫默认在调度器进程内运行：安装绑定到当前事件循环的 asyncio reactor，
+用 CrawlerRunner 启动爬虫，统计直接取自 crawler.stats，省去每次启动子进程
+（解释器 + Scrapy + pymongo + jieba 导入）的开销。已安装其他 reactor 等无法
+进程内运行的情况退回 subprocess。
 """
 
 import asyncio
 import re
 import subprocess
-from typing import Dict, List, Optional, Any
+import threading
+import time
+from functools import partial
+from typing import Dict, List, Optional, Any, Type, Union
 from pathlib import Path
 from loguru import logger
 
 import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from pipeline import DataProcessor
+from pipeline import AsyncDataProcessor
 from aggregators import get_aggregator
 
+SCRAPY_PROJECT_PATH = Path(__file__).parent.parent / "crawlers"
+SCRAPY_SETTINGS_MODULE = "mindspider_crawlers.settings"
+ASYNCIO_REACTOR = "twisted.internet.asyncioreactor.AsyncioSelectorReactor"
+SCRAPY_TIMEOUT = 300  # 单次爬取超时（秒）
+
+# stats 中写入执行结果的字段
+_SCRAPY_RESULT_STATS = (
+    "item_scraped_count",
+    "item_dropped_count",
+    "response_received_count",
+    "log_count/ERROR",
+    "mongo/inserted",
+    "mongo/updated",
+    "mongo/failed_items",
+    "finish_reason",
+    "elapsed_time_seconds",
+)
+
 
 class TaskRunner:
     """任务执行器"""
 
-    def __init__(self, mongo_uri: Optional[str] = None):
+    def __init__(self, mongo_uri: Optional[str] = None, scrapy_in_process: bool = True):
         """
         初始化任务执行器
 
         Args:
             mongo_uri: MongoDB 连接 URI
+            scrapy_in_process: Scrapy 爬虫在当前进程的事件循环中运行，False 时每次启动子进程
         """
         self.mongo_uri = mongo_uri
-        self.processor: Optional[DataProcessor] = None
-        self._scrapy_project_path = Path(__file__).parent.parent / "crawlers"
-
-    def _get_processor(self) -> DataProcessor:
-        """获取数据处理器"""
+        self.scrapy_in_process = scrapy_in_process
+        self.processor: Optional[AsyncDataProcessor] = None
+        # 各聚合器信源最近一批写入的开始时间，上游未变化时据此刷新 last_seen_at
+        self._batch_started_at: Dict[str, int] = {}
+        self._scrapy_project_path = SCRAPY_PROJECT_PATH
+        self._scrapy_settings = None
+
+    async def _get_processor(self) -> AsyncDataProcessor:
+        """获取数据处理器（异步写入，不阻塞事件循环）"""
         if self.processor is None:
-            self.processor = DataProcessor(mongo_uri=self.mongo_uri)
-            self.processor.connect()
+            processor = AsyncDataProcessor(mongo_uri=self.mongo_uri)
+            await processor.connect()
+            self.processor = processor
         return self.processor
 
     async def run_aggregator(self, source_name: str, config: Dict) -> Dict:
@@ -73,9 +105,19 @@ class TaskRunner:
                 logger.error(f"[{source_name}] 获取数据失败: {result.error}")
                 return {"success": False, "error": result.error}
 
+            if result.unchanged:
+                return await self._touch_unchanged(source_name)
+
             # 处理数据
-            processor = self._get_processor()
-            stats = processor.process_batch_optimized(result.items, source_name)
+            processor = await self._get_processor()
+            batch_started_at = int(time.time())
+            try:
+                stats = await processor.process_batch_optimized(result.items, source_name)
+            except Exception:
+                # 本次内容未入库，下次不能按"未变化"跳过
+                aggregator.forget_payload(aggregator_source)
+                raise
+            self._batch_started_at[source_name] = batch_started_at
 
             logger.info(
                 f"[{source_name}] 聚合器任务完成: "
@@ -95,6 +137,27 @@ class TaskRunner:
             logger.error(f"[{source_name}] 聚合器任务失败: {e}")
             return {"success": False, "error": str(e)}
 
+    async def _touch_unchanged(self, source_name: str) -> Dict:
+        """上游内容未变化：跳过解析、去重查询和历史追加，只刷新上一批文档的 last_seen_at"""
+        touched = 0
+        since_ts = self._batch_started_at.get(source_name)
+        if since_ts is not None:
+            processor = await self._get_processor()
+            touch_started_at = int(time.time())
+            touched = await processor.touch_last_seen(source_name, since_ts)
+            self._batch_started_at[source_name] = touch_started_at
+
+        logger.info(f"[{source_name}] 上游内容未变化，刷新 last_seen_at {touched} 条")
+        return {
+            "success": True,
+            "unchanged": True,
+            "fetched": 0,
+            "inserted": 0,
+            "updated": 0,
+            "skipped": 0,
+            "touched": touched,
+        }
+
     def run_scrapy(self, source_name: str, config: Dict) -> Dict:
         """
         运行 Scrapy 爬虫任务
@@ -166,6 +229,136 @@ class TaskRunner:
             logger.error(f"[{source_name}] Scrapy 爬虫异常: {e}")
             return {"success": False, "error": str(e)}
 
+    async def run_scrapy_async(self, source_name: str, config: Dict) -> Dict:
+        """
+        运行 Scrapy 爬虫任务：优先在进程内运行，不可用时在线程池中启动子进程
+
+        Args:
+            source_name: 信源名称
+            config: 信源配置
+
+        Returns:
+            执行结果，进程内运行时附带 stats
+        """
+        if not (self.scrapy_in_process and self._ensure_asyncio_reactor()):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self.run_scrapy, source_name, config)
+
+        spider_name = config.get("spider_name")
+        if not spider_name:
+            logger.error(f"[{source_name}] 缺少 spider_name 配置")
+            return {"success": False, "error": "缺少 spider_name 配置"}
+
+        spider_kwargs = {}
+        if config.get("region"):
+            spider_kwargs["region"] = config["region"]
+
+        logger.info(f"[{source_name}] 启动 Scrapy 爬虫 (进程内): {spider_name}")
+        try:
+            stats = await self.crawl_in_process(
+                spider_name, {"SOURCE_NAME": source_name}, spider_kwargs
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"[{source_name}] Scrapy 爬虫超时")
+            return {"success": False, "error": "执行超时"}
+        except Exception as e:
+            logger.error(f"[{source_name}] Scrapy 爬虫异常: {e}")
+            return {"success": False, "error": str(e)}
+
+        item_count = stats.get("item_scraped_count", 0)
+        if item_count == 0:
+            logger.warning(f"[{source_name}] Scrapy 爬虫完成但未爬取到数据 (item_scraped_count=0)")
+        else:
+            logger.info(f"[{source_name}] Scrapy 爬虫完成: 爬取 {item_count} 条")
+        if stats.get("log_count/ERROR"):
+            logger.warning(f"[{source_name}] Scrapy 运行中有 {stats['log_count/ERROR']} 条错误日志")
+
+        return {
+            "success": stats.get("finish_reason") == "finished",
+            "item_count": item_count,
+            "stats": stats,
+        }
+
+    async def crawl_in_process(
+        self,
+        spider: Union[str, Type],
+        settings: Optional[Dict] = None,
+        spider_kwargs: Optional[Dict] = None,
+        timeout: float = SCRAPY_TIMEOUT,
+    ) -> Dict:
+        """
+        在当前事件循环中运行一次爬虫，返回精简后的 stats
+
+        Args:
+            spider: 爬虫名称或爬虫类
+            settings: 覆盖项目设置的本次运行设置
+            spider_kwargs: 传给爬虫的参数（同 scrapy crawl -a）
+            timeout: 超时秒数，超时后关闭爬虫并抛出 asyncio.TimeoutError
+        """
+        from scrapy.crawler import CrawlerRunner
+        from scrapy.utils.defer import maybe_deferred_to_future
+
+        if not self._ensure_asyncio_reactor():
+            raise RuntimeError("当前进程无法安装 asyncio reactor")
+
+        run_settings = self._get_scrapy_settings().copy()
+        run_settings.setdict(settings or {}, priority="cmdline")
+        runner = CrawlerRunner(run_settings)
+        crawler = runner.create_crawler(spider)
+
+        started = time.perf_counter()
+        done = maybe_deferred_to_future(runner.crawl(crawler, **(spider_kwargs or {})))
+        try:
+            await asyncio.wait_for(asyncio.shield(done), timeout)
+        except asyncio.TimeoutError:
+            await crawler.stop_async()
+            await done
+            raise
+
+        stats = crawler.stats.get_stats()
+        result = {key: stats[key] for key in _SCRAPY_RESULT_STATS if key in stats}
+        result.setdefault("item_scraped_count", 0)
+        result.setdefault("elapsed_time_seconds", round(time.perf_counter() - started, 3))
+        return result
+
+    def _get_scrapy_settings(self):
+        """加载 Scrapy 项目设置（进程内只加载一次）"""
+        if self._scrapy_settings is None:
+            from scrapy.settings import Settings
+
+            if str(self._scrapy_project_path) not in sys.path:
+                sys.path.insert(0, str(self._scrapy_project_path))
+            settings = Settings()
+            settings.setmodule(SCRAPY_SETTINGS_MODULE, priority="project")
+            settings.set("TWISTED_REACTOR", ASYNCIO_REACTOR, priority="cmdline")
+            self._scrapy_settings = settings
+        return self._scrapy_settings
+
+    @staticmethod
+    def _ensure_asyncio_reactor() -> bool:
+        """确保已安装运行在当前事件循环上的 asyncio reactor"""
+        from scrapy.utils.reactor import install_reactor, is_asyncio_reactor_installed
+
+        loop = asyncio.get_running_loop()
+        if "twisted.internet.reactor" not in sys.modules:
+            install_reactor(ASYNCIO_REACTOR)
+        if not is_asyncio_reactor_installed():
+            logger.warning("[Scrapy] 已安装非 asyncio reactor，退回子进程运行")
+            return False
+
+        from twisted.internet import reactor
+
+        if getattr(reactor, "_asyncioEventloop", None) is not loop:
+            logger.warning("[Scrapy] reactor 绑定在其他事件循环上，退回子进程运行")
+            return False
+        if not reactor.running:
+            # 事件循环由调度器驱动，不调用 reactor.run()；需手动进入 running 状态，
+            # 否则 reactor 线程池不会启动，Scrapy 的线程 DNS 解析一直挂起到超时。
+            # reactor 不会经 stop() 关闭，线程池用守护线程，避免阻塞进程退出
+            reactor.getThreadPool().threadFactory = partial(threading.Thread, daemon=True)
+            reactor.startRunning(installSignalHandlers=False)
+        return True
+
     def _parse_scrapy_item_count(self, stderr: str) -> Optional[int]:
         """从 Scrapy 的 stats dump 中提取 item_scraped_count"""
         if not stderr:
@@ -194,11 +387,7 @@ class TaskRunner:
         if source_type == "aggregator":
             return await self.run_aggregator(source_name, config)
         else:
-            # Scrapy 是同步的，在线程池中运行
-            loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(
-                None, self.run_scrapy, source_name, config
-            )
+            return await self.run_scrapy_async(source_name, config)
 
     def close(self) -> None:
         """关闭资源"""
@@ -219,7 +408,5 @@ async def create_default_handlers(runner: TaskRunner) -> Dict[str, Any]:
     """
     return {
         "aggregator": runner.run_aggregator,
-        "scrapy": lambda name, config: asyncio.get_event_loop().run_in_executor(
-            None, runner.run_scrapy, name, config
-        ),
+        "scrapy": runner.run_scrapy_async,
     }
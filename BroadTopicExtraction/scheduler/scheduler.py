@@ -5,10 +5,15 @@ MindSpider 调度器
 基于 APScheduler 实现定时任务调度。
 每个信源爬完后自动触发 Layer 1 信号检测，
 跨平台检测（Layer 2）独立定时运行。
+
+realtime 模式下改为监听热搜 collection 的 change stream，按微批增量检测；
+change stream 不可用（单机 mongod）或监听失败时自动退回上述轮询模式。
 """
 
 import asyncio
 import inspect
+import threading
+import time
 from typing import Dict, List, Optional, Callable, Any
 from datetime import datetime
 
@@ -28,9 +33,16 @@ from pipeline import ConfigLoader
 from analyzer.data_reader import DataReader
 from analyzer.signal_detector import SignalDetector
 from analyzer.candidate_manager import CandidateManager
+from analyzer.change_stream import ChangeBatch, ChangeStreamWatcher
 from pipeline.mongo_writer import MongoWriter
+from pipeline.async_mongo_writer import AsyncMongoWriter
+from pipeline.history_rollup import HistoryCompactor
+from .governor import ConcurrencyGovernor, GovernorLimits
 from ms_config import settings
 
+# realtime 模式下跨平台检测 + 候选管理的最小间隔（秒）
+REALTIME_CROSS_PLATFORM_INTERVAL = 60
+
 
 class MindSpiderScheduler:
     """MindSpider 调度器"""
@@ -39,6 +51,7 @@ class MindSpiderScheduler:
         self,
         config_dir: Optional[str] = None,
         use_async: bool = True,
+        realtime: bool = False,
     ):
         """
         初始化调度器
@@ -46,9 +59,11 @@ class MindSpiderScheduler:
         Args:
             config_dir: 配置文件目录
             use_async: 是否使用异步调度器
+            realtime: 监听 change stream 实时检测，不可用时退回轮询
         """
         self.config_loader = ConfigLoader(config_dir)
         self.use_async = use_async
+        self.realtime = realtime
 
         if use_async:
             self.scheduler = AsyncIOScheduler()
@@ -58,7 +73,16 @@ class MindSpiderScheduler:
         self._job_handlers: Dict[str, Callable] = {}
         self._setup_listeners()
 
-        # 信号检测器（共享连接）
+        # 采集并发控制：全局 / 分类 / 上游主机上限
+        scheduler_config = self.config_loader.get_schedule_config().get("scheduler", {})
+        self._governor = ConcurrencyGovernor(
+            GovernorLimits.from_config(scheduler_config.get("concurrency"))
+        )
+
+        # 执行指标等事件循环内的写入走异步连接
+        self._async_mongo = AsyncMongoWriter()
+
+        # 信号检测器（共享连接）；检测 / 候选管理在线程中运行，不阻塞事件循环
         self._raw_mongo = MongoWriter()
         self._signal_mongo = MongoWriter(db_name=settings.MONGO_SIGNAL_DB_NAME)
         self._data_reader = DataReader(mongo_writer=self._raw_mongo)
@@ -69,6 +93,16 @@ class MindSpiderScheduler:
         self._candidate_manager = CandidateManager(
             signal_writer=self._signal_mongo,
         )
+        self._history_compactor = HistoryCompactor(
+            mongo_writer=self._raw_mongo,
+            config_loader=self.config_loader,
+        )
+
+        # 实时检测：监听线程存活期间接管 Layer 1 / Layer 2，轮询任务跳过
+        self._realtime_active = False
+        self._realtime_stop = threading.Event()
+        self._realtime_thread: Optional[threading.Thread] = None
+        self._last_realtime_cross_platform = 0.0
 
     def _setup_listeners(self) -> None:
         """设置事件监听器"""
@@ -142,9 +176,10 @@ class MindSpiderScheduler:
                 f"({config.get('display_name', '')}) - {schedule}"
             )
 
-        # 添加跨平台信号检测定时任务
+        # 添加跨平台信号检测、历史压缩定时任务
         if job_count > 0:
             self._setup_cross_platform_job()
+            self._setup_history_compaction_job()
 
         return job_count
 
@@ -159,8 +194,33 @@ class MindSpiderScheduler:
         )
         logger.info("[Scheduler] 添加跨平台信号检测任务 (每 30 分钟)")
 
+    def _setup_history_compaction_job(self) -> None:
+        """添加时变字段历史压缩任务（每小时）"""
+        self.scheduler.add_job(
+            self._run_history_compaction,
+            IntervalTrigger(hours=1),
+            id="history_compaction",
+            name="历史数据压缩",
+            replace_existing=True,
+        )
+        logger.info("[Scheduler] 添加历史数据压缩任务 (每小时)")
+
+    async def _run_history_compaction(self) -> None:
+        """把早于保留窗口的历史点汇总为小时/天粒度"""
+        try:
+            await asyncio.to_thread(self._history_compactor.compact)
+        except Exception as e:
+            logger.error(f"[HistoryRollup] 历史压缩失败: {e}")
+
     async def _run_cross_platform_detection(self) -> None:
         """执行跨平台信号检测，然后运行候选管理"""
+        if self._realtime_active:
+            logger.debug("[Signal] 实时检测运行中，跳过定时跨平台检测")
+            return
+        await asyncio.to_thread(self._cross_platform_cycle)
+
+    def _cross_platform_cycle(self) -> None:
+        """跨平台检测 + 候选管理（定时任务与实时检测共用）"""
         try:
             signals = self._detector.detect_cross_platform()
             logger.info(f"[Signal] 跨平台检测完成: {len(signals)} 个信号")
@@ -220,16 +280,20 @@ class MindSpiderScheduler:
             logger.error(f"[Scheduler] 未注册处理器: {source_type}")
             return
 
-        logger.info(f"[Scheduler] 开始执行: {source_name}")
+        queue_wait = None
         start_time = datetime.now()
 
         try:
-            if asyncio.iscoroutinefunction(handler):
-                result = await handler(source_name, config)
-            else:
-                result = handler(source_name, config)
-                if inspect.isawaitable(result):
-                    result = await result
+            # 排队等待并发槽位，采集完成即释放（信号检测不占用槽位）
+            async with self._governor.slot(source_name, config) as queue_wait:
+                logger.info(f"[Scheduler] 开始执行: {source_name}")
+                start_time = datetime.now()
+                if asyncio.iscoroutinefunction(handler):
+                    result = await handler(source_name, config)
+                else:
+                    result = handler(source_name, config)
+                    if inspect.isawaitable(result):
+                        result = await result
 
             elapsed = (datetime.now() - start_time).total_seconds()
             logger.info(f"[Scheduler] {source_name} 完成，耗时 {elapsed:.2f}s")
@@ -238,7 +302,7 @@ class MindSpiderScheduler:
             item_count = None
             if isinstance(result, dict):
                 item_count = result.get("fetched") or result.get("item_count")
-            self._write_run_metric({
+            await self._write_run_metric({
                 "source_name": source_name,
                 "started_at": start_time,
                 "finished_at": datetime.now(),
@@ -248,19 +312,21 @@ class MindSpiderScheduler:
                 "error_message": None,
                 "source_type": config.get("source_type"),
                 "category": config.get("category"),
+                "queue_wait_seconds": round(queue_wait, 3) if queue_wait is not None else None,
             })
 
-            # 采集成功后触发 Layer 1 信号检测
+            # 采集成功后触发 Layer 1 信号检测（上游内容未变化时没有新数据，跳过）
             success = result.get("success", False) if isinstance(result, dict) else True
+            unchanged = isinstance(result, dict) and result.get("unchanged", False)
             collection = config.get("mongo_collection", "")
-            if success and collection:
+            if success and not unchanged and collection:
                 # Scrapy 源写入 MongoDB 的 source 字段是 spider_name，不是 YAML key
                 mongo_source = config.get("spider_name", source_name) if source_type == "scrapy" else source_name
-                self._run_signal_detection(mongo_source, collection)
+                await self._run_signal_detection(mongo_source, collection)
 
         except Exception as e:
             elapsed = (datetime.now() - start_time).total_seconds()
-            self._write_run_metric({
+            await self._write_run_metric({
                 "source_name": source_name,
                 "started_at": start_time,
                 "finished_at": datetime.now(),
@@ -270,27 +336,77 @@ class MindSpiderScheduler:
                 "error_message": str(e),
                 "source_type": config.get("source_type"),
                 "category": config.get("category"),
+                "queue_wait_seconds": round(queue_wait, 3) if queue_wait is not None else None,
             })
             logger.error(f"[Scheduler] {source_name} 执行失败: {e}")
             raise
 
-    def _write_run_metric(self, doc: dict) -> None:
+    async def _write_run_metric(self, doc: dict) -> None:
         """写入执行指标到 crawl_runs 集合，失败不影响采集流程"""
         try:
-            self._raw_mongo.insert_one("crawl_runs", doc)
+            await self._async_mongo.insert_one("crawl_runs", doc)
         except Exception as e:
             logger.warning(f"[Scheduler] 写入 crawl_runs 失败: {e}")
 
-    def _run_signal_detection(self, source_name: str, collection: str) -> None:
+    async def _run_signal_detection(self, source_name: str, collection: str) -> None:
         """采集完成后触发 Layer 1 信号检测"""
+        if self._realtime_active:
+            # 写入已由 change stream 实时检测
+            return
         try:
-            signals = self._detector.detect_for_source(source_name, collection)
+            signals = await asyncio.to_thread(
+                self._detector.detect_for_source, source_name, collection
+            )
             if signals:
                 logger.info(f"[Signal] {source_name}: {len(signals)} 个 Layer 1 信号")
         except Exception as e:
             # 信号检测失败不应影响采集流程
             logger.error(f"[Signal] {source_name} 检测失败: {e}")
 
+    # ==================== 实时检测 ====================
+
+    def _start_realtime(self) -> None:
+        """启动 change stream 监听线程"""
+        if self._realtime_thread and self._realtime_thread.is_alive():
+            return
+        self._realtime_stop.clear()
+        self._realtime_thread = threading.Thread(
+            target=self._realtime_loop, name="signal-change-stream", daemon=True
+        )
+        self._realtime_thread.start()
+
+    def _realtime_loop(self) -> None:
+        """监听线程主体：不支持或放弃监听时退回轮询"""
+        watcher = ChangeStreamWatcher(self._raw_mongo, self._on_realtime_batch)
+        if not watcher.supported():
+            logger.warning("[Signal] 当前 MongoDB 不支持 change stream，使用轮询检测")
+            return
+
+        self._realtime_active = True
+        logger.info("[Signal] 实时检测已启用")
+        try:
+            watcher.run(self._realtime_stop)
+        except Exception as e:
+            logger.error(f"[Signal] change stream 监听失败，退回轮询检测: {e}")
+        finally:
+            self._realtime_active = False
+
+    def _on_realtime_batch(self, changes: ChangeBatch, since_ts: int) -> None:
+        """处理一个变更微批：对变更的信源跑 Layer 1，跨平台检测按最小间隔节流"""
+        for collection, sources in changes.items():
+            for source in sorted(sources):
+                try:
+                    signals = self._detector.detect_for_source(source, collection, since_ts)
+                    if signals:
+                        logger.info(f"[Signal] {source}: {len(signals)} 个 Layer 1 信号（实时）")
+                except Exception as e:
+                    logger.error(f"[Signal] {source} 实时检测失败: {e}")
+
+        now = time.monotonic()
+        if now - self._last_realtime_cross_platform >= REALTIME_CROSS_PLATFORM_INTERVAL:
+            self._last_realtime_cross_platform = now
+            self._cross_platform_cycle()
+
     def add_job(
         self,
         func: Callable,
@@ -335,6 +451,10 @@ class MindSpiderScheduler:
         self.scheduler.resume_job(source_name)
         logger.info(f"[Scheduler] 恢复任务: {source_name}")
 
+    def get_concurrency(self) -> Dict:
+        """并发控制状态：运行数、排队信源、各信源排队时长"""
+        return self._governor.snapshot()
+
     def get_jobs(self) -> List[Dict]:
         """获取所有任务信息"""
         jobs = []
@@ -352,13 +472,19 @@ class MindSpiderScheduler:
         if not self.scheduler.running:
             self.scheduler.start()
             logger.info("[Scheduler] 调度器已启动")
+        if self.realtime:
+            self._start_realtime()
 
     def shutdown(self, wait: bool = True) -> None:
         """关闭调度器"""
+        self._realtime_stop.set()
+        if self._realtime_thread:
+            self._realtime_thread.join(timeout=5)
         if self.scheduler.running:
             self.scheduler.shutdown(wait=wait)
             logger.info("[Scheduler] 调度器已关闭")
         # 关闭信号检测的 MongoDB 连接
+        self._async_mongo.close()
         self._raw_mongo.close()
         self._signal_mongo.close()
 
@@ -7,6 +7,7 @@ MindSpider 数据采集调度器 - 一键启动脚本
     uv run python BroadTopicExtraction/start_scheduler.py
     uv run python BroadTopicExtraction/start_scheduler.py --categories hot_national hot_vertical
     uv run python BroadTopicExtraction/start_scheduler.py --once
+    uv run python BroadTopicExtraction/start_scheduler.py --realtime
     uv run python BroadTopicExtraction/start_scheduler.py --list
     uv run python BroadTopicExtraction/start_scheduler.py --log-level ERROR
 """
@@ -52,7 +53,7 @@ def setup_logging(level: str = "INFO"):
 MONGO_URI = settings.MONGO_URI
 
 
-async def start_scheduler(categories=None, mongo_uri=MONGO_URI):
+async def start_scheduler(categories=None, mongo_uri=MONGO_URI, realtime=False):
     """启动调度器，持续运行"""
     logger.info("=" * 60)
     logger.info("MindSpider 数据采集调度器启动")
@@ -60,13 +61,11 @@ async def start_scheduler(categories=None, mongo_uri=MONGO_URI):
     logger.info("=" * 60)
 
     runner = TaskRunner(mongo_uri=mongo_uri)
-    scheduler = MindSpiderScheduler()
+    scheduler = MindSpiderScheduler(realtime=realtime)
 
     # 注册处理器
     scheduler.register_handler("aggregator", runner.run_aggregator)
-    scheduler.register_handler("scrapy", lambda name, config: asyncio.get_event_loop().run_in_executor(
-        None, runner.run_scrapy, name, config
-    ))
+    scheduler.register_handler("scrapy", runner.run_scrapy_async)
 
     # 设置任务
     job_count = scheduler.setup_jobs(categories=categories)
@@ -120,9 +119,7 @@ async def run_once(categories=None, mongo_uri=MONGO_URI):
     scheduler = MindSpiderScheduler()
 
     scheduler.register_handler("aggregator", runner.run_aggregator)
-    scheduler.register_handler("scrapy", lambda name, config: asyncio.get_event_loop().run_in_executor(
-        None, runner.run_scrapy, name, config
-    ))
+    scheduler.register_handler("scrapy", runner.run_scrapy_async)
 
     try:
         await scheduler.run_all_once(categories=categories)
@@ -172,6 +169,10 @@ def main():
     )
     parser.add_argument("--once", action="store_true", help="所有任务执行一次后退出")
     parser.add_argument("--list", action="store_true", help="列出所有启用的数据源")
+    parser.add_argument(
+        "--realtime", action="store_true",
+        help="监听 change stream 实时信号检测（需副本集，不可用时退回定时检测）",
+    )
     parser.add_argument("--mongo-uri", default=MONGO_URI, help="MongoDB 连接 URI")
     parser.add_argument(
         "--log-level", default="INFO",
@@ -191,7 +192,9 @@ def main():
     if args.once:
         asyncio.run(run_once(categories=args.categories, mongo_uri=mongo_uri))
     else:
-        asyncio.run(start_scheduler(categories=args.categories, mongo_uri=mongo_uri))
+        asyncio.run(start_scheduler(
+            categories=args.categories, mongo_uri=mongo_uri, realtime=args.realtime
+        ))
 
 
 if __name__ == "__main__":
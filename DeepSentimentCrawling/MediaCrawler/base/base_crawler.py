@@ -13,8 +13,13 @@ from typing import Dict, Optional
 
 from playwright.async_api import BrowserContext, BrowserType, Playwright
 
+import config
+from tools.browser_pool import BrowserLease
+from var import browser_pool_var
+
 
 class AbstractCrawler(ABC):
+    browser_lease: Optional[BrowserLease] = None
 
     @abstractmethod
     async def start(self):
@@ -54,6 +59,45 @@ class AbstractCrawler(ABC):
         # 默认实现：回退到标准模式
         return await self.launch_browser(playwright.chromium, playwright_proxy, user_agent, headless)
 
+    async def lease_pooled_browser(self, playwright_proxy: Optional[Dict], user_agent: Optional[str]) -> bool:
+        """
+        从当前任务的浏览器池（browser_pool_var）租用浏览器上下文，设置 browser_context / context_page
+        :param playwright_proxy: playwright代理配置
+        :param user_agent: 用户代理
+        :return: 是否租用成功；未启用浏览器池、CDP 模式或保存登录状态时返回 False，由 crawler 自行启动浏览器
+        """
+        pool = browser_pool_var.get()
+        if pool is None or config.ENABLE_CDP_MODE or config.SAVE_LOGIN_STATE:
+            return False
+        self.browser_lease = await pool.acquire(config.PLATFORM, config.COOKIES, user_agent, playwright_proxy)
+        self.browser_context = self.browser_lease.context
+        self.context_page = self.browser_lease.page
+        return True
+
+    @property
+    def browser_warm(self) -> bool:
+        """
+        浏览器上下文是否已预热（浏览器池中复用的上下文已写入 cookie 并打开过首页）
+        """
+        return self.browser_lease is not None and self.browser_lease.warm
+
+    async def release_pooled_browser(self, discard: bool = False) -> None:
+        """
+        归还租用的浏览器上下文（未使用浏览器池时为空操作）
+        :param discard: 任务失败时为 True，关闭该上下文而不是留给后续任务
+        """
+        if self.browser_lease is not None:
+            await browser_pool_var.get().release(self.browser_lease, discard=discard)
+            self.browser_lease = None
+
+    async def close_http_pool(self) -> None:
+        """
+        关闭 crawler 持有的 httpx 连接池（未使用连接池的平台为空操作）
+        """
+        http_pool = getattr(self, "http_pool", None)
+        if http_pool is not None:
+            await http_pool.aclose()
+
 
 class AbstractLogin(ABC):
 
@@ -9,5 +9,62 @@
 # 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。  
 
 
+import sys
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Any, Iterator
+
+from var import crawler_config_var
+
 from .base_config import *
-from .db_config import *
\ No newline at end of file
+from .db_config import *
+
+
+class _TaskScopedConfig(ModuleType):
+    """config 模块类型：大写配置项的读写优先落在当前任务的覆盖上
+
+    未进入 task_config 时行为与普通模块一致（读写全局值）；进入后，
+    crawler / client / store 中的 config.XXX 读取当前任务的值，
+    login.py、core.py 中对 config.XXX 的赋值也只作用于当前任务。
+    """
+
+    def __getattribute__(self, name: str) -> Any:
+        if name.isupper():
+            overrides = crawler_config_var.get()
+            if overrides is not None and name in overrides:
+                return overrides[name]
+        return super().__getattribute__(name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        overrides = crawler_config_var.get()
+        if overrides is not None and name.isupper():
+            overrides[name] = value
+        else:
+            super().__setattr__(name, value)
+
+    def __delattr__(self, name: str) -> None:
+        overrides = crawler_config_var.get()
+        if overrides is not None and name in overrides:
+            del overrides[name]
+        else:
+            super().__delattr__(name)
+
+
+@contextmanager
+def task_config(**overrides: Any) -> Iterator[None]:
+    """在当前上下文（asyncio 任务）内覆盖配置项，退出后恢复
+
+    同一进程内并发运行的多个爬取任务各自进入 task_config，互不影响：
+
+        with config.task_config(PLATFORM="xhs", KEYWORDS="关键词"):
+            await crawler.start()
+    """
+    parent = crawler_config_var.get()
+    token = crawler_config_var.set({**(parent or {}), **overrides})
+    try:
+        yield
+    finally:
+        crawler_config_var.reset(token)
+
+
+sys.modules[__name__].__class__ = _TaskScopedConfig
@@ -64,8 +64,23 @@ BROWSER_LAUNCH_TIMEOUT = 30
 # 设置为False可以保持浏览器运行，便于调试
 AUTO_CLOSE_BROWSER = True
 
-# 数据保存类型选项配置,支持五种类型：csv、db、json、sqlite、postgresql, 最好保存到DB，有排重的功能。
-SAVE_DATA_OPTION = "db"  # csv or db or json or sqlite or postgresql
+# ==================== 浏览器池（深层采集 worker 复用已启动的浏览器） ====================
+# 同一平台 + cookie 的浏览器上下文跨任务复用，最多服务的任务数，达到后关闭重建
+BROWSER_POOL_MAX_USES = 20
+
+# 页面 JS 堆超过该值（MB）时回收浏览器上下文
+BROWSER_POOL_MAX_HEAP_MB = 512
+
+# 单个浏览器进程累计创建的上下文数上限，达到后不再分配新上下文，最后一个上下文归还时关闭
+BROWSER_POOL_BROWSER_MAX_CONTEXTS = 200
+
+# 空闲上下文最多保留的个数与时长（秒）
+BROWSER_POOL_MAX_IDLE = 8
+BROWSER_POOL_IDLE_TTL = 1800
+
+# 数据保存类型选项配置,支持六种类型：csv、db、json、jsonl、sqlite、postgresql, 最好保存到DB，有排重的功能。
+# 大量评论需要保存为文件时建议用 jsonl（逐行追加），json 每写一条都会重写整个文件
+SAVE_DATA_OPTION = "db"  # csv or db or json or jsonl or sqlite or postgresql
 
 # 用户浏览器缓存的浏览器文件配置
 USER_DATA_DIR = "%s_user_data_dir"  # %s will be replaced by platform name
@@ -123,6 +138,57 @@ PLATFORM_SLEEP_SEC = {
     "zhihu": 2,    # 知乎：较宽松
 }
 
+# ==================== HTTP 连接池配置 ====================
+# 每个 crawler 实例按代理复用 httpx 长连接，避免每个请求重新握手
+# 连接池最大连接数
+HTTP_POOL_MAX_CONNECTIONS = 20
+
+# 保持 keep-alive 的空闲连接数
+HTTP_POOL_MAX_KEEPALIVE = 10
+
+# 空闲连接保持时间（秒）
+HTTP_POOL_KEEPALIVE_EXPIRY = 30
+
+# 是否启用 HTTP/2（需要安装 h2：pip install httpx[http2]，未安装时自动回退 HTTP/1.1）
+ENABLE_HTTP2 = False
+
+# ==================== JS 签名服务配置 ====================
+# 抖音 a_bogus / 知乎 x-zse-96 等签名由常驻 node 进程池异步计算，不阻塞事件循环
+# 每份签名脚本的常驻 node 进程数
+JS_SIGN_POOL_SIZE = 2
+
+# 签名请求合并窗口（毫秒），窗口内到达的请求合并为一次 IPC 往返
+JS_SIGN_BATCH_WINDOW_MS = 2
+
+# 单批签名等待 node 响应的超时（秒），超时的进程会被结束，本批签名回退到 execjs
+JS_SIGN_TIMEOUT = 10
+
+# ==================== DB 写后缓冲配置 ====================
+# 是否开启 DB 写后缓冲：内容/评论/创作者先进入内存缓冲，按条数/时间阈值批量 upsert，
+# crawler 结束时保证落库（仅对 db / sqlite / postgresql 存储生效）
+ENABLE_DB_WRITE_BEHIND = True
+
+# 缓冲行数达到该值时立即落库
+DB_WRITE_BEHIND_FLUSH_SIZE = 200
+
+# 首条缓冲行等待超过该秒数时落库
+DB_WRITE_BEHIND_FLUSH_INTERVAL = 5
+
+# ==================== JSONL 存储配置 ====================
+# SAVE_DATA_OPTION = "jsonl" 时生效：每条记录一行，缓冲后追加写入，数据保存在 data/<platform>/jsonl/
+# 缓冲记录数达到该值时追加落盘
+JSONL_BUFFER_SIZE = 100
+
+# 首条缓冲记录等待超过该秒数时落盘
+JSONL_FLUSH_INTERVAL = 5
+
+# fsync 策略：never（交给操作系统）| batch（每次落盘后 fsync）| always（每条记录立即写入并 fsync）
+JSONL_FSYNC_POLICY = "batch"
+
+# crawler 结束时是否将 JSONL 文件转换为 JSON 数组（写到 data/<platform>/json/ 下同名文件）
+# 也可离线执行：python -m tools.async_file_writer data/xhs/jsonl/xxx.jsonl
+JSONL_COMPACT_ON_FINISH = False
+
 from .bilibili_config import *
 from .xhs_config import *
 from .dy_config import *
@@ -0,0 +1,343 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+DB 写后缓冲（write-behind）
+
+各平台 *DbStoreImplement 之前每条内容/评论都要开一个 session、SELECT 一次、
+INSERT/UPDATE 一次再 commit，一个 500 条评论的帖子约 1000 次数据库往返。
+WriteBehindBuffer 把待写行按 (model, 业务主键) 缓冲起来，达到条数/时间阈值或
+crawler 结束时统一落库，每个 model 每批只需一个事务：
+
+- 业务主键上有唯一约束：方言原生批量 upsert（MySQL ON DUPLICATE KEY UPDATE、
+  PostgreSQL / SQLite ON CONFLICT DO UPDATE），一条语句完成
+- 无唯一约束（多数评论表只有普通索引）：一次 SELECT ... IN 取出已存在行的主键，
+  新行一次批量 INSERT，已存在行按主键批量 UPDATE
+
+各平台 DB store 没有共同的 DB 基类（AbstractStore 同时派生 CSV/JSON/DB 等实现），
+统一的接入点是本模块的 db_upsert：store 只需把 "SELECT + INSERT/UPDATE" 换成一次
+db_upsert 调用，缓冲开关、阈值与落库都集中在这里。
+
+落库失败时整批行放回缓冲，不会丢失；定时落库的失败只记录日志，
+crawler 结束时的 flush_write_buffer 会重试并把异常抛给调用方（任务因此记为失败）。
+
+同一进程并发执行多个任务时，每个任务通过 write_buffer_var 持有独立的缓冲，
+flush_write_buffer 只落库当前任务的行，失败不会记到其他任务头上。
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+from sqlalchemy import inspect as sqlalchemy_inspect
+from sqlalchemy import UniqueConstraint, insert, select, tuple_, update
+
+import config
+from database.db_session import get_session
+from tools import utils
+from var import write_buffer_var
+
+_BufferKey = Tuple[Any, Tuple[str, ...]]
+
+# 单条 SQL 语句携带的最大行数，避免超过数据库参数个数上限
+_STATEMENT_CHUNK = 200
+
+
+class _PendingRow:
+    __slots__ = ("row", "update_columns", "insertable")
+
+    def __init__(self, row: Dict, update_columns: Sequence[str], insertable: bool) -> None:
+        self.row = row
+        self.update_columns = list(update_columns)
+        self.insertable = insertable
+
+    def merge(self, other: "_PendingRow") -> None:
+        """同一业务主键在一个批次内多次写入：后写覆盖先写"""
+        self.row.update(other.row)
+        for col in other.update_columns:
+            if col not in self.update_columns:
+                self.update_columns.append(col)
+        self.insertable = self.insertable or other.insertable
+
+
+def _has_unique_key(model: Type, key_columns: Tuple[str, ...]) -> bool:
+    table = model.__table__
+    wanted = set(key_columns)
+    if len(key_columns) == 1 and table.columns[key_columns[0]].unique:
+        return True
+    for constraint in table.constraints:
+        if isinstance(constraint, UniqueConstraint) and {c.name for c in constraint.columns} == wanted:
+            return True
+    for index in table.indexes:
+        if index.unique and {c.name for c in index.columns} == wanted:
+            return True
+    return False
+
+
+def _chunks(rows: List, size: int = _STATEMENT_CHUNK) -> Iterable[List]:
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+def _group_by_columns(rows: List[_PendingRow]) -> Dict[Tuple, List[_PendingRow]]:
+    """多行 VALUES 要求列集合一致，按 (插入列, 更新列) 分组"""
+    groups: Dict[Tuple, List[_PendingRow]] = {}
+    for pending in rows:
+        group_key = (tuple(sorted(pending.row)), tuple(sorted(pending.update_columns)))
+        groups.setdefault(group_key, []).append(pending)
+    return groups
+
+
+class WriteBehindBuffer:
+    """
+    按 model 缓冲待写入行，达到条数/时间阈值时批量 upsert
+
+    Args:
+        flush_size: 缓冲行数达到该值时立即落库
+        flush_interval: 首条缓冲行等待超过该秒数时落库
+    """
+
+    def __init__(self, flush_size: int = 200, flush_interval: float = 5.0) -> None:
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._pending: Dict[_BufferKey, Dict[Tuple, _PendingRow]] = {}
+        self._count = 0
+        self._lock: Optional[asyncio.Lock] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats = {"rows": 0, "flushes": 0, "statements": 0}
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self._timer = None
+
+    async def upsert(
+        self,
+        model: Type,
+        key_columns: Sequence[str],
+        row: Dict,
+        update_columns: Optional[Iterable[str]] = None,
+        insertable: bool = True,
+    ) -> None:
+        """
+        缓冲一行待写数据
+
+        Args:
+            model: ORM model
+            key_columns: 业务主键列（如 ("comment_id",)）
+            row: 新插入时写入的完整行
+            update_columns: 行已存在时需要更新的列，默认为 row 中除业务主键外的所有列
+            insertable: 为 False 时行不存在则跳过插入（只更新已存在行）
+        """
+        self._bind_loop()
+        columns = model.__table__.columns
+        row = {k: v for k, v in row.items() if k in columns}
+        key_columns = tuple(key_columns)
+        if update_columns is None:
+            update_columns = [k for k in row if k not in key_columns]
+        else:
+            update_columns = [k for k in update_columns if k in row and k not in key_columns]
+
+        pending = _PendingRow(row, update_columns, insertable)
+        bucket = self._pending.setdefault((model, key_columns), {})
+        key_value = tuple(row.get(k) for k in key_columns)
+        if key_value in bucket:
+            bucket[key_value].merge(pending)
+        else:
+            bucket[key_value] = pending
+            self._count += 1
+
+        if self._count >= self.flush_size:
+            await self.flush()
+        elif self._timer is None and self.flush_interval > 0:
+            self._timer = self._loop.call_later(self.flush_interval, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._loop.create_task(self._flush_logged())
+
+    async def _flush_logged(self) -> None:
+        try:
+            await self.flush()
+        except Exception as e:
+            # 行已放回缓冲，由下一次 flush（任务结束时的 flush_write_buffer）重试并向调用方抛错
+            utils.logger.error(f"[WriteBehindBuffer] 定时落库失败，{self._count} 行保留待重试: {e}")
+
+    async def flush(self) -> None:
+        """将所有缓冲行落库"""
+        if self._lock is None:
+            return
+        async with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            pending, self._pending = self._pending, {}
+            self._count = 0
+            if not pending:
+                return
+            try:
+                async with get_session() as session:
+                    if session is None:
+                        raise RuntimeError(f"数据库未配置 (SAVE_DATA_OPTION={config.SAVE_DATA_OPTION})")
+                    dialect = session.bind.dialect.name
+                    for (model, key_columns), bucket in pending.items():
+                        await self._flush_model(
+                            session, dialect, model, key_columns, list(bucket.values())
+                        )
+            except BaseException:
+                self._restore(pending)
+                raise
+            self.stats["flushes"] += 1
+
+    def _restore(self, pending: Dict[_BufferKey, Dict[Tuple, _PendingRow]]) -> None:
+        """落库失败（事务已回滚）时把本批行放回缓冲，落库期间新缓冲的同键行覆盖旧行"""
+        for buffer_key, bucket in pending.items():
+            current = self._pending.setdefault(buffer_key, {})
+            for key_value, row in bucket.items():
+                newer = current.get(key_value)
+                if newer is not None:
+                    row.merge(newer)
+                current[key_value] = row
+        self._count = sum(len(bucket) for bucket in self._pending.values())
+
+    async def _flush_model(
+        self, session, dialect: str, model: Type, key_columns: Tuple[str, ...], rows: List[_PendingRow]
+    ) -> None:
+        self.stats["rows"] += len(rows)
+        native = dialect in ("mysql", "postgresql", "sqlite") and _has_unique_key(model, key_columns)
+        if native:
+            insertable = [p for p in rows if p.insertable]
+            update_only = [p for p in rows if not p.insertable]
+            await self._native_upsert(session, dialect, model, key_columns, insertable)
+            if update_only:
+                await self._select_then_write(session, model, key_columns, update_only)
+        else:
+            await self._select_then_write(session, model, key_columns, rows)
+
+    async def _native_upsert(
+        self, session, dialect: str, model: Type, key_columns: Tuple[str, ...], rows: List[_PendingRow]
+    ) -> None:
+        if dialect == "mysql":
+            from sqlalchemy.dialects.mysql import insert as dialect_insert
+        elif dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+        for (_, update_cols), group in _group_by_columns(rows).items():
+            for chunk in _chunks(group):
+                stmt = dialect_insert(model.__table__).values([p.row for p in chunk])
+                if dialect == "mysql":
+                    set_ = {c: stmt.inserted[c] for c in update_cols} or {key_columns[0]: stmt.inserted[key_columns[0]]}
+                    stmt = stmt.on_duplicate_key_update(set_)
+                elif update_cols:
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=list(key_columns),
+                        set_={c: stmt.excluded[c] for c in update_cols},
+                    )
+                else:
+                    stmt = stmt.on_conflict_do_nothing(index_elements=list(key_columns))
+                await session.execute(stmt)
+                self.stats["statements"] += 1
+
+    async def _select_then_write(
+        self, session, model: Type, key_columns: Tuple[str, ...], rows: List[_PendingRow]
+    ) -> None:
+        pk_name = sqlalchemy_inspect(model).primary_key[0].name
+        pk_col = getattr(model, pk_name)
+        key_attrs = [getattr(model, k) for k in key_columns]
+
+        existing: Dict[Tuple, Any] = {}
+        for chunk in _chunks(rows):
+            key_values = [tuple(p.row.get(k) for k in key_columns) for p in chunk]
+            if len(key_columns) == 1:
+                cond = key_attrs[0].in_([kv[0] for kv in key_values])
+            else:
+                cond = tuple_(*key_attrs).in_(key_values)
+            result = await session.execute(select(pk_col, *key_attrs).where(cond))
+            self.stats["statements"] += 1
+            for record in result.all():
+                # 库中已有重复业务主键时沿用原实现行为：更新第一条
+                existing.setdefault(tuple(record[1:]), record[0])
+
+        to_insert: List[Dict] = []
+        to_update: List[Dict] = []
+        for p in rows:
+            pk = existing.get(tuple(p.row.get(k) for k in key_columns))
+            if pk is None:
+                if p.insertable:
+                    to_insert.append(p.row)
+            elif p.update_columns:
+                values = {c: p.row[c] for c in p.update_columns}
+                values[pk_name] = pk
+                to_update.append(values)
+
+        if to_insert:
+            await session.execute(insert(model), to_insert)
+            self.stats["statements"] += 1
+        if to_update:
+            await session.execute(update(model), to_update)
+            self.stats["statements"] += 1
+
+
+_buffer: Optional[WriteBehindBuffer] = None
+
+
+def new_write_buffer() -> WriteBehindBuffer:
+    """按配置的阈值创建写后缓冲（任务级缓冲设置到 write_buffer_var）"""
+    return WriteBehindBuffer(
+        flush_size=config.DB_WRITE_BEHIND_FLUSH_SIZE,
+        flush_interval=config.DB_WRITE_BEHIND_FLUSH_INTERVAL,
+    )
+
+
+def get_write_buffer() -> WriteBehindBuffer:
+    """当前任务的写后缓冲；未设置 write_buffer_var 时使用进程级共享缓冲"""
+    buffer = write_buffer_var.get()
+    if buffer is not None:
+        return buffer
+    global _buffer
+    if _buffer is None:
+        _buffer = new_write_buffer()
+    return _buffer
+
+
+async def db_upsert(
+    model: Type,
+    key_columns: Sequence[str],
+    row: Dict,
+    update_columns: Optional[Iterable[str]] = None,
+    insertable: bool = True,
+) -> None:
+    """
+    DB store 统一写入入口：开启写后缓冲时进入缓冲，否则立即以单行批次落库
+    """
+    if config.ENABLE_DB_WRITE_BEHIND:
+        await get_write_buffer().upsert(model, key_columns, row, update_columns, insertable)
+        return
+    buffer = WriteBehindBuffer(flush_size=1, flush_interval=0)
+    await buffer.upsert(model, key_columns, row, update_columns, insertable)
+
+
+async def flush_write_buffer() -> None:
+    """落库当前任务缓冲的数据（crawler 结束时调用）"""
+    buffer = write_buffer_var.get()
+    if buffer is None:
+        buffer = _buffer
+    if buffer is None:
+        return
+    started = time.perf_counter()
+    await buffer.flush()
+    utils.logger.info(
+        f"[flush_write_buffer] stats={buffer.stats}, cost={time.perf_counter() - started:.3f}s"
+    )
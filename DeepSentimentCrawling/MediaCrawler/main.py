@@ -16,6 +16,7 @@ from typing import Optional
 import cmd_arg
 import config
 from database import db
+from database.write_behind import flush_write_buffer
 from base.base_crawler import AbstractCrawler
 from media_platform.bilibili import BilibiliCrawler
 from media_platform.douyin import DouYinCrawler
@@ -24,7 +25,8 @@ from media_platform.tieba import TieBaCrawler
 from media_platform.weibo import WeiboCrawler
 from media_platform.xhs import XiaoHongShuCrawler
 from media_platform.zhihu import ZhihuCrawler
-from tools.async_file_writer import AsyncFileWriter
+from tools.async_file_writer import AsyncFileWriter, flush_jsonl_writers
+from tools.js_signer import close_js_signers
 from var import crawler_type_var
 
 
@@ -72,15 +74,22 @@ async def main():
 
 
     crawler = CrawlerFactory.create_crawler(platform=config.PLATFORM)
-    await crawler.start()
+    try:
+        await crawler.start()
+    finally:
+        await flush_write_buffer()
+        await flush_jsonl_writers()
+        await crawler.close_http_pool()
+        await close_js_signers()
 
     # Generate wordcloud after crawling is complete
-    # Only for JSON save mode
-    if config.SAVE_DATA_OPTION == "json" and config.ENABLE_GET_WORDCLOUD:
+    # Only for JSON / JSONL save mode
+    if config.SAVE_DATA_OPTION in ("json", "jsonl") and config.ENABLE_GET_WORDCLOUD:
         try:
             file_writer = AsyncFileWriter(
                 platform=config.PLATFORM,
-                crawler_type=crawler_type_var.get()
+                crawler_type=crawler_type_var.get(),
+                json_lines=config.SAVE_DATA_OPTION == "jsonl",
             )
             await file_writer.generate_wordcloud_from_comments()
         except Exception as e:
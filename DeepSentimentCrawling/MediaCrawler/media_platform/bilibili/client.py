@@ -24,6 +24,7 @@ from playwright.async_api import BrowserContext, Page
 import config
 from base.base_crawler import AbstractApiClient
 from tools import utils
+from tools.http_client import HttpClientPool
 
 from .exception import DataFetchError
 from .field import CommentOrderType, SearchOrderType
@@ -40,8 +41,10 @@ class BilibiliClient(AbstractApiClient):
         headers: Dict[str, str],
         playwright_page: Page,
         cookie_dict: Dict[str, str],
+        http_pool: Optional[HttpClientPool] = None,
     ):
         self.proxy = proxy
+        self.http_pool = http_pool or HttpClientPool(platform="bili")
         self.timeout = timeout
         self.headers = headers
         self._host = "https://api.bilibili.com"
@@ -49,8 +52,9 @@ class BilibiliClient(AbstractApiClient):
         self.cookie_dict = cookie_dict
 
     async def request(self, method, url, **kwargs) -> Any:
-        async with httpx.AsyncClient(proxy=self.proxy) as client:
-            response = await client.request(method, url, timeout=self.timeout, **kwargs)
+        response = await self.http_pool.request(
+            method, url, proxy=self.proxy, timeout=self.timeout, **kwargs
+        )
         try:
             data: Dict = response.json()
         except json.JSONDecodeError:
@@ -203,19 +207,18 @@ class BilibiliClient(AbstractApiClient):
 
     async def get_video_media(self, url: str) -> Union[bytes, None]:
         # Follow CDN 302 redirects and treat any 2xx as success (some endpoints return 206)
-        async with httpx.AsyncClient(proxy=self.proxy, follow_redirects=True) as client:
-            try:
-                response = await client.request("GET", url, timeout=self.timeout, headers=self.headers)
-                response.raise_for_status()
-                if 200 <= response.status_code < 300:
-                    return response.content
-                utils.logger.error(
-                    f"[BilibiliClient.get_video_media] Unexpected status {response.status_code} for {url}"
-                )
-                return None
-            except httpx.HTTPError as exc:  # some wrong when call httpx.request method, such as connection error, client error, server error or response status code is not 2xx
-                utils.logger.error(f"[BilibiliClient.get_video_media] {exc.__class__.__name__} for {exc.request.url} - {exc}")  # 保留原始异常类型名称，以便开发者调试
-                return None
+        try:
+            response = await self.http_pool.request("GET", url, proxy=self.proxy, follow_redirects=True, timeout=self.timeout, headers=self.headers)
+            response.raise_for_status()
+            if 200 <= response.status_code < 300:
+                return response.content
+            utils.logger.error(
+                f"[BilibiliClient.get_video_media] Unexpected status {response.status_code} for {url}"
+            )
+            return None
+        except httpx.HTTPError as exc:  # some wrong when call httpx.request method, such as connection error, client error, server error or response status code is not 2xx
+            utils.logger.error(f"[BilibiliClient.get_video_media] {exc.__class__.__name__} for {exc.request.url} - {exc}")  # 保留原始异常类型名称，以便开发者调试
+            return None
 
     async def get_video_comments(
         self,
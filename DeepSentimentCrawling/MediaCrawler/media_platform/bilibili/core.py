@@ -36,6 +36,7 @@ from proxy.proxy_ip_pool import IpInfoModel, create_ip_pool
 from store import bilibili as bilibili_store
 from tools import utils
 from tools.cdp_browser import CDPBrowserManager
+from tools.http_client import HttpClientPool
 from var import crawler_type_var, source_keyword_var
 
 from .client import BilibiliClient
@@ -55,6 +56,7 @@ class BilibiliCrawler(AbstractCrawler):
         self.index_url = "https://www.bilibili.com"
         self.user_agent = utils.get_user_agent()
         self.cdp_manager = None
+        self.http_pool = HttpClientPool(platform="bili")
         self._crawled_video_ids: set = set()
 
     async def start(self):
@@ -66,7 +68,9 @@ class BilibiliCrawler(AbstractCrawler):
 
         async with async_playwright() as playwright:
             # 根据配置选择启动模式
-            if config.ENABLE_CDP_MODE:
+            if await self.lease_pooled_browser(None, self.user_agent):
+                utils.logger.info(f"[BilibiliCrawler] 使用浏览器池中的浏览器上下文 (warm={self.browser_warm})")
+            elif config.ENABLE_CDP_MODE:
                 utils.logger.info("[BilibiliCrawler] 使用CDP模式启动浏览器")
                 self.browser_context = await self.launch_browser_with_cdp(
                     playwright,
@@ -82,8 +86,11 @@ class BilibiliCrawler(AbstractCrawler):
                 # stealth.min.js is a js script to prevent the website from detecting the crawler.
                 await self.browser_context.add_init_script(path=os.path.join(config.LIBS_DIR, "stealth.min.js"))
 
-            self.context_page = await self.browser_context.new_page()
-            await self.context_page.goto(self.index_url)
+            if self.browser_lease is None:
+                self.context_page = await self.browser_context.new_page()
+            # 浏览器池中复用的上下文已打开过首页
+            if not self.browser_warm:
+                await self.context_page.goto(self.index_url)
 
             # Create a client to interact with the xiaohongshu website.
             self.bili_client = await self.create_bilibili_client(httpx_proxy_format)
@@ -473,6 +480,7 @@ class BilibiliCrawler(AbstractCrawler):
             },
             playwright_page=self.context_page,
             cookie_dict=cookie_dict,
+            http_pool=self.http_pool,
         )
         return bilibili_client_obj
 
@@ -547,6 +555,7 @@ class BilibiliCrawler(AbstractCrawler):
 
     async def close(self):
         """Close browser context"""
+        await self.close_http_pool()
         try:
             # 如果使用CDP模式，需要特殊处理
             if self.cdp_manager:
@@ -19,6 +19,7 @@ from playwright.async_api import BrowserContext
 
 from base.base_crawler import AbstractApiClient
 from tools import utils
+from tools.http_client import HttpClientPool
 from var import request_keyword_var
 
 from .exception import *
@@ -36,8 +37,10 @@ class DouYinClient(AbstractApiClient):
         headers: Dict,
         playwright_page: Optional[Page],
         cookie_dict: Dict,
+        http_pool: Optional[HttpClientPool] = None,
     ):
         self.proxy = proxy
+        self.http_pool = http_pool or HttpClientPool(platform="dy")
         self.timeout = timeout
         self.headers = headers
         self._host = "https://www.douyin.com"
@@ -95,8 +98,9 @@ class DouYinClient(AbstractApiClient):
         params["a_bogus"] = a_bogus
 
     async def request(self, method, url, **kwargs):
-        async with httpx.AsyncClient(proxy=self.proxy) as client:
-            response = await client.request(method, url, timeout=self.timeout, **kwargs)
+        response = await self.http_pool.request(
+            method, url, proxy=self.proxy, timeout=self.timeout, **kwargs
+        )
         try:
             if response.text == "" or response.text == "blocked":
                 utils.logger.error(f"request params incrr, response.text: {response.text}")
@@ -321,18 +325,17 @@ class DouYinClient(AbstractApiClient):
         return result
 
     async def get_aweme_media(self, url: str) -> Union[bytes, None]:
-        async with httpx.AsyncClient(proxy=self.proxy) as client:
-            try:
-                response = await client.request("GET", url, timeout=self.timeout, follow_redirects=True)
-                response.raise_for_status()
-                if not response.reason_phrase == "OK":
-                    utils.logger.error(f"[DouYinClient.get_aweme_media] request {url} err, res:{response.text}")
-                    return None
-                else:
-                    return response.content
-            except httpx.HTTPError as exc:  # some wrong when call httpx.request method, such as connection error, client error, server error or response status code is not 2xx
-                utils.logger.error(f"[DouYinClient.get_aweme_media] {exc.__class__.__name__} for {exc.request.url} - {exc}")  # 保留原始异常类型名称，以便开发者调试
+        try:
+            response = await self.http_pool.request("GET", url, proxy=self.proxy, timeout=self.timeout, follow_redirects=True)
+            response.raise_for_status()
+            if not response.reason_phrase == "OK":
+                utils.logger.error(f"[DouYinClient.get_aweme_media] request {url} err, res:{response.text}")
                 return None
+            else:
+                return response.content
+        except httpx.HTTPError as exc:  # some wrong when call httpx.request method, such as connection error, client error, server error or response status code is not 2xx
+            utils.logger.error(f"[DouYinClient.get_aweme_media] {exc.__class__.__name__} for {exc.request.url} - {exc}")  # 保留原始异常类型名称，以便开发者调试
+            return None
 
     async def resolve_short_url(self, short_url: str) -> str:
         """
@@ -342,19 +345,18 @@ class DouYinClient(AbstractApiClient):
         Returns:
             重定向后的完整URL
         """
-        async with httpx.AsyncClient(proxy=self.proxy, follow_redirects=False) as client:
-            try:
-                utils.logger.info(f"[DouYinClient.resolve_short_url] Resolving short URL: {short_url}")
-                response = await client.get(short_url, timeout=10)
-
-                # 短链接通常返回302重定向
-                if response.status_code in [301, 302, 303, 307, 308]:
-                    redirect_url = response.headers.get("Location", "")
-                    utils.logger.info(f"[DouYinClient.resolve_short_url] Resolved to: {redirect_url}")
-                    return redirect_url
-                else:
-                    utils.logger.warning(f"[DouYinClient.resolve_short_url] Unexpected status code: {response.status_code}")
-                    return ""
-            except Exception as e:
-                utils.logger.error(f"[DouYinClient.resolve_short_url] Failed to resolve short URL: {e}")
+        try:
+            utils.logger.info(f"[DouYinClient.resolve_short_url] Resolving short URL: {short_url}")
+            response = await self.http_pool.request("GET", short_url, proxy=self.proxy, timeout=10)
+
+            # 短链接通常返回302重定向
+            if response.status_code in [301, 302, 303, 307, 308]:
+                redirect_url = response.headers.get("Location", "")
+                utils.logger.info(f"[DouYinClient.resolve_short_url] Resolved to: {redirect_url}")
+                return redirect_url
+            else:
+                utils.logger.warning(f"[DouYinClient.resolve_short_url] Unexpected status code: {response.status_code}")
                 return ""
+        except Exception as e:
+            utils.logger.error(f"[DouYinClient.resolve_short_url] Failed to resolve short URL: {e}")
+            return ""
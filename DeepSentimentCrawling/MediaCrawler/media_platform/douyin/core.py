@@ -28,6 +28,7 @@ from proxy.proxy_ip_pool import IpInfoModel, create_ip_pool
 from store import douyin as douyin_store
 from tools import utils
 from tools.cdp_browser import CDPBrowserManager
+from tools.http_client import HttpClientPool
 from var import crawler_type_var, source_keyword_var
 
 from .client import DouYinClient
@@ -46,6 +47,7 @@ class DouYinCrawler(AbstractCrawler):
     def __init__(self) -> None:
         self.index_url = "https://www.douyin.com"
         self.cdp_manager = None
+        self.http_pool = HttpClientPool(platform="dy")
         self.user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
         self._crawled_aweme_ids: set = set()
 
@@ -58,7 +60,9 @@ class DouYinCrawler(AbstractCrawler):
 
         async with async_playwright() as playwright:
             # 根据配置选择启动模式
-            if config.ENABLE_CDP_MODE:
+            if await self.lease_pooled_browser(playwright_proxy_format, self.user_agent):
+                utils.logger.info(f"[DouYinCrawler] 使用浏览器池中的浏览器上下文 (warm={self.browser_warm})")
+            elif config.ENABLE_CDP_MODE:
                 utils.logger.info("[DouYinCrawler] 使用CDP模式启动浏览器")
                 self.browser_context = await self.launch_browser_with_cdp(
                     playwright,
@@ -79,32 +83,35 @@ class DouYinCrawler(AbstractCrawler):
                 # stealth.min.js is a js script to prevent the website from detecting the crawler.
                 await self.browser_context.add_init_script(path=os.path.join(config.LIBS_DIR, "stealth.min.js"))
 
-            self.context_page = await self.browser_context.new_page()
-
-            # 在导航前注入 cookie，确保页面以已登录状态加载
-            if config.LOGIN_TYPE == "cookie" and config.COOKIES:
-                cookie_dict = utils.convert_str_cookie_to_dict(config.COOKIES)
-                for key, value in cookie_dict.items():
-                    await self.browser_context.add_cookies([{
-                        'name': key,
-                        'value': value,
-                        'domain': ".douyin.com",
-                        'path': "/"
-                    }])
-                # 补充 LOGIN_STATUS=1，Chrome 扩展可能未导出此 cookie，
-                # 但有 sessionid 即代表已登录
-                if "sessionid" in cookie_dict and "LOGIN_STATUS" not in cookie_dict:
-                    await self.browser_context.add_cookies([{
-                        'name': 'LOGIN_STATUS',
-                        'value': '1',
-                        'domain': ".douyin.com",
-                        'path': "/"
-                    }])
-                    utils.logger.info("[DouYinCrawler] 自动补充 LOGIN_STATUS=1 cookie")
-
-            await self.context_page.goto(self.index_url)
-            # 等待页面 JS 初始化完成（设置 localStorage 等）
-            await asyncio.sleep(3)
+            if self.browser_lease is None:
+                self.context_page = await self.browser_context.new_page()
+
+            # 浏览器池中复用的上下文已写入 cookie 并打开过首页
+            if not self.browser_warm:
+                # 在导航前注入 cookie，确保页面以已登录状态加载
+                if config.LOGIN_TYPE == "cookie" and config.COOKIES:
+                    cookie_dict = utils.convert_str_cookie_to_dict(config.COOKIES)
+                    for key, value in cookie_dict.items():
+                        await self.browser_context.add_cookies([{
+                            'name': key,
+                            'value': value,
+                            'domain': ".douyin.com",
+                            'path': "/"
+                        }])
+                    # 补充 LOGIN_STATUS=1，Chrome 扩展可能未导出此 cookie，
+                    # 但有 sessionid 即代表已登录
+                    if "sessionid" in cookie_dict and "LOGIN_STATUS" not in cookie_dict:
+                        await self.browser_context.add_cookies([{
+                            'name': 'LOGIN_STATUS',
+                            'value': '1',
+                            'domain': ".douyin.com",
+                            'path': "/"
+                        }])
+                        utils.logger.info("[DouYinCrawler] 自动补充 LOGIN_STATUS=1 cookie")
+
+                await self.context_page.goto(self.index_url)
+                # 等待页面 JS 初始化完成（设置 localStorage 等）
+                await asyncio.sleep(3)
 
             # 检测首页是否被验证码拦截
             page_title = await self.context_page.title()
@@ -471,6 +478,7 @@ class DouYinCrawler(AbstractCrawler):
             },
             playwright_page=self.context_page,
             cookie_dict=cookie_dict,
+            http_pool=self.http_pool,
         )
         return douyin_client
 
@@ -537,6 +545,7 @@ class DouYinCrawler(AbstractCrawler):
 
     async def close(self) -> None:
         """Close browser context"""
+        await self.close_http_pool()
         # 如果使用CDP模式，需要特殊处理
         if self.cdp_manager:
             await self.cdp_manager.cleanup()
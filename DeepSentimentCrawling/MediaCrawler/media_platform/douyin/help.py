@@ -26,6 +26,7 @@ from playwright.async_api import Page
 import config
 from model.m_douyin import VideoUrlInfo, CreatorUrlInfo
 from tools.crawler_util import extract_url_params_to_dict
+from tools.js_signer import get_js_signer
 
 douyin_sign_obj = execjs.compile(open(os.path.join(config.LIBS_DIR, 'douyin.js'), encoding='utf-8-sig').read())
 
@@ -54,12 +55,18 @@ def get_web_id():
 async def get_a_bogus(url: str, params: str, post_data: dict, user_agent: str, page: Page = None):
     """
     获取 a_bogus 参数, 目前不支持post请求类型的签名
+    签名在常驻 node 进程池中异步计算，不阻塞事件循环
     """
-    return get_a_bogus_from_js(url, params, user_agent)
+    return await get_js_signer("douyin.js").call(_sign_js_name(url), params, user_agent)
+
+def _sign_js_name(url: str) -> str:
+    if "/reply" in url:
+        return "sign_reply"
+    return "sign_datail"
 
 def get_a_bogus_from_js(url: str, params: str, user_agent: str):
     """
-    通过js获取 a_bogus 参数
+    通过js获取 a_bogus 参数（同步版本，会阻塞调用方，async 路径请使用 get_a_bogus）
     Args:
         url:
         params:
@@ -68,10 +75,7 @@ def get_a_bogus_from_js(url: str, params: str, user_agent: str):
     Returns:
 
     """
-    sign_js_name = "sign_datail"
-    if "/reply" in url:
-        sign_js_name = "sign_reply"
-    return douyin_sign_obj.call(sign_js_name, params, user_agent)
+    return douyin_sign_obj.call(_sign_js_name(url), params, user_agent)
 
 
 
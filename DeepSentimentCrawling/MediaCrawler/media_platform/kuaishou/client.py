@@ -23,6 +23,7 @@ from playwright.async_api import BrowserContext, Page
 import config
 from base.base_crawler import AbstractApiClient
 from tools import utils
+from tools.http_client import HttpClientPool
 
 from .exception import DataFetchError
 from .graphql import KuaiShouGraphQL
@@ -98,8 +99,10 @@ class KuaiShouClient(AbstractApiClient):
         headers: Dict[str, str],
         playwright_page: Page,
         cookie_dict: Dict[str, str],
+        http_pool: Optional[HttpClientPool] = None,
     ):
         self.proxy = proxy
+        self.http_pool = http_pool or HttpClientPool(platform="ks")
         self.timeout = timeout
         self.headers = headers
         self._host = "https://www.kuaishou.com/graphql"
@@ -108,8 +111,9 @@ class KuaiShouClient(AbstractApiClient):
         self.graphql = KuaiShouGraphQL()
 
     async def request(self, method, url, **kwargs) -> Any:
-        async with httpx.AsyncClient(proxy=self.proxy) as client:
-            response = await client.request(method, url, timeout=self.timeout, **kwargs)
+        response = await self.http_pool.request(
+            method, url, proxy=self.proxy, timeout=self.timeout, **kwargs
+        )
         data: Dict = response.json()
         if data.get("errors"):
             utils.logger.error(f"[KuaiShouClient.request] GraphQL errors: {data.get('errors')}")
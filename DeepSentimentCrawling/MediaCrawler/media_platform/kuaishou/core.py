@@ -28,6 +28,7 @@ from proxy.proxy_ip_pool import IpInfoModel, create_ip_pool
 from store import kuaishou as kuaishou_store
 from tools import utils
 from tools.cdp_browser import CDPBrowserManager
+from tools.http_client import HttpClientPool
 from var import crawler_type_var, source_keyword_var
 
 from .client import KuaiShouClient
@@ -46,6 +47,7 @@ class KuaishouCrawler(AbstractCrawler):
         self.index_url = "https://www.kuaishou.com"
         self.user_agent = utils.get_user_agent()
         self.cdp_manager = None
+        self.http_pool = HttpClientPool(platform="ks")
         self._crawled_video_ids: set = set()
 
     async def start(self):
@@ -61,7 +63,9 @@ class KuaishouCrawler(AbstractCrawler):
 
         async with async_playwright() as playwright:
             # 根据配置选择启动模式
-            if config.ENABLE_CDP_MODE:
+            if await self.lease_pooled_browser(None, self.user_agent):
+                utils.logger.info(f"[KuaishouCrawler] 使用浏览器池中的浏览器上下文 (warm={self.browser_warm})")
+            elif config.ENABLE_CDP_MODE:
                 utils.logger.info("[KuaishouCrawler] 使用CDP模式启动浏览器")
                 self.browser_context = await self.launch_browser_with_cdp(
                     playwright,
@@ -80,19 +84,22 @@ class KuaishouCrawler(AbstractCrawler):
                 await self.browser_context.add_init_script(path=os.path.join(config.LIBS_DIR, "stealth.min.js"))
 
 
-            self.context_page = await self.browser_context.new_page()
+            if self.browser_lease is None:
+                self.context_page = await self.browser_context.new_page()
 
-            # 在导航前注入 cookie，确保页面以已登录状态加载
-            if config.LOGIN_TYPE == "cookie" and config.COOKIES:
-                for key, value in utils.convert_str_cookie_to_dict(config.COOKIES).items():
-                    await self.browser_context.add_cookies([{
-                        'name': key,
-                        'value': value,
-                        'domain': ".kuaishou.com",
-                        'path': "/"
-                    }])
+            # 浏览器池中复用的上下文已写入 cookie 并打开过首页
+            if not self.browser_warm:
+                # 在导航前注入 cookie，确保页面以已登录状态加载
+                if config.LOGIN_TYPE == "cookie" and config.COOKIES:
+                    for key, value in utils.convert_str_cookie_to_dict(config.COOKIES).items():
+                        await self.browser_context.add_cookies([{
+                            'name': key,
+                            'value': value,
+                            'domain': ".kuaishou.com",
+                            'path': "/"
+                        }])
 
-            await self.context_page.goto(f"{self.index_url}?isHome=1")
+                await self.context_page.goto(f"{self.index_url}?isHome=1")
 
             # Create a client to interact with the kuaishou website.
             self.ks_client = await self.create_ks_client(httpx_proxy_format)
@@ -308,6 +315,7 @@ class KuaishouCrawler(AbstractCrawler):
             },
             playwright_page=self.context_page,
             cookie_dict=cookie_dict,
+            http_pool=self.http_pool,
         )
         return ks_client_obj
 
@@ -426,6 +434,7 @@ class KuaishouCrawler(AbstractCrawler):
 
     async def close(self):
         """Close browser context"""
+        await self.close_http_pool()
         # 如果使用CDP模式，需要特殊处理
         if self.cdp_manager:
             await self.cdp_manager.cleanup()
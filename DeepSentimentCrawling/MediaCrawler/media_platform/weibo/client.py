@@ -26,6 +26,7 @@ from playwright.async_api import BrowserContext, Page
 
 import config
 from tools import utils
+from tools.http_client import HttpClientPool
 
 from .exception import DataFetchError
 from .field import SearchType
@@ -41,8 +42,10 @@ class WeiboClient:
         headers: Dict[str, str],
         playwright_page: Page,
         cookie_dict: Dict[str, str],
+        http_pool: Optional[HttpClientPool] = None,
     ):
         self.proxy = proxy
+        self.http_pool = http_pool or HttpClientPool(platform="wb")
         self.timeout = timeout
         self.headers = headers
         self._host = "https://m.weibo.cn"
@@ -52,8 +55,9 @@ class WeiboClient:
 
     async def request(self, method, url, **kwargs) -> Union[Response, Dict]:
         enable_return_response = kwargs.pop("return_response", False)
-        async with httpx.AsyncClient(proxy=self.proxy) as client:
-            response = await client.request(method, url, timeout=self.timeout, **kwargs)
+        response = await self.http_pool.request(
+            method, url, proxy=self.proxy, timeout=self.timeout, **kwargs
+        )
 
         if enable_return_response:
             return response
@@ -224,20 +228,19 @@ class WeiboClient:
         :return:
         """
         url = f"{self._host}/detail/{note_id}"
-        async with httpx.AsyncClient(proxy=self.proxy) as client:
-            response = await client.request("GET", url, timeout=self.timeout, headers=self.headers)
-            if response.status_code != 200:
-                raise DataFetchError(f"get weibo detail err: {response.text}")
-            match = re.search(r'var \$render_data = (\[.*?\])\[0\]', response.text, re.DOTALL)
-            if match:
-                render_data_json = match.group(1)
-                render_data_dict = json.loads(render_data_json)
-                note_detail = render_data_dict[0].get("status")
-                note_item = {"mblog": note_detail}
-                return note_item
-            else:
-                utils.logger.info(f"[WeiboClient.get_note_info_by_id] 未找到$render_data的值")
-                return dict()
+        response = await self.http_pool.request("GET", url, proxy=self.proxy, timeout=self.timeout, headers=self.headers)
+        if response.status_code != 200:
+            raise DataFetchError(f"get weibo detail err: {response.text}")
+        match = re.search(r'var \$render_data = (\[.*?\])\[0\]', response.text, re.DOTALL)
+        if match:
+            render_data_json = match.group(1)
+            render_data_dict = json.loads(render_data_json)
+            note_detail = render_data_dict[0].get("status")
+            note_item = {"mblog": note_detail}
+            return note_item
+        else:
+            utils.logger.info(f"[WeiboClient.get_note_info_by_id] 未找到$render_data的值")
+            return dict()
 
     async def get_note_image(self, image_url: str) -> bytes:
         image_url = image_url[8:]  # 去掉 https://
@@ -254,18 +257,17 @@ class WeiboClient:
         # 由于微博图片是通过 i1.wp.com 来访问的，所以需要拼接一下
         final_uri = (f"{self._image_agent_host}"
                      f"{image_url}")
-        async with httpx.AsyncClient(proxy=self.proxy) as client:
-            try:
-                response = await client.request("GET", final_uri, timeout=self.timeout)
-                response.raise_for_status()
-                if not response.reason_phrase == "OK":
-                    utils.logger.error(f"[WeiboClient.get_note_image] request {final_uri} err, res:{response.text}")
-                    return None
-                else:
-                    return response.content
-            except httpx.HTTPError as exc:  # some wrong when call httpx.request method, such as connection error, client error, server error or response status code is not 2xx
-                utils.logger.error(f"[DouYinClient.get_aweme_media] {exc.__class__.__name__} for {exc.request.url} - {exc}")    # 保留原始异常类型名称，以便开发者调试
+        try:
+            response = await self.http_pool.request("GET", final_uri, proxy=self.proxy, timeout=self.timeout)
+            response.raise_for_status()
+            if not response.reason_phrase == "OK":
+                utils.logger.error(f"[WeiboClient.get_note_image] request {final_uri} err, res:{response.text}")
                 return None
+            else:
+                return response.content
+        except httpx.HTTPError as exc:  # some wrong when call httpx.request method, such as connection error, client error, server error or response status code is not 2xx
+            utils.logger.error(f"[DouYinClient.get_aweme_media] {exc.__class__.__name__} for {exc.request.url} - {exc}")    # 保留原始异常类型名称，以便开发者调试
+            return None
 
     async def get_creator_container_info(self, creator_id: str) -> Dict:
         """
@@ -33,6 +33,7 @@ from proxy.proxy_ip_pool import IpInfoModel, create_ip_pool
 from store import weibo as weibo_store
 from tools import utils
 from tools.cdp_browser import CDPBrowserManager
+from tools.http_client import HttpClientPool
 from var import crawler_type_var, source_keyword_var
 
 from .client import WeiboClient
@@ -54,6 +55,7 @@ class WeiboCrawler(AbstractCrawler):
         self.user_agent = utils.get_user_agent()
         self.mobile_user_agent = utils.get_mobile_user_agent()
         self.cdp_manager = None
+        self.http_pool = HttpClientPool(platform="wb")
         self._crawled_note_ids: set = set()
 
     async def start(self):
@@ -65,7 +67,9 @@ class WeiboCrawler(AbstractCrawler):
 
         async with async_playwright() as playwright:
             # 根据配置选择启动模式
-            if config.ENABLE_CDP_MODE:
+            if await self.lease_pooled_browser(None, self.mobile_user_agent):
+                utils.logger.info(f"[WeiboCrawler] 使用浏览器池中的浏览器上下文 (warm={self.browser_warm})")
+            elif config.ENABLE_CDP_MODE:
                 utils.logger.info("[WeiboCrawler] 使用CDP模式启动浏览器")
                 self.browser_context = await self.launch_browser_with_cdp(
                     playwright,
@@ -83,8 +87,11 @@ class WeiboCrawler(AbstractCrawler):
                 await self.browser_context.add_init_script(path=os.path.join(config.LIBS_DIR, "stealth.min.js"))
 
 
-            self.context_page = await self.browser_context.new_page()
-            await self.context_page.goto(self.mobile_index_url)
+            if self.browser_lease is None:
+                self.context_page = await self.browser_context.new_page()
+            # 浏览器池中复用的上下文已打开过首页
+            if not self.browser_warm:
+                await self.context_page.goto(self.mobile_index_url)
 
             # Create a client to interact with the xiaohongshu website.
             self.wb_client = await self.create_weibo_client(httpx_proxy_format)
@@ -333,6 +340,7 @@ class WeiboCrawler(AbstractCrawler):
             },
             playwright_page=self.context_page,
             cookie_dict=cookie_dict,
+            http_pool=self.http_pool,
         )
         return weibo_client_obj
 
@@ -397,6 +405,7 @@ class WeiboCrawler(AbstractCrawler):
 
     async def close(self):
         """Close browser context"""
+        await self.close_http_pool()
         # 如果使用CDP模式，需要特殊处理
         if self.cdp_manager:
             await self.cdp_manager.cleanup()
@@ -22,6 +22,7 @@ from xhshow import Xhshow
 import config
 from base.base_crawler import AbstractApiClient
 from tools import utils
+from tools.http_client import HttpClientPool
 
 
 from .exception import DataFetchError, IPBlockError
@@ -40,8 +41,10 @@ class XiaoHongShuClient(AbstractApiClient):
         headers: Dict[str, str],
         playwright_page: Page,
         cookie_dict: Dict[str, str],
+        http_pool: Optional[HttpClientPool] = None,
     ):
         self.proxy = proxy
+        self.http_pool = http_pool or HttpClientPool(platform="xhs")
         self.timeout = timeout
         self.headers = headers
         self._host = "https://edith.xiaohongshu.com"
@@ -123,8 +126,9 @@ class XiaoHongShuClient(AbstractApiClient):
         """
         # return response.text
         return_response = kwargs.pop("return_response", False)
-        async with httpx.AsyncClient(proxy=self.proxy) as client:
-            response = await client.request(method, url, timeout=self.timeout, **kwargs)
+        response = await self.http_pool.request(
+            method, url, proxy=self.proxy, timeout=self.timeout, **kwargs
+        )
 
         if response.status_code == 471 or response.status_code == 461:
             # someday someone maybe will bypass captcha
@@ -184,24 +188,23 @@ class XiaoHongShuClient(AbstractApiClient):
         )
 
     async def get_note_media(self, url: str) -> Union[bytes, None]:
-        async with httpx.AsyncClient(proxy=self.proxy) as client:
-            try:
-                response = await client.request("GET", url, timeout=self.timeout)
-                response.raise_for_status()
-                if not response.reason_phrase == "OK":
-                    utils.logger.error(
-                        f"[XiaoHongShuClient.get_note_media] request {url} err, res:{response.text}"
-                    )
-                    return None
-                else:
-                    return response.content
-            except (
-                httpx.HTTPError
-            ) as exc:  # some wrong when call httpx.request method, such as connection error, client error, server error or response status code is not 2xx
+        try:
+            response = await self.http_pool.request("GET", url, proxy=self.proxy, timeout=self.timeout)
+            response.raise_for_status()
+            if not response.reason_phrase == "OK":
                 utils.logger.error(
-                    f"[XiaoHongShuClient.get_aweme_media] {exc.__class__.__name__} for {exc.request.url} - {exc}"
-                )  # 保留原始异常类型名称，以便开发者调试
+                    f"[XiaoHongShuClient.get_note_media] request {url} err, res:{response.text}"
+                )
                 return None
+            else:
+                return response.content
+        except (
+            httpx.HTTPError
+        ) as exc:  # some wrong when call httpx.request method, such as connection error, client error, server error or response status code is not 2xx
+            utils.logger.error(
+                f"[XiaoHongShuClient.get_aweme_media] {exc.__class__.__name__} for {exc.request.url} - {exc}"
+            )  # 保留原始异常类型名称，以便开发者调试
+            return None
 
     async def pong(self) -> bool:
         """
@@ -25,12 +25,12 @@ from tenacity import RetryError
 
 import config
 from base.base_crawler import AbstractCrawler
-from config import CRAWLER_MAX_COMMENTS_COUNT_SINGLENOTES
 from model.m_xiaohongshu import NoteUrlInfo, CreatorUrlInfo
 from proxy.proxy_ip_pool import IpInfoModel, create_ip_pool
 from store import xhs as xhs_store
 from tools import utils
 from tools.cdp_browser import CDPBrowserManager
+from tools.http_client import HttpClientPool
 from var import crawler_type_var, source_keyword_var
 
 from .client import XiaoHongShuClient
@@ -51,6 +51,7 @@ class XiaoHongShuCrawler(AbstractCrawler):
         # self.user_agent = utils.get_user_agent()
         self.user_agent = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36"
         self.cdp_manager = None
+        self.http_pool = HttpClientPool(platform="xhs")
         self._crawled_note_ids: set = set()
 
     async def start(self) -> None:
@@ -62,7 +63,9 @@ class XiaoHongShuCrawler(AbstractCrawler):
 
         async with async_playwright() as playwright:
             # 根据配置选择启动模式
-            if config.ENABLE_CDP_MODE:
+            if await self.lease_pooled_browser(playwright_proxy_format, self.user_agent):
+                utils.logger.info(f"[XiaoHongShuCrawler] 使用浏览器池中的浏览器上下文 (warm={self.browser_warm})")
+            elif config.ENABLE_CDP_MODE:
                 utils.logger.info("[XiaoHongShuCrawler] 使用CDP模式启动浏览器")
                 self.browser_context = await self.launch_browser_with_cdp(
                     playwright,
@@ -83,21 +86,24 @@ class XiaoHongShuCrawler(AbstractCrawler):
                 # stealth.min.js is a js script to prevent the website from detecting the crawler.
                 await self.browser_context.add_init_script(path=os.path.join(config.LIBS_DIR, "stealth.min.js"))
 
-            self.context_page = await self.browser_context.new_page()
-
-            # 在导航前注入 cookie，确保页面以已登录状态加载
-            if config.LOGIN_TYPE == "cookie" and config.COOKIES:
-                for key, value in utils.convert_str_cookie_to_dict(config.COOKIES).items():
-                    await self.browser_context.add_cookies([{
-                        'name': key,
-                        'value': value,
-                        'domain': ".xiaohongshu.com",
-                        'path': "/"
-                    }])
-
-            await self.context_page.goto(self.index_url)
-            # 等待页面 JS 初始化完成（设置 localStorage 等签名所需数据）
-            await asyncio.sleep(3)
+            if self.browser_lease is None:
+                self.context_page = await self.browser_context.new_page()
+
+            # 浏览器池中复用的上下文已写入 cookie 并打开过首页
+            if not self.browser_warm:
+                # 在导航前注入 cookie，确保页面以已登录状态加载
+                if config.LOGIN_TYPE == "cookie" and config.COOKIES:
+                    for key, value in utils.convert_str_cookie_to_dict(config.COOKIES).items():
+                        await self.browser_context.add_cookies([{
+                            'name': key,
+                            'value': value,
+                            'domain': ".xiaohongshu.com",
+                            'path': "/"
+                        }])
+
+                await self.context_page.goto(self.index_url)
+                # 等待页面 JS 初始化完成（设置 localStorage 等签名所需数据）
+                await asyncio.sleep(3)
 
             # Create a client to interact with the xiaohongshu website.
             self.xhs_client = await self.create_xhs_client(httpx_proxy_format)
@@ -363,7 +369,7 @@ class XiaoHongShuCrawler(AbstractCrawler):
                 xsec_token=xsec_token,
                 crawl_interval=crawl_interval,
                 callback=xhs_store.batch_update_xhs_note_comments,
-                max_count=CRAWLER_MAX_COMMENTS_COUNT_SINGLENOTES,
+                max_count=config.CRAWLER_MAX_COMMENTS_COUNT_SINGLENOTES,
             )
             
             # Sleep after fetching comments
@@ -396,6 +402,7 @@ class XiaoHongShuCrawler(AbstractCrawler):
             },
             playwright_page=self.context_page,
             cookie_dict=cookie_dict,
+            http_pool=self.http_pool,
         )
         return xhs_client_obj
 
@@ -462,6 +469,7 @@ class XiaoHongShuCrawler(AbstractCrawler):
 
     async def close(self):
         """Close browser context"""
+        await self.close_http_pool()
         # 如果使用CDP模式，需要特殊处理
         if self.cdp_manager:
             await self.cdp_manager.cleanup()
@@ -23,6 +23,7 @@ from constant import zhihu as zhihu_constant
 from model.m_zhihu import ZhihuComment, ZhihuContent, ZhihuCreator
 from tools import utils
 from tools.crawler_util import extract_text_from_html
+from tools.js_signer import get_js_signer
 
 ZHIHU_SGIN_JS = None
 
@@ -45,6 +46,19 @@ def sign(url: str, cookies: str) -> Dict:
     return ZHIHU_SGIN_JS.call("get_sign", url, cookies)
 
 
+async def async_sign(url: str, cookies: str) -> Dict:
+    """
+    zhihu sign algorithm, 在常驻 node 进程池中异步计算，不阻塞事件循环
+    Args:
+        url: request url with query string
+        cookies: request cookies with d_c0 key
+
+    Returns:
+
+    """
+    return await get_js_signer("zhihu.js").call("get_sign", url, cookies)
+
+
 class ZhihuExtractor:
     def __init__(self):
         pass
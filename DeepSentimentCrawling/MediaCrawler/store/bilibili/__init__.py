@@ -27,6 +27,7 @@ class BiliStoreFactory:
         "csv": BiliCsvStoreImplement,
         "db": BiliDbStoreImplement,
         "json": BiliJsonStoreImplement,
+        "jsonl": BiliJsonlStoreImplement,
         "sqlite": BiliSqliteStoreImplement,
         "postgresql": BiliDbStoreImplement,
     }
@@ -35,7 +36,7 @@ class BiliStoreFactory:
     def create_store() -> AbstractStore:
         store_class = BiliStoreFactory.STORES.get(config.SAVE_DATA_OPTION)
         if not store_class:
-            raise ValueError("[BiliStoreFactory.create_store] Invalid save option only supported csv or db or json or sqlite or postgresql ...")
+            raise ValueError("[BiliStoreFactory.create_store] Invalid save option only supported csv or db or json or jsonl or sqlite or postgresql ...")
         return store_class()
 
 
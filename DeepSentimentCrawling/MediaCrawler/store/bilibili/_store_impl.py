@@ -21,13 +21,12 @@ import pathlib
 from typing import Dict
 
 import aiofiles
-from sqlalchemy import select
 from sqlalchemy.orm import sessionmaker
 
 import config
 from base.base_crawler import AbstractStore
-from database.db_session import get_session
 from database.models import BilibiliVideoComment, BilibiliVideo, BilibiliUpInfo, BilibiliUpDynamic, BilibiliContactInfo
+from database.write_behind import db_upsert
 from tools.async_file_writer import AsyncFileWriter
 from tools import utils, words
 from var import crawler_type_var
@@ -129,30 +128,24 @@ class BiliCsvStoreImplement(AbstractStore):
 
 
 class BiliDbStoreImplement(AbstractStore):
+    @staticmethod
+    def _to_int(item: Dict, *keys: str) -> None:
+        # 确保 id 为整数类型，匹配数据库 BigInteger 字段
+        for key in keys:
+            value = item.get(key)
+            if value is not None and not isinstance(value, int):
+                item[key] = int(value)
+
     async def store_content(self, content_item: Dict):
         """
         Bilibili content DB storage implementation
         Args:
             content_item: content item dict
         """
-        video_id = content_item.get("video_id")
-        # 确保 video_id 为整数类型，匹配数据库 BigInteger 字段
-        if video_id is not None:
-            video_id = int(video_id) if not isinstance(video_id, int) else video_id
-            content_item["video_id"] = video_id
+        self._to_int(content_item, "video_id")
         content_item = _sanitize_strings(content_item)
-        async with get_session() as session:
-            result = await session.execute(select(BilibiliVideo).where(BilibiliVideo.video_id == video_id))
-            video_detail = result.scalar_one_or_none()
-
-            if not video_detail:
-                content_item["add_ts"] = utils.get_current_timestamp()
-                new_content = BilibiliVideo(**content_item)
-                session.add(new_content)
-            else:
-                for key, value in content_item.items():
-                    setattr(video_detail, key, value)
-            await session.commit()
+        row = {**content_item, "add_ts": utils.get_current_timestamp()}
+        await db_upsert(BilibiliVideo, ("video_id",), row, update_columns=content_item.keys())
 
     async def store_comment(self, comment_item: Dict):
         """
@@ -160,24 +153,10 @@ class BiliDbStoreImplement(AbstractStore):
         Args:
             comment_item: comment item dict
         """
-        comment_id = comment_item.get("comment_id")
-        # 确保 comment_id 为整数类型，匹配数据库 BigInteger 字段
-        if comment_id is not None:
-            comment_id = int(comment_id) if not isinstance(comment_id, int) else comment_id
-            comment_item["comment_id"] = comment_id
+        self._to_int(comment_item, "comment_id")
         comment_item = _sanitize_strings(comment_item)
-        async with get_session() as session:
-            result = await session.execute(select(BilibiliVideoComment).where(BilibiliVideoComment.comment_id == comment_id))
-            comment_detail = result.scalar_one_or_none()
-
-            if not comment_detail:
-                comment_item["add_ts"] = utils.get_current_timestamp()
-                new_comment = BilibiliVideoComment(**comment_item)
-                session.add(new_comment)
-            else:
-                for key, value in comment_item.items():
-                    setattr(comment_detail, key, value)
-            await session.commit()
+        row = {**comment_item, "add_ts": utils.get_current_timestamp()}
+        await db_upsert(BilibiliVideoComment, ("comment_id",), row, update_columns=comment_item.keys())
 
     async def store_creator(self, creator: Dict):
         """
@@ -185,24 +164,10 @@ class BiliDbStoreImplement(AbstractStore):
         Args:
             creator: creator item dict
         """
-        creator_id = creator.get("user_id")
-        # 确保 creator_id 为整数类型，匹配数据库 BigInteger 字段
-        if creator_id is not None:
-            creator_id = int(creator_id) if not isinstance(creator_id, int) else creator_id
-            creator["user_id"] = creator_id
+        self._to_int(creator, "user_id")
         creator = _sanitize_strings(creator)
-        async with get_session() as session:
-            result = await session.execute(select(BilibiliUpInfo).where(BilibiliUpInfo.user_id == creator_id))
-            creator_detail = result.scalar_one_or_none()
-
-            if not creator_detail:
-                creator["add_ts"] = utils.get_current_timestamp()
-                new_creator = BilibiliUpInfo(**creator)
-                session.add(new_creator)
-            else:
-                for key, value in creator.items():
-                    setattr(creator_detail, key, value)
-            await session.commit()
+        row = {**creator, "add_ts": utils.get_current_timestamp()}
+        await db_upsert(BilibiliUpInfo, ("user_id",), row, update_columns=creator.keys())
 
     async def store_contact(self, contact_item: Dict):
         """
@@ -210,30 +175,10 @@ class BiliDbStoreImplement(AbstractStore):
         Args:
             contact_item: contact item dict
         """
-        up_id = contact_item.get("up_id")
-        fan_id = contact_item.get("fan_id")
-        # 确保 up_id 和 fan_id 为整数类型，匹配数据库 BigInteger 字段
-        if up_id is not None:
-            up_id = int(up_id) if not isinstance(up_id, int) else up_id
-            contact_item["up_id"] = up_id
-        if fan_id is not None:
-            fan_id = int(fan_id) if not isinstance(fan_id, int) else fan_id
-            contact_item["fan_id"] = fan_id
+        self._to_int(contact_item, "up_id", "fan_id")
         contact_item = _sanitize_strings(contact_item)
-        async with get_session() as session:
-            result = await session.execute(
-                select(BilibiliContactInfo).where(BilibiliContactInfo.up_id == up_id, BilibiliContactInfo.fan_id == fan_id)
-            )
-            contact_detail = result.scalar_one_or_none()
-
-            if not contact_detail:
-                contact_item["add_ts"] = utils.get_current_timestamp()
-                new_contact = BilibiliContactInfo(**contact_item)
-                session.add(new_contact)
-            else:
-                for key, value in contact_item.items():
-                    setattr(contact_detail, key, value)
-            await session.commit()
+        row = {**contact_item, "add_ts": utils.get_current_timestamp()}
+        await db_upsert(BilibiliContactInfo, ("up_id", "fan_id"), row, update_columns=contact_item.keys())
 
     async def store_dynamic(self, dynamic_item):
         """
@@ -241,20 +186,9 @@ class BiliDbStoreImplement(AbstractStore):
         Args:
             dynamic_item: dynamic item dict
         """
-        dynamic_id = dynamic_item.get("dynamic_id")
         dynamic_item = _sanitize_strings(dynamic_item)
-        async with get_session() as session:
-            result = await session.execute(select(BilibiliUpDynamic).where(BilibiliUpDynamic.dynamic_id == dynamic_id))
-            dynamic_detail = result.scalar_one_or_none()
-
-            if not dynamic_detail:
-                dynamic_item["add_ts"] = utils.get_current_timestamp()
-                new_dynamic = BilibiliUpDynamic(**dynamic_item)
-                session.add(new_dynamic)
-            else:
-                for key, value in dynamic_item.items():
-                    setattr(dynamic_detail, key, value)
-            await session.commit()
+        row = {**dynamic_item, "add_ts": utils.get_current_timestamp()}
+        await db_upsert(BilibiliUpDynamic, ("dynamic_id",), row, update_columns=dynamic_item.keys())
 
 
 class BiliJsonStoreImplement(AbstractStore):
@@ -336,5 +270,12 @@ class BiliJsonStoreImplement(AbstractStore):
 
 
 
+class BiliJsonlStoreImplement(BiliJsonStoreImplement):
+    """JSONL 存储：复用 JSON 存储逻辑，逐行缓冲追加写入"""
+
+    def __init__(self):
+        self.file_writer = AsyncFileWriter(platform="bili", crawler_type=crawler_type_var.get(), json_lines=True)
+
+
 class BiliSqliteStoreImplement(BiliDbStoreImplement):
     pass
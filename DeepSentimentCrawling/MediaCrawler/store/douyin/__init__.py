@@ -26,6 +26,7 @@ class DouyinStoreFactory:
         "csv": DouyinCsvStoreImplement,
         "db": DouyinDbStoreImplement,
         "json": DouyinJsonStoreImplement,
+        "jsonl": DouyinJsonlStoreImplement,
         "sqlite": DouyinSqliteStoreImplement,
         "postgresql": DouyinDbStoreImplement,
     }
@@ -34,7 +35,7 @@ class DouyinStoreFactory:
     def create_store() -> AbstractStore:
         store_class = DouyinStoreFactory.STORES.get(config.SAVE_DATA_OPTION)
         if not store_class:
-            raise ValueError("[DouyinStoreFactory.create_store] Invalid save option only supported csv or db or json or sqlite or postgresql ...")
+            raise ValueError("[DouyinStoreFactory.create_store] Invalid save option only supported csv or db or json or jsonl or sqlite or postgresql ...")
         return store_class()
 
 
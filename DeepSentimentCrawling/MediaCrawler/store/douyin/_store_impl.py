@@ -19,12 +19,10 @@ import os
 import pathlib
 from typing import Dict
 
-from sqlalchemy import select
-
 import config
 from base.base_crawler import AbstractStore
-from database.db_session import get_session
 from database.models import DouyinAweme, DouyinAwemeComment, DyCreator
+from database.write_behind import db_upsert
 from tools import utils, words
 from tools.async_file_writer import AsyncFileWriter
 from var import crawler_type_var
@@ -87,20 +85,12 @@ class DouyinDbStoreImplement(AbstractStore):
         Args:
             content_item: content item dict
         """
-        aweme_id = content_item.get("aweme_id")
-        async with get_session() as session:
-            result = await session.execute(select(DouyinAweme).where(DouyinAweme.aweme_id == aweme_id))
-            aweme_detail = result.scalar_one_or_none()
-
-            if not aweme_detail:
-                content_item["add_ts"] = utils.get_current_timestamp()
-                if content_item.get("title"):
-                    new_content = DouyinAweme(**content_item)
-                    session.add(new_content)
-            else:
-                for key, value in content_item.items():
-                    setattr(aweme_detail, key, value)
-            await session.commit()
+        row = {**content_item, "add_ts": utils.get_current_timestamp()}
+        await db_upsert(
+            DouyinAweme, ("aweme_id",), row,
+            update_columns=content_item.keys(),
+            insertable=bool(content_item.get("title")),
+        )
 
     async def store_comment(self, comment_item: Dict):
         """
@@ -108,19 +98,8 @@ class DouyinDbStoreImplement(AbstractStore):
         Args:
             comment_item: comment item dict
         """
-        comment_id = comment_item.get("comment_id")
-        async with get_session() as session:
-            result = await session.execute(select(DouyinAwemeComment).where(DouyinAwemeComment.comment_id == comment_id))
-            comment_detail = result.scalar_one_or_none()
-
-            if not comment_detail:
-                comment_item["add_ts"] = utils.get_current_timestamp()
-                new_comment = DouyinAwemeComment(**comment_item)
-                session.add(new_comment)
-            else:
-                for key, value in comment_item.items():
-                    setattr(comment_detail, key, value)
-            await session.commit()
+        row = {**comment_item, "add_ts": utils.get_current_timestamp()}
+        await db_upsert(DouyinAwemeComment, ("comment_id",), row, update_columns=comment_item.keys())
 
     async def store_creator(self, creator: Dict):
         """
@@ -128,19 +107,8 @@ class DouyinDbStoreImplement(AbstractStore):
         Args:
             creator: creator dict
         """
-        user_id = creator.get("user_id")
-        async with get_session() as session:
-            result = await session.execute(select(DyCreator).where(DyCreator.user_id == user_id))
-            user_detail = result.scalar_one_or_none()
-
-            if not user_detail:
-                creator["add_ts"] = utils.get_current_timestamp()
-                new_creator = DyCreator(**creator)
-                session.add(new_creator)
-            else:
-                for key, value in creator.items():
-                    setattr(user_detail, key, value)
-            await session.commit()
+        row = {**creator, "add_ts": utils.get_current_timestamp()}
+        await db_upsert(DyCreator, ("user_id",), row, update_columns=creator.keys())
 
 
 class DouyinJsonStoreImplement(AbstractStore):
@@ -194,5 +162,12 @@ class DouyinJsonStoreImplement(AbstractStore):
 
 
 
+class DouyinJsonlStoreImplement(DouyinJsonStoreImplement):
+    """JSONL 存储：复用 JSON 存储逻辑，逐行缓冲追加写入"""
+
+    def __init__(self):
+        self.file_writer = AsyncFileWriter(platform="douyin", crawler_type=crawler_type_var.get(), json_lines=True)
+
+
 class DouyinSqliteStoreImplement(DouyinDbStoreImplement):
     pass
\ No newline at end of file
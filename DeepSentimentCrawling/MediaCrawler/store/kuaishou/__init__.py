@@ -26,6 +26,7 @@ class KuaishouStoreFactory:
         "csv": KuaishouCsvStoreImplement,
         "db": KuaishouDbStoreImplement,
         "json": KuaishouJsonStoreImplement,
+        "jsonl": KuaishouJsonlStoreImplement,
         "sqlite": KuaishouSqliteStoreImplement,
         "postgresql": KuaishouDbStoreImplement,
     }
@@ -35,7 +36,7 @@ class KuaishouStoreFactory:
         store_class = KuaishouStoreFactory.STORES.get(config.SAVE_DATA_OPTION)
         if not store_class:
             raise ValueError(
-                "[KuaishouStoreFactory.create_store] Invalid save option only supported csv or db or json or sqlite or postgresql ...")
+                "[KuaishouStoreFactory.create_store] Invalid save option only supported csv or db or json or jsonl or sqlite or postgresql ...")
         return store_class()
 
 
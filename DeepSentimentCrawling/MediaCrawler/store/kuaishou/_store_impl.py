@@ -22,12 +22,11 @@ from typing import Dict
 from tools.async_file_writer import AsyncFileWriter
 
 import aiofiles
-from sqlalchemy import select
 
 import config
 from base.base_crawler import AbstractStore
-from database.db_session import get_session
 from database.models import KuaishouVideo, KuaishouVideoComment
+from database.write_behind import db_upsert
 from tools import utils, words
 from var import crawler_type_var
 
@@ -88,19 +87,8 @@ class KuaishouDbStoreImplement(AbstractStore):
         Args:
             content_item: content item dict
         """
-        video_id = content_item.get("video_id")
-        async with get_session() as session:
-            result = await session.execute(select(KuaishouVideo).where(KuaishouVideo.video_id == video_id))
-            video_detail = result.scalar_one_or_none()
-
-            if not video_detail:
-                content_item["add_ts"] = utils.get_current_timestamp()
-                new_content = KuaishouVideo(**content_item)
-                session.add(new_content)
-            else:
-                for key, value in content_item.items():
-                    setattr(video_detail, key, value)
-            await session.commit()
+        row = {**content_item, "add_ts": utils.get_current_timestamp()}
+        await db_upsert(KuaishouVideo, ("video_id",), row, update_columns=content_item.keys())
 
     async def store_comment(self, comment_item: Dict):
         """
@@ -108,20 +96,8 @@ class KuaishouDbStoreImplement(AbstractStore):
         Args:
             comment_item: comment item dict
         """
-        comment_id = comment_item.get("comment_id")
-        async with get_session() as session:
-            result = await session.execute(
-                select(KuaishouVideoComment).where(KuaishouVideoComment.comment_id == comment_id))
-            comment_detail = result.scalar_one_or_none()
-
-            if not comment_detail:
-                comment_item["add_ts"] = utils.get_current_timestamp()
-                new_comment = KuaishouVideoComment(**comment_item)
-                session.add(new_comment)
-            else:
-                for key, value in comment_item.items():
-                    setattr(comment_detail, key, value)
-            await session.commit()
+        row = {**comment_item, "add_ts": utils.get_current_timestamp()}
+        await db_upsert(KuaishouVideoComment, ("comment_id",), row, update_columns=comment_item.keys())
 
 
 class KuaishouJsonStoreImplement(AbstractStore):
@@ -155,6 +131,14 @@ class KuaishouJsonStoreImplement(AbstractStore):
         pass
 
 
+class KuaishouJsonlStoreImplement(KuaishouJsonStoreImplement):
+    """JSONL 存储：复用 JSON 存储逻辑，逐行缓冲追加写入"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.writer = AsyncFileWriter(platform="kuaishou", crawler_type=crawler_type_var.get(), json_lines=True)
+
+
 class KuaishouSqliteStoreImplement(KuaishouDbStoreImplement):
     async def store_creator(self, creator: Dict):
         pass
\ No newline at end of file
@@ -23,6 +23,7 @@ class TieBaStoreFactory:
         "csv": TieBaCsvStoreImplement,
         "db": TieBaDbStoreImplement,
         "json": TieBaJsonStoreImplement,
+        "jsonl": TieBaJsonlStoreImplement,
         "sqlite": TieBaSqliteStoreImplement,
         "postgresql": TieBaDbStoreImplement,
     }
@@ -32,7 +33,7 @@ class TieBaStoreFactory:
         store_class = TieBaStoreFactory.STORES.get(config.SAVE_DATA_OPTION)
         if not store_class:
             raise ValueError(
-                "[TieBaStoreFactory.create_store] Invalid save option only supported csv or db or json or sqlite or postgresql ...")
+                "[TieBaStoreFactory.create_store] Invalid save option only supported csv or db or json or jsonl or sqlite or postgresql ...")
         return store_class()
 
 
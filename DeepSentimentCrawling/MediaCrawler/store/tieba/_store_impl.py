@@ -21,14 +21,12 @@ import pathlib
 from typing import Dict
 
 import aiofiles
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
 
 import config
 from base.base_crawler import AbstractStore
 from database.models import TiebaNote, TiebaComment, TiebaCreator
 from tools import utils, words
-from database.db_session import get_session
+from database.write_behind import db_upsert
 from var import crawler_type_var
 from tools.async_file_writer import AsyncFileWriter
 
@@ -94,18 +92,7 @@ class TieBaDbStoreImplement(AbstractStore):
         Args:
             content_item: content item dict
         """
-        note_id = content_item.get("note_id")
-        async with get_session() as session:
-            stmt = select(TiebaNote).where(TiebaNote.note_id == note_id)
-            res = await session.execute(stmt)
-            db_note = res.scalar_one_or_none()
-            if db_note:
-                for key, value in content_item.items():
-                    setattr(db_note, key, value)
-            else:
-                db_note = TiebaNote(**content_item)
-                session.add(db_note)
-            await session.commit()
+        await db_upsert(TiebaNote, ("note_id",), content_item)
 
     async def store_comment(self, comment_item: Dict):
         """
@@ -113,18 +100,7 @@ class TieBaDbStoreImplement(AbstractStore):
         Args:
             comment_item: comment item dict
         """
-        comment_id = comment_item.get("comment_id")
-        async with get_session() as session:
-            stmt = select(TiebaComment).where(TiebaComment.comment_id == comment_id)
-            res = await session.execute(stmt)
-            db_comment = res.scalar_one_or_none()
-            if db_comment:
-                for key, value in comment_item.items():
-                    setattr(db_comment, key, value)
-            else:
-                db_comment = TiebaComment(**comment_item)
-                session.add(db_comment)
-            await session.commit()
+        await db_upsert(TiebaComment, ("comment_id",), comment_item)
 
     async def store_creator(self, creator: Dict):
         """
@@ -132,18 +108,7 @@ class TieBaDbStoreImplement(AbstractStore):
         Args:
             creator: creator dict
         """
-        user_id = creator.get("user_id")
-        async with get_session() as session:
-            stmt = select(TiebaCreator).where(TiebaCreator.user_id == user_id)
-            res = await session.execute(stmt)
-            db_creator = res.scalar_one_or_none()
-            if db_creator:
-                for key, value in creator.items():
-                    setattr(db_creator, key, value)
-            else:
-                db_creator = TiebaCreator(**creator)
-                session.add(db_creator)
-            await session.commit()
+        await db_upsert(TiebaCreator, ("user_id",), creator)
 
 
 class TieBaJsonStoreImplement(AbstractStore):
@@ -185,6 +150,14 @@ class TieBaJsonStoreImplement(AbstractStore):
         await self.writer.write_single_item_to_json(item_type="creators", item=creator)
 
 
+class TieBaJsonlStoreImplement(TieBaJsonStoreImplement):
+    """JSONL 存储：复用 JSON 存储逻辑，逐行缓冲追加写入"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.writer = AsyncFileWriter(platform="tieba", crawler_type=crawler_type_var.get(), json_lines=True)
+
+
 class TieBaSqliteStoreImplement(TieBaDbStoreImplement):
     """
     Tieba sqlite store implement
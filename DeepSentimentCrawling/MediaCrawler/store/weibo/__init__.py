@@ -27,6 +27,7 @@ class WeibostoreFactory:
         "csv": WeiboCsvStoreImplement,
         "db": WeiboDbStoreImplement,
         "json": WeiboJsonStoreImplement,
+        "jsonl": WeiboJsonlStoreImplement,
         "sqlite": WeiboSqliteStoreImplement,
         "postgresql": WeiboDbStoreImplement,
     }
@@ -35,7 +36,7 @@ class WeibostoreFactory:
     def create_store() -> AbstractStore:
         store_class = WeibostoreFactory.STORES.get(config.SAVE_DATA_OPTION)
         if not store_class:
-            raise ValueError("[WeibotoreFactory.create_store] Invalid save option only supported csv or db or json or sqlite or postgresql ...")
+            raise ValueError("[WeibotoreFactory.create_store] Invalid save option only supported csv or db or json or jsonl or sqlite or postgresql ...")
         return store_class()
 
 
@@ -21,15 +21,13 @@ import pathlib
 from typing import Dict
 
 import aiofiles
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
 
 import config
 from base.base_crawler import AbstractStore
 from database.models import WeiboCreator, WeiboNote, WeiboNoteComment
 from tools import utils, words
 from tools.async_file_writer import AsyncFileWriter
-from database.db_session import get_session
+from database.write_behind import db_upsert
 from var import crawler_type_var
 
 
@@ -89,6 +87,12 @@ class WeiboCsvStoreImplement(AbstractStore):
 
 class WeiboDbStoreImplement(AbstractStore):
 
+    @staticmethod
+    async def _upsert(model, key: str, item: Dict):
+        now = utils.get_current_timestamp()
+        row = {**item, "add_ts": now, "last_modify_ts": now}
+        await db_upsert(model, (key,), row, update_columns=[*item.keys(), "last_modify_ts"])
+
     async def store_content(self, content_item: Dict):
         """
         Weibo content DB storage implementation
@@ -98,22 +102,7 @@ class WeiboDbStoreImplement(AbstractStore):
         Returns:
 
         """
-        note_id = content_item.get("note_id")
-        async with get_session() as session:
-            stmt = select(WeiboNote).where(WeiboNote.note_id == note_id)
-            res = await session.execute(stmt)
-            db_note = res.scalar_one_or_none()
-            if db_note:
-                db_note.last_modify_ts = utils.get_current_timestamp()
-                for key, value in content_item.items():
-                    if hasattr(db_note, key):
-                        setattr(db_note, key, value)
-            else:
-                content_item["add_ts"] = utils.get_current_timestamp()
-                content_item["last_modify_ts"] = utils.get_current_timestamp()
-                db_note = WeiboNote(**content_item)
-                session.add(db_note)
-            await session.commit()
+        await self._upsert(WeiboNote, "note_id", content_item)
 
     async def store_comment(self, comment_item: Dict):
         """
@@ -124,22 +113,7 @@ class WeiboDbStoreImplement(AbstractStore):
         Returns:
 
         """
-        comment_id = comment_item.get("comment_id")
-        async with get_session() as session:
-            stmt = select(WeiboNoteComment).where(WeiboNoteComment.comment_id == comment_id)
-            res = await session.execute(stmt)
-            db_comment = res.scalar_one_or_none()
-            if db_comment:
-                db_comment.last_modify_ts = utils.get_current_timestamp()
-                for key, value in comment_item.items():
-                    if hasattr(db_comment, key):
-                        setattr(db_comment, key, value)
-            else:
-                comment_item["add_ts"] = utils.get_current_timestamp()
-                comment_item["last_modify_ts"] = utils.get_current_timestamp()
-                db_comment = WeiboNoteComment(**comment_item)
-                session.add(db_comment)
-            await session.commit()
+        await self._upsert(WeiboNoteComment, "comment_id", comment_item)
 
     async def store_creator(self, creator: Dict):
         """
@@ -150,22 +124,7 @@ class WeiboDbStoreImplement(AbstractStore):
         Returns:
 
         """
-        user_id = creator.get("user_id")
-        async with get_session() as session:
-            stmt = select(WeiboCreator).where(WeiboCreator.user_id == user_id)
-            res = await session.execute(stmt)
-            db_creator = res.scalar_one_or_none()
-            if db_creator:
-                db_creator.last_modify_ts = utils.get_current_timestamp()
-                for key, value in creator.items():
-                    if hasattr(db_creator, key):
-                        setattr(db_creator, key, value)
-            else:
-                creator["add_ts"] = utils.get_current_timestamp()
-                creator["last_modify_ts"] = utils.get_current_timestamp()
-                db_creator = WeiboCreator(**creator)
-                session.add(db_creator)
-            await session.commit()
+        await self._upsert(WeiboCreator, "user_id", creator)
 
 
 class WeiboJsonStoreImplement(AbstractStore):
@@ -207,6 +166,14 @@ class WeiboJsonStoreImplement(AbstractStore):
         await self.writer.write_single_item_to_json(item_type="creators", item=creator)
 
 
+class WeiboJsonlStoreImplement(WeiboJsonStoreImplement):
+    """JSONL 存储：复用 JSON 存储逻辑，逐行缓冲追加写入"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.writer = AsyncFileWriter(platform="weibo", crawler_type=crawler_type_var.get(), json_lines=True)
+
+
 class WeiboSqliteStoreImplement(WeiboDbStoreImplement):
     """
     Weibo content SQLite storage implementation
@@ -26,6 +26,7 @@ class XhsStoreFactory:
         "csv": XhsCsvStoreImplement,
         "db": XhsDbStoreImplement,
         "json": XhsJsonStoreImplement,
+        "jsonl": XhsJsonlStoreImplement,
         "sqlite": XhsSqliteStoreImplement,
         "postgresql": XhsDbStoreImplement,
     }
@@ -34,7 +35,7 @@ class XhsStoreFactory:
     def create_store() -> AbstractStore:
         store_class = XhsStoreFactory.STORES.get(config.SAVE_DATA_OPTION)
         if not store_class:
-            raise ValueError("[XhsStoreFactory.create_store] Invalid save option only supported csv or db or json or sqlite or postgresql ...")
+            raise ValueError("[XhsStoreFactory.create_store] Invalid save option only supported csv or db or json or jsonl or sqlite or postgresql ...")
         return store_class()
 
 
@@ -7,13 +7,13 @@ import os
 from datetime import datetime
 from typing import List, Dict, Any
 
-from sqlalchemy import select, update, delete
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from base.base_crawler import AbstractStore
 from database.db_session import get_session
 from database.models import XhsNote, XhsNoteComment, XhsCreator
+from database.write_behind import db_upsert, flush_write_buffer
 
 from tools.async_file_writer import AsyncFileWriter
 from tools.time_util import get_current_timestamp
@@ -82,6 +82,15 @@ class XhsJsonStoreImplement(AbstractStore):
 
 
 class XhsDbStoreImplement(AbstractStore):
+    # 记录已存在时只更新以下字段
+    CONTENT_UPDATE_COLUMNS = (
+        "last_modify_ts", "liked_count", "collected_count", "comment_count", "share_count", "last_update_time",
+    )
+    COMMENT_UPDATE_COLUMNS = ("last_modify_ts", "like_count", "sub_comment_count")
+    CREATOR_UPDATE_COLUMNS = (
+        "last_modify_ts", "nickname", "avatar", "desc", "follows", "fans", "interaction", "tag_list",
+    )
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
@@ -89,16 +98,16 @@ class XhsDbStoreImplement(AbstractStore):
         note_id = content_item.get("note_id")
         if not note_id:
             return
-        async with get_session() as session:
-            if await self.content_is_exist(session, note_id):
-                await self.update_content(session, content_item)
-            else:
-                await self.add_content(session, content_item)
+        await db_upsert(
+            XhsNote, ("note_id",), self.build_content_row(content_item),
+            update_columns=self.CONTENT_UPDATE_COLUMNS,
+        )
 
-    async def add_content(self, session: AsyncSession, content_item: Dict):
+    @staticmethod
+    def build_content_row(content_item: Dict) -> Dict:
         add_ts = int(get_current_timestamp())
         last_modify_ts = int(get_current_timestamp())
-        note = XhsNote(
+        return dict(
             user_id=content_item.get("user_id"),
             nickname=content_item.get("nickname"),
             avatar=content_item.get("avatar"),
@@ -124,43 +133,23 @@ class XhsDbStoreImplement(AbstractStore):
             crawling_task_id=content_item.get("crawling_task_id", ""),
             xsec_token=content_item.get("xsec_token", "")
         )
-        session.add(note)
-
-    async def update_content(self, session: AsyncSession, content_item: Dict):
-        note_id = content_item.get("note_id")
-        last_modify_ts = int(get_current_timestamp())
-        update_data = {
-            "last_modify_ts": last_modify_ts,
-            "liked_count": str(content_item.get("liked_count")),
-            "collected_count": str(content_item.get("collected_count")),
-            "comment_count": str(content_item.get("comment_count")),
-            "share_count": str(content_item.get("share_count")),
-            "last_update_time": content_item.get("last_update_time"),
-        }
-        stmt = update(XhsNote).where(XhsNote.note_id == note_id).values(**update_data)
-        await session.execute(stmt)
-
-    async def content_is_exist(self, session: AsyncSession, note_id: str) -> bool:
-        stmt = select(XhsNote).where(XhsNote.note_id == note_id)
-        result = await session.execute(stmt)
-        return result.first() is not None
 
     async def store_comment(self, comment_item: Dict):
         if not comment_item:
             return
-        async with get_session() as session:
-            comment_id = comment_item.get("comment_id")
-            if not comment_id:
-                return
-            if await self.comment_is_exist(session, comment_id):
-                await self.update_comment(session, comment_item)
-            else:
-                await self.add_comment(session, comment_item)
-
-    async def add_comment(self, session: AsyncSession, comment_item: Dict):
+        comment_id = comment_item.get("comment_id")
+        if not comment_id:
+            return
+        await db_upsert(
+            XhsNoteComment, ("comment_id",), self.build_comment_row(comment_item),
+            update_columns=self.COMMENT_UPDATE_COLUMNS,
+        )
+
+    @staticmethod
+    def build_comment_row(comment_item: Dict) -> Dict:
         add_ts = int(get_current_timestamp())
         last_modify_ts = int(get_current_timestamp())
-        comment = XhsNoteComment(
+        return dict(
             user_id=comment_item.get("user_id"),
             nickname=comment_item.get("nickname"),
             avatar=comment_item.get("avatar"),
@@ -176,38 +165,21 @@ class XhsDbStoreImplement(AbstractStore):
             parent_comment_id=comment_item.get("parent_comment_id"),
             like_count=str(comment_item.get("like_count"))
         )
-        session.add(comment)
-
-    async def update_comment(self, session: AsyncSession, comment_item: Dict):
-        comment_id = comment_item.get("comment_id")
-        last_modify_ts = int(get_current_timestamp())
-        update_data = {
-            "last_modify_ts": last_modify_ts,
-            "like_count": str(comment_item.get("like_count")),
-            "sub_comment_count": comment_item.get("sub_comment_count"),
-        }
-        stmt = update(XhsNoteComment).where(XhsNoteComment.comment_id == comment_id).values(**update_data)
-        await session.execute(stmt)
-
-    async def comment_is_exist(self, session: AsyncSession, comment_id: str) -> bool:
-        stmt = select(XhsNoteComment).where(XhsNoteComment.comment_id == comment_id)
-        result = await session.execute(stmt)
-        return result.first() is not None
 
     async def store_creator(self, creator_item: Dict):
         user_id = creator_item.get("user_id")
         if not user_id:
             return
-        async with get_session() as session:
-            if await self.creator_is_exist(session, user_id):
-                await self.update_creator(session, creator_item)
-            else:
-                await self.add_creator(session, creator_item)
+        await db_upsert(
+            XhsCreator, ("user_id",), self.build_creator_row(creator_item),
+            update_columns=self.CREATOR_UPDATE_COLUMNS,
+        )
 
-    async def add_creator(self, session: AsyncSession, creator_item: Dict):
+    @staticmethod
+    def build_creator_row(creator_item: Dict) -> Dict:
         add_ts = int(get_current_timestamp())
         last_modify_ts = int(get_current_timestamp())
-        creator = XhsCreator(
+        return dict(
             user_id=creator_item.get("user_id"),
             nickname=creator_item.get("nickname"),
             avatar=creator_item.get("avatar"),
@@ -221,42 +193,30 @@ class XhsDbStoreImplement(AbstractStore):
             interaction=str(creator_item.get("interaction")),
             tag_list=json.dumps(creator_item.get("tag_list"))
         )
-        session.add(creator)
-
-    async def update_creator(self, session: AsyncSession, creator_item: Dict):
-        user_id = creator_item.get("user_id")
-        last_modify_ts = int(get_current_timestamp())
-        update_data = {
-            "last_modify_ts": last_modify_ts,
-            "nickname": creator_item.get("nickname"),
-            "avatar": creator_item.get("avatar"),
-            "desc": creator_item.get("desc"),
-            "follows": str(creator_item.get("follows")),
-            "fans": str(creator_item.get("fans")),
-            "interaction": str(creator_item.get("interaction")),
-            "tag_list": json.dumps(creator_item.get("tag_list"))
-        }
-        stmt = update(XhsCreator).where(XhsCreator.user_id == user_id).values(**update_data)
-        await session.execute(stmt)
-
-    async def creator_is_exist(self, session: AsyncSession, user_id: str) -> bool:
-        stmt = select(XhsCreator).where(XhsCreator.user_id == user_id)
-        result = await session.execute(stmt)
-        return result.first() is not None
 
     async def get_all_content(self) -> List[Dict]:
+        await flush_write_buffer()
         async with get_session() as session:
             stmt = select(XhsNote)
             result = await session.execute(stmt)
             return [item.__dict__ for item in result.scalars().all()]
 
     async def get_all_comments(self) -> List[Dict]:
+        await flush_write_buffer()
         async with get_session() as session:
             stmt = select(XhsNoteComment)
             result = await session.execute(stmt)
             return [item.__dict__ for item in result.scalars().all()]
 
 
+class XhsJsonlStoreImplement(XhsJsonStoreImplement):
+    """JSONL 存储：复用 JSON 存储逻辑，逐行缓冲追加写入"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.writer = AsyncFileWriter(platform="xhs", crawler_type=crawler_type_var.get(), json_lines=True)
+
+
 class XhsSqliteStoreImplement(XhsDbStoreImplement):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -21,13 +21,11 @@ import pathlib
 from typing import Dict
 
 import aiofiles
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
 
 import config
 from base.base_crawler import AbstractStore
-from database.db_session import get_session
 from database.models import ZhihuContent, ZhihuComment, ZhihuCreator
+from database.write_behind import db_upsert
 from tools import utils, words
 from var import crawler_type_var
 from tools.async_file_writer import AsyncFileWriter
@@ -93,18 +91,7 @@ class ZhihuDbStoreImplement(AbstractStore):
         Args:
             content_item: content item dict
         """
-        content_id = content_item.get("content_id")
-        async with get_session() as session:
-            stmt = select(ZhihuContent).where(ZhihuContent.content_id == content_id)
-            result = await session.execute(stmt)
-            existing_content = result.scalars().first()
-            if existing_content:
-                for key, value in content_item.items():
-                    setattr(existing_content, key, value)
-            else:
-                new_content = ZhihuContent(**content_item)
-                session.add(new_content)
-            await session.commit()
+        await db_upsert(ZhihuContent, ("content_id",), content_item)
 
     async def store_comment(self, comment_item: Dict):
         """
@@ -112,18 +99,7 @@ class ZhihuDbStoreImplement(AbstractStore):
         Args:
             comment_item: comment item dict
         """
-        comment_id = comment_item.get("comment_id")
-        async with get_session() as session:
-            stmt = select(ZhihuComment).where(ZhihuComment.comment_id == comment_id)
-            result = await session.execute(stmt)
-            existing_comment = result.scalars().first()
-            if existing_comment:
-                for key, value in comment_item.items():
-                    setattr(existing_comment, key, value)
-            else:
-                new_comment = ZhihuComment(**comment_item)
-                session.add(new_comment)
-            await session.commit()
+        await db_upsert(ZhihuComment, ("comment_id",), comment_item)
 
     async def store_creator(self, creator: Dict):
         """
@@ -131,18 +107,7 @@ class ZhihuDbStoreImplement(AbstractStore):
         Args:
             creator: creator dict
         """
-        user_id = creator.get("user_id")
-        async with get_session() as session:
-            stmt = select(ZhihuCreator).where(ZhihuCreator.user_id == user_id)
-            result = await session.execute(stmt)
-            existing_creator = result.scalars().first()
-            if existing_creator:
-                for key, value in creator.items():
-                    setattr(existing_creator, key, value)
-            else:
-                new_creator = ZhihuCreator(**creator)
-                session.add(new_creator)
-            await session.commit()
+        await db_upsert(ZhihuCreator, ("user_id",), creator)
 
 
 class ZhihuJsonStoreImplement(AbstractStore):
@@ -184,6 +149,14 @@ class ZhihuJsonStoreImplement(AbstractStore):
         await self.writer.write_single_item_to_json(item_type="creators", item=creator)
 
 
+class ZhihuJsonlStoreImplement(ZhihuJsonStoreImplement):
+    """JSONL 存储：复用 JSON 存储逻辑，逐行缓冲追加写入"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.writer = AsyncFileWriter(platform="zhihu", crawler_type=crawler_type_var.get(), json_lines=True)
+
+
 class ZhihuSqliteStoreImplement(ZhihuDbStoreImplement):
     """
     Zhihu content SQLite storage implementation
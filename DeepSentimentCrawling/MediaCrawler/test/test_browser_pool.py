@@ -0,0 +1,127 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+# -*- coding: utf-8 -*-
+# @Desc    : BrowserPool 复用与回收测试（假浏览器对象，不启动 Chromium）
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+from tools.browser_pool import BrowserPool
+
+
+class _FakePage:
+    heap_bytes = 0
+
+    def is_closed(self):
+        return False
+
+    async def evaluate(self, expression):
+        return self.heap_bytes
+
+
+class _FakeContext:
+    def __init__(self):
+        self.closed = False
+        self.init_scripts = 0
+
+    async def add_init_script(self, script=None, path=None):
+        self.init_scripts += 1
+
+    async def new_page(self):
+        return _FakePage()
+
+    async def close(self):
+        self.closed = True
+
+
+class _FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+        self.closed = False
+
+    def is_connected(self):
+        return not self.closed
+
+    async def new_context(self, **kwargs):
+        self.contexts.append(_FakeContext())
+        return self.contexts[-1]
+
+    async def close(self):
+        self.closed = True
+
+
+class _FakeBrowserPool(BrowserPool):
+    def __init__(self):
+        super().__init__()
+        self.launched = []
+
+    async def _launch(self, proxy):
+        self.launched.append(_FakeBrowser())
+        return self.launched[-1]
+
+    def _stealth(self):
+        return ""
+
+
+class TestBrowserPool(IsolatedAsyncioTestCase):
+
+    async def test_reuse_same_cookie(self):
+        pool = _FakeBrowserPool()
+        lease = await pool.acquire("xhs", "a=1", "ua")
+        self.assertFalse(lease.warm)
+        await pool.release(lease)
+
+        again = await pool.acquire("xhs", "a=1", "ua")
+        self.assertIs(again, lease)
+        self.assertTrue(again.warm)
+        self.assertEqual(again.context.init_scripts, 1)
+
+        # 不同 cookie / 平台使用新的上下文，共用同一个浏览器进程
+        other = await pool.acquire("xhs", "a=2", "ua")
+        self.assertIsNot(other.context, lease.context)
+        self.assertEqual(len(pool.launched), 1)
+        self.assertEqual(pool.stats["warm"], 1)
+        self.assertEqual(pool.stats["cold"], 2)
+
+    async def test_recycle_on_failure_uses_and_heap(self):
+        pool = _FakeBrowserPool()
+
+        lease = await pool.acquire("dy", "a=1", "ua")
+        await pool.release(lease, discard=True)
+        self.assertTrue(lease.context.closed)
+
+        with patch("config.BROWSER_POOL_MAX_USES", 2):
+            lease = await pool.acquire("dy", "a=1", "ua")
+            await pool.release(lease)
+            self.assertIs(await pool.acquire("dy", "a=1", "ua"), lease)
+            await pool.release(lease)
+            self.assertTrue(lease.context.closed)
+
+        lease = await pool.acquire("dy", "a=1", "ua")
+        lease.page.heap_bytes = 1024 ** 4
+        await pool.release(lease)
+        self.assertTrue(lease.context.closed)
+        self.assertEqual(pool.stats["recycled"], 3)
+
+    async def test_browser_retired_after_max_contexts(self):
+        pool = _FakeBrowserPool()
+        with patch("config.BROWSER_POOL_BROWSER_MAX_CONTEXTS", 2):
+            first = await pool.acquire("wb", "a=1", "ua")
+            second = await pool.acquire("wb", "a=2", "ua")
+            third = await pool.acquire("wb", "a=3", "ua")
+            self.assertEqual(len(pool.launched), 2)
+            self.assertIs(third.slot.browser, pool.launched[1])
+
+            # 退役浏览器在最后一个上下文归还后关闭
+            await pool.release(first, discard=True)
+            self.assertFalse(pool.launched[0].closed)
+            await pool.release(second, discard=True)
+            self.assertTrue(pool.launched[0].closed)
+            self.assertFalse(pool.launched[1].closed)
@@ -0,0 +1,78 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+# -*- coding: utf-8 -*-
+# @Desc    : HttpClientPool 连接复用测试（本地 HTTP 服务，不依赖外网）
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import IsolatedAsyncioTestCase
+
+from tools.http_client import HttpClientPool
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{"ok": 1}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Set-Cookie", "server_side=1; Path=/")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestHttpClientPool(IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    async def test_connection_reused_across_requests(self):
+        pool = HttpClientPool(platform="test")
+        for _ in range(5):
+            response = await pool.request("GET", f"{self.base_url}/api", timeout=5)
+            self.assertEqual(response.json(), {"ok": 1})
+        self.assertEqual(pool.stats.requests, 5)
+        self.assertEqual(pool.stats.new_connections, 1)
+        self.assertAlmostEqual(pool.stats.reuse_ratio, 0.8)
+        await pool.aclose()
+
+    async def test_same_client_per_proxy_key(self):
+        pool = HttpClientPool(platform="test")
+        self.assertIs(pool.get_client(None), pool.get_client(None))
+        self.assertIsNot(pool.get_client(None), pool.get_client(None, follow_redirects=True))
+        await pool.aclose()
+
+    async def test_response_cookies_not_persisted(self):
+        pool = HttpClientPool(platform="test")
+        await pool.request("GET", f"{self.base_url}/api", timeout=5)
+        self.assertEqual(len(pool.get_client(None).cookies), 0)
+        await pool.aclose()
+
+    async def test_stats_hook_called_on_close(self):
+        pool = HttpClientPool(platform="test")
+        reported = []
+        pool.add_stats_hook(lambda platform, stats: reported.append((platform, stats)))
+        await pool.request("GET", f"{self.base_url}/api", timeout=5)
+        await pool.aclose()
+        self.assertEqual(len(reported), 1)
+        self.assertEqual(reported[0][0], "test")
+        self.assertEqual(reported[0][1]["requests"], 1)
@@ -0,0 +1,85 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+# -*- coding: utf-8 -*-
+# @Desc    : 常驻 node 签名服务测试
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+from tools.js_signer import JsSigner, JsSignError
+
+_TEST_JS = """
+const prefix = 'sig_';
+function echo_sign(a, b) { return prefix + a + '|' + b; }
+function boom() { throw new Error('bad input'); }
+function hang() { while (true) {} }
+"""
+
+
+@unittest.skipUnless(shutil.which("node") or shutil.which("nodejs"), "node runtime not installed")
+class TestJsSigner(IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        fd, self.script_path = tempfile.mkstemp(suffix=".js")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(_TEST_JS)
+        self.signer = JsSigner(self.script_path, pool_size=2)
+
+    async def asyncTearDown(self):
+        await self.signer.close()
+        os.remove(self.script_path)
+
+    async def test_call(self):
+        self.assertEqual(await self.signer.call("echo_sign", "x", 1), "sig_x|1")
+
+    async def test_concurrent_calls_are_batched_and_ordered(self):
+        results = await asyncio.gather(*(self.signer.call("echo_sign", i, i * 2) for i in range(100)))
+        self.assertEqual(results, [f"sig_{i}|{i * 2}" for i in range(100)])
+
+    async def test_js_error_raises_without_breaking_batch(self):
+        ok, bad = await asyncio.gather(
+            self.signer.call("echo_sign", "a", "b"),
+            self.signer.call("boom"),
+            return_exceptions=True,
+        )
+        self.assertEqual(ok, "sig_a|b")
+        self.assertIsInstance(bad, JsSignError)
+        self.assertEqual(await self.signer.call("echo_sign", "c", "d"), "sig_c|d")
+
+    async def test_loop_change_kills_old_runtimes(self):
+        await self.signer.call("echo_sign", "x", 1)
+        old_procs = [r._proc for r in self.signer._runtimes if r._proc is not None]
+        self.assertTrue(old_procs)
+
+        self.signer._loop = object()  # 模拟事件循环已更换
+        self.assertEqual(await self.signer.call("echo_sign", "y", 2), "sig_y|2")
+        for proc in old_procs:
+            await asyncio.wait_for(proc.wait(), timeout=5)
+            self.assertIsNotNone(proc.returncode)
+
+    async def test_hung_runtime_is_killed_and_falls_back_to_execjs(self):
+        signer = JsSigner(self.script_path, pool_size=1, timeout=0.5)
+        try:
+            await signer.call("echo_sign", "x", 1)
+            hung_proc = signer._runtimes[0]._proc
+            with patch.object(signer, "_call_execjs", return_value="execjs_sign") as fallback:
+                self.assertEqual(await signer.call("hang"), "execjs_sign")
+            fallback.assert_called_once_with("hang", ())
+            await asyncio.wait_for(hung_proc.wait(), timeout=5)
+            self.assertIsNotNone(hung_proc.returncode)
+            # 下一批次重新拉起 node 进程
+            self.assertEqual(await signer.call("echo_sign", "y", 2), "sig_y|2")
+        finally:
+            await signer.close()
@@ -0,0 +1,91 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+# -*- coding: utf-8 -*-
+# @Desc    : JSONL 存储模式测试
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+import config
+from tools import async_file_writer
+from tools.async_file_writer import AsyncFileWriter, compact_jsonl_to_json, flush_jsonl_writers
+
+
+class TestJsonlWriter(IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.old_cwd = os.getcwd()
+        os.chdir(self.work_dir)
+        self._saved = (config.JSONL_BUFFER_SIZE, config.JSONL_FLUSH_INTERVAL, config.JSONL_FSYNC_POLICY)
+        config.JSONL_BUFFER_SIZE = 10
+        config.JSONL_FLUSH_INTERVAL = 0
+        config.JSONL_FSYNC_POLICY = "never"
+
+    def tearDown(self):
+        config.JSONL_BUFFER_SIZE, config.JSONL_FLUSH_INTERVAL, config.JSONL_FSYNC_POLICY = self._saved
+        async_file_writer._jsonl_sinks.clear()
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.work_dir)
+
+    async def test_buffered_append_across_writers(self):
+        items = [{"comment_id": str(i), "content": f"评论{i}"} for i in range(25)]
+        for item in items:
+            # store 实例按条创建，每条都是新的 writer
+            writer = AsyncFileWriter(platform="xhs", crawler_type="search", json_lines=True)
+            await writer.write_single_item_to_json(item, "comments")
+
+        file_path = writer._get_file_path("jsonl", "comments")
+        with open(file_path, encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 20)
+
+        await flush_jsonl_writers()
+        with open(file_path, encoding="utf-8") as f:
+            self.assertEqual([json.loads(line) for line in f], items)
+
+    async def test_compact_matches_json_mode_format(self):
+        items = [{"id": 1, "tags": ["a", "b"]}, {"id": 2, "nested": {"k": "值"}}]
+        writer = AsyncFileWriter(platform="dy", crawler_type="search", json_lines=True)
+        for item in items:
+            await writer.write_to_jsonl(item, "contents")
+        await flush_jsonl_writers()
+
+        jsonl_path = writer._get_file_path("jsonl", "contents")
+        with open(jsonl_path, "a", encoding="utf-8") as f:
+            f.write('{"id": 3, "trunc')  # 进程中断残留的半行
+        self.assertEqual(compact_jsonl_to_json(jsonl_path), 2)
+
+        json_path = writer._get_file_path("json", "contents")
+        with open(json_path, encoding="utf-8") as f:
+            self.assertEqual(f.read(), json.dumps(items, ensure_ascii=False, indent=4))
+
+    async def test_failed_timed_flush_keeps_lines(self):
+        config.JSONL_FLUSH_INTERVAL = 0.01
+        writer = AsyncFileWriter(platform="wb", crawler_type="search", json_lines=True)
+        sink_path = writer._get_file_path("jsonl", "comments")
+        failing = patch.object(
+            async_file_writer._JsonlSink, "_append_lines", side_effect=OSError("disk full")
+        )
+        with failing:
+            await writer.write_to_jsonl({"id": 1}, "comments")
+            sink = async_file_writer._jsonl_sinks[sink_path]
+            await asyncio.sleep(0.05)
+            # 定时落盘失败：异常已记录，数据留在缓冲
+            self.assertIsNone(sink._flush_task)
+        self.assertEqual(len(sink._lines), 1)
+
+        await flush_jsonl_writers()
+        with open(sink_path, encoding="utf-8") as f:
+            self.assertEqual([json.loads(line) for line in f], [{"id": 1}])
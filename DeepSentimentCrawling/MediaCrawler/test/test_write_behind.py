@@ -0,0 +1,147 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+# -*- coding: utf-8 -*-
+# @Desc    : DB 写后缓冲测试（临时 sqlite 库）
+import asyncio
+import os
+import tempfile
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import config
+from database import db_session
+from database.models import Base, BilibiliVideo, TiebaComment
+from database.write_behind import (
+    WriteBehindBuffer,
+    db_upsert,
+    flush_write_buffer,
+    new_write_buffer,
+)
+from var import write_buffer_var
+
+
+class TestWriteBehindBuffer(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        fd, self.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        self.engine = create_async_engine(f"sqlite+aiosqlite:///{self.db_path}")
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        self._saved_option = config.SAVE_DATA_OPTION
+        self._saved_engine = db_session._engines.get("sqlite")
+        config.SAVE_DATA_OPTION = "sqlite"
+        db_session._engines["sqlite"] = self.engine
+
+    async def asyncTearDown(self):
+        config.SAVE_DATA_OPTION = self._saved_option
+        if self._saved_engine is None:
+            db_session._engines.pop("sqlite", None)
+        else:
+            db_session._engines["sqlite"] = self._saved_engine
+        await self.engine.dispose()
+        os.remove(self.db_path)
+
+    async def _rows(self, model):
+        async with db_session.get_session() as session:
+            return (await session.execute(select(model).order_by(model.id))).scalars().all()
+
+    async def test_select_then_write_batches_and_updates(self):
+        buffer = WriteBehindBuffer(flush_size=1000, flush_interval=0)
+        for i in range(50):
+            await buffer.upsert(TiebaComment, ("comment_id",), {"comment_id": str(i), "content": "v1"})
+        await buffer.flush()
+        # 一次 SELECT + 一次批量 INSERT
+        self.assertEqual(buffer.stats["statements"], 2)
+
+        await buffer.upsert(TiebaComment, ("comment_id",), {"comment_id": "1", "content": "v2"})
+        await buffer.upsert(TiebaComment, ("comment_id",), {"comment_id": "1", "content": "v3"})
+        await buffer.upsert(TiebaComment, ("comment_id",), {"comment_id": "new", "content": "n"})
+        await buffer.upsert(TiebaComment, ("comment_id",), {"comment_id": "skip", "content": "x"}, insertable=False)
+        await buffer.flush()
+
+        rows = await self._rows(TiebaComment)
+        self.assertEqual(len(rows), 51)
+        by_id = {r.comment_id: r.content for r in rows}
+        self.assertEqual(by_id["1"], "v3")
+        self.assertEqual(by_id["new"], "n")
+        self.assertNotIn("skip", by_id)
+
+    async def test_update_columns_keep_insert_only_fields(self):
+        buffer = WriteBehindBuffer(flush_size=1000, flush_interval=0)
+        row = {"video_id": 1, "video_url": "u", "title": "t1", "add_ts": 100}
+        await buffer.upsert(BilibiliVideo, ("video_id",), row, update_columns=["video_url", "title"])
+        await buffer.flush()
+        row = {"video_id": 1, "video_url": "u", "title": "t2", "add_ts": 200}
+        await buffer.upsert(BilibiliVideo, ("video_id",), row, update_columns=["video_url", "title"])
+        await buffer.flush()
+
+        rows = await self._rows(BilibiliVideo)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0].title, "t2")
+        self.assertEqual(rows[0].add_ts, 100)
+        # video_id 有唯一约束，走原生 upsert：每次落库一条语句
+        self.assertEqual(buffer.stats["statements"], 2)
+
+    async def test_flush_size_triggers_flush(self):
+        buffer = WriteBehindBuffer(flush_size=10, flush_interval=0)
+        for i in range(25):
+            await buffer.upsert(TiebaComment, ("comment_id",), {"comment_id": str(i)})
+        self.assertEqual(buffer.stats["flushes"], 2)
+        self.assertEqual(len(await self._rows(TiebaComment)), 20)
+        await buffer.flush()
+        self.assertEqual(len(await self._rows(TiebaComment)), 25)
+
+    async def test_failed_flush_keeps_rows(self):
+        buffer = WriteBehindBuffer(flush_size=1000, flush_interval=0)
+        await buffer.upsert(TiebaComment, ("comment_id",), {"comment_id": "1", "content": "v1"})
+        await buffer.upsert(TiebaComment, ("comment_id",), {"comment_id": "2", "content": "v1"})
+        config.SAVE_DATA_OPTION = "json"  # 无数据库 session
+        with self.assertRaises(RuntimeError):
+            await buffer.flush()
+        config.SAVE_DATA_OPTION = "sqlite"
+
+        await buffer.upsert(TiebaComment, ("comment_id",), {"comment_id": "1", "content": "v2"})
+        with patch.object(buffer, "_flush_model", side_effect=OSError("db down")):
+            with self.assertRaises(OSError):
+                await buffer.flush()
+        self.assertEqual(buffer._count, 2)
+
+        await buffer.flush()
+        rows = await self._rows(TiebaComment)
+        self.assertEqual({r.comment_id: r.content for r in rows}, {"1": "v2", "2": "v1"})
+
+    async def test_flush_only_covers_current_task_buffer(self):
+        b_flushed = asyncio.Event()
+        buffers = {}
+
+        async def run_task(name, flush_first):
+            write_buffer_var.set(new_write_buffer())
+            buffers[name] = write_buffer_var.get()
+            await db_upsert(TiebaComment, ("comment_id",), {"comment_id": name})
+            if flush_first:
+                await flush_write_buffer()
+                b_flushed.set()
+            else:
+                await b_flushed.wait()
+
+        with patch.object(config, "ENABLE_DB_WRITE_BEHIND", True):
+            await asyncio.gather(run_task("a", False), run_task("b", True))
+
+        # 任务 b 的 flush 不落库任务 a 的行
+        self.assertEqual([r.comment_id for r in await self._rows(TiebaComment)], ["b"])
+        self.assertEqual(buffers["a"]._count, 1)
+        self.assertIsNone(write_buffer_var.get())
+        await buffers["a"].flush()
+        self.assertEqual(len(await self._rows(TiebaComment)), 2)
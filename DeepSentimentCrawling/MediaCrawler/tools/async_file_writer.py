@@ -3,17 +3,153 @@ import csv
 import json
 import os
 import pathlib
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional
 import aiofiles
 import config
 from tools.utils import utils
 from tools.words import AsyncWordCloudGenerator
 
+
+class _JsonlSink:
+    """
+    单个 JSONL 文件的缓冲追加写入
+
+    store 实例按条创建，缓冲必须按文件路径在进程内共享；
+    达到 JSONL_BUFFER_SIZE 条或等待超过 JSONL_FLUSH_INTERVAL 秒时一次性追加落盘
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._lines: List[str] = []
+        self._lock: Optional[asyncio.Lock] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional[asyncio.Task] = None  # 定时落盘任务，持有引用防止被回收
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _bind_loop(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self._timer = None
+            self._flush_task = None
+
+    async def append(self, item: Dict):
+        self._bind_loop()
+        self._lines.append(json.dumps(item, ensure_ascii=False) + "\n")
+        if config.JSONL_FSYNC_POLICY == "always" or len(self._lines) >= config.JSONL_BUFFER_SIZE:
+            await self.flush()
+        elif self._timer is None and config.JSONL_FLUSH_INTERVAL > 0:
+            self._timer = self._loop.call_later(config.JSONL_FLUSH_INTERVAL, self._on_timer)
+
+    def _on_timer(self):
+        self._timer = None
+        self._flush_task = self._loop.create_task(self.flush())
+        self._flush_task.add_done_callback(self._on_flushed)
+
+    def _on_flushed(self, task: asyncio.Task):
+        if self._flush_task is task:
+            self._flush_task = None
+        if not task.cancelled() and task.exception() is not None:
+            utils.logger.error(
+                f"[_JsonlSink] timed flush of {self.file_path} failed, "
+                f"{len(self._lines)} lines kept for retry: {task.exception()}"
+            )
+
+    async def flush(self):
+        if self._lock is None:
+            return
+        async with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            lines, self._lines = self._lines, []
+            if not lines:
+                return
+            try:
+                await asyncio.to_thread(self._append_lines, "".join(lines))
+            except Exception:
+                # 写入失败时放回缓冲，下次落盘重试
+                self._lines = lines + self._lines
+                raise
+
+    def _append_lines(self, data: str):
+        with open(self.file_path, "a", encoding="utf-8") as f:
+            f.write(data)
+            if config.JSONL_FSYNC_POLICY in ("batch", "always"):
+                f.flush()
+                os.fsync(f.fileno())
+
+
+_jsonl_sinks: Dict[str, _JsonlSink] = {}
+
+
+def iter_jsonl(file_path: str) -> Iterator[Dict]:
+    """逐行读取 JSONL 文件，跳过进程中断时可能残留的不完整行"""
+    with open(file_path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                utils.logger.warning(f"[iter_jsonl] skip broken line {line_no} in {file_path}")
+
+
+def compact_jsonl_to_json(jsonl_path: str, json_path: Optional[str] = None) -> int:
+    """
+    将 JSONL 文件离线转换为 JSON 数组文件（格式与 json 存储模式一致），流式处理不占用整份内存
+
+    Args:
+        jsonl_path: JSONL 文件路径，如 data/xhs/jsonl/search_comments_2025-01-01.jsonl
+        json_path: 输出路径，默认写到同级 json 目录下的同名 .json 文件
+
+    Returns:
+        写入的记录数
+    """
+    if json_path is None:
+        src = pathlib.Path(jsonl_path)
+        json_dir = src.parent.parent / "json"
+        json_dir.mkdir(parents=True, exist_ok=True)
+        json_path = str(json_dir / f"{src.stem}.json")
+
+    count = 0
+    tmp_path = f"{json_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as out:
+        out.write("[")
+        for item in iter_jsonl(jsonl_path):
+            body = json.dumps(item, ensure_ascii=False, indent=4).replace("\n", "\n    ")
+            out.write(("," if count else "") + "\n    " + body)
+            count += 1
+        out.write("\n]" if count else "]")
+    os.replace(tmp_path, json_path)
+    return count
+
+
+async def flush_jsonl_writers():
+    """将所有 JSONL 缓冲落盘（crawler 结束时调用），按配置压缩为 JSON 数组"""
+    for sink in list(_jsonl_sinks.values()):
+        await sink.flush()
+    if config.JSONL_COMPACT_ON_FINISH:
+        for file_path in list(_jsonl_sinks):
+            if os.path.exists(file_path):
+                count = await asyncio.to_thread(compact_jsonl_to_json, file_path)
+                utils.logger.info(f"[flush_jsonl_writers] compacted {count} records from {file_path}")
+
+
 class AsyncFileWriter:
-    def __init__(self, platform: str, crawler_type: str):
+    def __init__(self, platform: str, crawler_type: str, json_lines: bool = False):
+        """
+        Args:
+            platform: 平台名
+            crawler_type: 爬取类型
+            json_lines: 为 True 时 write_single_item_to_json 以 JSONL 追加写入 data/<platform>/jsonl/
+        """
         self.lock = asyncio.Lock()
         self.platform = platform
         self.crawler_type = crawler_type
+        self.json_lines = json_lines
         self.wordcloud_generator = AsyncWordCloudGenerator() if config.ENABLE_GET_WORDCLOUD else None
 
     def _get_file_path(self, file_type: str, item_type: str) -> str:
@@ -32,7 +168,17 @@ class AsyncFileWriter:
                     await writer.writeheader()
                 await writer.writerow(item)
 
+    async def write_to_jsonl(self, item: Dict, item_type: str):
+        file_path = self._get_file_path('jsonl', item_type)
+        sink = _jsonl_sinks.get(file_path)
+        if sink is None:
+            sink = _jsonl_sinks[file_path] = _JsonlSink(file_path)
+        await sink.append(item)
+
     async def write_single_item_to_json(self, item: Dict, item_type: str):
+        if self.json_lines:
+            await self.write_to_jsonl(item, item_type)
+            return
         file_path = self._get_file_path('json', item_type)
         async with self.lock:
             existing_data = []
@@ -65,20 +211,23 @@ class AsyncFileWriter:
 
         try:
             # Read comments from JSON file
-            comments_file_path = self._get_file_path('json', 'comments')
+            comments_file_path = self._get_file_path('jsonl' if self.json_lines else 'json', 'comments')
             if not os.path.exists(comments_file_path) or os.path.getsize(comments_file_path) == 0:
                 utils.logger.info(f"[AsyncFileWriter.generate_wordcloud_from_comments] No comments file found at {comments_file_path}")
                 return
 
-            async with aiofiles.open(comments_file_path, 'r', encoding='utf-8') as f:
-                content = await f.read()
-                if not content:
-                    utils.logger.info(f"[AsyncFileWriter.generate_wordcloud_from_comments] Comments file is empty")
-                    return
+            if self.json_lines:
+                comments_data = await asyncio.to_thread(lambda: list(iter_jsonl(comments_file_path)))
+            else:
+                async with aiofiles.open(comments_file_path, 'r', encoding='utf-8') as f:
+                    content = await f.read()
+                    if not content:
+                        utils.logger.info(f"[AsyncFileWriter.generate_wordcloud_from_comments] Comments file is empty")
+                        return
 
-                comments_data = json.loads(content)
-                if not isinstance(comments_data, list):
-                    comments_data = [comments_data]
+                    comments_data = json.loads(content)
+                    if not isinstance(comments_data, list):
+                        comments_data = [comments_data]
 
             # Filter comments data to only include 'content' field
             # Handle different comment data structures across platforms
@@ -104,4 +253,11 @@ class AsyncFileWriter:
             utils.logger.info(f"[AsyncFileWriter.generate_wordcloud_from_comments] Wordcloud generated successfully at {words_file_prefix}")
 
         except Exception as e:
-            utils.logger.error(f"[AsyncFileWriter.generate_wordcloud_from_comments] Error generating wordcloud: {e}")
\ No newline at end of file
+            utils.logger.error(f"[AsyncFileWriter.generate_wordcloud_from_comments] Error generating wordcloud: {e}")
+
+if __name__ == "__main__":
+    # 离线压缩：python -m tools.async_file_writer data/xhs/jsonl/search_comments_2025-01-01.jsonl [...]
+    import sys
+
+    for path in sys.argv[1:]:
+        print(f"{path}: {compact_jsonl_to_json(path)} records")
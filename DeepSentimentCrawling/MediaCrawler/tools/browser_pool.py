@@ -0,0 +1,261 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+跨任务复用的浏览器池
+
+每个爬取任务都新建 crawler，start() 中启动 Chromium、注入 stealth.min.js、写入 cookie
+并打开首页，第一个 API 请求之前就要花掉数秒和数百 MB 内存。BrowserPool 持有常驻的
+Playwright 与 Chromium 进程，按 (平台, cookie, UA, 代理) 缓存已注入 stealth 的浏览器上下文:
+
+- acquire 优先取同键的空闲上下文（warm：cookie 已写入、首页已打开，crawler 跳过预热），
+  没有则在当前浏览器上新建上下文
+- release 归还上下文；任务失败、服务满 BROWSER_POOL_MAX_USES 个任务或页面 JS 堆
+  超过 BROWSER_POOL_MAX_HEAP_MB 时关闭该上下文
+- 单个浏览器累计创建 BROWSER_POOL_BROWSER_MAX_CONTEXTS 个上下文后退役，
+  其最后一个上下文关闭时结束浏览器进程
+
+crawler 通过 var.browser_pool_var 取得当前任务的浏览器池（AbstractCrawler.lease_pooled_browser），
+未设置时仍按原方式自行启动浏览器。
+"""
+
+import asyncio
+import hashlib
+import os
+import time
+from typing import Dict, List, Optional
+
+from playwright.async_api import Browser, BrowserContext, Page, Playwright, async_playwright
+
+import config
+from tools import utils
+
+
+class _BrowserSlot:
+    """一个 Chromium 进程及其上下文计数"""
+
+    def __init__(self, browser: Browser) -> None:
+        self.browser = browser
+        self.open_contexts = 0
+        self.created_contexts = 0
+
+    @property
+    def retired(self) -> bool:
+        return (
+            self.created_contexts >= config.BROWSER_POOL_BROWSER_MAX_CONTEXTS
+            or not self.browser.is_connected()
+        )
+
+
+class BrowserLease:
+    """租用中的浏览器上下文，任务结束后交还 BrowserPool.release"""
+
+    def __init__(self, key: str, slot: _BrowserSlot, context: BrowserContext, page: Page) -> None:
+        self.key = key
+        self.slot = slot
+        self.context = context
+        self.page = page
+        self.uses = 0  # 已服务完的任务数
+        self.idle_since = 0.0
+
+    @property
+    def warm(self) -> bool:
+        """是否已服务过任务（cookie 已写入、首页已打开）"""
+        return self.uses > 0
+
+
+class BrowserPool:
+    """常驻 Chromium + 按平台/cookie 复用的浏览器上下文"""
+
+    def __init__(self, headless: bool = True) -> None:
+        self.headless = headless
+        self._playwright: Optional[Playwright] = None
+        self._browsers: Dict[str, _BrowserSlot] = {}  # 代理 server -> 分配新上下文的浏览器
+        self._idle: Dict[str, List[BrowserLease]] = {}
+        self._lock = asyncio.Lock()
+        self._stealth_script: Optional[str] = None
+        self.stats = {"warm": 0, "cold": 0, "recycled": 0}
+
+    @staticmethod
+    def lease_key(
+        platform: str, cookies: str, user_agent: Optional[str], proxy: Optional[Dict]
+    ) -> str:
+        raw = "|".join([cookies or "", user_agent or "", (proxy or {}).get("server", "")])
+        return f"{platform}:{hashlib.sha1(raw.encode()).hexdigest()[:12]}"
+
+    async def acquire(
+        self,
+        platform: str,
+        cookies: str,
+        user_agent: Optional[str] = None,
+        proxy: Optional[Dict] = None,
+    ) -> BrowserLease:
+        """租用浏览器上下文，同键有空闲上下文时直接复用"""
+        key = self.lease_key(platform, cookies, user_agent, proxy)
+        async with self._lock:
+            await self._evict_idle()
+            idle = self._idle.get(key)
+            while idle:
+                lease = idle.pop()
+                if lease.slot.browser.is_connected() and not lease.page.is_closed():
+                    self.stats["warm"] += 1
+                    return lease
+                await self._close_lease(lease)
+            slot = await self._browser(proxy)
+            slot.open_contexts += 1
+            slot.created_contexts += 1
+
+        try:
+            context = await slot.browser.new_context(
+                viewport={"width": 1920, "height": 1080}, user_agent=user_agent
+            )
+            # stealth.min.js is a js script to prevent the website from detecting the crawler.
+            await context.add_init_script(script=self._stealth())
+            page = await context.new_page()
+        except Exception:
+            await self._release_slot(slot)
+            raise
+        self.stats["cold"] += 1
+        return BrowserLease(key, slot, context, page)
+
+    async def release(self, lease: BrowserLease, discard: bool = False) -> None:
+        """归还上下文，满足回收条件时关闭"""
+        lease.uses += 1
+        reason = ""
+        if discard:
+            reason = "任务失败"
+        elif lease.uses >= config.BROWSER_POOL_MAX_USES:
+            reason = f"已服务 {lease.uses} 个任务"
+        elif not lease.slot.browser.is_connected() or lease.page.is_closed():
+            reason = "浏览器已断开"
+        else:
+            heap_mb = await self._heap_mb(lease.page)
+            if heap_mb > config.BROWSER_POOL_MAX_HEAP_MB:
+                reason = f"JS 堆 {heap_mb:.0f}MB"
+
+        if reason:
+            utils.logger.info(f"[BrowserPool] 回收浏览器上下文 {lease.key}: {reason}")
+            self.stats["recycled"] += 1
+            await self._close_lease(lease)
+            return
+
+        lease.idle_since = time.monotonic()
+        async with self._lock:
+            self._idle.setdefault(lease.key, []).append(lease)
+            await self._evict_idle()
+
+    async def close(self) -> None:
+        """关闭所有上下文、浏览器与 Playwright"""
+        async with self._lock:
+            for leases in self._idle.values():
+                for lease in leases:
+                    await self._close_lease(lease)
+            self._idle.clear()
+            for slot in self._browsers.values():
+                await self._close_browser(slot)
+            self._browsers.clear()
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+    def snapshot(self) -> Dict:
+        return {
+            "browsers": len(self._browsers),
+            "idle_contexts": sum(len(v) for v in self._idle.values()),
+            **self.stats,
+        }
+
+    # ==================== 内部 ====================
+
+    async def _launch(self, proxy: Optional[Dict]) -> Browser:
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        return await self._playwright.chromium.launch(headless=self.headless, proxy=proxy)  # type: ignore
+
+    async def _browser(self, proxy: Optional[Dict]) -> _BrowserSlot:
+        """当前用于新建上下文的浏览器，退役后换新进程"""
+        server = (proxy or {}).get("server", "")
+        slot = self._browsers.get(server)
+        if slot is None or slot.retired:
+            if slot is not None and slot.open_contexts == 0:
+                await self._close_browser(slot)
+            slot = _BrowserSlot(await self._launch(proxy))
+            self._browsers[server] = slot
+            utils.logger.info(f"[BrowserPool] 启动浏览器 (proxy={server or 'none'})")
+        return slot
+
+    async def _evict_idle(self) -> None:
+        """关闭超过 BROWSER_POOL_IDLE_TTL 或超出 BROWSER_POOL_MAX_IDLE 的空闲上下文"""
+        now = time.monotonic()
+        idle = sorted(
+            (lease for leases in self._idle.values() for lease in leases),
+            key=lambda lease: lease.idle_since,
+        )
+        excess = len(idle) - config.BROWSER_POOL_MAX_IDLE
+        for i, lease in enumerate(idle):
+            if i < excess or now - lease.idle_since > config.BROWSER_POOL_IDLE_TTL:
+                self._idle[lease.key].remove(lease)
+                await self._close_lease(lease)
+
+    async def _close_lease(self, lease: BrowserLease) -> None:
+        try:
+            await lease.context.close()
+        except Exception as e:
+            utils.logger.debug(f"[BrowserPool] 关闭上下文失败（可忽略）: {e}")
+        await self._release_slot(lease.slot)
+
+    async def _release_slot(self, slot: _BrowserSlot) -> None:
+        slot.open_contexts -= 1
+        if slot.retired and slot.open_contexts == 0:
+            await self._close_browser(slot)
+            for server, current in list(self._browsers.items()):
+                if current is slot:
+                    del self._browsers[server]
+
+    @staticmethod
+    async def _close_browser(slot: _BrowserSlot) -> None:
+        try:
+            await slot.browser.close()
+        except Exception as e:
+            utils.logger.debug(f"[BrowserPool] 关闭浏览器失败（可忽略）: {e}")
+
+    @staticmethod
+    async def _heap_mb(page: Page) -> float:
+        try:
+            used = await page.evaluate(
+                "() => performance.memory ? performance.memory.usedJSHeapSize : 0"
+            )
+        except Exception:
+            return 0.0
+        return used / 1024 / 1024
+
+    def _stealth(self) -> str:
+        if self._stealth_script is None:
+            with open(os.path.join(config.LIBS_DIR, "stealth.min.js"), encoding="utf-8") as f:
+                self._stealth_script = f.read()
+        return self._stealth_script
+
+
+_pool: Optional[BrowserPool] = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """进程内共享的浏览器池"""
+    global _pool
+    if _pool is None:
+        _pool = BrowserPool(headless=config.HEADLESS)
+    return _pool
+
+
+async def close_browser_pool() -> None:
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
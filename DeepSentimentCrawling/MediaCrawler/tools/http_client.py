@@ -0,0 +1,178 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+按爬虫实例共享的 httpx 连接池
+
+各平台 client 之前每次 request() 都新建 httpx.AsyncClient，搜索/评论/子评论
+每一页都要重新做 TCP + TLS 握手。HttpClientPool 按 (proxy, follow_redirects)
+缓存长连接 client，生命周期由 crawler 管理（start 结束 / close 时 aclose），
+并通过 httpcore 的 trace 扩展统计连接复用率与握手耗时。
+"""
+
+import time
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+import config
+from tools import utils
+
+_ClientKey = Tuple[Optional[str], bool]
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _no_cookie_jar() -> CookieJar:
+    """
+    不接收也不回写任何 Set-Cookie 的 cookie jar
+
+    各平台 client 通过 headers["Cookie"] 显式携带登录态，共享 client 若保留响应
+    写回的 cookie 会与显式 Cookie 头混在一起，因此禁用 client 级 cookie 持久化。
+    """
+    return CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+
+class HttpClientStats:
+    """单个连接池的请求/建连统计"""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.new_connections = 0
+        self.handshake_seconds = 0.0
+
+    @property
+    def reused_requests(self) -> int:
+        return max(self.requests - self.new_connections, 0)
+
+    @property
+    def reuse_ratio(self) -> float:
+        if not self.requests:
+            return 0.0
+        return self.reused_requests / self.requests
+
+    @property
+    def avg_handshake_ms(self) -> float:
+        if not self.new_connections:
+            return 0.0
+        return self.handshake_seconds * 1000 / self.new_connections
+
+    def to_dict(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reuse_ratio": round(self.reuse_ratio, 4),
+            "avg_handshake_ms": round(self.avg_handshake_ms, 2),
+        }
+
+
+class _HandshakeTracer:
+    """
+    httpcore trace 回调：识别本次请求是否新建了连接，并记录握手耗时
+
+    新建连接时 httpcore 会依次触发 connection.connect_tcp.* 与（HTTPS）
+    connection.start_tls.* 事件；复用连接时这些事件都不会出现。
+    """
+
+    def __init__(self) -> None:
+        self.connected = False
+        self._started: Optional[float] = None
+        self.handshake_seconds = 0.0
+
+    async def __call__(self, event_name: str, info: Dict) -> None:
+        if event_name == "connection.connect_tcp.started":
+            self.connected = True
+            self._started = time.perf_counter()
+        elif event_name in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+            if self._started is not None:
+                self.handshake_seconds = time.perf_counter() - self._started
+
+
+class HttpClientPool:
+    """
+    按 proxy 复用的 httpx.AsyncClient 集合
+
+    Args:
+        platform: 平台标识，仅用于日志与统计
+    """
+
+    def __init__(self, platform: str = "") -> None:
+        self.platform = platform
+        self.stats = HttpClientStats()
+        self._clients: Dict[_ClientKey, httpx.AsyncClient] = {}
+        self._stats_hooks: List[Callable[[str, Dict], None]] = []
+
+    def add_stats_hook(self, hook: Callable[[str, Dict], None]) -> None:
+        """注册统计回调，关闭连接池时以 (platform, stats_dict) 调用"""
+        self._stats_hooks.append(hook)
+
+    def get_client(self, proxy: Optional[str] = None, follow_redirects: bool = False) -> httpx.AsyncClient:
+        key = (proxy, follow_redirects)
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            limits = httpx.Limits(
+                max_connections=config.HTTP_POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=config.HTTP_POOL_MAX_KEEPALIVE,
+                keepalive_expiry=config.HTTP_POOL_KEEPALIVE_EXPIRY,
+            )
+            http2 = config.ENABLE_HTTP2 and _http2_available()
+            client = httpx.AsyncClient(
+                proxy=proxy,
+                follow_redirects=follow_redirects,
+                limits=limits,
+                http2=http2,
+                cookies=_no_cookie_jar(),
+            )
+            self._clients[key] = client
+        return client
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        proxy: Optional[str] = None,
+        follow_redirects: bool = False,
+        **kwargs,
+    ) -> httpx.Response:
+        client = self.get_client(proxy, follow_redirects)
+        tracer = _HandshakeTracer()
+        extensions = dict(kwargs.pop("extensions", None) or {})
+        extensions["trace"] = tracer
+        try:
+            return await client.request(method, url, extensions=extensions, **kwargs)
+        finally:
+            self.stats.requests += 1
+            if tracer.connected:
+                self.stats.new_connections += 1
+                self.stats.handshake_seconds += tracer.handshake_seconds
+
+    async def aclose(self) -> None:
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            if not client.is_closed:
+                await client.aclose()
+        if not self.stats.requests:
+            return
+        stats = self.stats.to_dict()
+        utils.logger.info(f"[HttpClientPool.aclose] platform={self.platform} stats={stats}")
+        for hook in self._stats_hooks:
+            try:
+                hook(self.platform, stats)
+            except Exception as e:
+                utils.logger.warning(f"[HttpClientPool.aclose] stats hook error: {e}")
@@ -0,0 +1,330 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+异步 JS 签名服务
+
+execjs 每次 call 都会同步拉起一个 node 进程并重新编译整份脚本（douyin.js 单次约 1s），
+在 async 请求路径里直接调用会阻塞整个事件循环。JsSigner 维护一组常驻的 node
+进程（脚本只加载一次），通过 stdin/stdout 逐行 JSON 通信：
+
+- 完全异步：签名请求不占用事件循环
+- 批量合并：同一时间窗口内到达的多个签名请求合并为一次 IPC 往返
+- 无 node 时回退到 execjs + 线程池，行为与原同步实现一致；node 进程退出或响应超时时，
+  该批签名同样回退到 execjs
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import shutil
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import config
+from tools import utils
+
+# node 端常驻脚本：加载签名 JS 后循环读取 {"id", "calls": [[fn, args], ...]}，
+# 逐个执行并返回 {"id", "results": [{"ok", "value"|"error"}, ...]}
+_NODE_BOOTSTRAP = r"""
+(() => {
+  const vm = require('vm');
+  const fs = require('fs');
+  const readline = require('readline');
+  const write = process.stdout.write.bind(process.stdout);
+  for (const k of ['log', 'info', 'warn', 'debug']) console[k] = console.error;
+  global.require = require;
+  const source = fs.readFileSync(process.argv[1], 'utf-8').replace(/^\uFEFF/, '');
+  vm.runInThisContext(source, {filename: process.argv[1]});
+  const rl = readline.createInterface({input: process.stdin});
+  rl.on('line', (line) => {
+    const req = JSON.parse(line);
+    const results = req.calls.map(([fn, args]) => {
+      try {
+        return {ok: true, value: vm.runInThisContext(fn).apply(null, args)};
+      } catch (e) {
+        return {ok: false, error: String((e && e.stack) || e)};
+      }
+    });
+    write(JSON.stringify({id: req.id, results: results}) + '\n');
+  });
+})();
+"""
+
+_Call = Tuple[str, Tuple[Any, ...]]
+
+
+class JsSignError(Exception):
+    """签名脚本执行失败"""
+
+
+class _NodeRuntimeError(JsSignError):
+    """node 进程本身不可用（退出 / 超时 / 响应错位），与脚本抛出的异常区分，可回退到 execjs"""
+
+
+class _NodeRuntime:
+    """单个常驻 node 进程，同一时刻只处理一个批次"""
+
+    def __init__(self, script_path: str, node_bin: str, timeout: float) -> None:
+        self.script_path = script_path
+        self.node_bin = node_bin
+        self.timeout = timeout
+        self._proc: Optional[asyncio.subprocess.Process] = None
+        self._ids = itertools.count(1)
+
+    async def _ensure_started(self) -> asyncio.subprocess.Process:
+        if self._proc is None or self._proc.returncode is not None:
+            self._proc = await asyncio.create_subprocess_exec(
+                self.node_bin,
+                "-e",
+                _NODE_BOOTSTRAP,
+                self.script_path,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+                limit=2 ** 24,
+            )
+        return self._proc
+
+    async def run_batch(self, calls: List[_Call]) -> List[Dict]:
+        proc = await self._ensure_started()
+        req_id = next(self._ids)
+        payload = {"id": req_id, "calls": [[fn, list(args)] for fn, args in calls]}
+        proc.stdin.write((json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8"))
+        await proc.stdin.drain()
+        try:
+            line = await asyncio.wait_for(proc.stdout.readline(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            # 脚本卡死时 node 不会再读取后续请求，只能结束进程，下一批次重新拉起
+            self.kill()
+            raise _NodeRuntimeError(
+                f"node 签名进程 {self.timeout}s 未响应: {os.path.basename(self.script_path)}"
+            )
+        if not line:
+            await self.close()
+            raise _NodeRuntimeError(f"node 签名进程已退出: {os.path.basename(self.script_path)}")
+        resp = json.loads(line)
+        if resp.get("id") != req_id:
+            await self.close()
+            raise _NodeRuntimeError("node 签名进程响应错位")
+        return resp["results"]
+
+    async def close(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None or proc.returncode is not None:
+            return
+        proc.stdin.close()
+        try:
+            await asyncio.wait_for(proc.wait(), timeout=2)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+
+    def kill(self) -> None:
+        """不经事件循环直接结束进程（所属事件循环已更换 / 关闭时使用）"""
+        proc, self._proc = self._proc, None
+        if proc is None or proc.returncode is not None:
+            return
+        try:
+            proc.kill()
+        except ProcessLookupError:
+            pass
+
+
+class JsSigner:
+    """
+    一份签名脚本对应一个 JsSigner，内部维护 pool_size 个常驻 node 进程
+
+    Args:
+        script_path: 签名 JS 文件路径（如 libs/douyin.js）
+        pool_size: 常驻 node 进程数
+        batch_window: 合并批次的等待窗口（秒）
+        max_batch_size: 单批次最大签名数
+        timeout: 单批次等待 node 响应的超时（秒）
+    """
+
+    def __init__(
+        self,
+        script_path: str,
+        pool_size: int = 2,
+        batch_window: float = 0.002,
+        max_batch_size: int = 32,
+        timeout: float = 10.0,
+    ) -> None:
+        self.script_path = script_path
+        self.pool_size = max(pool_size, 1)
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.timeout = timeout
+        self.node_bin = shutil.which("node") or shutil.which("nodejs")
+        self._pending: List[Tuple[_Call, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._idle: Optional[asyncio.Queue] = None
+        self._runtimes: List[_NodeRuntime] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._execjs_ctx = None
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        # 首次使用或事件循环已更换（旧循环上的子进程不可复用，直接结束）
+        for runtime in self._runtimes:
+            runtime.kill()
+        self._loop = loop
+        self._pending = []
+        self._flush_handle = None
+        self._runtimes = [
+            _NodeRuntime(self.script_path, self.node_bin, self.timeout)
+            for _ in range(self.pool_size)
+        ]
+        self._idle = asyncio.Queue()
+        for runtime in self._runtimes:
+            self._idle.put_nowait(runtime)
+
+    async def call(self, fn_name: str, *args: Any) -> Any:
+        """异步调用签名脚本中的全局函数"""
+        if not self.node_bin:
+            return await asyncio.to_thread(self._call_execjs, fn_name, args)
+
+        self._bind_loop()
+        future = self._loop.create_future()
+        self._pending.append(((fn_name, args), future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = self._loop.call_later(self.batch_window, self._flush)
+        try:
+            return await future
+        except _NodeRuntimeError as e:
+            utils.logger.warning(f"[JsSigner.call] {e}，{fn_name} 回退到 execjs")
+            return await asyncio.to_thread(self._call_execjs, fn_name, args)
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            self._loop.create_task(self._dispatch(batch))
+
+    async def _dispatch(self, batch: List[Tuple[_Call, asyncio.Future]]) -> None:
+        runtime = await self._idle.get()
+        try:
+            results = await runtime.run_batch([call for call, _ in batch])
+        except Exception as e:
+            error = e if isinstance(e, JsSignError) else _NodeRuntimeError(str(e))
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        finally:
+            self._idle.put_nowait(runtime)
+
+        for (call, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if result.get("ok"):
+                future.set_result(result.get("value"))
+            else:
+                future.set_exception(JsSignError(f"{call[0]} 执行失败: {result.get('error')}"))
+
+    def _call_execjs(self, fn_name: str, args: Tuple[Any, ...]) -> Any:
+        import execjs
+
+        if self._execjs_ctx is None:
+            with open(self.script_path, encoding="utf-8-sig") as f:
+                self._execjs_ctx = execjs.compile(f.read())
+        return self._execjs_ctx.call(fn_name, *args)
+
+    async def close(self) -> None:
+        runtimes, self._runtimes = self._runtimes, []
+        same_loop = self._loop is asyncio.get_running_loop()
+        self._loop = None
+        for runtime in runtimes:
+            if same_loop:
+                await runtime.close()
+            else:
+                runtime.kill()
+
+
+_signers: Dict[str, JsSigner] = {}
+
+
+def get_js_signer(script_name: str) -> JsSigner:
+    """
+    获取 libs 目录下指定签名脚本的共享 JsSigner
+
+    Args:
+        script_name: 脚本文件名，如 "douyin.js"
+    """
+    signer = _signers.get(script_name)
+    if signer is None:
+        signer = JsSigner(
+            os.path.join(config.LIBS_DIR, script_name),
+            pool_size=config.JS_SIGN_POOL_SIZE,
+            batch_window=config.JS_SIGN_BATCH_WINDOW_MS / 1000,
+            timeout=config.JS_SIGN_TIMEOUT,
+        )
+        _signers[script_name] = signer
+    return signer
+
+
+async def close_js_signers() -> None:
+    """关闭所有常驻签名进程"""
+    for signer in list(_signers.values()):
+        await signer.close()
+
+
+async def benchmark(
+    script_name: str, fn_name: str, args: Tuple[Any, ...], total: int = 200, concurrency: int = 20
+) -> Dict:
+    """
+    签名微基准：并发发起 total 次签名，统计吞吐与延迟分位
+
+    Returns:
+        {"signs_per_sec", "p50_ms", "p99_ms"}
+    """
+    signer = get_js_signer(script_name)
+    await signer.call(fn_name, *args)  # 预热
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await signer.call(fn_name, *args)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "signs_per_sec": round(total / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+        "p99_ms": round(latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)] * 1000, 2),
+    }
+
+
+if __name__ == "__main__":
+    async def _main() -> None:
+        ua = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
+        cases = [
+            ("douyin.js", "sign_datail", ("device_platform=webapp&aid=6383&aweme_id=1", ua)),
+            ("zhihu.js", "get_sign", ("/api/v4/search_v3?q=python", "d_c0=AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA=|1700000000")),
+        ]
+        for script_name, fn_name, args in cases:
+            result = await benchmark(script_name, fn_name, args)
+            utils.logger.info(f"[js_signer.benchmark] {script_name}:{fn_name} {result}")
+        await close_js_signers()
+
+    asyncio.run(_main())
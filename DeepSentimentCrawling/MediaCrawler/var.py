@@ -11,14 +11,28 @@
 
 from asyncio.tasks import Task
 from contextvars import ContextVar
-from typing import List
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 import aiomysql
 
+if TYPE_CHECKING:
+    from database.write_behind import WriteBehindBuffer
+    from tools.browser_pool import BrowserPool
+
 request_keyword_var: ContextVar[str] = ContextVar("request_keyword", default="")
 crawler_type_var: ContextVar[str] = ContextVar("crawler_type", default="")
 comment_tasks_var: ContextVar[List[Task]] = ContextVar("comment_tasks", default=[])
 db_conn_pool_var: ContextVar[aiomysql.Pool] = ContextVar("db_conn_pool_var")
 source_keyword_var: ContextVar[str] = ContextVar("source_keyword", default="")
 topic_id_var: ContextVar[str] = ContextVar("topic_id", default="")
-crawling_task_id_var: ContextVar[str] = ContextVar("crawling_task_id", default="")
\ No newline at end of file
+crawling_task_id_var: ContextVar[str] = ContextVar("crawling_task_id", default="")
+# 当前爬取任务的配置覆盖（见 config.task_config），None 表示直接使用 config 模块的全局值
+crawler_config_var: ContextVar[Optional[Dict[str, Any]]] = ContextVar(
+    "crawler_config", default=None
+)
+# 当前爬取任务使用的浏览器池（见 tools.browser_pool），None 表示 crawler 自行启动浏览器
+browser_pool_var: ContextVar[Optional["BrowserPool"]] = ContextVar("browser_pool", default=None)
+# 当前爬取任务独占的写后缓冲（见 database.write_behind），None 表示使用进程级共享缓冲
+write_buffer_var: ContextVar[Optional["WriteBehindBuffer"]] = ContextVar(
+    "write_buffer", default=None
+)
@@ -121,7 +121,7 @@ def get_overview(mongo, dispatcher=None) -> Dict:
     """
     总览统计：各状态任务数、Redis 队列深度。
 
-    dispatcher 可选，用于获取 Redis 队列大小。
+    dispatcher 可选，用于获取 Redis 队列大小和进程池状态。
     """
     mongo.connect()
     col = mongo.get_collection("crawl_tasks")
@@ -146,6 +146,8 @@ def get_overview(mongo, dispatcher=None) -> Dict:
                 stats["redis_queue_size"] = queue.get_queue_size()
         except Exception:
             pass
+        if getattr(dispatcher, "pool", None):
+            stats["worker_pool"] = dispatcher.pool.snapshot()
 
     return stats
 
@@ -3,21 +3,37 @@
 TaskDispatcher — 异步任务调度器
 
 从 Redis 任务队列 + MongoDB 获取待执行任务，按优先级调度到 PlatformWorker。
-每个平台同时只运行一个任务（平台锁），连续失败触发熔断器。
+每个平台同时最多运行 PLATFORM_CONCURRENCY 个任务（平台槽位），连续失败触发熔断器。
+PlatformWorker 的任务配置按 asyncio 任务隔离，同进程内的并发任务互不干扰。
+processes > 0 时任务交给 WorkerPool 的常驻子进程执行，CPU 开销分摊到多核。
+
+调度循环由事件驱动：每轮调度后阻塞等待唤醒，而不是固定间隔轮询。
+  - TaskQueue 入队时 PUBLISH 唤醒消息（Redis pub/sub）
+  - MongoDB crawl_tasks 变更流中出现新的 pending 任务（需副本集，不支持时跳过）
+  - 本进程任务结束、平台槽位释放
+  - 兜底定时器：有唤醒通道时为 IDLE_POLL_INTERVAL（不晚于最早的重试到期），
+    否则退回 POLL_INTERVAL 轮询
 
 任务来源优先级：
   1. Redis 队列（user 任务 > candidate 任务）
   2. MongoDB 轮询（重试任务、Redis 之前遗留的任务）
+
+多节点部署（TASK_QUEUE_BACKEND=stream）时，Redis 任务经消费组只投递给一个节点，
+执行结束后 ack，运行中每 RENEW_INTERVAL 续约；开始执行前以 pending → running
+条件更新认领，同一任务经 Redis 与 MongoDB 两条路径到达不同节点时也只执行一次。
 """
 
 import asyncio
 import json
+import threading
 import time
+from collections import deque
 from typing import Optional
 from datetime import date
 from urllib.parse import quote_plus
 
 from loguru import logger
+from pymongo.errors import OperationFailure
 from sqlalchemy import create_engine, text
 
 import sys
@@ -30,6 +46,7 @@ from ms_config import settings
 
 from BroadTopicExtraction.pipeline.mongo_writer import MongoWriter
 from DeepSentimentCrawling.worker import PlatformWorker
+from DeepSentimentCrawling.worker_pool import WorkerPool
 from DeepSentimentCrawling.cookie_manager import CookieManager
 from DeepSentimentCrawling.alert import alert_circuit_open
 
@@ -39,16 +56,33 @@ TASK_STATUS_COLLECTION = "task_status"
 # 所有支持的平台
 ALL_PLATFORMS = ["xhs", "dy", "bili", "wb", "ks", "tieba", "zhihu"]
 
+# 非副本集上的 $changeStream / 不识别的聚合阶段（同 analyzer.change_stream）
+_CHANGE_STREAM_UNSUPPORTED_CODES = (40573, 40324)
+
+
+def _change_stream_unsupported(error: Exception) -> bool:
+    """
+    变更流永久不可用（单机部署），区别于网络中断、主节点切换等临时错误。
+
+    只按错误码判断：选主期间的 "No replica set members match selector" 等消息
+    同样含 replica set，但属于临时错误。
+    """
+    return isinstance(error, OperationFailure) and error.code in _CHANGE_STREAM_UNSUPPORTED_CODES
+
 
 class TaskDispatcher:
     """异步爬取任务调度器"""
 
-    POLL_INTERVAL = 10  # 轮询间隔（秒）
+    POLL_INTERVAL = 10  # 无唤醒通道时的轮询间隔（秒）
+    IDLE_POLL_INTERVAL = 60  # 有唤醒通道时的兜底轮询间隔（秒）
+    EVENT_DRIVEN = True  # False 时恢复固定间隔轮询
     CIRCUIT_THRESHOLD = 3  # 连续失败次数触发熔断
     MAX_ATTEMPTS = 3  # 单任务最大重试次数
     RETRY_BACKOFF = [120, 240, 480]  # 重试退避（秒）
     ZOMBIE_TIMEOUT = 3600  # running 超过 60 分钟视为僵尸（秒）
+    PLATFORM_CONCURRENCY = 2  # 单平台同时运行的任务数（同平台 cookie / 风控限制）
     STALE_PENDING_TIMEOUT = 1800  # pending 超过 30 分钟视为过期（秒）
+    RENEW_INTERVAL = 60  # Redis 任务续约间隔（秒），需小于 StreamTaskQueue.CLAIM_IDLE_MS
 
     def __init__(
         self,
@@ -56,6 +90,7 @@ class TaskDispatcher:
         cookie_manager: Optional[CookieManager] = None,
         mongo_writer: Optional[MongoWriter] = None,
         dry_run: bool = False,
+        processes: int = 0,
     ):
         self.platforms = platforms or ALL_PLATFORMS
         self.cookie_manager = cookie_manager or CookieManager()
@@ -64,8 +99,10 @@ class TaskDispatcher:
         self._mysql_engine = None
         self._task_queue = None  # TaskQueue (lazy init)
 
-        self.workers: dict[str, PlatformWorker] = {}
-        self.platform_locks: dict[str, asyncio.Lock] = {}
+        # 进程池模式下所有平台共用一个 WorkerPool（接口同 PlatformWorker）
+        self.pool: Optional[WorkerPool] = WorkerPool(processes) if processes > 0 else None
+        self.workers: dict[str, PlatformWorker | WorkerPool] = {}
+        self.platform_slots: dict[str, asyncio.Semaphore] = {}
         self.failure_counts: dict[str, int] = {}
         self.circuit_open: dict[str, bool] = {}
 
@@ -73,9 +110,14 @@ class TaskDispatcher:
         self._running_tasks: set[asyncio.Task] = set()  # fire-and-forget 任务跟踪
         self._circuit_drop_logged: set[str] = set()  # 熔断丢弃日志去重
 
+        self._wakeup = asyncio.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake_sources: set[str] = set()  # 已生效的唤醒通道: redis / mongo
+        self._latencies: deque[float] = deque(maxlen=500)  # 最近任务的提交→开始时延（秒）
+
         for plat in self.platforms:
-            self.workers[plat] = PlatformWorker(cookie_manager=self.cookie_manager)
-            self.platform_locks[plat] = asyncio.Lock()
+            self.workers[plat] = self.pool or PlatformWorker(cookie_manager=self.cookie_manager)
+            self.platform_slots[plat] = asyncio.Semaphore(self.PLATFORM_CONCURRENCY)
             self.failure_counts[plat] = 0
             self.circuit_open[plat] = False
 
@@ -345,6 +387,59 @@ class TaskDispatcher:
             sort=[("priority", -1), ("created_at", 1)],
         )
 
+    def _ack_task(self, task: dict) -> None:
+        """Redis 任务执行结束后确认（Streams 后端从待确认列表移除）"""
+        if not task.get("_from_redis"):
+            return
+        queue = self._get_task_queue()
+        if not queue:
+            return
+        try:
+            queue.ack(task)
+        except Exception as e:
+            logger.warning(f"[Dispatcher] Redis 确认 {task['task_id']} 失败: {e}")
+
+    def _claim_mongo_task(self, task_id: str, reclaimed: bool = False) -> bool:
+        """
+        条件更新 → running，多个调度节点拉到同一任务时只有一个认领成功。
+
+        只认领 pending 且重试时间已到的任务；reclaimed 为 True（接管自崩溃节点的
+        Redis 任务）时还可认领仍为 running 的任务，已完成 / 已失败的不再认领。
+        """
+        col = self.mongo.get_collection(CRAWL_TASKS_COLLECTION)
+        now = int(time.time())
+        due_pending = {
+            "status": "pending",
+            "$or": [
+                {"next_retry_at": {"$exists": False}},
+                {"next_retry_at": {"$lte": now}},
+            ],
+        }
+        query = {"$or": [due_pending, {"status": "running"}]} if reclaimed else due_pending
+        result = col.update_one(
+            {"task_id": task_id, **query},
+            {"$set": {"status": "running", "started_at": now}},
+        )
+        return bool(result.matched_count)
+
+    def _claim_for_dispatch(self, task: dict) -> bool:
+        """
+        派发前认领任务并标记 running，防止下一轮调度（或其他调度节点）重复拉取。
+
+        认领失败（已被其他节点认领、已完成 / 失败或仍在重试退避中）时确认并丢弃
+        Redis 条目，任务以 MongoDB 状态为准。
+        """
+        self._ensure_task_in_mongo(task)
+        if not self._claim_mongo_task(task["task_id"], reclaimed=bool(task.get("_reclaimed"))):
+            logger.debug(f"[Dispatcher] 任务 {task['task_id']} 认领失败，跳过")
+            self._ack_task(task)
+            return False
+        self._update_task_status(
+            task["task_id"],
+            {"status": "running", "started_at": int(time.time())},
+        )
+        return True
+
     # ==================== 任务状态更新 ====================
 
     def _ensure_task_in_mongo(self, task: dict) -> None:
@@ -353,6 +448,7 @@ class TaskDispatcher:
         if col.find_one({"task_id": task["task_id"]}):
             return
         doc = {k: v for k, v in task.items() if not k.startswith("_")}
+        doc.setdefault("status", "pending")
         doc.setdefault("created_at", int(time.time()))
         doc.setdefault("attempts", 0)
         col.insert_one(doc)
@@ -467,6 +563,7 @@ class TaskDispatcher:
         """执行单个任务"""
         platform = task["platform"]
         task_id = task["task_id"]
+        self._record_start(task)
 
         if self.dry_run:
             logger.info(f"[Dispatcher] DRY RUN: 跳过任务 {task_id} ({platform})")
@@ -571,51 +668,58 @@ class TaskDispatcher:
         if not tasks:
             return
 
+        redis_count = sum(1 for t in tasks if t.get("_from_redis"))
         dispatched = []
-        push_back = []  # 锁占用的 Redis 任务，需推回
+        push_back = []  # 槽位已满的 Redis 任务，需推回
         circuit_dropped: dict[str, int] = {}  # 熔断丢弃计数 {platform: count}
 
         for task in tasks:
             platform = task["platform"]
 
             if platform not in self.platforms:
+                self._ack_task(task)
                 continue
 
             # 熔断 → Redis 任务直接丢弃（MongoDB 中已有记录，恢复后自然拾起）
             if self._is_circuit_open(platform):
                 if task.get("_from_redis"):
                     self._ensure_task_in_mongo(task)
+                    self._ack_task(task)
                     circuit_dropped[platform] = circuit_dropped.get(platform, 0) + 1
                 continue
 
-            # 平台锁已占用
-            lock = self.platform_locks.get(platform)
-            if lock and lock.locked():
-                # user 任务：等锁（create_task 会排队获取锁后执行）
+            # 平台槽位已满
+            slots = self.platform_slots.get(platform)
+            if slots and slots.locked():
+                # user 任务：等槽位（create_task 会排队获取槽位后执行）
                 if task.get("_source") == "user":
+                    if not self._claim_for_dispatch(task):
+                        continue
 
                     async def _run_wait(t=task, p=platform):
-                        async with self.platform_locks[p]:
-                            await self._execute_one(t)
+                        async with self.platform_slots[p]:
+                            try:
+                                await self._execute_one(t)
+                            finally:
+                                self._ack_task(t)
 
                     dispatched.append(asyncio.create_task(_run_wait()))
                     continue
-                # 系统任务：锁占用 → 推回 Redis（锁很快释放）
+                # 系统任务：槽位已满 → 推回 Redis（槽位很快释放）
                 if task.get("_from_redis"):
                     push_back.append(task)
                 continue
 
-            # 提前标记 running，防止下一轮调度重复拉取
-            self._ensure_task_in_mongo(task)
-            self._update_task_status(
-                task["task_id"],
-                {"status": "running", "started_at": int(time.time())},
-            )
+            if not self._claim_for_dispatch(task):
+                continue
 
             # 启动异步任务
             async def _run(t=task, p=platform):
-                async with self.platform_locks[p]:
-                    await self._execute_one(t)
+                async with self.platform_slots[p]:
+                    try:
+                        await self._execute_one(t)
+                    finally:
+                        self._ack_task(t)
 
             dispatched.append(asyncio.create_task(_run()))
 
@@ -627,19 +731,182 @@ class TaskDispatcher:
                 )
                 self._circuit_drop_logged.add(plat)
 
-        # 将锁占用的 Redis 任务推回队列
+        # 将槽位已满的 Redis 任务推回队列
         queue = self._get_task_queue()
         if push_back and queue:
             for task in push_back:
                 score = task.get("_redis_score", 10000)
                 queue.push_back(task, score)
-            logger.debug(f"[Dispatcher] {len(push_back)} 个任务推回 Redis 队列（锁占用）")
+            logger.debug(f"[Dispatcher] {len(push_back)} 个任务推回 Redis 队列（槽位已满）")
 
         if dispatched:
             logger.info(f"[Dispatcher] 本轮调度 {len(dispatched)} 个任务")
             for t in dispatched:
                 self._running_tasks.add(t)
                 t.add_done_callback(self._running_tasks.discard)
+                # 任务结束释放槽位，等槽位的 pending 任务可以开始
+                t.add_done_callback(lambda _: self._wakeup.set())
+
+        # Redis 取满一批且没有推回，队列里可能还有任务，紧接着再调度一轮
+        if redis_count >= len(self.platforms) * 2 and not push_back:
+            self._wakeup.set()
+
+    # ==================== 唤醒 ====================
+
+    def wake(self) -> None:
+        """唤醒调度循环立即执行一轮调度（可在任意线程调用）"""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _start_wake_listeners(self) -> None:
+        queue = self._get_task_queue()
+        if queue:
+            threading.Thread(
+                target=self._listen_redis, args=(queue,), name="dispatcher-redis-wake", daemon=True
+            ).start()
+        threading.Thread(
+            target=self._watch_mongo, name="dispatcher-mongo-watch", daemon=True
+        ).start()
+
+    def _listen_redis(self, queue) -> None:
+        """后台线程：订阅 TaskQueue 入队消息，连接断开后重新订阅"""
+        while self._running:
+            try:
+                pubsub = queue.subscribe_wakeups()
+            except Exception as e:
+                logger.warning(f"[Dispatcher] Redis 唤醒订阅失败: {e}")
+                time.sleep(self.POLL_INTERVAL)
+                continue
+            self._wake_sources.add("redis")
+            # 订阅建立前入队的任务收不到消息，补一轮调度
+            self.wake()
+            try:
+                while self._running:
+                    if pubsub.get_message(timeout=1.0):
+                        self.wake()
+            except Exception as e:
+                logger.warning(f"[Dispatcher] Redis 唤醒订阅中断: {e}")
+            finally:
+                self._wake_sources.discard("redis")
+                pubsub.close()
+
+    def _watch_mongo(self) -> None:
+        """
+        后台线程：监听 crawl_tasks 变更流，有任务变为 pending 时唤醒。
+
+        覆盖 Redis 之外的任务来源（Redis 推送失败的任务、重试、僵尸回收）。
+        变更流需要副本集 / 分片集群，单机 MongoDB 不支持时由兜底定时器拾取；
+        网络中断、主节点切换等临时错误按指数退避重连。
+        """
+        pipeline = [
+            {
+                "$match": {
+                    "$or": [
+                        {"operationType": "insert", "fullDocument.status": "pending"},
+                        {
+                            "operationType": "update",
+                            "updateDescription.updatedFields.status": "pending",
+                        },
+                    ]
+                }
+            }
+        ]
+        backoff = 1.0
+        while self._running:
+            try:
+                col = self.mongo.get_collection(CRAWL_TASKS_COLLECTION)
+                with col.watch(pipeline, max_await_time_ms=1000) as stream:
+                    self._wake_sources.add("mongo")
+                    backoff = 1.0
+                    # 重连期间变为 pending 的任务收不到事件，补一轮调度
+                    self.wake()
+                    while self._running and stream.alive:
+                        if stream.try_next() is not None:
+                            self.wake()
+            except Exception as e:
+                if _change_stream_unsupported(e):
+                    logger.info(f"[Dispatcher] MongoDB 变更流不可用，pending 任务由定时轮询拾取: {e}")
+                    return
+                logger.warning(f"[Dispatcher] MongoDB 变更流中断，{backoff:.0f}s 后重连: {e}")
+            finally:
+                self._wake_sources.discard("mongo")
+            time.sleep(backoff)
+            backoff = min(backoff * 2, self.IDLE_POLL_INTERVAL)
+
+    def _next_retry_at(self) -> Optional[int]:
+        """最早到期的重试任务时间"""
+        now = int(time.time())
+        task = self.mongo.get_collection(CRAWL_TASKS_COLLECTION).find_one(
+            {"status": "pending", "next_retry_at": {"$gt": now}},
+            projection={"next_retry_at": 1},
+            sort=[("next_retry_at", 1)],
+        )
+        return task["next_retry_at"] if task else None
+
+    async def _next_poll_delay(self) -> float:
+        """距下一次兜底轮询的秒数（重试到期时间在线程中查询，不阻塞事件循环）"""
+        if not self._wake_sources:
+            return self.POLL_INTERVAL
+        delay = self.IDLE_POLL_INTERVAL
+        try:
+            retry_at = await asyncio.to_thread(self._next_retry_at)
+        except Exception as e:
+            logger.debug(f"[Dispatcher] 查询重试到期时间失败: {e}")
+            return self.POLL_INTERVAL
+        if retry_at is not None:
+            delay = min(delay, max(0.0, retry_at - time.time()))
+        return delay
+
+    async def _wait_for_work(self) -> None:
+        """阻塞直到收到唤醒或兜底定时器到期"""
+        if not self.EVENT_DRIVEN:
+            await asyncio.sleep(self.POLL_INTERVAL)
+            return
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=await self._next_poll_delay())
+        except asyncio.TimeoutError:
+            pass
+
+    # ==================== 提交→开始时延 ====================
+
+    def _record_start(self, task: dict) -> None:
+        """记录任务从提交到开始执行的时延（重试任务含退避等待，不计入）"""
+        if task.get("attempts", 0):
+            return
+        if "_redis_score" in task:
+            submitted = task["_redis_score"] % 1e10  # score = 层级 × 1e10 + 入队时间
+        else:
+            submitted = task.get("created_at")
+        if not submitted:
+            return
+        latency = max(0.0, time.time() - submitted)
+        self._latencies.append(latency)
+        logger.debug(f"[Dispatcher] 任务 {task['task_id']} 提交→开始 {latency:.2f}s")
+
+    def latency_summary(self) -> dict:
+        """最近任务提交→开始时延的分位数（秒）"""
+        samples = sorted(self._latencies)
+        if not samples:
+            return {"samples": 0}
+        n = len(samples)
+        return {
+            "samples": n,
+            "p50": round(samples[n // 2], 3),
+            "p95": round(samples[min(n - 1, int(n * 0.95))], 3),
+            "max": round(samples[-1], 3),
+        }
+
+    async def _renew_loop(self):
+        """定期续约本节点运行中的 Redis 任务，避免被其他调度节点接管"""
+        while self._running:
+            await asyncio.sleep(self.RENEW_INTERVAL)
+            queue = self._get_task_queue()
+            if not queue:
+                continue
+            try:
+                queue.renew()
+            except Exception as e:
+                logger.warning(f"[Dispatcher] Redis 任务续约失败: {e}")
 
     async def _zombie_reaper_loop(self):
         """独立的僵尸回收循环（不受调度阻塞影响）"""
@@ -659,13 +926,23 @@ class TaskDispatcher:
 
         # 尝试连接 Redis
         queue = self._get_task_queue()
-        redis_status = "已连接" if queue else "不可用（降级到 MongoDB 轮询）"
+        redis_status = f"已连接 ({type(queue).__name__})" if queue else "不可用（降级到 MongoDB 轮询）"
+
+        if self.pool:
+            await self.pool.start()
+        mode = f"进程池 ({self.pool.processes} 进程)" if self.pool else "进程内"
+
+        if self.EVENT_DRIVEN:
+            wait_mode = f"事件唤醒（兜底轮询 {self.IDLE_POLL_INTERVAL}s）"
+        else:
+            wait_mode = f"固定间隔轮询 {self.POLL_INTERVAL}s"
 
         logger.info(
             f"[Dispatcher] 启动调度器\n"
             f"  平台: {self.platforms}\n"
-            f"  轮询间隔: {self.POLL_INTERVAL}s\n"
+            f"  调度触发: {wait_mode}\n"
             f"  Redis: {redis_status}\n"
+            f"  执行模式: {mode}\n"
             f"  dry_run: {self.dry_run}"
         )
 
@@ -678,17 +955,34 @@ class TaskDispatcher:
 
         # 启动独立僵尸回收循环
         asyncio.create_task(self._zombie_reaper_loop())
+        asyncio.create_task(self._renew_loop())
+
+        await self._dispatch_loop()
+
+        if self.pool:
+            await self.pool.stop()
+        else:
+            await PlatformWorker.shutdown()
+
+    async def _dispatch_loop(self):
+        """调度主循环：每轮调度后阻塞等待唤醒或兜底定时器"""
+        self._loop = asyncio.get_running_loop()
+        if self.EVENT_DRIVEN:
+            self._start_wake_listeners()
 
         while self._running:
+            # 先清除再调度：调度期间到达的唤醒留给下一轮，不会丢失
+            self._wakeup.clear()
             try:
                 await self._dispatch_round()
             except Exception as e:
                 logger.error(f"[Dispatcher] 调度轮次异常: {e}")
 
-            await asyncio.sleep(self.POLL_INTERVAL)
+            await self._wait_for_work()
 
     def stop(self):
         self._running = False
+        self.wake()
         logger.info("[Dispatcher] 调度器停止信号已发送")
 
     def get_stats(self) -> dict:
@@ -706,4 +1000,8 @@ class TaskDispatcher:
         queue = self._get_task_queue()
         if queue:
             stats["redis_queue_size"] = queue.get_queue_size()
+        if self.pool:
+            stats["worker_pool"] = self.pool.snapshot()
+        stats["wake_sources"] = sorted(self._wake_sources)
+        stats["dispatch_latency"] = self.latency_summary()
         return stats
@@ -90,6 +90,12 @@ def parse_args():
     parser.add_argument(
         "--dry-run", action="store_true", help="试运行模式：只打印任务，不实际执行爬取"
     )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=0,
+        help="爬取子进程数，0 表示在调度器进程内执行 (默认: 0)",
+    )
     return parser.parse_args()
 
 
@@ -122,6 +128,7 @@ async def main():
         platforms=platforms,
         cookie_manager=cookie_manager,
         dry_run=args.dry_run,
+        processes=args.processes,
     )
 
     init_mongo_writer(dispatcher.mongo)
@@ -173,6 +180,7 @@ async def main():
         f"[DeepCrawl] 深层采集服务已启动\n"
         f"  平台: {plat_str}\n"
         f"  轮询间隔: {dispatcher.POLL_INTERVAL}s\n"
+        f"  爬取子进程: {args.processes or '无（进程内执行）'}\n"
         f"  登录控制台: http://0.0.0.0:{port}\n"
         f"  dry_run: {args.dry_run}"
     )
@@ -0,0 +1,343 @@
+# -*- coding: utf-8 -*-
+"""
+深度爬取任务队列 — 基于 Redis Streams 消费组（多调度节点）
+
+TaskQueue（ZSET + HASH）为单调度器设计：zpopmin 即删除，节点崩溃时已取出的任务
+只能靠 MongoDB 僵尸回收按运行时长推断。StreamTaskQueue 接口与 TaskQueue 一致，
+多个调度节点共用消费组 GROUP 并发取任务：
+
+STREAM mindspider:tasks:user       → 用户任务（优先读取）
+STREAM mindspider:tasks:candidate  → 候选任务
+HASH   mindspider:tasks:index      → field=prefixed_id, value="stream entry_id"（去重 / remove_task）
+
+- pop_task: XREADGROUP 按优先级依次读取，每个条目只投递给一个节点，进入该节点的
+  待确认列表（PEL）；任务执行结束后调度器调用 ack（XACK + XDEL）
+- renew: 调度器定期续约运行中的任务（XCLAIM 自身，重置空闲时间）
+- 节点崩溃后，其 PEL 中超过 CLAIM_IDLE_MS 未续约的任务由其他节点 XAUTOCLAIM 接管；
+  投递超过 MAX_DELIVERIES 次的任务视为毒任务，确认后丢弃（MongoDB 中仍有记录）
+- push_back: 确认原条目并追加到同一优先级流末尾（保留原提交时间），
+  其他有空闲槽位的节点可以取走
+
+入队同样在 WAKE_CHANNEL 上发布唤醒消息。需要 Redis >= 6.2（XAUTOCLAIM）。
+设置 TASK_QUEUE_BACKEND=stream 后 get_task_queue() 返回该队列。
+"""
+
+import json
+import os
+import socket
+import time
+from collections import deque
+from typing import List, Optional
+
+from loguru import logger
+from redis.exceptions import ResponseError
+
+import sys
+from pathlib import Path
+
+_PROJECT_ROOT = str(Path(__file__).parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+from DeepSentimentCrawling.task_queue import TaskQueue
+
+
+class StreamTaskQueue(TaskQueue):
+    """深度爬取任务队列（Redis Streams 消费组）"""
+
+    # 按读取优先级排列
+    STREAM_KEYS = {
+        "user": "mindspider:tasks:user",
+        "candidate": "mindspider:tasks:candidate",
+    }
+    INDEX_KEY = "mindspider:tasks:index"
+    GROUP = "dispatchers"
+
+    CLAIM_IDLE_MS = 10 * 60 * 1000  # 超过该时长未续约的任务由其他节点接管（毫秒）
+    RECLAIM_INTERVAL = 30  # 两次 XAUTOCLAIM 扫描的最小间隔（秒）
+    MAX_DELIVERIES = 3  # 超过该投递次数的任务丢弃
+
+    def __init__(self, consumer: Optional[str] = None):
+        super().__init__()
+        self.consumer = consumer or f"{socket.gethostname()}:{os.getpid()}"
+        self._inflight: dict[str, str] = {}  # entry_id -> stream，本节点已取出未确认
+        self._claimed: deque = deque()  # 接管到的 (stream, entry_id, fields)
+        self._last_reclaim = 0.0
+
+    # ---------- 连接管理 ----------
+
+    def connect(self) -> None:
+        if self._connected:
+            return
+        super().connect()
+        self._create_groups()
+
+    def _create_groups(self) -> None:
+        for stream in self.STREAM_KEYS.values():
+            try:
+                # id=0：建组前已写入的条目同样投递
+                self._redis.xgroup_create(stream, self.GROUP, id="0", mkstream=True)
+            except ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+
+    # ---------- 入队 ----------
+
+    def push_user_task(self, task: dict) -> str:
+        """推送用户任务（最高优先级）"""
+        task_id = task.get("task_id")
+        if not task_id:
+            raise ValueError("task_id 不能为空")
+        entry = self._push("user", f"user:{task_id}", task, time.time())
+        logger.info(f"[StreamTaskQueue] 用户任务入队: {task_id} ({entry})")
+        return task_id
+
+    def push_candidate_task(self, candidate_id: str, status: str, task: dict) -> str:
+        """推送候选状态触发的任务（普通优先级）"""
+        task_id = task.get("task_id")
+        if not task_id:
+            raise ValueError("task_id 不能为空")
+        entry = self._push("candidate", f"candidate:{status}:{task_id}", task, time.time())
+        logger.info(f"[StreamTaskQueue] 候选任务入队: {task_id} (status={status}, {entry})")
+        return task_id
+
+    def _push(
+        self, source: str, prefixed_id: str, task: dict, submitted_at: float, wake: bool = True
+    ) -> str:
+        """追加条目；同一 prefixed_id 已在队列中时替换旧条目"""
+        self._ensure()
+        stream = self.STREAM_KEYS[source]
+        old = self._redis.hget(self.INDEX_KEY, prefixed_id)
+
+        pipe = self._redis.pipeline()
+        if old:
+            old_stream, old_entry = old.split(" ")
+            pipe.xack(old_stream, self.GROUP, old_entry)
+            pipe.xdel(old_stream, old_entry)
+        pipe.xadd(
+            stream,
+            {
+                "id": prefixed_id,
+                "ts": submitted_at,
+                "task": json.dumps(task, ensure_ascii=False, default=str),
+            },
+        )
+        if wake:
+            pipe.publish(self.WAKE_CHANNEL, prefixed_id)
+        entry_id = pipe.execute()[-2 if wake else -1]
+
+        self._redis.hset(self.INDEX_KEY, prefixed_id, f"{stream} {entry_id}")
+        return entry_id
+
+    # ---------- 出队 / 确认 ----------
+
+    def pop_task(self) -> Optional[dict]:
+        """
+        取出一个任务：先交付接管到的超时任务，再按优先级读取新任务。
+
+        返回 task dict（含 _source / _redis_score / _prefixed_id / _stream_entry 内部字段，
+        接管的任务另有 _reclaimed），执行结束后需调用 ack；队列为空返回 None。
+        """
+        self._ensure()
+        if not self._claimed and time.monotonic() - self._last_reclaim >= self.RECLAIM_INTERVAL:
+            self._reclaim()
+
+        while self._claimed:
+            stream, entry_id, fields = self._claimed.popleft()
+            task = self._checkout(stream, entry_id, fields)
+            if task:
+                task["_reclaimed"] = True
+                return task
+
+        for stream in self.STREAM_KEYS.values():
+            response = self._redis.xreadgroup(self.GROUP, self.consumer, {stream: ">"}, count=1)
+            for _, entries in response or []:
+                for entry_id, fields in entries:
+                    task = self._checkout(stream, entry_id, fields)
+                    if task:
+                        return task
+        return None
+
+    def ack(self, task: dict) -> None:
+        """任务执行结束（完成、失败或转入 MongoDB 重试）后确认并删除条目"""
+        ref = task.get("_stream_entry")
+        if not ref:
+            return
+        self._ensure()
+        stream, entry_id = ref.split(" ")
+        self._ack_entry(stream, entry_id, task.get("_prefixed_id"))
+
+    def renew(self) -> int:
+        """
+        续约本节点运行中的任务（重置 PEL 空闲时间），避免被其他节点接管。
+
+        已被其他节点接管的任务（本节点曾长时间失联）不再续约，返回续约数量。
+        """
+        if not self._inflight:
+            return 0
+        self._ensure()
+        by_stream: dict[str, list[str]] = {}
+        for entry_id, stream in self._inflight.items():
+            by_stream.setdefault(stream, []).append(entry_id)
+
+        renewed = 0
+        for stream, entry_ids in by_stream.items():
+            owned = {
+                p["message_id"]
+                for p in self._redis.xpending_range(
+                    stream, self.GROUP, min="-", max="+",
+                    count=len(self._inflight) + len(self._claimed) + 100,
+                    consumername=self.consumer,
+                )
+            }
+            lost = [e for e in entry_ids if e not in owned]
+            for entry_id in lost:
+                logger.warning(f"[StreamTaskQueue] {entry_id} 已被其他节点接管或删除，停止续约")
+                self._inflight.pop(entry_id, None)
+            keep = [e for e in entry_ids if e in owned]
+            if keep:
+                self._redis.xclaim(stream, self.GROUP, self.consumer, 0, keep, justid=True)
+                renewed += len(keep)
+        return renewed
+
+    def push_back(self, task: dict, score: float) -> None:
+        """将未能执行的任务推回队列：确认原条目，追加到同优先级流末尾（保留原提交时间）"""
+        prefixed_id = task.get("_prefixed_id")
+        ref = task.get("_stream_entry")
+        if not prefixed_id or not ref:
+            return
+        self._ensure()
+        stream, entry_id = ref.split(" ")
+        self._ack_entry(stream, entry_id, prefixed_id)
+        clean = {k: v for k, v in task.items() if not k.startswith("_")}
+        source = prefixed_id.split(":")[0]
+        self._push(source, prefixed_id, clean, score % 1e10, wake=False)
+
+    def _checkout(self, stream: str, entry_id: str, fields: Optional[dict]) -> Optional[dict]:
+        """投递到本节点的条目转为 task dict 并记为运行中；无数据的条目直接确认"""
+        task = self._decode(stream, entry_id, fields)
+        if task is None:
+            logger.warning(f"[StreamTaskQueue] {stream} {entry_id} 无任务数据，跳过")
+            self._ack_entry(stream, entry_id, (fields or {}).get("id"))
+            return None
+        self._inflight[entry_id] = stream
+        return task
+
+    def _decode(self, stream: str, entry_id: str, fields: Optional[dict]) -> Optional[dict]:
+        if not fields or "task" not in fields:
+            return None
+        source = next(s for s, key in self.STREAM_KEYS.items() if key == stream)
+        tier = self.TIER_USER if source == "user" else self.TIER_CANDIDATE
+        task = json.loads(fields["task"])
+        task["_source"] = source
+        # 与 ZSET 后端的 score 含义一致：层级 × 1e10 + 提交时间
+        task["_redis_score"] = tier * 1e10 + float(fields.get("ts", 0))
+        task["_prefixed_id"] = fields["id"]
+        task["_stream_entry"] = f"{stream} {entry_id}"
+        return task
+
+    def _ack_entry(self, stream: str, entry_id: str, prefixed_id: Optional[str]) -> None:
+        pipe = self._redis.pipeline()
+        pipe.xack(stream, self.GROUP, entry_id)
+        pipe.xdel(stream, entry_id)
+        pipe.execute()
+        self._inflight.pop(entry_id, None)
+        # 同一任务可能已重新入队，索引只在仍指向该条目时删除
+        if prefixed_id and self._redis.hget(self.INDEX_KEY, prefixed_id) == f"{stream} {entry_id}":
+            self._redis.hdel(self.INDEX_KEY, prefixed_id)
+
+    def _reclaim(self) -> None:
+        """XAUTOCLAIM 接管其他节点超过 CLAIM_IDLE_MS 未续约的任务"""
+        self._last_reclaim = time.monotonic()
+        for stream in self.STREAM_KEYS.values():
+            start = "0-0"
+            while True:
+                next_start, claimed, *_ = self._redis.xautoclaim(
+                    stream, self.GROUP, self.consumer, self.CLAIM_IDLE_MS,
+                    start_id=start, count=50,
+                )
+                for entry_id, fields in claimed:
+                    if entry_id is None:
+                        continue
+                    prefixed_id = (fields or {}).get("id")
+                    deliveries = self._deliveries(stream, entry_id)
+                    if deliveries > self.MAX_DELIVERIES:
+                        logger.warning(
+                            f"[StreamTaskQueue] {prefixed_id} 已投递 {deliveries} 次，丢弃"
+                        )
+                        self._ack_entry(stream, entry_id, prefixed_id)
+                        continue
+                    logger.warning(
+                        f"[StreamTaskQueue] 接管超时任务 {prefixed_id} ({entry_id}, "
+                        f"第 {deliveries} 次投递)"
+                    )
+                    self._claimed.append((stream, entry_id, fields))
+                if next_start == "0-0":
+                    break
+                start = next_start
+
+    def _deliveries(self, stream: str, entry_id: str) -> int:
+        pending = self._redis.xpending_range(
+            stream, self.GROUP, min=entry_id, max=entry_id, count=1
+        )
+        return pending[0]["times_delivered"] if pending else 0
+
+    # ---------- 查询 ----------
+
+    def peek_tasks(self, limit: int = 10) -> List[dict]:
+        """查看尚未投递的前 N 个任务（不取出）"""
+        self._ensure()
+        tasks: List[dict] = []
+        for stream in self.STREAM_KEYS.values():
+            if len(tasks) >= limit:
+                break
+            last = self._group_info(stream).get("last-delivered-id", "0-0")
+            entries = self._redis.xrange(stream, min=f"({last}", max="+", count=limit - len(tasks))
+            for entry_id, fields in entries:
+                task = self._decode(stream, entry_id, fields)
+                if task:
+                    tasks.append(task)
+        return tasks
+
+    def get_queue_size(self) -> int:
+        """等待投递的任务数（已确认的条目即删除，XLEN 减去待确认数即为积压）"""
+        self._ensure()
+        return sum(
+            max(0, self._redis.xlen(stream) - self._group_info(stream).get("pending", 0))
+            for stream in self.STREAM_KEYS.values()
+        )
+
+    def _group_info(self, stream: str) -> dict:
+        for group in self._redis.xinfo_groups(stream):
+            if group["name"] == self.GROUP:
+                return group
+        return {}
+
+    def remove_task(self, task_id: str, prefix: str = "user") -> bool:
+        """按 task_id 移除任务（支持 user / candidate 前缀）"""
+        self._ensure()
+        patterns = [f"{prefix}:{task_id}"]
+        if prefix == "candidate":
+            for status in ("exploded", "confirmed", "rising"):
+                patterns.append(f"candidate:{status}:{task_id}")
+
+        removed = False
+        for pid in patterns:
+            ref = self._redis.hget(self.INDEX_KEY, pid)
+            if ref:
+                stream, entry_id = ref.split(" ")
+                self._ack_entry(stream, entry_id, pid)
+                removed = True
+                logger.info(f"[StreamTaskQueue] 已移除: {pid}")
+        return removed
+
+    def clear_queue(self) -> int:
+        """清空所有流与索引（同时丢弃各节点的待确认任务）"""
+        self._ensure()
+        size = self.get_queue_size()
+        self._redis.delete(*self.STREAM_KEYS.values(), self.INDEX_KEY)
+        self._inflight.clear()
+        self._claimed.clear()
+        self._create_groups()
+        logger.info(f"[StreamTaskQueue] 清空队列，移除 {size} 个任务")
+        return size
@@ -10,6 +10,12 @@ HASH (mindspider:task_data)   → 数据：field=prefixed_id, value=JSON task
   - candidate 任务:  score ≈ 1e10 + timestamp    (1 × 1e10 + ts)
 
 同一层内按时间 FIFO。
+
+多调度节点部署使用 Redis Streams 消费组实现的 StreamTaskQueue（stream_task_queue.py），
+接口相同，由 TASK_QUEUE_BACKEND 选择。
+
+新任务入队时在 WAKE_CHANNEL 上 PUBLISH 唤醒消息，调度器订阅后即时取任务，
+不必等待下一次定时轮询（push_back 为调度器自身推回，不发唤醒）。
 """
 
 import json
@@ -33,6 +39,7 @@ class TaskQueue:
 
     QUEUE_KEY = "mindspider:task_queue"
     DATA_KEY = "mindspider:task_data"
+    WAKE_CHANNEL = "mindspider:task_wake"
 
     # 优先级分层：user < candidate（score 越小优先级越高）
     TIER_USER = 0
@@ -92,6 +99,7 @@ class TaskQueue:
             self.DATA_KEY, prefixed_id,
             json.dumps(task, ensure_ascii=False, default=str),
         )
+        pipe.publish(self.WAKE_CHANNEL, prefixed_id)
         pipe.execute()
 
         logger.info(f"[TaskQueue] 用户任务入队: {task_id} (score={score:.0f})")
@@ -117,6 +125,7 @@ class TaskQueue:
             self.DATA_KEY, prefixed_id,
             json.dumps(task, ensure_ascii=False, default=str),
         )
+        pipe.publish(self.WAKE_CHANNEL, prefixed_id)
         pipe.execute()
 
         logger.info(
@@ -125,6 +134,13 @@ class TaskQueue:
         )
         return task_id
 
+    def subscribe_wakeups(self):
+        """订阅入队唤醒消息，返回 PubSub（独立连接，调用方负责 close）"""
+        self._ensure()
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self.WAKE_CHANNEL)
+        return pubsub
+
     # ---------- 出队 ----------
 
     def pop_task(self) -> Optional[dict]:
@@ -171,6 +187,13 @@ class TaskQueue:
         )
         pipe.execute()
 
+    def ack(self, task: dict) -> None:
+        """任务执行结束后确认（zpopmin 取出即删除，无需确认）"""
+
+    def renew(self) -> int:
+        """续约运行中的任务（单调度器无需续约）"""
+        return 0
+
     # ---------- 查询 ----------
 
     def peek_tasks(self, limit: int = 10) -> List[dict]:
@@ -226,10 +249,15 @@ _task_queue: Optional[TaskQueue] = None
 
 
 def get_task_queue() -> TaskQueue:
-    """获取 TaskQueue 单例（自动连接）"""
+    """获取任务队列单例（自动连接），TASK_QUEUE_BACKEND=stream 时为 StreamTaskQueue"""
     global _task_queue
     if _task_queue is None:
-        _task_queue = TaskQueue()
+        if settings.TASK_QUEUE_BACKEND == "stream":
+            from DeepSentimentCrawling.stream_task_queue import StreamTaskQueue
+
+            _task_queue = StreamTaskQueue()
+        else:
+            _task_queue = TaskQueue()
         _task_queue.connect()
     return _task_queue
 
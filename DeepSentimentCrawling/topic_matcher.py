@@ -20,7 +20,6 @@ import json
 import time
 from typing import Optional
 
-import jieba
 from loguru import logger
 from openai import OpenAI
 
@@ -29,31 +28,15 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from ms_config import settings
+from BroadTopicExtraction.pipeline.keywords import extract_keywords as _extract_keywords
 from BroadTopicExtraction.pipeline.mongo_writer import MongoWriter
 
-# 复用 signal_detector 的停用词
-_STOPWORDS = frozenset(
-    "的 了 在 是 我 有 和 就 不 人 都 一 一个 上 也 很 到 说 要 去 你 会 着 没有 看 好 "
-    "自己 这 他 她 它 们 那 被 从 把 让 用 为 什么 怎么 如何 如何看待 哪些 为什么 "
-    "怎样 可以 这个 那个 还是 或者 以及 但是 然而 因为 所以 如果 虽然 已经 正在 "
-    "关于 对于 通过 进行 开始 之后 之前 以来 目前 今天 昨天 明天 最新 最近 突发 "
-    "热搜 曝光 回应 官方 发布 公布 通报".split()
-)
-
 # 匹配结果类型
 MATCH_DUPLICATE = "duplicate"       # 同一事件同一角度，无需爬取
 MATCH_DEVELOPMENT = "development"   # 同一事件新进展，需要爬取
 MATCH_DIFFERENT = "different"       # 无关事件
 
 
-def _extract_keywords(title: str) -> set[str]:
-    """用 jieba 从标题提取关键词，过滤停用词和单字"""
-    if not title:
-        return set()
-    words = jieba.cut(title)
-    return {w for w in words if len(w) >= 2 and w not in _STOPWORDS}
-
-
 def _parse_llm_json(text: str) -> dict:
     """从 LLM 输出中提取 JSON，容忍 markdown code block"""
     text = text.strip()
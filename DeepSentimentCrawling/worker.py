@@ -2,8 +2,11 @@
 """
 PlatformWorker — 在进程内调用 MediaCrawler 执行单个爬取任务
 
-通过保存/恢复 MediaCrawler 的全局 config 模块实现并发安全，
-每个任务执行前设置 ContextVar 以便 store 层写入 topic_id 和 crawling_task_id。
+任务参数通过 mc_config.task_config 设为当前 asyncio 任务的配置覆盖，
+crawler / client / store 读取的 config 均为本任务的值，同一进程可并发执行多个任务；
+同时设置 ContextVar 以便 store 层写入 topic_id 和 crawling_task_id，
+并为每个任务创建独立的 DB 写后缓冲，任务结束时只落库本任务的数据。
+浏览器由进程内共享的 BrowserPool 提供，同平台同 cookie 的任务复用已预热的浏览器上下文。
 """
 
 import asyncio
@@ -27,7 +30,16 @@ from DeepSentimentCrawling.cookie_manager import CookieManager
 from DeepSentimentCrawling.alert import alert_cookie_expired
 
 import config as mc_config
-from var import source_keyword_var, topic_id_var, crawling_task_id_var
+from var import (
+    browser_pool_var,
+    crawling_task_id_var,
+    source_keyword_var,
+    topic_id_var,
+    write_buffer_var,
+)
+from database.write_behind import flush_write_buffer, new_write_buffer
+from tools.browser_pool import close_browser_pool, get_browser_pool
+from tools.js_signer import close_js_signers
 from media_platform.bilibili import BilibiliCrawler
 from media_platform.douyin import DouYinCrawler
 from media_platform.kuaishou import KuaishouCrawler
@@ -47,15 +59,22 @@ _CRAWLERS = {
 }
 
 
-def _save_config() -> dict:
-    """快照 MediaCrawler config 模块的所有大写属性"""
-    return {k: getattr(mc_config, k) for k in dir(mc_config) if k.isupper()}
-
-
-def _restore_config(saved: dict) -> None:
-    """恢复 MediaCrawler config 模块到快照状态"""
-    for k, v in saved.items():
-        setattr(mc_config, k, v)
+def _task_overrides(task: dict, cookies: dict) -> dict:
+    """任务对应的 MediaCrawler 配置覆盖"""
+    return {
+        "PLATFORM": task["platform"],
+        "KEYWORDS": ",".join(task.get("search_keywords", [])),
+        "CRAWLER_MAX_NOTES_COUNT": task.get("max_notes", 20),
+        "SAVE_DATA_OPTION": "db",
+        "LOGIN_TYPE": "cookie",
+        "COOKIES": CookieManager.format_cookies_for_config(cookies),
+        "HEADLESS": True,
+        "ENABLE_CDP_MODE": False,
+        "SAVE_LOGIN_STATE": False,
+        "ENABLE_GET_COMMENTS": True,
+        "CRAWLER_TYPE": "search",
+        "ENABLE_GET_MEIDAS": False,
+    }
 
 
 class PlatformWorker:
@@ -63,8 +82,12 @@ class PlatformWorker:
 
     TASK_TIMEOUT = 1800  # 单任务最大执行时间（30 分钟）
 
-    def __init__(self, cookie_manager: Optional[CookieManager] = None):
+    def __init__(
+        self, cookie_manager: Optional[CookieManager] = None, use_browser_pool: bool = True
+    ):
         self.cookie_manager = cookie_manager or CookieManager()
+        self.use_browser_pool = use_browser_pool
+        self.running_crawlers: dict = {}  # task_id -> crawler，供进程池心跳上报进度
 
     async def execute_task(self, task: dict) -> dict:
         """
@@ -88,34 +111,32 @@ class PlatformWorker:
             return {"status": "blocked", "reason": "no_cookies"}
         cookie_id, cookies = loaded
 
-        # 2. 保存 MediaCrawler 全局配置快照
-        saved_config = _save_config()
-
-        try:
-            # 3. 覆写 config 为当前任务参数
-            mc_config.PLATFORM = platform
-            mc_config.KEYWORDS = ",".join(task.get("search_keywords", []))
-            mc_config.CRAWLER_MAX_NOTES_COUNT = task.get("max_notes", 20)
-            mc_config.SAVE_DATA_OPTION = "db"
-            mc_config.LOGIN_TYPE = "cookie"
-            mc_config.COOKIES = CookieManager.format_cookies_for_config(cookies)
-            mc_config.HEADLESS = True
-            mc_config.ENABLE_CDP_MODE = False
-            mc_config.SAVE_LOGIN_STATE = False
-            mc_config.ENABLE_GET_COMMENTS = True
-            mc_config.CRAWLER_TYPE = "search"
-            mc_config.ENABLE_GET_MEIDAS = False
-
-            # 4. 设置 ContextVar
+        # 2. 任务级配置覆盖，只作用于当前 asyncio 任务，退出后自动失效
+        with mc_config.task_config(**_task_overrides(task, cookies)):
+            # 3. 设置 ContextVar
             source_keyword_var.set(task.get("topic_title", ""))
             topic_id_var.set(candidate_id)
             crawling_task_id_var.set(task_id)
+            write_buffer_var.set(new_write_buffer())
+            if self.use_browser_pool:
+                browser_pool_var.set(get_browser_pool())
+
+            return await self._run_crawler(task, cookie_id)
 
-            # 5. 创建并运行 crawler
+    async def _run_crawler(self, task: dict, cookie_id: str) -> dict:
+        """在任务配置上下文中创建并运行 crawler"""
+        platform = task["platform"]
+        task_id = task["task_id"]
+        crawler = None
+        succeeded = False
+
+        try:
+            # 4. 创建并运行 crawler
             crawler_cls = _CRAWLERS.get(platform)
             if not crawler_cls:
                 return {"status": "failed", "error": f"不支持的平台: {platform}"}
             crawler = crawler_cls()
+            self.running_crawlers[task_id] = crawler
 
             logger.info(
                 f"[Worker] 开始执行任务 {task_id}: "
@@ -124,10 +145,13 @@ class PlatformWorker:
             )
 
             await asyncio.wait_for(crawler.start(), timeout=self.TASK_TIMEOUT)
+            # 落库写后缓冲，失败时行保留在缓冲中，任务记为失败
+            await flush_write_buffer()
 
-            # 6. 获取实际爬取数量
+            # 5. 获取实际爬取数量
             crawled_count = self._get_crawled_count(crawler)
             logger.info(f"[Worker] 任务 {task_id} 执行成功, 爬取 {crawled_count} 条内容")
+            succeeded = True
             return {"status": "success", "total_crawled": crawled_count, "cookie_id": cookie_id}
 
         except asyncio.TimeoutError:
@@ -161,8 +185,32 @@ class PlatformWorker:
             return {"status": "failed", "error": error_msg, "cookie_id": cookie_id}
 
         finally:
-            # 7. 恢复 config 快照
-            _restore_config(saved_config)
+            # 6. 失败任务尽量落库已爬数据，关闭 crawler 的 HTTP 连接池，归还浏览器上下文（失败的任务不复用）
+            self.running_crawlers.pop(task_id, None)
+            if not succeeded:
+                try:
+                    await flush_write_buffer()
+                except Exception as e:
+                    logger.error(f"[Worker] 任务 {task_id} 写后缓冲落库失败: {e}")
+            if crawler is not None:
+                await crawler.close_http_pool()
+                try:
+                    await crawler.release_pooled_browser(discard=not succeeded)
+                except Exception as e:
+                    logger.warning(f"[Worker] 任务 {task_id} 归还浏览器上下文失败: {e}")
+
+    @staticmethod
+    async def shutdown() -> None:
+        """关闭进程内共享的浏览器池与常驻签名进程（调度器 / 子进程退出时调用）"""
+        await close_browser_pool()
+        await close_js_signers()
+
+    def progress(self) -> dict:
+        """运行中任务的已爬取数量 {task_id: count}"""
+        return {
+            task_id: self._get_crawled_count(crawler)
+            for task_id, crawler in self.running_crawlers.items()
+        }
 
     @staticmethod
     def _get_crawled_count(crawler) -> int:
@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+"""
+WorkerPool — 多进程爬取任务执行池
+
+TaskDispatcher 默认在本进程内以 asyncio 任务运行所有 PlatformWorker，
+jieba 分词、JSON 解析、JS 签名、store 序列化等 CPU 开销共用一个核。
+进程池模式下任务交给 N 个常驻子进程执行：每个子进程有独立的事件循环、
+PlatformWorker 和浏览器，最多同时执行 tasks_per_process 个任务。
+
+本地 IPC（multiprocessing.Queue）:
+  - 任务队列：每个子进程一条，调度器 → 子进程；None 为退出信号。
+    由父进程按各子进程的空闲槽位分配任务（先记录分配再发送），子进程只读自己的队列，
+    被强制结束的子进程不会卡住其他子进程的队列锁
+  - 事件队列：子进程 → 调度器
+      {"type": "started",   "worker": i, "task_id": ...}
+      {"type": "heartbeat", "worker": i, "progress": {task_id: 已爬取数}}
+      {"type": "result",    "worker": i, "task_id": ..., "result": {...}}
+
+子进程退出或心跳超时时，其已开始的任务以 failed（worker_crashed）返回，
+由调度器按常规失败重试；已分配但尚未开始的任务放回待分配队列，并拉起新的子进程。
+
+execute_task 与 PlatformWorker.execute_task 接口一致，TaskDispatcher 可直接替换使用。
+"""
+
+import asyncio
+import multiprocessing
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+from loguru import logger
+
+
+def _platform_worker():
+    """子进程内创建 PlatformWorker（在子进程中导入 MediaCrawler）"""
+    from DeepSentimentCrawling.worker import PlatformWorker
+
+    return PlatformWorker()
+
+
+def _worker_main(index, task_q, event_q, heartbeat_interval, worker_factory):
+    """子进程入口"""
+    asyncio.run(_worker_loop(index, task_q, event_q, heartbeat_interval, worker_factory))
+
+
+async def _worker_loop(index, task_q, event_q, heartbeat_interval, worker_factory):
+    worker = worker_factory()
+    loop = asyncio.get_running_loop()
+    running: set[asyncio.Task] = set()
+
+    async def heartbeat():
+        while True:
+            event_q.put({"type": "heartbeat", "worker": index, "progress": worker.progress()})
+            await asyncio.sleep(heartbeat_interval)
+
+    async def run(task: dict):
+        try:
+            result = await worker.execute_task(task)
+        except Exception as e:
+            result = {"status": "failed", "error": f"{type(e).__name__}: {e}"}
+        event_q.put(
+            {"type": "result", "worker": index, "task_id": task["task_id"], "result": result}
+        )
+
+    beat = asyncio.create_task(heartbeat())
+    while True:
+        # 父进程只在本进程有空闲槽位时发送任务，收到即执行
+        task = await loop.run_in_executor(None, task_q.get)
+        if task is None:
+            break
+        event_q.put({"type": "started", "worker": index, "task_id": task["task_id"]})
+        t = asyncio.create_task(run(task))
+        running.add(t)
+        t.add_done_callback(running.discard)
+
+    if running:
+        await asyncio.gather(*running)
+    beat.cancel()
+    shutdown = getattr(worker, "shutdown", None)
+    if shutdown is not None:
+        await shutdown()
+
+
+class WorkerPool:
+    """常驻子进程池，任务结果、心跳和爬取进度通过事件队列回传"""
+
+    TASKS_PER_PROCESS = 2  # 单个子进程同时执行的任务数
+    HEARTBEAT_INTERVAL = 10  # 子进程心跳间隔 / 父进程巡检间隔（秒）
+    HEARTBEAT_TIMEOUT = 120  # 超过该时长无心跳视为卡死（秒）
+    STOP_TIMEOUT = 60  # 停止时等待子进程完成当前任务的时长（秒）
+
+    def __init__(
+        self,
+        processes: int,
+        tasks_per_process: int = TASKS_PER_PROCESS,
+        worker_factory: Callable = _platform_worker,
+        start_method: str = "spawn",
+    ):
+        """
+        Args:
+            processes: 子进程数
+            tasks_per_process: 单个子进程同时执行的任务数
+            worker_factory: 子进程内创建 worker 的函数，需提供 execute_task / progress
+            start_method: 默认 spawn，避免 fork 继承父进程的事件循环、线程和数据库连接
+        """
+        self.processes = processes
+        self.tasks_per_process = tasks_per_process
+        self._worker_factory = worker_factory
+        self._ctx = multiprocessing.get_context(start_method)
+        self._event_q = self._ctx.Queue()
+
+        self._procs: dict = {}  # index -> Process
+        self._task_qs: dict = {}  # index -> 该子进程的任务队列
+        self._free: dict[int, int] = {}  # index -> 空闲槽位数
+        self._heartbeats: dict[int, float] = {}
+        self._progress: dict[int, dict] = {}  # index -> {task_id: 已爬取数}
+        self._backlog: deque[dict] = deque()  # 等待空闲槽位的任务
+        self._tasks: dict[str, dict] = {}  # task_id -> 已分配的任务（子进程崩溃时重新分配）
+        self._assigned: dict[str, int] = {}  # task_id -> index（发送前记录）
+        self._started: set[str] = set()  # 子进程已开始执行的 task_id
+        self._futures: dict[str, asyncio.Future] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._reader: Optional[threading.Thread] = None
+        self._monitor_task: Optional[asyncio.Task] = None
+        self._running = False
+
+    # ==================== 生命周期 ====================
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._running = True
+        for index in range(self.processes):
+            self._spawn(index)
+        self._reader = threading.Thread(
+            target=self._read_events, name="worker-pool-events", daemon=True
+        )
+        self._reader.start()
+        self._monitor_task = asyncio.create_task(self._monitor())
+        logger.info(
+            f"[WorkerPool] 已启动 {self.processes} 个子进程，"
+            f"每进程并发 {self.tasks_per_process} 个任务"
+        )
+
+    async def stop(self) -> None:
+        """发送退出信号，等待子进程完成当前任务，超时强制结束"""
+        if not self._running:
+            return
+        self._running = False
+        if self._monitor_task:
+            self._monitor_task.cancel()
+        for task_q in self._task_qs.values():
+            task_q.put(None)
+
+        deadline = time.monotonic() + self.STOP_TIMEOUT
+        for proc in self._procs.values():
+            await asyncio.to_thread(proc.join, max(0.0, deadline - time.monotonic()))
+            if proc.is_alive():
+                logger.warning(f"[WorkerPool] 子进程 {proc.pid} 未按时退出，强制结束")
+                proc.kill()
+                await asyncio.to_thread(proc.join)
+
+        self._event_q.put(None)
+        await asyncio.to_thread(self._reader.join)
+        for task_id in list(self._futures):
+            self._resolve(task_id, {"status": "failed", "error": "worker_pool_stopped"})
+        logger.info("[WorkerPool] 已停止")
+
+    def _spawn(self, index: int) -> None:
+        # 每次拉起都新建任务队列，被强制结束的旧进程可能持有旧队列的读锁
+        task_q = self._ctx.Queue()
+        proc = self._ctx.Process(
+            target=_worker_main,
+            args=(index, task_q, self._event_q, self.HEARTBEAT_INTERVAL, self._worker_factory),
+            name=f"crawl-worker-{index}",
+        )
+        proc.start()
+        self._procs[index] = proc
+        self._task_qs[index] = task_q
+        self._free[index] = self.tasks_per_process
+        self._heartbeats[index] = time.monotonic()
+        self._progress[index] = {}
+        logger.info(f"[WorkerPool] 子进程 {index} 启动, pid={proc.pid}")
+
+    # ==================== 任务 ====================
+
+    async def execute_task(self, task: dict) -> dict:
+        """提交任务并等待子进程回传结果，返回值同 PlatformWorker.execute_task"""
+        future = self._loop.create_future()
+        self._futures[task["task_id"]] = future
+        # 下划线字段（_id、_from_redis 等）仅调度器内部使用，不传给子进程
+        self._backlog.append({k: v for k, v in task.items() if not k.startswith("_")})
+        self._assign()
+        return await future
+
+    def _assign(self) -> None:
+        """把待分配任务发给空闲槽位最多的子进程，发送前先记录分配关系"""
+        while self._backlog and self._running:
+            index = max(self._free, key=self._free.get, default=None)
+            if index is None or self._free[index] <= 0:
+                return
+            task = self._backlog.popleft()
+            task_id = task["task_id"]
+            self._free[index] -= 1
+            self._assigned[task_id] = index
+            self._tasks[task_id] = task
+            self._task_qs[index].put(task)
+
+    def _resolve(self, task_id: str, result: dict) -> None:
+        index = self._assigned.pop(task_id, None)
+        if index in self._free:
+            self._free[index] += 1
+        self._tasks.pop(task_id, None)
+        self._started.discard(task_id)
+        future = self._futures.pop(task_id, None)
+        if future is not None and not future.done():
+            future.set_result(result)
+
+    # ==================== 事件 / 巡检 ====================
+
+    def _read_events(self) -> None:
+        """后台线程：阻塞读取事件队列，转交事件循环处理"""
+        while True:
+            event = self._event_q.get()
+            if event is None:
+                return
+            self._loop.call_soon_threadsafe(self._on_event, event)
+
+    def _on_event(self, event: dict) -> None:
+        index = event["worker"]
+        self._heartbeats[index] = time.monotonic()
+        kind = event["type"]
+        # 已被判定崩溃的旧子进程可能还有残留事件，只处理仍分配给该子进程的任务
+        if kind == "started":
+            if self._assigned.get(event["task_id"]) == index:
+                self._started.add(event["task_id"])
+        elif kind == "heartbeat":
+            self._progress[index] = event["progress"]
+        elif kind == "result":
+            self._progress[index].pop(event["task_id"], None)
+            if self._assigned.get(event["task_id"]) == index:
+                self._resolve(event["task_id"], event["result"])
+                self._assign()
+
+    async def _monitor(self) -> None:
+        """巡检子进程：退出或心跳超时则结束其任务并重新拉起"""
+        while self._running:
+            await asyncio.sleep(self.HEARTBEAT_INTERVAL)
+            now = time.monotonic()
+            for index, proc in list(self._procs.items()):
+                silent = now - self._heartbeats[index]
+                if proc.is_alive() and silent < self.HEARTBEAT_TIMEOUT:
+                    continue
+                if proc.is_alive():
+                    reason = f"心跳超时 {silent:.0f}s"
+                    proc.kill()
+                    await asyncio.to_thread(proc.join)
+                else:
+                    reason = f"exitcode={proc.exitcode}"
+                self._recover(index, reason)
+
+    def _recover(self, index: int, reason: str) -> None:
+        assigned = [task_id for task_id, i in self._assigned.items() if i == index]
+        lost = [task_id for task_id in assigned if task_id in self._started]
+        requeued = [task_id for task_id in assigned if task_id not in self._started]
+        logger.error(
+            f"[WorkerPool] 子进程 {index} 异常 ({reason})，{len(lost)} 个运行中任务失败，"
+            f"{len(requeued)} 个未开始任务重新分配，重新拉起"
+        )
+        for task_id in lost:
+            self._resolve(task_id, {"status": "failed", "error": f"worker_crashed: {reason}"})
+        # 未开始的任务放回队首，保持原有顺序
+        for task_id in reversed(requeued):
+            self._assigned.pop(task_id, None)
+            self._backlog.appendleft(self._tasks.pop(task_id))
+        self._free.pop(index, None)
+        if self._running:
+            self._spawn(index)
+        self._assign()
+
+    def snapshot(self) -> dict:
+        """各子进程状态、运行中任务及其已爬取数量"""
+        now = time.monotonic()
+        workers = []
+        for index, proc in sorted(self._procs.items()):
+            progress = self._progress.get(index, {})
+            workers.append(
+                {
+                    "index": index,
+                    "pid": proc.pid,
+                    "alive": proc.is_alive(),
+                    "heartbeat_age": round(now - self._heartbeats[index], 1),
+                    "tasks": {
+                        task_id: progress.get(task_id, 0)
+                        for task_id, i in self._assigned.items()
+                        if i == index
+                    },
+                }
+            )
+        return {"workers": workers, "queued": len(self._backlog)}
@@ -44,6 +44,7 @@ class Settings(BaseSettings):
     REDIS_DB_PORT: int = Field(6379, description="Redis 端口")
     REDIS_DB_PWD: str = Field("", description="Redis 密码")
     REDIS_DB_NUM: int = Field(11, description="Redis 数据库编号")
+    TASK_QUEUE_BACKEND: str = Field("zset", description="深层采集任务队列：zset（单调度器）/ stream（Redis Streams 消费组，多调度节点）")
 
     # 深层采集服务配置
     SERVERCHAN_KEY: str = Field("", description="Server酱 SendKey，用于 cookie 过期等告警推送")
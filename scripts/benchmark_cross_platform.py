@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+跨平台共振聚类基准：keyword（倒排索引 + Union-Find）vs minhash（MinHash/LSH）
+
+合成带话题标签的数据（话题规模服从长尾分布，大话题远超 50 条），
+比较两种后端的运行时间与按条目对统计的召回率 / 精确率。
+
+用法:
+    python scripts/benchmark_cross_platform.py
+    python scripts/benchmark_cross_platform.py --sizes 1000 10000 --tokens char
+"""
+
+import argparse
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from BroadTopicExtraction.analyzer.minhash_lsh import MinHashLSH, char_shingles  # noqa: E402
+from BroadTopicExtraction.analyzer.signal_detector import DEFAULT_THRESHOLDS, _keyword_clusters  # noqa: E402
+
+_COMMON_WORDS = ["中国", "最新", "回应", "视频", "热议", "官方"]
+
+
+def _word(rng: random.Random, length: int = 2) -> str:
+    return "".join(chr(rng.randint(0x4E00, 0x9FA5)) for _ in range(length))
+
+
+def make_dataset(n: int, seed: int = 42) -> tuple[list[set[str]], list[str], list[int]]:
+    """生成 n 条 (关键词集合, 标题, 话题标签)，标签 -1 表示无话题的噪音条目"""
+    rng = random.Random(seed)
+    num_topics = max(n // 20, 1)
+    topics = [[_word(rng) for _ in range(6)] for _ in range(num_topics)]
+    # Zipf 长尾：少数大事件（如春晚）覆盖数百条
+    weights = [1.0 / (rank + 1) for rank in range(num_topics)]
+
+    keyword_sets, titles, labels = [], [], []
+    for _ in range(n):
+        if rng.random() < 0.1:
+            label = -1
+            words = [_word(rng) for _ in range(rng.randint(2, 4))]
+        else:
+            label = rng.choices(range(num_topics), weights)[0]
+            words = rng.sample(topics[label], rng.randint(3, 5))
+            if rng.random() < 0.3:
+                words.append(_word(rng))
+        if rng.random() < 0.5:
+            words.insert(0, rng.choice(_COMMON_WORDS))
+        keyword_sets.append(set(words))
+        titles.append("".join(words))
+        labels.append(label)
+    return keyword_sets, titles, labels
+
+
+def pair_metrics(groups: list[list[int]], labels: list[int]) -> tuple[float, float]:
+    """按条目对统计 (召回率, 精确率)，噪音条目不与任何条目构成真实配对"""
+
+    def pairs(count: int) -> int:
+        return count * (count - 1) // 2
+
+    truth = sum(pairs(c) for label, c in Counter(labels).items() if label != -1)
+    predicted = sum(pairs(len(g)) for g in groups)
+    hits = 0
+    for group in groups:
+        hits += sum(pairs(c) for label, c in Counter(labels[i] for i in group).items() if label != -1)
+    return (hits / truth if truth else 1.0, hits / predicted if predicted else 1.0)
+
+
+def run(sizes: list[int], tokens: str) -> None:
+    min_kw = DEFAULT_THRESHOLDS["cross_platform_min_keywords"]
+    lsh = MinHashLSH(
+        num_perm=DEFAULT_THRESHOLDS["minhash_num_perm"],
+        bands=DEFAULT_THRESHOLDS["minhash_bands"],
+    )
+    threshold = DEFAULT_THRESHOLDS["minhash_threshold"]
+
+    print(f"{'n':>7} {'engine':<8} {'seconds':>9} {'recall':>8} {'precision':>10} {'groups':>8}")
+    for n in sizes:
+        keyword_sets, titles, labels = make_dataset(n)
+
+        start = time.perf_counter()
+        id_groups = _keyword_clusters({str(i): kws for i, kws in enumerate(keyword_sets)}, min_kw)
+        elapsed = time.perf_counter() - start
+        groups = [[int(i) for i in g] for g in id_groups]
+        recall, precision = pair_metrics(groups, labels)
+        print(f"{n:>7} {'keyword':<8} {elapsed:>9.3f} {recall:>8.3f} {precision:>10.3f} {len(groups):>8}")
+
+        if tokens == "char":
+            token_sets, min_shared = [char_shingles(t) for t in titles], 1
+        else:
+            token_sets, min_shared = keyword_sets, min_kw
+        start = time.perf_counter()
+        groups = lsh.cluster(token_sets, threshold, min_shared=min_shared)
+        elapsed = time.perf_counter() - start
+        recall, precision = pair_metrics(groups, labels)
+        print(f"{n:>7} {'minhash':<8} {elapsed:>9.3f} {recall:>8.3f} {precision:>10.3f} {len(groups):>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="跨平台共振聚类基准")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--tokens", choices=["keyword", "char"], default="keyword")
+    args = parser.parse_args()
+    run(args.sizes, args.tokens)
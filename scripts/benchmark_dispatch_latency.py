@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+深度爬取任务提交→开始时延基准：固定间隔轮询 vs 事件唤醒
+
+用进程内的 TaskQueue 替身（同样的 score 规则与入队唤醒消息）驱动真实的
+TaskDispatcher 调度循环（dry_run，不访问 MongoDB / MySQL / 平台），
+按随机间隔提交用户任务，统计 _record_start 记录的提交→开始时延。
+轮询模式下时延约为 U(0, POLL_INTERVAL)，事件唤醒模式下只剩一次调度轮次的开销。
+
+用法:
+    python scripts/benchmark_dispatch_latency.py
+    python scripts/benchmark_dispatch_latency.py --tasks 20 --poll-interval 10
+"""
+
+import argparse
+import asyncio
+import heapq
+import queue
+import random
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from loguru import logger  # noqa: E402
+
+from DeepSentimentCrawling.dispatcher import ALL_PLATFORMS, TaskDispatcher  # noqa: E402
+
+
+class _MemoryPubSub:
+    def __init__(self, messages: queue.Queue):
+        self._messages = messages
+
+    def get_message(self, timeout: float = 0.0):
+        try:
+            return self._messages.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        pass
+
+
+class _MemoryTaskQueue:
+    """进程内的 TaskQueue 替身：score 为入队时间，入队时向订阅者发送唤醒消息"""
+
+    def __init__(self):
+        self._heap: list = []
+        self._subscribers: list[queue.Queue] = []
+        self._lock = threading.Lock()
+
+    def push_user_task(self, task: dict) -> str:
+        with self._lock:
+            heapq.heappush(self._heap, (time.time(), task["task_id"], task))
+            for messages in self._subscribers:
+                messages.put({"data": f"user:{task['task_id']}"})
+        return task["task_id"]
+
+    def pop_task(self):
+        with self._lock:
+            if not self._heap:
+                return None
+            score, task_id, task = heapq.heappop(self._heap)
+        prefixed_id = f"user:{task_id}"
+        return {**task, "_source": "user", "_redis_score": score, "_prefixed_id": prefixed_id}
+
+    def push_back(self, task: dict, score: float) -> None:
+        clean = {k: v for k, v in task.items() if not k.startswith("_")}
+        with self._lock:
+            heapq.heappush(self._heap, (score, task["task_id"], clean))
+
+    def ack(self, task: dict) -> None:
+        pass
+
+    def subscribe_wakeups(self) -> _MemoryPubSub:
+        messages: queue.Queue = queue.Queue()
+        with self._lock:
+            self._subscribers.append(messages)
+        return _MemoryPubSub(messages)
+
+    def get_queue_size(self) -> int:
+        return len(self._heap)
+
+
+class _BenchDispatcher(TaskDispatcher):
+    """只走 Redis 队列的调度器，不读写 MongoDB / MySQL"""
+
+    def __init__(self, task_queue: _MemoryTaskQueue, event_driven: bool, poll_interval: float):
+        super().__init__(dry_run=True)
+        self._task_queue = task_queue
+        self.EVENT_DRIVEN = event_driven
+        self.POLL_INTERVAL = poll_interval
+
+    def _fetch_from_mongo(self) -> list[dict]:
+        return []
+
+    def _ensure_task_in_mongo(self, task: dict) -> None:
+        pass
+
+    def _claim_mongo_task(self, task_id: str, reclaimed: bool = False) -> bool:
+        return True
+
+    def _update_task_status(self, task_id: str, updates: dict):
+        pass
+
+    def _watch_mongo(self) -> None:
+        pass
+
+    def _next_retry_at(self):
+        return None
+
+
+async def bench(event_driven: bool, tasks: int, poll_interval: float) -> list[float]:
+    task_queue = _MemoryTaskQueue()
+    dispatcher = _BenchDispatcher(task_queue, event_driven, poll_interval)
+    dispatcher._running = True
+    loop_task = asyncio.create_task(dispatcher._dispatch_loop())
+    await asyncio.sleep(0.5)  # 等待唤醒订阅建立
+
+    for i in range(tasks):
+        await asyncio.sleep(random.uniform(0, poll_interval))
+        task_queue.push_user_task(
+            {
+                "task_id": f"ut_bench_{i}",
+                "platform": ALL_PLATFORMS[i % len(ALL_PLATFORMS)],
+                "search_keywords": ["k"],
+                "attempts": 0,
+            }
+        )
+
+    deadline = time.monotonic() + poll_interval * 2 + 5
+    while len(dispatcher._latencies) < tasks and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+    dispatcher.stop()
+    await loop_task
+    return list(dispatcher._latencies)
+
+
+def _report(name: str, latencies: list[float]) -> None:
+    latencies = sorted(latencies)
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(
+        f"{name:<10} 任务 {len(latencies):3d}   "
+        f"平均 {statistics.mean(latencies) * 1000:8.1f} ms   "
+        f"P95 {p95 * 1000:8.1f} ms   最大 {latencies[-1] * 1000:8.1f} ms"
+    )
+
+
+def run(tasks: int, poll_interval: float) -> None:
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    _report("polling", asyncio.run(bench(False, tasks, poll_interval)))
+    _report("wake-up", asyncio.run(bench(True, tasks, poll_interval)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="深度爬取任务提交→开始时延基准")
+    parser.add_argument("--tasks", type=int, default=10)
+    parser.add_argument("--poll-interval", type=float, default=TaskDispatcher.POLL_INTERVAL)
+    args = parser.parse_args()
+    run(args.tasks, args.poll_interval)
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Scrapy 单次运行启动开销基准：subprocess（scrapy crawl 子进程）vs 进程内 CrawlerRunner
+
+两种方式运行同一个只请求 data: URL 的爬虫（不访问网络、不写库），
+耗时即每次调度的固定启动开销。子进程方式同样加载项目设置和全部爬虫模块；
+未启用 MongoPipeline，真实运行的子进程还要额外导入 pymongo / jieba，开销只会更大。
+
+用法:
+    python scripts/benchmark_scrapy_startup.py
+    python scripts/benchmark_scrapy_startup.py --runs 10
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "BroadTopicExtraction"))
+
+import scrapy  # noqa: E402
+
+from BroadTopicExtraction.scheduler.runner import SCRAPY_PROJECT_PATH, TaskRunner  # noqa: E402
+
+_SPIDER_SOURCE = '''
+import scrapy
+
+
+class DataSpider(scrapy.Spider):
+    name = "benchmark_data"
+    start_urls = ["data:,hello"]
+
+    def parse(self, response):
+        yield {"title": response.text}
+'''
+
+_OVERRIDES = {"ITEM_PIPELINES": {}, "LOG_ENABLED": False}
+
+
+class DataSpider(scrapy.Spider):
+    name = "benchmark_data"
+    start_urls = ["data:,hello"]
+
+    def parse(self, response):
+        yield {"title": response.text}
+
+
+def bench_subprocess(runs: int) -> list[float]:
+    with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as f:
+        f.write(_SPIDER_SOURCE)
+    cmd = [sys.executable, "-m", "scrapy", "runspider", f.name]
+    for key, value in _OVERRIDES.items():
+        cmd += ["-s", f"{key}={json.dumps(value) if isinstance(value, dict) else value}"]
+
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=str(SCRAPY_PROJECT_PATH), capture_output=True, check=True)
+        timings.append(time.perf_counter() - start)
+    Path(f.name).unlink()
+    return timings
+
+
+def bench_in_process(runs: int) -> list[float]:
+    runner = TaskRunner()
+
+    async def crawl_all() -> list[float]:
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            stats = await runner.crawl_in_process(DataSpider, _OVERRIDES)
+            assert stats["item_scraped_count"] == 1, stats
+            timings.append(time.perf_counter() - start)
+        return timings
+
+    return asyncio.run(crawl_all())
+
+
+def _report(name: str, timings: list[float]) -> None:
+    print(
+        f"{name:<12} 首次 {timings[0] * 1000:8.1f} ms   "
+        f"后续中位数 {statistics.median(timings[1:] or timings) * 1000:8.1f} ms"
+    )
+
+
+def run(runs: int) -> None:
+    _report("subprocess", bench_subprocess(runs))
+    _report("in-process", bench_in_process(runs))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrapy 单次运行启动开销基准")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    run(args.runs)
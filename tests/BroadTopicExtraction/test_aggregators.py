@@ -170,6 +170,9 @@ class TestTopHubAggregator:
         mock_response.text = '''
         <tr><td>1.</td><td><a href="https://example.com" target="_blank">测试</a></td><td>100</td></tr>
         '''
+        mock_response.status_code = 200
+        mock_response.headers = {}
+        mock_response.content = mock_response.text.encode("utf-8")
         mock_response.raise_for_status = MagicMock()
         mock_httpx_client.get = AsyncMock(return_value=mock_response)
 
@@ -492,3 +495,177 @@ class TestOfficialAPIAggregator:
         assert items[0]["title"] == "测试文章"
         assert items[0]["hot_value"] == 1000
         assert items[0]["author"] == "测试作者"
+
+
+class TestConcurrentFetch:
+    """测试并发抓取与限速"""
+
+    def test_token_bucket_reserve(self):
+        """突发额度用完后按速率排队"""
+        from BroadTopicExtraction.aggregators.rate_limit import TokenBucket
+
+        bucket = TokenBucket(rate=10, burst=2)
+        waits = [bucket.reserve() for _ in range(4)]
+
+        assert waits[:2] == [0.0, 0.0]
+        assert waits[2] == pytest.approx(0.1, abs=0.01)
+        assert waits[3] == pytest.approx(0.2, abs=0.01)
+
+    @pytest.mark.asyncio
+    async def test_fetch_all_concurrent(self):
+        """18 个源的总耗时接近单个最慢请求，而非总和"""
+        import asyncio
+        import time
+        from BroadTopicExtraction.aggregators.newsnow import NewsNowAggregator
+
+        aggregator = NewsNowAggregator()
+
+        async def fake_fetch(source, **kwargs):
+            await asyncio.sleep(0.05)
+            return aggregator._make_success_result(source, [{"title": source}])
+
+        with patch.object(aggregator, "fetch", side_effect=fake_fetch):
+            start = time.monotonic()
+            results = await aggregator.fetch_all()
+            elapsed = time.monotonic() - start
+
+        assert [r.source for r in results] == aggregator.get_supported_sources()
+        assert all(r.success for r in results)
+        assert elapsed < 0.5
+
+    @pytest.mark.asyncio
+    async def test_fetch_all_retry_and_partial(self):
+        """失败重试，不支持的源不重试，超时源记为失败而其余结果保留"""
+        import asyncio
+        from BroadTopicExtraction.aggregators import rate_limit
+        from BroadTopicExtraction.aggregators.newsnow import NewsNowAggregator
+
+        aggregator = NewsNowAggregator()
+        calls = {}
+
+        async def fake_fetch(source, **kwargs):
+            calls[source] = calls.get(source, 0) + 1
+            if source == "weibo" and calls[source] == 1:
+                return aggregator._make_error_result(source, "503")
+            if source == "zhihu":
+                await asyncio.sleep(10)
+            if source not in aggregator.SOURCE_MAP:
+                return aggregator._make_error_result(source, "不支持的数据源")
+            return aggregator._make_success_result(source, [])
+
+        with patch.object(aggregator, "fetch", side_effect=fake_fetch), \
+                patch.object(rate_limit, "RETRY_BACKOFF", 0.01):
+            results = await aggregator.fetch_all(
+                ["weibo", "zhihu", "unknown", "baidu"], timeout=0.5
+            )
+
+        by_source = {r.source: r for r in results}
+        assert by_source["weibo"].success and calls["weibo"] == 2
+        assert not by_source["zhihu"].success and "超时" in by_source["zhihu"].error
+        assert not by_source["unknown"].success and calls["unknown"] == 1
+        assert by_source["baidu"].success
+
+
+    @pytest.mark.asyncio
+    async def test_fetch_all_skips_retry_on_client_error(self):
+        """404 等非限流 4xx 不重试，429 / 5xx 重试"""
+        import httpx
+        from BroadTopicExtraction.aggregators import rate_limit
+        from BroadTopicExtraction.aggregators.newsnow import NewsNowAggregator
+
+        statuses = {"weibo": [404], "zhihu": [429, 200], "baidu": [503, 200]}
+        calls = {}
+
+        def handler(request):
+            source = request.url.params["id"]
+            calls[source] = calls.get(source, 0) + 1
+            status = statuses[source][calls[source] - 1]
+            return httpx.Response(status, json={"items": [{"title": source}]})
+
+        aggregator = NewsNowAggregator()
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with patch.object(aggregator, "_get_client", return_value=client), \
+                patch.object(rate_limit, "RETRY_BACKOFF", 0.01):
+            results = await aggregator.fetch_all(["weibo", "zhihu", "baidu"])
+
+        by_source = {r.source: r for r in results}
+        assert not by_source["weibo"].success and by_source["weibo"].status_code == 404
+        assert by_source["zhihu"].success and by_source["baidu"].success
+        assert calls == {"weibo": 1, "zhihu": 2, "baidu": 2}
+
+
+class TestConditionalFetch:
+    """测试条件请求与内容未变化短路"""
+
+    @staticmethod
+    def _client(handler):
+        import httpx
+
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    @pytest.mark.asyncio
+    async def test_etag_not_modified(self):
+        """第二次请求带 If-None-Match，304 时返回 unchanged"""
+        import httpx
+        from BroadTopicExtraction.aggregators.newsnow import NewsNowAggregator
+
+        seen_headers = []
+
+        def handler(request):
+            seen_headers.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json={"items": [{"title": "a"}]}, headers={"ETag": '"v1"'})
+
+        aggregator = NewsNowAggregator()
+        with patch.object(aggregator, "_get_client", return_value=self._client(handler)):
+            first = await aggregator.fetch("weibo")
+            second = await aggregator.fetch("weibo")
+
+        assert first.success and not first.unchanged and first.count == 1
+        assert second.success and second.unchanged and second.count == 0
+        assert seen_headers == [None, '"v1"']
+
+    @pytest.mark.asyncio
+    async def test_same_payload_skips_parsing(self):
+        """不支持条件请求的上游按内容哈希判断，内容变化或 forget_payload 后重新解析"""
+        import httpx
+        from BroadTopicExtraction.aggregators.newsnow import NewsNowAggregator
+
+        payloads = [{"items": [{"title": "a"}]}] * 3 + [{"items": [{"title": "b"}]}]
+
+        def handler(request):
+            return httpx.Response(200, json=payloads.pop(0))
+
+        aggregator = NewsNowAggregator()
+        with patch.object(aggregator, "_get_client", return_value=self._client(handler)), \
+                patch.object(aggregator, "_parse_items", wraps=aggregator._parse_items) as parse:
+            results = [await aggregator.fetch("weibo")]
+            results.append(await aggregator.fetch("weibo"))
+            aggregator.forget_payload("weibo")
+            results.append(await aggregator.fetch("weibo"))
+            results.append(await aggregator.fetch("weibo"))
+
+        assert [r.unchanged for r in results] == [False, True, False, False]
+        assert parse.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_parse_failure_does_not_record_payload(self):
+        """解析失败的响应不记录凭据，相同响应体重试时仍报错而不是返回 unchanged"""
+        import httpx
+        from BroadTopicExtraction.aggregators.newsnow import NewsNowAggregator
+
+        seen_headers = []
+
+        def handler(request):
+            seen_headers.append(request.headers.get("If-None-Match"))
+            return httpx.Response(200, text="<html>blocked</html>", headers={"ETag": '"v1"'})
+
+        aggregator = NewsNowAggregator()
+        with patch.object(aggregator, "_get_client", return_value=self._client(handler)):
+            first = await aggregator.fetch("weibo")
+            retry = await aggregator.fetch("weibo")
+
+        assert not first.success
+        assert not retry.success and not retry.unchanged
+        assert seen_headers == [None, None]
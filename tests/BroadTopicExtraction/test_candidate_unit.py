@@ -514,6 +514,140 @@ class TestRunCycleMocked:
         assert stats["signals_consumed"] == 1
         assert stats["candidates_created"] == 0
 
+    def test_matching_scores_only_candidates_sharing_keywords(self, manager, mock_mongo):
+        now = int(time.time())
+
+        def cand(cid, titles, keywords=None):
+            doc = {
+                "candidate_id": cid,
+                "canonical_title": titles[0],
+                "source_titles": list(titles),
+                "status": "emerging",
+                "platforms": ["baidu"],
+                "platform_count": 1,
+                "snapshots": [{"ts": now - 1800, "score_pos": 2000, "sum_hot": 100000}],
+                "first_seen_at": now - 3600,
+                "updated_at": now - 1800,
+                "status_history": [],
+            }
+            if keywords is not None:
+                doc["keywords"] = keywords
+            return doc
+
+        # 旧候选没有 keywords 字段，加载时补算
+        legacy = cand("cand_legacy", ["四川成都发生地震", "成都地震最新消息"])
+        others = [cand(f"cand_{i}", [f"无关话题{i}"], keywords=[f"无关{i}"]) for i in range(20)]
+        signals = [
+            _make_velocity_signal(title="四川成都地震救援"),
+            _make_position_jump_signal(title="春节档电影票房", curr_pos=3),
+            _make_position_jump_signal(title="春节档电影票房破纪录", curr_pos=4),
+        ]
+
+        def find_side_effect(collection, query, **kwargs):
+            if collection == "signals":
+                return signals
+            if collection == COLLECTION:
+                return [legacy, *others]
+            return []
+
+        mock_mongo.find.side_effect = find_side_effect
+        with patch.object(manager, "_compute_overlap", wraps=manager._compute_overlap) as overlap:
+            stats = manager.run_cycle()
+
+        assert stats["candidates_updated"] == 2
+        assert stats["candidates_created"] == 1
+        # 1 次候选匹配（仅 legacy 共享关键词）+ 1 次未匹配信号间聚类
+        assert overlap.call_count == 2
+
+        ops = mock_mongo.bulk_write.call_args[0][1]
+        saved = {op._filter["candidate_id"]: op._doc["$set"] for op in ops}
+        assert "救援" in saved["cand_legacy"]["keywords"]
+        assert saved["cand_legacy"]["keywords"] == sorted(saved["cand_legacy"]["keywords"])
+        # 关键词未变化的候选不重写 keywords
+        assert "keywords" not in saved["cand_0"]
+
+
+# ==================== 增量持久化 ====================
+
+
+class TestDeltaSave:
+    def _loaded_candidate(self, manager, mock_mongo, now):
+        doc = {
+            "candidate_id": "cand_big",
+            "canonical_title": "谷歌Gemini发布",
+            "source_titles": [f"谷歌Gemini相关标题{i}" for i in range(300)],
+            "keywords": ["Gemini", "谷歌"],
+            "status": "rising",
+            "platforms": ["baidu", "weibo"],
+            "platform_count": 2,
+            "snapshots": [
+                {"ts": now - 1800 * (MAX_SNAPSHOTS - i), "score_pos": 3000, "sum_hot": 500000}
+                for i in range(MAX_SNAPSHOTS)
+            ],
+            "first_seen_at": now - 3600,
+            "updated_at": now - 1800,
+            "status_history": [{"ts": now - 3600, "status": "emerging", "reason": "test"}],
+        }
+        mock_mongo.find.return_value = [doc]
+        return manager._load_active_candidates()[0]
+
+    def test_decay_only_pushes_snapshot(self, manager, mock_mongo):
+        from bson import BSON
+
+        now = int(time.time())
+        cand = self._loaded_candidate(manager, mock_mongo, now)
+        full_doc = {k: v for k, v in cand.items() if k != "_baseline"}
+        manager._apply_decay([cand], now)
+        manager._save_candidates([cand])
+
+        (op,) = mock_mongo.bulk_write.call_args[0][1]
+        assert not op._upsert
+        assert op._doc == {
+            "$set": {"updated_at": now},
+            "$push": {
+                "snapshots": {
+                    "$each": [{"ts": now, "score_pos": 2400, "sum_hot": 400000}],
+                    "$slice": -MAX_SNAPSHOTS,
+                }
+            },
+        }
+        # 写入量比整体 $set 小一个数量级以上
+        assert len(BSON.encode(op._doc)) * 10 < len(BSON.encode({"$set": full_doc}))
+
+    def test_update_pushes_titles_and_platforms(self, manager, mock_mongo):
+        now = int(time.time())
+        cand = self._loaded_candidate(manager, mock_mongo, now)
+        sig = _make_position_jump_signal(title="谷歌Gemini新功能", platform="bilibili")
+        manager._update_candidate(cand, sig, now)
+        manager._save_candidates([cand])
+
+        (op,) = mock_mongo.bulk_write.call_args[0][1]
+        assert op._doc["$push"]["source_titles"] == {"$each": ["谷歌Gemini新功能"], "$slice": SOURCE_TITLES_MAX}
+        assert op._doc["$push"]["platforms"] == {"$each": ["bilibili"]}
+        assert op._doc["$set"]["platform_count"] == 3
+        assert "功能" in op._doc["$set"]["keywords"]
+        assert "snapshots" in op._doc["$push"]
+
+    def test_untouched_candidate_skipped_and_new_upserted(self, manager, mock_mongo):
+        now = int(time.time())
+        cand = self._loaded_candidate(manager, mock_mongo, now)
+        new_cand = manager._create_candidate(_make_cross_platform_signal(), now)
+        result = manager._save_candidates([cand, new_cand])
+
+        assert result["skipped"] == 1
+        (op,) = mock_mongo.bulk_write.call_args[0][1]
+        assert op._filter == {"candidate_id": new_cand["candidate_id"]}
+        assert op._upsert is True
+
+    def test_rewritten_array_falls_back_to_set(self, manager, mock_mongo):
+        now = int(time.time())
+        cand = self._loaded_candidate(manager, mock_mongo, now)
+        cand["source_titles"] = ["重排后的标题"]
+        manager._save_candidates([cand])
+
+        (op,) = mock_mongo.bulk_write.call_args[0][1]
+        assert op._doc == {"$set": {"source_titles": ["重排后的标题"]}}
+
 
 # ==================== 状态机（真实场景模拟） ====================
 
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+change stream 实时检测 - 单元测试
+"""
+
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from pymongo.errors import AutoReconnect, OperationFailure
+
+from BroadTopicExtraction.analyzer import change_stream
+from BroadTopicExtraction.analyzer.change_stream import ChangeStreamWatcher
+
+
+class _FakeStream:
+    """按顺序返回事件，耗尽后设置 stop"""
+
+    def __init__(self, changes, stop, error=None):
+        self.changes = list(changes)
+        self.stop = stop
+        self.error = error
+        self.resume_token = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def try_next(self):
+        if not self.changes:
+            if self.error:
+                raise self.error
+            self.stop.set()
+            return None
+        change = self.changes.pop(0)
+        if change is not None:
+            self.resume_token = {"_data": change["_id"]}
+        return change
+
+
+def _change(i, coll, source):
+    return {"_id": str(i), "ns": {"coll": coll}, "fullDocument": {"source": source}}
+
+
+def _watcher(streams, **kwargs):
+    mongo = MagicMock()
+    mongo.db.watch.side_effect = streams
+    batches = []
+    watcher = ChangeStreamWatcher(mongo, lambda b, ts: batches.append(b), **kwargs)
+    return watcher, mongo, batches
+
+
+class TestChangeStreamWatcher:
+    def test_supported_by_topology(self):
+        watcher, mongo, _ = _watcher([])
+        mongo.db.command.return_value = {"isWritablePrimary": True}
+        assert not watcher.supported()
+        mongo.db.command.return_value = {"isWritablePrimary": True, "setName": "rs0"}
+        assert watcher.supported()
+
+    def test_micro_batches_by_collection_and_source(self):
+        stop = threading.Event()
+        changes = [
+            _change(1, "hot_national", "baidu_hot"),
+            _change(2, "hot_national", "baidu_hot"),
+            _change(3, "aggregator", "tophub_weibo"),
+            {"_id": "4", "ns": {"coll": "aggregator"}, "fullDocument": None},  # 已删除
+            _change(5, "hot_vertical", "36kr"),
+        ]
+        watcher, _, batches = _watcher([_FakeStream(changes, stop)], batch_max_events=3)
+        watcher.run(stop)
+        assert batches == [
+            {"hot_national": {"baidu_hot"}, "aggregator": {"tophub_weibo"}},
+            {"hot_vertical": {"36kr"}},
+        ]
+
+    def test_resumes_after_transient_error(self, monkeypatch):
+        monkeypatch.setattr(change_stream, "MAX_RETRIES", 1)
+        stop = threading.Event()
+        first = _FakeStream([_change(1, "hot_national", "baidu_hot")], stop, AutoReconnect("down"))
+        second = _FakeStream([_change(2, "hot_national", "weibo_hot")], stop)
+        watcher, mongo, batches = _watcher([first, second])
+        monkeypatch.setattr(stop, "wait", lambda timeout: None)
+
+        watcher.run(stop)
+
+        # 中断前收到的事件照常处理，重连时从 resume token 续接
+        assert batches == [{"hot_national": {"baidu_hot"}}, {"hot_national": {"weibo_hot"}}]
+        assert mongo.db.watch.call_args_list[1].kwargs["resume_after"] == {"_data": "1"}
+
+    def test_unsupported_deployment_raises(self):
+        stop = threading.Event()
+        error = OperationFailure("only supported on replica sets", code=40573)
+        watcher, mongo, _ = _watcher(error)
+        with pytest.raises(OperationFailure):
+            watcher.run(stop)
+        assert mongo.db.watch.call_count == 1
@@ -303,6 +303,43 @@ class TestScrapyPipelines:
         assert hasattr(MongoPipeline, "close_spider")
 
 
+    def test_batch_pipeline_flushes_by_size_time_and_close(self):
+        """满批、定时和关闭时各提交一次批量写入，写入结果计入 stats"""
+        import asyncio
+        from scrapy import Spider
+        from scrapy.statscollectors import MemoryStatsCollector
+        from twisted.internet import defer, task
+        from BroadTopicExtraction.crawlers.mindspider_crawlers import pipelines
+
+        batches = []
+
+        def write(items, source_name):
+            batches.append(([i["title"] for i in items], source_name))
+            return {"inserted": len(items), "updated": 0, "skipped": 0}
+
+        crawler = MagicMock()
+        stats = MemoryStatsCollector(crawler)
+        pipeline = pipelines.BatchMongoPipeline("mongodb://test", "config", 2, 5.0, stats)
+        pipeline.clock = task.Clock()
+        spider = Spider(name="rmrb")
+
+        with patch.object(pipelines, "DataProcessor") as MockProcessor, \
+                patch.object(pipeline, "_run_in_pool", side_effect=defer.maybeDeferred):
+            MockProcessor.return_value.process_batch_optimized.side_effect = write
+            pipeline.open_spider(spider)
+            for title in ["a", "b", "c"]:
+                pipeline.process_item({"title": title}, spider)
+            assert batches == [(["a", "b"], "rmrb")]
+
+            pipeline.clock.advance(5)
+            pipeline.process_item({"title": "d"}, spider)
+            asyncio.run(pipeline.close_spider(spider))
+
+        assert batches == [(["a", "b"], "rmrb"), (["c"], "rmrb"), (["d"], "rmrb")]
+        assert stats.get_value("mongo/inserted") == 4
+        MockProcessor.return_value.close.assert_called_once()
+
+
 class TestScrapyMiddlewares:
     """测试 Scrapy Middlewares"""
 
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+DataReader 历史字段 $slice 投影 - 单元测试
+
+用内存 collection 模拟服务端投影，统计一轮检测读取的 BSON 字节数。
+"""
+
+from unittest.mock import MagicMock
+
+from bson import BSON
+
+from BroadTopicExtraction.analyzer.data_reader import DataReader
+from BroadTopicExtraction.analyzer.signal_detector import SignalDetector
+from BroadTopicExtraction.pipeline.processor import HISTORY_MAX_POINTS
+
+_COLLECTIONS = ("hot_national", "hot_vertical", "aggregator")
+
+
+class _ProjectingMongo:
+    """按 inclusion / $slice 投影返回文档，并累计返回的 BSON 字节数"""
+
+    def __init__(self, docs: dict[str, list[dict]]):
+        self.docs = docs
+        self.bytes_returned = 0
+        self.projections: list[dict] = []
+
+    def find(self, collection, query, projection=None):
+        self.projections.append(projection)
+        result = []
+        for doc in self.docs.get(collection, []):
+            if doc["last_seen_at"] < query["last_seen_at"]["$gte"]:
+                continue
+            if "source" in query and doc.get("source") != query["source"]:
+                continue
+            out = {}
+            for key, spec in projection.items():
+                if key not in doc or not spec:
+                    continue
+                value = doc[key]
+                if isinstance(spec, dict):
+                    value = value[spec["$slice"]:]
+                out[key] = value
+            self.bytes_returned += len(BSON.encode(out))
+            result.append(out)
+        return result
+
+
+def _docs(now: int, per_collection: int = 300) -> dict[str, list[dict]]:
+    docs = {}
+    for c in _COLLECTIONS:
+        docs[c] = [
+            {
+                "item_id": f"{c}_{i}",
+                "title": f"{c}热搜标题{i}号事件进展",
+                "platform": "weibo",
+                "source": "tophub_weibo",
+                "position": i % 50 + 1,
+                "hot_value": 100000 + i,
+                "hot_value_history": [
+                    {"ts": now - 1800 * (HISTORY_MAX_POINTS - k), "val": 1000 * k} for k in range(HISTORY_MAX_POINTS)
+                ],
+                "position_history": [
+                    {"ts": now - 1800 * (HISTORY_MAX_POINTS - k), "val": 50 - k % 50}
+                    for k in range(HISTORY_MAX_POINTS)
+                ],
+                "first_seen_at": now - 86400,
+                "last_seen_at": now,
+            }
+            for i in range(per_collection)
+        ]
+    return docs
+
+
+class TestHistoryProjection:
+    def test_slice_projection(self):
+        mongo = _ProjectingMongo(_docs(1_700_000_000, per_collection=3))
+        reader = DataReader(mongo_writer=mongo)
+
+        items = reader.get_hot_national(1, history_points=2)
+        assert mongo.projections[-1]["hot_value_history"] == {"$slice": -2}
+        assert [p["val"] for p in items[0]["hot_value_history"]] == [
+            1000 * (HISTORY_MAX_POINTS - 2),
+            1000 * (HISTORY_MAX_POINTS - 1),
+        ]
+
+        items = reader.get_hot_vertical(1, history_points=0)
+        assert "position_history" not in mongo.projections[-1]
+        assert mongo.projections[-1]["vertical"] == 1
+        assert "position_history" not in items[0]
+
+        reader.get_aggregator(1)
+        assert mongo.projections[-1]["hot_value_history"] == 1
+
+    def test_detection_cycle_bytes_drop(self):
+        now = 1_700_000_000
+        docs = _docs(now)
+
+        def cycle_bytes(history_points):
+            mongo = _ProjectingMongo(docs)
+            reader = DataReader(mongo_writer=mongo)
+            reader._filters = {}
+            for c in _COLLECTIONS:
+                reader.get_items_by_source(c, "tophub_weibo", now - 3600, history_points=history_points)
+            reader.get_all_hot_items(now - 3600, history_points=history_points)
+            return mongo.bytes_returned
+
+        full, sliced = cycle_bytes(None), cycle_bytes(2)
+        assert sliced * 10 < full
+
+    def test_detector_requests_declared_history(self):
+        reader = MagicMock()
+        reader.get_items_by_source.return_value = []
+        reader.get_all_hot_items.return_value = []
+        detector = SignalDetector(data_reader=reader, signal_writer=MagicMock(), incremental=False)
+
+        detector.detect_for_source("tophub_weibo", "aggregator", since_ts=1)
+        detector.detect_cross_platform(since_ts=1)
+
+        assert reader.get_items_by_source.call_args.kwargs == {"history_points": 2}
+        assert reader.get_all_hot_items.call_args.kwargs == {"history_points": 2}
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+采集并发控制 - 单元测试
+"""
+
+import asyncio
+
+import pytest
+
+from BroadTopicExtraction.scheduler.governor import (
+    ConcurrencyGovernor,
+    GovernorLimits,
+    upstream_host,
+)
+
+
+def _source(category="hot_national", aggregator=None, platform="weibo"):
+    config = {"category": category, "platform": platform, "source_type": "scrapy"}
+    if aggregator:
+        config.update(source_type="aggregator", aggregator_name=aggregator)
+    return config
+
+
+async def _run_all(governor, jobs, hold=0.01):
+    """并发运行 jobs=[(name, config)]，返回 (放行顺序, 各时刻最大并发)"""
+    order, peak = [], {"now": 0, "max": 0}
+
+    async def job(name, config):
+        async with governor.slot(name, config):
+            order.append(name)
+            peak["now"] += 1
+            peak["max"] = max(peak["max"], peak["now"])
+            await asyncio.sleep(hold)
+            peak["now"] -= 1
+
+    await asyncio.gather(*(job(n, c) for n, c in jobs))
+    return order, peak["max"]
+
+
+class TestUpstreamHost:
+    def test_priority(self):
+        assert upstream_host(_source(aggregator="tophub")) == "tophub"
+        assert upstream_host(_source(aggregator="official", platform="baidu")) == "baidu"
+        assert upstream_host({**_source(aggregator="tophub"), "upstream_host": "x"}) == "x"
+        assert upstream_host(_source(platform="36kr")) == "36kr"
+
+
+class TestConcurrencyGovernor:
+    def test_limits_from_config(self):
+        limits = GovernorLimits.from_config({"global": 3, "hosts": {"tophub": 1}})
+        assert limits.global_limit == 3
+        assert limits.hosts == {"tophub": 1}
+        assert GovernorLimits.from_config(None) == GovernorLimits()
+
+    @pytest.mark.asyncio
+    async def test_global_limit(self):
+        governor = ConcurrencyGovernor(GovernorLimits(global_limit=2))
+        jobs = [(f"s{i}", _source(platform=f"p{i}")) for i in range(6)]
+        order, peak = await _run_all(governor, jobs)
+        assert peak == 2
+        assert order == [f"s{i}" for i in range(6)]
+        assert governor.snapshot()["running"] == {}
+
+    @pytest.mark.asyncio
+    async def test_host_limit_does_not_block_other_hosts(self):
+        governor = ConcurrencyGovernor(GovernorLimits(global_limit=4, hosts={"tophub": 1}))
+        jobs = [
+            ("tophub_a", _source(aggregator="tophub")),
+            ("tophub_b", _source(aggregator="tophub")),
+            ("newsnow_a", _source(aggregator="newsnow")),
+        ]
+        order, _ = await _run_all(governor, jobs)
+        # tophub_b 等 tophub 槽位时，newsnow_a 可以先行
+        assert order == ["tophub_a", "newsnow_a", "tophub_b"]
+
+    @pytest.mark.asyncio
+    async def test_earlier_waiter_keeps_priority(self):
+        """资源释放时先分给更早到达的等待者，不会被后来的任务饿死"""
+        governor = ConcurrencyGovernor(GovernorLimits(global_limit=2, categories={"media": 1}))
+        jobs = [
+            ("media_a", _source(category="media", platform="a")),
+            ("media_b", _source(category="media", platform="b")),
+            ("hot_a", _source(platform="c")),
+            ("hot_b", _source(platform="d")),
+        ]
+        order, peak = await _run_all(governor, jobs)
+        assert peak == 2
+        # media_b 等 media 槽位时 hot_a 先行；media_a 释放后 media_b 先于 hot_b
+        assert order.index("media_b") < order.index("hot_b")
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_releases_queue(self):
+        governor = ConcurrencyGovernor(GovernorLimits(global_limit=1))
+        config = _source()
+
+        async with governor.slot("first", config):
+            waiting = asyncio.create_task(_run_all(governor, [("second", config)]))
+            await asyncio.sleep(0.01)
+            assert governor.snapshot()["queued"] == ["second"]
+            waiting.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiting
+        assert governor.snapshot()["queued"] == []
+        assert governor.snapshot()["running"] == {}
+
+    @pytest.mark.asyncio
+    async def test_queue_wait_stats(self):
+        governor = ConcurrencyGovernor(GovernorLimits(global_limit=1))
+        waits = {}
+
+        async def job(name):
+            async with governor.slot(name, _source()) as wait:
+                waits[name] = wait
+                await asyncio.sleep(0.05)
+
+        await asyncio.gather(job("first"), job("second"))
+        assert waits["first"] < 0.01
+        assert waits["second"] >= 0.04
+        stats = governor.snapshot()["queue_wait"]
+        assert stats["second"]["count"] == 1
+        assert stats["second"]["max_seconds"] == pytest.approx(waits["second"], abs=1e-3)
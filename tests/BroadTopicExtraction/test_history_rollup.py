@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+时变字段历史压缩 - 单元测试
+"""
+
+from unittest.mock import MagicMock
+
+from BroadTopicExtraction.pipeline.history_rollup import (
+    MIN_RAW_POINTS,
+    ROLLUP_COLLECTION,
+    HistoryCompactor,
+    bucket_start,
+    rollup_points,
+    split_history,
+)
+
+# 2023-11-15 00:00 北京时间
+DAY = 1699977600
+
+
+class TestRollupPoints:
+    def test_bucket_start_uses_beijing_day(self):
+        assert bucket_start(DAY + 5 * 3600 + 120, "hour") == DAY + 5 * 3600
+        assert bucket_start(DAY + 23 * 3600, "day") == DAY
+        assert bucket_start(DAY - 1, "day") == DAY - 86400
+
+    def test_min_max_last_count(self):
+        points = [
+            {"ts": DAY + 1800, "val": 300},
+            {"ts": DAY + 600, "val": 500},
+            {"ts": DAY + 3000, "val": 100},
+            {"ts": DAY + 3700, "val": 900},
+            {"ts": DAY + 3800, "val": None},
+        ]
+        assert rollup_points(points, "hour") == {
+            DAY: {"min": 100, "max": 500, "last": 100, "last_ts": DAY + 3000, "count": 3},
+            DAY + 3600: {"min": 900, "max": 900, "last": 900, "last_ts": DAY + 3700, "count": 1},
+        }
+        assert rollup_points(points, "day")[DAY]["count"] == 4
+
+    def test_split_keeps_recent_and_minimum_points(self):
+        history = [{"ts": DAY + i * 1800, "val": i} for i in range(6)]
+        assert split_history(history, DAY + 3 * 1800) == history[:3]
+        # 全部早于 cutoff 时也保留最近 MIN_RAW_POINTS 个
+        assert split_history(history, DAY + 86400) == history[:-MIN_RAW_POINTS]
+        assert split_history(history[:MIN_RAW_POINTS], DAY + 86400) == []
+
+
+class TestHistoryCompactor:
+    def _compactor(self, docs):
+        mongo = MagicMock()
+        mongo.find.side_effect = [docs, []]
+        config_loader = MagicMock()
+        config_loader.get_all_sources.return_value = {
+            "weibo_hot": {"mongo_collection": "hot_national", "time_varying_fields": ["position", "hot_value"]},
+            "rmrb": {"mongo_collection": "media", "time_varying_fields": []},
+        }
+        return HistoryCompactor(mongo_writer=mongo, config_loader=config_loader), mongo
+
+    def test_history_fields_from_config(self):
+        compactor, _ = self._compactor([])
+        assert compactor.history_fields() == {"hot_national": ["hot_value", "position"]}
+
+    def test_rolls_up_then_pulls_old_points(self):
+        history = [{"ts": DAY + i * 1800, "val": 1000 + i} for i in range(10)]
+        docs = [{"_id": "oid", "item_id": "abc", "hot_value_history": history, "position_history": history[-2:]}]
+        compactor, mongo = self._compactor(docs)
+
+        stats = compactor.compact_collection("hot_national", ["hot_value", "position"], cutoff=DAY + 4 * 1800)
+
+        assert stats == {"documents": 1, "points": 4, "buckets": 3}
+        (rollup_call, pull_call) = mongo.bulk_write.call_args_list
+        assert rollup_call.args[0] == ROLLUP_COLLECTION
+        ops = {(op._filter["granularity"], op._filter["bucket"]): op._doc for op in rollup_call.args[1]}
+        assert ops[("hour", DAY)]["$min"] == {"min": 1000}
+        assert ops[("hour", DAY + 3600)]["$set"] == {"last": 1003}
+        assert ops[("day", DAY)]["$inc"] == {"count": 4}
+        assert "expire_at" in ops[("hour", DAY)]["$setOnInsert"]
+        assert "expire_at" not in ops[("day", DAY)]["$setOnInsert"]
+
+        assert pull_call.args[0] == "hot_national"
+        (pull,) = pull_call.args[1]
+        assert pull._doc == {"$pull": {"hot_value_history": {"ts": {"$in": [p["ts"] for p in history[:4]]}}}}
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+共享关键词提取缓存 - 单元测试
+"""
+
+from BroadTopicExtraction.pipeline import keywords
+from BroadTopicExtraction.pipeline.keywords import (
+    extract_keywords,
+    item_keywords,
+    keyword_cache_stats,
+)
+
+
+class TestKeywordCache:
+    def test_repeated_titles_hit_cache(self):
+        keywords._tokenize.cache_clear()
+        first = extract_keywords("台风登陆浙江沿海")
+        for _ in range(3):
+            assert extract_keywords("台风登陆浙江沿海") == first
+
+        stats = keyword_cache_stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 3
+        assert stats["size"] == 1
+        assert stats["hit_rate"] == 0.75
+
+    def test_cached_result_not_shared_with_callers(self):
+        kws = extract_keywords("华为芯片发布会")
+        kws.add("噪音")
+        assert "噪音" not in extract_keywords("华为芯片发布会")
+        assert "噪音" not in item_keywords({"title": "华为芯片发布会"})
+
+    def test_item_keywords_prefers_stored_field(self):
+        keywords._tokenize.cache_clear()
+        item = {"title": "华为芯片发布会", "keywords": ["华为", "芯片"]}
+        assert item_keywords(item) == {"华为", "芯片"}
+        assert keyword_cache_stats()["misses"] == 0
+
+        # 旧数据没有 keywords 字段，回退到分词
+        assert item_keywords({"title": "华为芯片发布会"}) == extract_keywords("华为芯片发布会")
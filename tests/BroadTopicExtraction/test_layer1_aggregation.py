@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+Layer 1 聚合管道引擎 - 单元测试
+
+用内存 collection 解释 DataReader.match_hot_items 生成的聚合管道，
+与 Python 引擎在同一批数据、同一组阈值上交叉校验。
+"""
+
+import random
+from unittest.mock import patch
+
+from BroadTopicExtraction.analyzer.data_reader import DataReader
+from BroadTopicExtraction.analyzer.signal_detector import SignalDetector, layer1_match_expr
+
+NOW = 1_700_000_000
+SOURCE = "baidu_hot"
+
+_REMOVE = object()
+
+
+def _eval(expr, doc: dict, env: dict):
+    """解释管道用到的聚合表达式子集"""
+    if expr == "$$REMOVE":
+        return _REMOVE
+    if isinstance(expr, str) and expr.startswith("$$"):
+        name, *path = expr[2:].split(".")
+        value = env.get(name)
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+        return value
+    if isinstance(expr, str) and expr.startswith("$"):
+        return doc.get(expr[1:])
+    if not isinstance(expr, dict):
+        return expr
+
+    ((op, args),) = expr.items()
+    if op == "$let":
+        scope = {**env, **{k: _eval(v, doc, env) for k, v in args["vars"].items()}}
+        return _eval(args["in"], doc, scope)
+    if op == "$and":
+        return all(_eval(a, doc, env) for a in args)  # 与 MongoDB 一致短路求值
+    if op == "$or":
+        return any(_eval(a, doc, env) for a in args)
+    if op == "$cond":
+        cond, then, other = args
+        return _eval(then if _eval(cond, doc, env) else other, doc, env)
+
+    values = [_eval(a, doc, env) for a in args]
+    if op == "$isArray":
+        return isinstance(values[0], list)
+    if op == "$ifNull":
+        return values[0] if values[0] is not None else values[1]
+    if op == "$arrayElemAt":
+        array, index = values
+        return array[index] if array and -len(array) <= index < len(array) else None
+    if op == "$slice":
+        array, n = values
+        return array[n:] if array is not None else None
+    binary = {
+        "$gt": lambda a, b: a > b,
+        "$gte": lambda a, b: a >= b,
+        "$lte": lambda a, b: a <= b,
+        "$eq": lambda a, b: a == b,
+        "$ne": lambda a, b: a != b,
+        "$subtract": lambda a, b: a - b,
+        "$divide": lambda a, b: a / b,
+    }
+    return binary[op](*values)
+
+
+class _AggregatingMongo:
+    """按 $match / $match.$expr / $project 执行聚合管道，同时支持 find"""
+
+    def __init__(self, docs: list[dict]):
+        self.docs = docs
+        self.pipelines: list[list[dict]] = []
+
+    def _match(self, doc: dict, query: dict) -> bool:
+        if doc["last_seen_at"] < query["last_seen_at"]["$gte"]:
+            return False
+        return "source" not in query or doc.get("source") == query["source"]
+
+    def find(self, collection, query, projection=None):
+        result = []
+        for doc in self.docs:
+            if self._match(doc, query):
+                out = {}
+                for key, spec in projection.items():
+                    if key in doc and spec:
+                        out[key] = doc[key][spec["$slice"]:] if isinstance(spec, dict) else doc[key]
+                result.append(out)
+        return result
+
+    @staticmethod
+    def _project(doc: dict, projection: dict) -> dict:
+        out = {}
+        for key, spec in projection.items():
+            if isinstance(spec, dict):
+                value = _eval(spec, doc, {})
+                if value is not _REMOVE:
+                    out[key] = value
+            elif spec and key in doc:
+                out[key] = doc[key]
+        return out
+
+    def aggregate(self, collection, pipeline):
+        self.pipelines.append(pipeline)
+        docs = self.docs
+        for stage in pipeline:
+            if "$match" in stage and "$expr" in stage["$match"]:
+                docs = [d for d in docs if _eval(stage["$match"]["$expr"], d, {})]
+            elif "$match" in stage:
+                docs = [d for d in docs if self._match(d, stage["$match"])]
+            else:
+                docs = [self._project(d, stage["$project"]) for d in docs]
+        return docs
+
+
+def _random_docs(n: int = 400, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    docs = []
+    for i in range(n):
+        points = rng.choice([0, 1, 2, 5])
+        hot = [{"ts": NOW - 600 * (points - k), "val": rng.choice([0, 5000, 9000, 12000, 30000])}
+               for k in range(points)]
+        pos = [{"ts": NOW - 600 * (points - k), "val": rng.randint(0, 50)} for k in range(points)]
+        if points and rng.random() < 0.1:
+            del hot[-1]["val"]  # 缺失 val 按 0 处理
+        doc = {
+            "item_id": f"item_{i}",
+            "title": f"热搜标题{i}",
+            "platform": "baidu",
+            "source": SOURCE if i % 5 else "weibo_hot",
+            "position": rng.choice([None, 0, 3, 10, 11, 40]),
+            "hot_value": rng.choice([None, 0, 20000, 50000, 80000]),
+            "first_seen_at": rng.choice([0, NOW - 100, NOW - 1800, NOW - 1801, NOW - 7200]),
+            "last_seen_at": NOW - rng.choice([0, 1800, 7200]),
+        }
+        if points:
+            doc["hot_value_history"] = hot
+            doc["position_history"] = pos
+        docs.append(doc)
+    return docs
+
+
+def _detect(engine: str, docs: list[dict]) -> tuple[list[dict], _AggregatingMongo]:
+    mongo = _AggregatingMongo(docs)
+    reader = DataReader(mongo_writer=mongo)
+    reader._filters = {}
+    detector = SignalDetector(
+        data_reader=reader,
+        signal_writer=mongo,
+        thresholds={"layer1_engine": engine},
+    )
+    with patch("BroadTopicExtraction.analyzer.signal_detector.time.time", return_value=NOW), \
+            patch.object(SignalDetector, "_write_signals"):
+        signals = detector.detect_for_source(SOURCE, "hot_national", since_ts=NOW - 3600)
+    return signals, mongo
+
+
+class TestLayer1Aggregation:
+    def test_engines_agree(self):
+        docs = _random_docs()
+        python_signals, _ = _detect("python", docs)
+        agg_signals, mongo = _detect("aggregation", docs)
+
+        assert {s["signal_type"] for s in python_signals} == {"velocity", "new_entry", "position_jump"}
+        key = lambda s: (s["signal_type"], s["title"])  # noqa: E731
+        assert sorted(map(key, agg_signals)) == sorted(map(key, python_signals))
+        assert sorted(agg_signals, key=key) == sorted(python_signals, key=key)
+
+        # 服务端只返回触发信号的条目
+        (pipeline,) = mongo.pipelines
+        returned = mongo.aggregate("hot_national", pipeline)
+        assert len(returned) == len({s["title"] for s in python_signals})
+        history_spec = pipeline[-1]["$project"]["hot_value_history"]
+        assert history_spec["$cond"][1] == {"$slice": ["$hot_value_history", -2]}
+
+    def test_thresholds_shared(self):
+        doc = {
+            "hot_value_history": [{"val": 10000}, {"val": 14000}],
+            "position_history": [{"val": 20}, {"val": 15}],
+            "first_seen_at": NOW - 7200,
+        }
+        loose = {
+            "velocity_growth_rate": 0.4,
+            "velocity_min_hot_value": 10000,
+            "new_entry_max_age": 1800,
+            "new_entry_min_hot_value": 50000,
+            "new_entry_max_position": 10,
+            "position_jump_min": 5,
+        }
+        assert _eval(layer1_match_expr(loose, NOW), doc, {})
+        strict = {**loose, "velocity_growth_rate": 0.5, "position_jump_min": 6}
+        assert not _eval(layer1_match_expr(strict, NOW), doc, {})
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+MinHash/LSH 聚类后端 - 单元测试
+"""
+
+from unittest.mock import MagicMock
+
+from BroadTopicExtraction.analyzer.minhash_lsh import MinHashLSH, char_shingles
+from BroadTopicExtraction.analyzer.resonance_index import MAX_KEYWORD_FANOUT
+from BroadTopicExtraction.analyzer.signal_detector import SignalDetector, _keyword_clusters
+
+
+class TestMinHashLSH:
+    def test_groups_near_duplicates(self):
+        token_sets = [
+            {"华为", "芯片", "发布会"},
+            {"台风", "登陆", "浙江"},
+            {"华为", "芯片", "发布会", "解读"},
+            {"台风", "登陆", "浙江", "视频"},
+            {"高考", "分数线"},
+        ]
+        groups = MinHashLSH().cluster(token_sets, threshold=0.5, min_shared=2)
+        assert groups == [[0, 2], [1, 3], [4]]
+
+    def test_char_shingles(self):
+        assert char_shingles("台风 登陆") == {"台风", "风登", "登陆"}
+        assert char_shingles("热") == {"热"}
+
+    def test_popular_topic_not_dropped_past_fanout(self):
+        # 大事件（如春晚）的关键词命中数远超 MAX_KEYWORD_FANOUT
+        extras = ["节目", "主持人", "小品", "歌曲", "舞台", "观众"]
+        token_sets = [{"春晚", "直播", extras[i % 6], extras[(i + 1) % 6]} for i in range(MAX_KEYWORD_FANOUT * 3)]
+        keyword_groups = _keyword_clusters({str(i): kws for i, kws in enumerate(token_sets)}, 2)
+        assert max(len(g) for g in keyword_groups) < len(token_sets)
+
+        groups = MinHashLSH().cluster(token_sets, threshold=0.3, min_shared=2)
+        assert [len(g) for g in groups] == [len(token_sets)]
+
+
+class TestMinHashEngine:
+    def _items(self):
+        platforms = ["weibo", "baidu", "douyin", "zhihu"]
+        items = [
+            {"item_id": f"a{i}", "title": title, "platform": platforms[i], "hot_value": 1000, "position": i + 1}
+            for i, title in enumerate(["华为芯片发布会", "华为发布会芯片", "华为芯片发布会现场", "华为新芯片发布会"])
+        ]
+        items.append({"item_id": "b", "title": "台风登陆浙江", "platform": "weibo", "hot_value": 10, "position": 9})
+        return items
+
+    def test_engine_selected_via_thresholds(self):
+        items = self._items()
+        keyword = SignalDetector(data_reader=MagicMock(), signal_writer=MagicMock(), incremental=False)
+        minhash = SignalDetector(
+            data_reader=MagicMock(),
+            signal_writer=MagicMock(),
+            thresholds={"cross_platform_engine": "minhash"},
+        )
+        keyword_signals = keyword._detect_cross_platform(items)
+        minhash_signals = minhash._detect_cross_platform(items)
+        assert minhash._minhash is not None and keyword._minhash is None
+        assert len(minhash_signals) == 1
+        assert minhash_signals == keyword_signals
+
+    def test_minhash_engine_uses_batch_read(self):
+        reader = MagicMock()
+        reader.get_all_hot_items.return_value = self._items()
+        detector = SignalDetector(
+            data_reader=reader,
+            signal_writer=MagicMock(),
+            thresholds={"cross_platform_engine": "minhash", "minhash_tokens": "char"},
+        )
+        signals = detector.detect_cross_platform(0)
+        reader.get_all_hot_items.assert_called_once()
+        reader.get_hot_updates.assert_not_called()
+        assert len(signals) == 1
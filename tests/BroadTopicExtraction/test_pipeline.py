@@ -7,7 +7,7 @@ Pipeline 模块单元测试
 
 import pytest
 import hashlib
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 
 class TestConfigLoader:
@@ -254,11 +254,36 @@ class TestDataProcessor:
             assert doc["last_seen_at"] == now
             assert doc["position_history"] == [{"ts": now, "val": 1}]
             assert doc["hot_value_history"] == [{"ts": now, "val": 1000}]
+            # 未指定热搜 collection 时不写关键词
+            assert "keywords" not in doc
+
+    def test_build_new_doc_stores_keywords_for_hot_items(self, temp_yaml_config):
+        """测试热搜文档入库时写入标题关键词"""
+        with patch("BroadTopicExtraction.pipeline.mongo_writer.settings"):
+            from BroadTopicExtraction.pipeline.keywords import extract_keywords
+            from BroadTopicExtraction.pipeline.processor import DataProcessor
+
+            processor = DataProcessor(
+                mongo_uri="mongodb://test:27017",
+                config_dir=str(temp_yaml_config),
+            )
+
+            item = {"title": "华为芯片发布会现场", "hot_value": 1000}
+            doc = processor._build_new_doc(
+                item, "test_id", "weibo_hot", ["hot_value"], 1700000000, "hot_national"
+            )
+            assert doc["keywords"] == sorted(extract_keywords(item["title"]))
+            assert "keywords" not in item
+
+            doc = processor._build_new_doc(
+                {"title": "人民日报评论"}, "rmrb_id", "rmrb", [], 1700000000, "media"
+            )
+            assert "keywords" not in doc
 
     def test_build_update_ops(self, temp_yaml_config):
         """测试构建更新操作"""
         with patch("BroadTopicExtraction.pipeline.mongo_writer.settings"):
-            from BroadTopicExtraction.pipeline.processor import DataProcessor
+            from BroadTopicExtraction.pipeline.processor import DataProcessor, HISTORY_MAX_POINTS
 
             processor = DataProcessor(
                 mongo_uri="mongodb://test:27017",
@@ -275,8 +300,14 @@ class TestDataProcessor:
             assert ops["$set"]["last_seen_at"] == now
             assert ops["$set"]["position"] == 5
             assert ops["$set"]["hot_value"] == 2000
-            assert ops["$push"]["position_history"] == {"ts": now, "val": 5}
-            assert ops["$push"]["hot_value_history"] == {"ts": now, "val": 2000}
+            assert ops["$push"]["position_history"] == {
+                "$each": [{"ts": now, "val": 5}],
+                "$slice": -HISTORY_MAX_POINTS,
+            }
+            assert ops["$push"]["hot_value_history"] == {
+                "$each": [{"ts": now, "val": 2000}],
+                "$slice": -HISTORY_MAX_POINTS,
+            }
 
     def test_build_update_ops_partial(self, temp_yaml_config):
         """测试部分字段更新"""
@@ -315,6 +346,92 @@ class TestDataProcessor:
                     processor.process({"title": "test"}, "unknown_source")
 
 
+class TestAsyncDataProcessor:
+    """测试异步数据处理器"""
+
+    @pytest.mark.asyncio
+    async def test_process_batch_optimized_awaits_writer(self, temp_yaml_config):
+        """整批一次 bulk_write upsert，不预先查询，统计取自写入结果"""
+        from BroadTopicExtraction.pipeline.processor import AsyncDataProcessor
+
+        processor = AsyncDataProcessor(
+            mongo_uri="mongodb://test:27017",
+            config_dir=str(temp_yaml_config),
+        )
+        processor.mongo_writer = AsyncMock()
+        processor.mongo_writer.bulk_write.return_value = {
+            "inserted": 0, "modified": 1, "upserted": 1,
+        }
+        items = [
+            {"title": "已存在", "position": 1, "hot_value": 10},
+            {"title": "新条目", "position": 2},
+            {"title": "未变化", "position": 3},
+        ]
+
+        stats = await processor.process_batch_optimized(items, "weibo_hot")
+
+        assert stats == {"inserted": 1, "updated": 1, "skipped": 1}
+        processor.mongo_writer.connect.assert_awaited_once()
+        processor.mongo_writer.find.assert_not_called()
+        collection, operations = processor.mongo_writer.bulk_write.await_args.args
+        assert collection == "raw_hot_national"
+        assert all(op._upsert for op in operations)
+
+
+    def test_async_processor_not_a_sync_processor(self, temp_yaml_config):
+        """异步处理器不继承同步处理器：没有同步上下文管理和逐条接口"""
+        from BroadTopicExtraction.pipeline.processor import AsyncDataProcessor, DataProcessor
+
+        processor = AsyncDataProcessor(config_dir=str(temp_yaml_config))
+        assert not isinstance(processor, DataProcessor)
+        for name in ("__enter__", "process", "process_batch"):
+            assert not hasattr(processor, name)
+
+
+class TestUpsertPath:
+    """测试单次往返 upsert"""
+
+    def test_upsert_paths_do_not_conflict(self, temp_yaml_config):
+        """$setOnInsert 与 $set / $push 不含相同字段，插入后文档与 _build_new_doc 一致"""
+        from BroadTopicExtraction.pipeline.processor import DataProcessor
+
+        processor = DataProcessor(config_dir=str(temp_yaml_config))
+        item = {"title": "测试", "platform": "weibo", "position": 1, "hot_value": None}
+        update = processor._build_upsert(
+            item, "id1", "weibo_hot", ["position", "hot_value"], 100, "raw_hot_national"
+        )
+
+        on_insert = set(update["$setOnInsert"])
+        assert not on_insert & set(update["$set"])
+        assert not on_insert & set(update["$push"])
+        # 模拟插入：$setOnInsert + $set + $push（空数组上追加）
+        inserted = {**update["$setOnInsert"], **update["$set"]}
+        for field, push in update["$push"].items():
+            inserted[field] = push["$each"]
+        assert inserted == processor._build_new_doc(
+            item, "id1", "weibo_hot", ["position", "hot_value"], 100, "raw_hot_national"
+        )
+
+    def test_process_single_round_trip(self, temp_yaml_config, mock_mongo_client):
+        """单条处理只发一次 update_one upsert"""
+        from BroadTopicExtraction.pipeline.processor import DataProcessor
+
+        with patch("BroadTopicExtraction.pipeline.mongo_writer.MongoClient") as MockClient:
+            MockClient.return_value = mock_mongo_client
+            collection = mock_mongo_client["test_db"]["raw_hot_national"]
+            processor = DataProcessor(config_dir=str(temp_yaml_config))
+
+            collection.update_one.return_value = MagicMock(upserted_id="new")
+            first = processor.process({"title": "a", "position": 1}, "weibo_hot")
+            collection.update_one.return_value = MagicMock(upserted_id=None)
+            second = processor.process({"title": "a", "position": 2}, "weibo_hot")
+
+        assert (first.action, second.action) == ("inserted", "updated")
+        assert collection.update_one.call_count == 2
+        assert collection.update_one.call_args.kwargs["upsert"] is True
+        collection.find_one.assert_not_called()
+
+
 class TestProcessResult:
     """测试处理结果类"""
 
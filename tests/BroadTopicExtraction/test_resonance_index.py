@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+增量跨平台共振索引 - 单元测试
+
+用内存中的 collection 回放多轮采集（新增、更新、滑出窗口、被过滤），
+每轮对比增量索引与批量算法生成的跨平台信号完全一致。
+"""
+
+import copy
+import random
+from unittest.mock import MagicMock
+
+from BroadTopicExtraction.analyzer.data_reader import DataReader
+from BroadTopicExtraction.analyzer.resonance_index import MAX_KEYWORD_FANOUT, ResonanceIndex
+from BroadTopicExtraction.analyzer.signal_detector import SignalDetector
+from BroadTopicExtraction.pipeline.keywords import item_keywords
+
+_TOPICS = [
+    ("华为", "芯片", "发布会"),
+    ("台风", "登陆", "浙江"),
+    ("高考", "分数线", "公布"),
+    ("足球", "联赛", "冠军"),
+    ("油价", "上涨", "汽车"),
+    ("电影", "票房", "春节"),
+]
+_PLATFORMS = ["weibo", "baidu", "douyin", "zhihu", "toutiao", "bilibili", "bilibili-hot-search", "cls-hot"]
+_COLLECTIONS = ["hot_national", "hot_vertical", "aggregator"]
+
+
+class _MemoryMongo:
+    """按插入顺序返回文档的内存 collection，支持 last_seen_at / source 查询"""
+
+    def __init__(self):
+        self.docs: dict[str, list[dict]] = {c: [] for c in _COLLECTIONS}
+
+    def find(self, collection, query, projection=None):
+        since = query["last_seen_at"]["$gte"]
+        result = []
+        for doc in self.docs.get(collection, []):
+            if doc["last_seen_at"] < since:
+                continue
+            if "source" in query and doc.get("source") != query["source"]:
+                continue
+            result.append(copy.deepcopy(doc))
+        return result
+
+
+def _make_title(rng: random.Random) -> str:
+    words = list(rng.choice(_TOPICS))
+    rng.shuffle(words)
+    title = "".join(words[: rng.choice((2, 3))])
+    if rng.random() < 0.7:
+        # 高频词：触发常见词（命中数 > MAX_KEYWORD_FANOUT）阈值的跨越
+        title = "中国" + title
+    if rng.random() < 0.5:
+        title += rng.choice(["进展", "热议", "解读", "视频"])
+    return title
+
+
+def _replay_detectors(rounds: int = 20, seed: int = 7):
+    rng = random.Random(seed)
+    mongo = _MemoryMongo()
+    reader = DataReader(mongo_writer=mongo)
+    reader._filters = {"source_blacklist": {"tophub_zhihu": {"titles": frozenset(["中国台风登陆"])}}}
+    batch = SignalDetector(data_reader=reader, signal_writer=MagicMock(), incremental=False)
+    incremental = SignalDetector(data_reader=reader, signal_writer=MagicMock(), incremental=True)
+
+    now = 1_700_000_000
+    seq = 0
+    for _ in range(rounds):
+        now += 600
+        # 更新部分已有条目（last_seen_at 前移、热度/排名变化，少量被过滤）
+        for docs in mongo.docs.values():
+            for doc in docs:
+                if rng.random() < 0.2:
+                    doc["last_seen_at"] = now
+                    doc["hot_value"] = rng.randint(1000, 900000)
+                    doc["position"] = rng.randint(1, 50)
+                    doc["hot_value_history"].append({"ts": now, "val": doc["hot_value"]})
+        # 新增条目
+        for _ in range(rng.randint(10, 30)):
+            seq += 1
+            collection = rng.choice(_COLLECTIONS)
+            platform = rng.choice(_PLATFORMS)
+            mongo.docs[collection].append(
+                {
+                    "item_id": f"id{seq}",
+                    "title": _make_title(rng),
+                    "platform": platform,
+                    "source": f"tophub_{rng.choice(['zhihu', 'weibo'])}",
+                    "position": rng.randint(1, 50),
+                    "hot_value": rng.randint(1000, 900000),
+                    "hot_value_history": [],
+                    "position_history": [],
+                    "first_seen_at": now,
+                    "last_seen_at": now,
+                }
+            )
+        since = now - 3600
+        yield (
+            batch._detect_cross_platform(reader.get_all_hot_items(since)),
+            incremental.detect_cross_platform(since),
+            incremental,
+        )
+
+
+class TestResonanceIndexEquivalence:
+    def test_identical_signals_to_batch_algorithm(self):
+        total_batch = 0
+        for batch_signals, incremental_signals, _ in _replay_detectors():
+            assert incremental_signals == batch_signals
+            total_batch += len(batch_signals)
+        assert total_batch > 0, "回放数据应产生跨平台信号"
+
+    def test_only_changed_titles_are_tokenized(self):
+        *_, (_, _, detector) = _replay_detectors()
+        stats = detector._resonance_index.stats
+        assert stats["evicted"] > 0
+        # 更新的条目标题不变，不重新分词
+        assert stats["tokenized"] < stats["ingested"] / 2
+
+
+class TestResonanceIndex:
+    def _index(self):
+        return ResonanceIndex(2, item_keywords, _COLLECTIONS)
+
+    def _item(self, item_id, title, platform, ts=100):
+        return {"item_id": item_id, "title": title, "platform": platform, "first_seen_at": ts, "last_seen_at": ts}
+
+    def test_cluster_splits_after_bridge_evicted(self):
+        index = self._index()
+        index.upsert("hot_national", self._item("a", "华为芯片发布会", "weibo", ts=100))
+        index.upsert("hot_national", self._item("b", "华为芯片发布会现场", "baidu", ts=200))
+        index.upsert("hot_national", self._item("c", "华为发布会芯片解读", "zhihu", ts=100))
+        assert [len(g) for g in index.groups()] == [3]
+
+        index.evict(150)
+        assert [[item["item_id"] for item, _ in g] for g in index.groups()] == [["b"]]
+
+    def test_lower_priority_duplicate_title_takes_over(self):
+        index = self._index()
+        index.upsert("hot_national", self._item("n1", "台风登陆浙江", "weibo", ts=100))
+        index.upsert("aggregator", self._item("g1", "台风登陆浙江", "zhihu", ts=200))
+        assert [item["item_id"] for item, _ in index.groups()[0]] == ["n1"]
+
+        index.remove("hot_national", "n1")
+        assert [item["item_id"] for item, _ in index.groups()[0]] == ["g1"]
+
+    def test_common_keyword_stops_counting_past_fanout(self):
+        index = self._index()
+        for i in range(MAX_KEYWORD_FANOUT + 1):
+            index.upsert("aggregator", self._item(f"x{i}", f"中国台风第{i}号", "weibo"))
+        index.upsert("aggregator", self._item("y", "中国台风登陆", "baidu"))
+        # "中国" / "台风" 命中数超过阈值，不再产生配对
+        assert all(len(g) == 1 for g in index.groups())
+
+        for i in range(MAX_KEYWORD_FANOUT):
+            index.remove("aggregator", f"x{i}")
+        assert [len(g) for g in index.groups(min_size=2)] == [2]
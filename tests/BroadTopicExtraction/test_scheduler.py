@@ -5,6 +5,8 @@ Scheduler 模块单元测试
 测试 scheduler/ 下的任务执行器和调度器
 """
 
+import asyncio
+
 import pytest
 from unittest.mock import MagicMock, AsyncMock, patch
 from pathlib import Path
@@ -15,7 +17,7 @@ class TestTaskRunner:
 
     def test_init(self):
         """测试初始化"""
-        with patch("BroadTopicExtraction.scheduler.runner.DataProcessor"):
+        with patch("BroadTopicExtraction.scheduler.runner.AsyncDataProcessor"):
             from BroadTopicExtraction.scheduler.runner import TaskRunner
 
             runner = TaskRunner(mongo_uri="mongodb://test:27017")
@@ -23,10 +25,11 @@ class TestTaskRunner:
             assert runner.mongo_uri == "mongodb://test:27017"
             assert runner.processor is None
 
-    def test_get_processor_lazy(self):
+    @pytest.mark.asyncio
+    async def test_get_processor_lazy(self):
         """测试延迟初始化处理器"""
-        with patch("BroadTopicExtraction.scheduler.runner.DataProcessor") as MockProcessor:
-            mock_processor = MagicMock()
+        with patch("BroadTopicExtraction.scheduler.runner.AsyncDataProcessor") as MockProcessor:
+            mock_processor = AsyncMock()
             MockProcessor.return_value = mock_processor
 
             from BroadTopicExtraction.scheduler.runner import TaskRunner
@@ -34,18 +37,18 @@ class TestTaskRunner:
             runner = TaskRunner(mongo_uri="mongodb://test:27017")
 
             # 第一次调用应该创建处理器
-            processor1 = runner._get_processor()
+            processor1 = await runner._get_processor()
             assert processor1 is mock_processor
-            mock_processor.connect.assert_called_once()
+            mock_processor.connect.assert_awaited_once()
 
             # 第二次调用应该返回同一个处理器
-            processor2 = runner._get_processor()
+            processor2 = await runner._get_processor()
             assert processor2 is processor1
 
     @pytest.mark.asyncio
     async def test_run_aggregator_missing_config(self):
         """测试聚合器任务缺少配置"""
-        with patch("BroadTopicExtraction.scheduler.runner.DataProcessor"):
+        with patch("BroadTopicExtraction.scheduler.runner.AsyncDataProcessor"):
             from BroadTopicExtraction.scheduler.runner import TaskRunner
 
             runner = TaskRunner()
@@ -59,7 +62,7 @@ class TestTaskRunner:
     @pytest.mark.asyncio
     async def test_run_aggregator_unknown_aggregator(self):
         """测试未知聚合器"""
-        with patch("BroadTopicExtraction.scheduler.runner.DataProcessor"):
+        with patch("BroadTopicExtraction.scheduler.runner.AsyncDataProcessor"):
             with patch("BroadTopicExtraction.scheduler.runner.get_aggregator") as mock_get:
                 mock_get.return_value = None
 
@@ -79,7 +82,7 @@ class TestTaskRunner:
     @pytest.mark.asyncio
     async def test_run_aggregator_fetch_failed(self):
         """测试聚合器获取数据失败"""
-        with patch("BroadTopicExtraction.scheduler.runner.DataProcessor"):
+        with patch("BroadTopicExtraction.scheduler.runner.AsyncDataProcessor"):
             with patch("BroadTopicExtraction.scheduler.runner.get_aggregator") as mock_get:
                 # Mock 聚合器
                 mock_aggregator = AsyncMock()
@@ -110,8 +113,8 @@ class TestTaskRunner:
     @pytest.mark.asyncio
     async def test_run_aggregator_success(self):
         """测试聚合器任务成功"""
-        with patch("BroadTopicExtraction.scheduler.runner.DataProcessor") as MockProcessor:
-            mock_processor = MagicMock()
+        with patch("BroadTopicExtraction.scheduler.runner.AsyncDataProcessor") as MockProcessor:
+            mock_processor = AsyncMock()
             mock_processor.process_batch_optimized.return_value = {
                 "inserted": 5,
                 "updated": 3,
@@ -128,6 +131,7 @@ class TestTaskRunner:
                 # Mock 成功的结果
                 mock_result = MagicMock()
                 mock_result.success = True
+                mock_result.unchanged = False
                 mock_result.count = 10
                 mock_result.items = [{"title": f"item{i}"} for i in range(10)]
                 mock_aggregator.fetch = AsyncMock(return_value=mock_result)
@@ -150,9 +154,49 @@ class TestTaskRunner:
                 assert result["updated"] == 3
                 assert result["skipped"] == 2
 
+    @pytest.mark.asyncio
+    async def test_run_aggregator_unchanged(self):
+        """上游内容未变化时不处理数据，只刷新上一批的 last_seen_at"""
+        from BroadTopicExtraction.aggregators.base import AggregatorResult
+
+        with patch("BroadTopicExtraction.scheduler.runner.AsyncDataProcessor") as MockProcessor:
+            mock_processor = AsyncMock()
+            mock_processor.process_batch_optimized.return_value = {
+                "inserted": 1,
+                "updated": 0,
+                "skipped": 0,
+            }
+            mock_processor.touch_last_seen.return_value = 1
+            MockProcessor.return_value = mock_processor
+
+            with patch("BroadTopicExtraction.scheduler.runner.get_aggregator") as mock_get:
+                mock_aggregator = AsyncMock()
+                mock_aggregator.__aenter__ = AsyncMock(return_value=mock_aggregator)
+                mock_aggregator.__aexit__ = AsyncMock(return_value=None)
+                mock_aggregator.fetch = AsyncMock(side_effect=[
+                    AggregatorResult(success=True, source="weibo", items=[{"title": "a"}]),
+                    AggregatorResult(success=True, source="weibo", unchanged=True),
+                ])
+                mock_get.return_value = mock_aggregator
+
+                from BroadTopicExtraction.scheduler.runner import TaskRunner
+
+                runner = TaskRunner()
+                config = {"aggregator_name": "tophub", "aggregator_source": "weibo"}
+
+                await runner.run_aggregator("test_source", config)
+                result = await runner.run_aggregator("test_source", config)
+
+                assert result["unchanged"] is True
+                assert result["touched"] == 1
+                mock_processor.process_batch_optimized.assert_called_once()
+                source, since_ts = mock_processor.touch_last_seen.call_args.args
+                assert source == "test_source"
+                assert since_ts > 0
+
     def test_run_scrapy_missing_spider_name(self):
         """测试 Scrapy 任务缺少 spider_name"""
-        with patch("BroadTopicExtraction.scheduler.runner.DataProcessor"):
+        with patch("BroadTopicExtraction.scheduler.runner.AsyncDataProcessor"):
             from BroadTopicExtraction.scheduler.runner import TaskRunner
 
             runner = TaskRunner()
@@ -167,7 +211,7 @@ class TestTaskRunner:
         """测试 Scrapy 任务超时"""
         import subprocess
 
-        with patch("BroadTopicExtraction.scheduler.runner.DataProcessor"):
+        with patch("BroadTopicExtraction.scheduler.runner.AsyncDataProcessor"):
             with patch("subprocess.run") as mock_run:
                 mock_run.side_effect = subprocess.TimeoutExpired(cmd="scrapy", timeout=300)
 
@@ -183,7 +227,7 @@ class TestTaskRunner:
 
     def test_run_scrapy_success(self):
         """测试 Scrapy 任务成功"""
-        with patch("BroadTopicExtraction.scheduler.runner.DataProcessor"):
+        with patch("BroadTopicExtraction.scheduler.runner.AsyncDataProcessor"):
             with patch("subprocess.run") as mock_run:
                 mock_run.return_value = MagicMock(
                     returncode=0,
@@ -201,7 +245,7 @@ class TestTaskRunner:
 
     def test_run_scrapy_failed(self):
         """测试 Scrapy 任务失败"""
-        with patch("BroadTopicExtraction.scheduler.runner.DataProcessor"):
+        with patch("BroadTopicExtraction.scheduler.runner.AsyncDataProcessor"):
             with patch("subprocess.run") as mock_run:
                 mock_run.return_value = MagicMock(returncode=1, stderr="Spider error")
 
@@ -218,7 +262,7 @@ class TestTaskRunner:
     @pytest.mark.asyncio
     async def test_run_task_aggregator(self):
         """测试 run_task 自动选择聚合器"""
-        with patch("BroadTopicExtraction.scheduler.runner.DataProcessor"):
+        with patch("BroadTopicExtraction.scheduler.runner.AsyncDataProcessor"):
             from BroadTopicExtraction.scheduler.runner import TaskRunner
 
             runner = TaskRunner()
@@ -238,10 +282,10 @@ class TestTaskRunner:
     @pytest.mark.asyncio
     async def test_run_task_scrapy(self):
         """测试 run_task 自动选择 Scrapy"""
-        with patch("BroadTopicExtraction.scheduler.runner.DataProcessor"):
+        with patch("BroadTopicExtraction.scheduler.runner.AsyncDataProcessor"):
             from BroadTopicExtraction.scheduler.runner import TaskRunner
 
-            runner = TaskRunner()
+            runner = TaskRunner(scrapy_in_process=False)
             runner.run_scrapy = MagicMock(return_value={"success": True})
 
             config = {
@@ -253,16 +297,72 @@ class TestTaskRunner:
 
             assert result["success"] is True
 
-    def test_close(self):
+    def test_crawl_in_process_returns_stats(self):
+        """进程内运行爬虫，统计直接取自 stats collector；HTTP 请求经 DNS 解析正常完成"""
+        import http.server
+        import threading
+
+        import scrapy
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = b"hello"
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = http.server.HTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        class DataSpider(scrapy.Spider):
+            name = "data_spider"
+            start_urls = ["data:,hello"]
+
+            def parse(self, response):
+                yield {"title": response.text}
+
+        class HttpSpider(DataSpider):
+            name = "http_spider"
+            # localhost 需经 reactor 线程池做 DNS 解析
+            start_urls = [f"http://localhost:{server.server_port}/"]
+
+        with patch("BroadTopicExtraction.scheduler.runner.AsyncDataProcessor"):
+            from BroadTopicExtraction.scheduler.runner import TaskRunner
+
+            runner = TaskRunner()
+
+            async def crawl_all():
+                overrides = {"ITEM_PIPELINES": {}, "LOG_ENABLED": False}
+                results = [await runner.crawl_in_process(DataSpider, overrides) for _ in range(2)]
+                results.append(await runner.crawl_in_process(HttpSpider, overrides, timeout=20))
+                return results
+
+            try:
+                results = asyncio.run(crawl_all())
+            finally:
+                server.shutdown()
+
+            for stats in results:
+                assert stats["item_scraped_count"] == 1
+                assert stats["finish_reason"] == "finished"
+            assert results[-1]["elapsed_time_seconds"] < 10
+
+    @pytest.mark.asyncio
+    async def test_close(self):
         """测试关闭资源"""
-        with patch("BroadTopicExtraction.scheduler.runner.DataProcessor") as MockProcessor:
-            mock_processor = MagicMock()
+        with patch("BroadTopicExtraction.scheduler.runner.AsyncDataProcessor") as MockProcessor:
+            mock_processor = AsyncMock()
+            mock_processor.close = MagicMock()
             MockProcessor.return_value = mock_processor
 
             from BroadTopicExtraction.scheduler.runner import TaskRunner
 
             runner = TaskRunner()
-            runner._get_processor()  # 初始化处理器
+            await runner._get_processor()  # 初始化处理器
 
             runner.close()
 
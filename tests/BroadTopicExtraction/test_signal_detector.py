@@ -7,6 +7,7 @@
 """
 
 import time
+from unittest.mock import MagicMock
 
 import pytest
 
@@ -325,20 +326,22 @@ class TestSignalDetector:
 class TestDetectForSource:
     """测试单信源 Layer 1 检测"""
 
+    THRESHOLDS = {
+        "velocity_growth_rate": 0.05,
+        "velocity_min_hot_value": 1000,
+        "new_entry_max_age": LOOKBACK,
+        "new_entry_min_hot_value": 10000,
+        "new_entry_max_position": 20,
+        "position_jump_min": 3,
+    }
+
     @pytest.fixture(scope="class")
     def source_result(self, mongo, signal_mongo):
         reader = DataReader(mongo_writer=mongo)
         detector = SignalDetector(
             data_reader=reader,
             signal_writer=signal_mongo,
-            thresholds={
-                "velocity_growth_rate": 0.05,
-                "velocity_min_hot_value": 1000,
-                "new_entry_max_age": LOOKBACK,
-                "new_entry_min_hot_value": 10000,
-                "new_entry_max_position": 20,
-                "position_jump_min": 3,
-            },
+            thresholds=self.THRESHOLDS,
         )
         since = int(time.time()) - LOOKBACK
         signals = detector.detect_for_source("baidu_hot", "hot_national", since_ts=since)
@@ -372,6 +375,19 @@ class TestDetectForSource:
             assert "hot_value_history" in s
             assert "position_history" in s
 
+    def test_aggregation_engine_matches(self, source_result, mongo):
+        """聚合管道引擎与 Python 引擎在真实数据上输出相同信号"""
+        detector = SignalDetector(
+            data_reader=DataReader(mongo_writer=mongo),
+            signal_writer=MagicMock(),
+            thresholds={**self.THRESHOLDS, "layer1_engine": "aggregation"},
+        )
+        since = int(time.time()) - LOOKBACK
+        signals = detector.detect_for_source("baidu_hot", "hot_national", since_ts=since)
+        assert sorted(s["signal_id"] for s in signals) == sorted(
+            s["signal_id"] for s in source_result
+        )
+
 
 # ==================== detect_cross_platform 测试 ====================
 
@@ -211,9 +211,7 @@ class TestWorkerExecution:
 
     @pytest.mark.asyncio
     async def test_worker_config_restored_after_blocked(self, task_doc):
-        """即使任务 blocked，config 也应被恢复"""
-        from DeepSentimentCrawling.worker import _save_config
-
+        """即使任务 blocked，config 也应保持不变"""
         import config as cfg_module
         # 在项目 config 上设置标记属性
         cfg_module._TEST_MARKER = "original_value"
@@ -5,17 +5,22 @@
 测试内容：
 1. _emit_crawl_tasks() 任务生成逻辑
 2. CookieManager 保存/加载/过期周期
-3. PlatformWorker config 保存/恢复安全性
+3. PlatformWorker 任务级 config 隔离（并发任务互不干扰）
 4. TaskDispatcher 熔断器逻辑
 5. 集成冒烟测试：假设话题 → 状态跃迁 → crawl_task 生成 → Worker 执行 → MySQL 数据验证
 6. TopicMatcher 去重改进：fast-path / 36h 窗口 / 候选路径去重 / exclude_candidate_id
+7. WorkerPool 多进程执行：结果回传、子进程崩溃恢复
+8. TaskDispatcher 入队唤醒：任务到达即调度，不等定时轮询
 """
 
 import asyncio
+import os
+import queue
 import time
 from unittest.mock import MagicMock, AsyncMock, patch
 
 import pytest
+from pymongo.errors import AutoReconnect, OperationFailure, ServerSelectionTimeoutError
 
 import sys
 from pathlib import Path
@@ -414,34 +419,82 @@ class TestAlertService:
 
 
 class TestWorkerConfigSafety:
-    """测试 config 保存/恢复不会泄漏全局状态"""
+    """测试任务级 config 覆盖不会泄漏全局状态，并发任务互不干扰"""
 
-    def test_save_restore_roundtrip(self):
-        """config 保存后恢复，全局状态应不变"""
-        from DeepSentimentCrawling.worker import _save_config, _restore_config, mc_config
+    def test_task_config_scoped(self):
+        """task_config 内的读写只作用于当前上下文，退出后全局值不变"""
+        from DeepSentimentCrawling.worker import mc_config
 
-        # 先设置一个已知属性用于测试
-        mc_config.TEST_PLATFORM = "bili"
         mc_config.TEST_KEYWORDS = "原始关键词"
-
-        original = _save_config()
-        assert "TEST_PLATFORM" in original
-        assert original["TEST_PLATFORM"] == "bili"
-
-        # 修改
-        mc_config.TEST_PLATFORM = "test_modified"
-        mc_config.TEST_KEYWORDS = "被篡改的关键词"
-        assert mc_config.TEST_PLATFORM == "test_modified"
-
-        # 恢复
-        _restore_config(original)
-        assert mc_config.TEST_PLATFORM == "bili"
+        with mc_config.task_config(TEST_KEYWORDS="任务关键词"):
+            assert mc_config.TEST_KEYWORDS == "任务关键词"
+            # 爬虫内部的赋值（如 login.py 的 config.LOGIN_TYPE = ...）只落在任务覆盖上
+            mc_config.TEST_KEYWORDS = "被篡改的关键词"
+            assert mc_config.TEST_KEYWORDS == "被篡改的关键词"
         assert mc_config.TEST_KEYWORDS == "原始关键词"
 
         # 清理
-        del mc_config.TEST_PLATFORM
         del mc_config.TEST_KEYWORDS
 
+    def test_parallel_tasks_isolated(self):
+        """两个平台的任务并发执行，各自看到自己的关键词与配置"""
+        from DeepSentimentCrawling import worker as worker_module
+        from var import crawling_task_id_var
+
+        mc_config = worker_module.mc_config
+        original_platform = mc_config.PLATFORM
+        seen = {}
+
+        class FakeCrawler:
+            async def start(self):
+                task_id = crawling_task_id_var.get()
+                seen[task_id] = [(mc_config.PLATFORM, mc_config.KEYWORDS)]
+                # 与真实爬虫一样在运行中改写 config，交错执行
+                mc_config.CRAWLER_MAX_NOTES_COUNT = len(task_id)
+                await asyncio.sleep(0.01)
+                seen[task_id].append(
+                    (mc_config.PLATFORM, mc_config.KEYWORDS, mc_config.CRAWLER_MAX_NOTES_COUNT)
+                )
+
+            async def close_http_pool(self):
+                pass
+
+            async def release_pooled_browser(self, discard=False):
+                pass
+
+        cm = MagicMock()
+        cm.load_cookies.return_value = ("cookie_1", {"sid": "x"})
+        worker = worker_module.PlatformWorker(cookie_manager=cm)
+
+        def make_task(task_id, platform, keywords):
+            return {
+                "task_id": task_id,
+                "platform": platform,
+                "candidate_id": "cand_1",
+                "search_keywords": keywords,
+                "max_notes": 5,
+            }
+
+        async def run_both():
+            return await asyncio.gather(
+                worker.execute_task(make_task("t_xhs", "xhs", ["关键词A", "A2"])),
+                worker.execute_task(make_task("task_wb", "wb", ["关键词B"])),
+            )
+
+        # 私有事件循环，不设为当前循环，不影响同模块中使用 get_event_loop 的同步测试
+        loop = asyncio.new_event_loop()
+        try:
+            with patch.dict(worker_module._CRAWLERS, {"xhs": FakeCrawler, "wb": FakeCrawler}), \
+                    patch.object(worker_module, "flush_write_buffer", AsyncMock()):
+                results = loop.run_until_complete(run_both())
+        finally:
+            loop.close()
+
+        assert [r["status"] for r in results] == ["success", "success"]
+        assert seen["t_xhs"] == [("xhs", "关键词A,A2"), ("xhs", "关键词A,A2", 5)]
+        assert seen["task_wb"] == [("wb", "关键词B"), ("wb", "关键词B", 7)]
+        assert mc_config.PLATFORM == original_platform
+
 
 # ==================== 5. TaskDispatcher 熔断器测试 ====================
 
@@ -845,7 +898,7 @@ class TestDispatcherCircuitDrop:
             assert len(info_calls_round2) == 0
 
     def test_lock_skipped_tasks_still_push_back(self, mock_mongo):
-        """锁占用时 Redis 任务应推回队列"""
+        """平台槽位已满时 Redis 任务应推回队列"""
         dispatcher = TaskDispatcher(
             platforms=["wb"], mongo_writer=mock_mongo, dry_run=True
         )
@@ -855,9 +908,9 @@ class TestDispatcherCircuitDrop:
         mock_queue = MagicMock()
         dispatcher._task_queue = mock_queue
 
-        # 手动锁住平台
-        lock = dispatcher.platform_locks["wb"]
-        lock._locked = True  # asyncio.Lock 内部状态
+        # 手动占满平台槽位
+        slots = dispatcher.platform_slots["wb"]
+        slots._value = 0  # asyncio.Semaphore 内部状态
 
         tasks = [self._make_task("wb")]
         dispatcher._fetch_pending_tasks = MagicMock(return_value=tasks)
@@ -866,6 +919,51 @@ class TestDispatcherCircuitDrop:
 
         mock_queue.push_back.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_slot_wait_user_task_claimed_first(self, mock_mongo):
+        """槽位已满的用户任务排队等槽位前先认领，认领失败则确认丢弃"""
+        dispatcher = TaskDispatcher(
+            platforms=["wb"], mongo_writer=mock_mongo, dry_run=True
+        )
+        dispatcher.cookie_manager = MagicMock()
+        dispatcher.cookie_manager.has_active_cookies.return_value = True
+        dispatcher._task_queue = mock_queue = MagicMock()
+        dispatcher.platform_slots["wb"]._value = 0
+        col = mock_mongo.get_collection.return_value
+        col.update_one.return_value = MagicMock(matched_count=0)
+
+        task = self._make_task("wb", "ut_wait_001")
+        task["_source"] = "user"
+        dispatcher._fetch_pending_tasks = MagicMock(return_value=[task])
+
+        await dispatcher._dispatch_round()
+
+        claim_filter = col.update_one.call_args_list[0].args[0]
+        assert claim_filter["task_id"] == "ut_wait_001"
+        assert claim_filter["status"] == "pending"
+        mock_queue.ack.assert_called_once_with(task)
+        assert not dispatcher._running_tasks
+
+    def test_reclaimed_task_claim(self, mock_mongo):
+        """接管的任务可认领 running / 到期 pending，已完成的确认丢弃"""
+        dispatcher = TaskDispatcher(
+            platforms=["wb"], mongo_writer=mock_mongo, dry_run=True
+        )
+        dispatcher._task_queue = mock_queue = MagicMock()
+        col = mock_mongo.get_collection.return_value
+        col.update_one.return_value = MagicMock(matched_count=0)  # MongoDB 中已完成
+
+        task = self._make_task("wb", "ct_reclaimed_001")
+        task["_reclaimed"] = True
+        assert dispatcher._claim_for_dispatch(task) is False
+        mock_queue.ack.assert_called_once_with(task)
+
+        claim_filter = col.update_one.call_args.args[0]
+        statuses = {cond["status"] for cond in claim_filter["$or"]}
+        assert statuses == {"pending", "running"}
+        pending = next(c for c in claim_filter["$or"] if c["status"] == "pending")
+        assert {"next_retry_at": {"$exists": False}} in pending["$or"]
+
     def test_circuit_recovery_clears_drop_log(self, mock_mongo):
         """熔断恢复后日志标记应被清除，下次熔断可再次输出"""
         dispatcher = TaskDispatcher(
@@ -880,3 +978,178 @@ class TestDispatcherCircuitDrop:
 
         assert dispatcher._is_circuit_open("wb") is False
         assert "wb" not in dispatcher._circuit_drop_logged
+
+
+# ==================== 9. WorkerPool 多进程执行测试 ====================
+
+
+class _FakePlatformWorker:
+    """子进程内的假 worker：按平台返回结果，platform=crash 时直接退出进程"""
+
+    async def execute_task(self, task):
+        await asyncio.sleep(0.05)
+        if task["platform"] == "crash":
+            os._exit(1)
+        return {
+            "status": "success",
+            "total_crawled": len(task["search_keywords"]),
+            "pid": os.getpid(),
+        }
+
+    def progress(self):
+        return {}
+
+
+class TestWorkerPool:
+    """任务在子进程中执行，结果经 IPC 回传；子进程崩溃时任务失败并重新拉起"""
+
+    @pytest.mark.asyncio
+    async def test_execute_and_recover(self):
+        from DeepSentimentCrawling.worker_pool import WorkerPool
+
+        pool = WorkerPool(
+            2, tasks_per_process=1, worker_factory=_FakePlatformWorker, start_method="fork"
+        )
+        pool.HEARTBEAT_INTERVAL = 0.1
+        await pool.start()
+        try:
+            tasks = [
+                {"task_id": f"t{i}", "platform": "wb", "search_keywords": ["k"] * i}
+                for i in range(1, 5)
+            ]
+            results = await asyncio.gather(*(pool.execute_task(t) for t in tasks))
+            assert [r["total_crawled"] for r in results] == [1, 2, 3, 4]
+            assert len({r["pid"] for r in results}) == 2
+            assert os.getpid() not in {r["pid"] for r in results}
+
+            crashed = await pool.execute_task(
+                {"task_id": "boom", "platform": "crash", "search_keywords": []}
+            )
+            assert crashed["status"] == "failed"
+            assert crashed["error"].startswith("worker_crashed")
+
+            # 崩溃的子进程已重新拉起，后续任务照常执行
+            again = await asyncio.wait_for(
+                pool.execute_task({"task_id": "t5", "platform": "wb", "search_keywords": []}), 5
+            )
+            assert again["status"] == "success"
+            assert all(w["alive"] for w in pool.snapshot()["workers"])
+        finally:
+            await pool.stop()
+
+
+    @pytest.mark.asyncio
+    async def test_unstarted_tasks_requeued_on_crash(self):
+        """子进程崩溃时已开始的任务失败，已分配未开始的任务重新分配"""
+        from DeepSentimentCrawling.worker_pool import WorkerPool
+
+        pool = WorkerPool(1, tasks_per_process=2)
+
+        def fake_spawn(index):
+            pool._task_qs[index] = queue.Queue()
+            pool._free[index] = pool.tasks_per_process
+            pool._heartbeats[index] = time.monotonic()
+            pool._progress[index] = {}
+
+        pool._spawn = fake_spawn
+        pool._loop = asyncio.get_running_loop()
+        pool._running = True
+        fake_spawn(0)
+
+        started = asyncio.create_task(pool.execute_task({"task_id": "a", "platform": "wb"}))
+        waiting = asyncio.create_task(pool.execute_task({"task_id": "b", "platform": "wb"}))
+        await asyncio.sleep(0)
+        assert pool._assigned == {"a": 0, "b": 0}
+        pool._on_event({"type": "started", "worker": 0, "task_id": "a"})
+
+        pool._recover(0, "exitcode=1")
+        assert (await started)["error"] == "worker_crashed: exitcode=1"
+        assert pool._task_qs[0].get_nowait()["task_id"] == "b"
+        assert pool._assigned == {"b": 0}
+
+        result = {"status": "success", "total_crawled": 1}
+        pool._on_event({"type": "result", "worker": 0, "task_id": "b", "result": result})
+        assert await waiting == result
+        assert pool._free == {0: 2}
+
+
+# ==================== 10. 调度器入队唤醒测试 ====================
+
+
+class _WakeTaskQueue:
+    """内存任务队列：入队时发送唤醒消息，接口同 TaskQueue"""
+
+    def __init__(self):
+        self.tasks = []
+        self.messages = queue.Queue()
+
+    def push_user_task(self, task):
+        self.tasks.append({**task, "_source": "user", "_redis_score": time.time()})
+        self.messages.put({"data": f"user:{task['task_id']}"})
+
+    def pop_task(self):
+        return self.tasks.pop(0) if self.tasks else None
+
+    def ack(self, task):
+        pass
+
+    def subscribe_wakeups(self):
+        def get_message(timeout=0.0):
+            try:
+                return self.messages.get(timeout=timeout)
+            except queue.Empty:
+                return None
+
+        pubsub = MagicMock()
+        pubsub.get_message.side_effect = get_message
+        return pubsub
+
+
+class TestDispatcherWakeup:
+    """调度循环阻塞等待唤醒；变更流不可用时仍由 Redis 唤醒"""
+
+    @pytest.mark.asyncio
+    async def test_push_wakes_dispatch_loop(self, mock_mongo):
+        mock_mongo.get_collection.return_value.watch.side_effect = OperationFailure(
+            "$changeStream stage is only supported on replica sets", code=40573
+        )
+        dispatcher = TaskDispatcher(platforms=["wb"], mongo_writer=mock_mongo, dry_run=True)
+        dispatcher._task_queue = task_queue = _WakeTaskQueue()
+        dispatcher._running = True
+        loop_task = asyncio.create_task(dispatcher._dispatch_loop())
+        try:
+            for _ in range(100):
+                if "redis" in dispatcher._wake_sources:
+                    break
+                await asyncio.sleep(0.02)
+            assert dispatcher._wake_sources == {"redis"}
+            assert await dispatcher._next_poll_delay() == dispatcher.IDLE_POLL_INTERVAL
+
+            task_queue.push_user_task(
+                {"task_id": "ut_wake_1", "platform": "wb", "search_keywords": ["k"]}
+            )
+            for _ in range(100):
+                if dispatcher._latencies:
+                    break
+                await asyncio.sleep(0.02)
+            # 远小于兜底轮询间隔
+            assert dispatcher.latency_summary()["samples"] == 1
+            assert dispatcher._latencies[0] < 1
+        finally:
+            dispatcher.stop()
+            await asyncio.wait_for(loop_task, 5)
+
+    def test_watch_mongo_retries_transient_errors(self, mock_mongo):
+        col = mock_mongo.get_collection.return_value
+        col.watch.side_effect = [
+            AutoReconnect("primary stepped down"),
+            # 选主期间的服务器选择超时，消息含 replica set 但仍是临时错误
+            ServerSelectionTimeoutError('No replica set members match selector "Primary()"'),
+            OperationFailure("$changeStream requires replica set", code=40573),
+        ]
+        dispatcher = TaskDispatcher(platforms=["wb"], mongo_writer=mock_mongo, dry_run=True)
+        dispatcher._running = True
+        with patch("DeepSentimentCrawling.dispatcher.time.sleep") as sleep:
+            dispatcher._watch_mongo()
+        assert col.watch.call_count == 3
+        assert [c.args[0] for c in sleep.call_args_list] == [1.0, 2.0]
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+StreamTaskQueue 集成测试（Redis Streams 消费组）
+
+两个消费者模拟两个调度节点：
+1. 按优先级取任务，每个任务只投递给一个节点，ack 后删除
+2. 节点崩溃（不 ack、不续约）后任务由另一节点 XAUTOCLAIM 接管，原节点停止续约
+3. push_back 保留提交时间，remove_task 按 task_id 移除
+
+前提：Redis >= 6.2 可达（使用独立的测试 key，不影响线上队列）
+
+运行：
+    uv run pytest tests/DeepSentimentCrawling/test_stream_task_queue.py -v
+"""
+
+import time
+
+import pytest
+from redis import Redis
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from DeepSentimentCrawling.stream_task_queue import StreamTaskQueue
+from ms_config import settings
+
+
+def _redis_available() -> bool:
+    try:
+        Redis(
+            host=settings.REDIS_DB_HOST,
+            port=settings.REDIS_DB_PORT,
+            password=settings.REDIS_DB_PWD or None,
+            db=settings.REDIS_DB_NUM,
+            socket_connect_timeout=2,
+        ).ping()
+        return True
+    except Exception:
+        return False
+
+
+# 测试标记：需要真实 Redis
+pytestmark = pytest.mark.skipif(not _redis_available(), reason="需要可连接的 Redis")
+
+
+class _TestStreamTaskQueue(StreamTaskQueue):
+    STREAM_KEYS = {
+        "user": "mindspider:test:tasks:user",
+        "candidate": "mindspider:test:tasks:candidate",
+    }
+    INDEX_KEY = "mindspider:test:tasks:index"
+
+
+@pytest.fixture
+def nodes():
+    a, b = _TestStreamTaskQueue("node-a"), _TestStreamTaskQueue("node-b")
+    a.connect()
+    b.connect()
+    a.clear_queue()
+    yield a, b
+    a.clear_queue()
+    a.disconnect()
+    b.disconnect()
+
+
+def _task(task_id: str, platform: str = "wb") -> dict:
+    return {"task_id": task_id, "platform": platform, "search_keywords": ["测试"], "attempts": 0}
+
+
+class TestStreamTaskQueue:
+
+    def test_priority_and_single_delivery(self, nodes):
+        a, b = nodes
+        a.push_candidate_task("cand_1", "rising", _task("ct_1"))
+        a.push_user_task(_task("ut_1"))
+        a.push_user_task(_task("ut_2"))
+        assert a.get_queue_size() == 3
+        assert [t["task_id"] for t in b.peek_tasks()] == ["ut_1", "ut_2", "ct_1"]
+
+        first, second, third = a.pop_task(), b.pop_task(), b.pop_task()
+        assert [first["task_id"], second["task_id"], third["task_id"]] == ["ut_1", "ut_2", "ct_1"]
+        assert first["_source"] == "user" and third["_source"] == "candidate"
+        assert a.pop_task() is None and b.pop_task() is None
+        assert a.get_queue_size() == 0
+
+        for node, task in ((a, first), (b, second), (b, third)):
+            node.ack(task)
+        assert a._redis.xlen(a.STREAM_KEYS["user"]) == 0
+        assert not a._redis.hgetall(a.INDEX_KEY)
+
+    def test_crashed_node_task_reclaimed(self, nodes):
+        a, b = nodes
+        a.push_user_task(_task("ut_crash"))
+        lost = a.pop_task()  # node-a 取出后崩溃：不 ack、不续约
+
+        b.CLAIM_IDLE_MS = 100
+        b.RECLAIM_INTERVAL = 0
+        assert b.pop_task() is None  # 未超时不接管
+        time.sleep(0.2)
+        taken = b.pop_task()
+        assert taken["task_id"] == "ut_crash"
+        assert taken["_reclaimed"] is True
+        assert taken["_stream_entry"] == lost["_stream_entry"]
+
+        # node-a 恢复后发现任务已被接管，不再续约
+        assert a.renew() == 0
+        assert b.renew() == 1
+        b.ack(taken)
+        assert b.pop_task() is None
+
+    def test_push_back_and_remove(self, nodes):
+        a, b = nodes
+        a.push_candidate_task("cand_1", "rising", _task("ct_back"))
+        task = a.pop_task()
+        a.push_back(task, task["_redis_score"])
+
+        again = b.pop_task()
+        assert again["task_id"] == "ct_back"
+        assert again["_redis_score"] == pytest.approx(task["_redis_score"])
+        assert again["_stream_entry"] != task["_stream_entry"]
+        assert a.renew() == 0
+
+        b.push_user_task(_task("ut_cancel"))
+        assert b.remove_task("ut_cancel", prefix="user") is True
+        assert a.pop_task() is None